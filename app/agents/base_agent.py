@@ -1,8 +1,10 @@
 """Base agent class."""
 
 from abc import ABC, abstractmethod
-from typing import Optional
-from app.llm.base_provider import BaseLLMProvider
+from typing import Optional, Callable, Dict, List, Tuple
+from app.llm.base_provider import BaseLLMProvider, TruncatedResponseError
+from app.llm.output_budget import OutputLengthTracker, get_output_tracker
+from app.llm.token_budget import BudgetReport, PromptBudgeter, PromptPart, get_token_counter, provider_model
 
 
 class BaseAgent(ABC):
@@ -19,10 +21,20 @@ class BaseAgent(ABC):
             llm_provider: LLM provider instance (dependency injection)
             role: Role identifier for this agent
             **kwargs: Additional configuration
+                - prompt_budget: Prompt token budget overriding the one
+                  derived from the model's context window
+                - dynamic_max_tokens: Size max_tokens from measured output
+                  lengths (default: True)
+                - output_tracker: OutputLengthTracker to use (default: the
+                  process-wide tracker)
         """
         self.llm_provider = llm_provider
         self.role = role
         self.config = kwargs
+        self.last_budget_report: Optional[BudgetReport] = None
+        self.output_tracker: Optional[OutputLengthTracker] = None
+        if kwargs.get('dynamic_max_tokens', True):
+            self.output_tracker = kwargs.get('output_tracker') or get_output_tracker()
     
     @abstractmethod
     def execute(self, *args, **kwargs) -> str:
@@ -44,4 +56,108 @@ class BaseAgent(ABC):
             Role identifier string
         """
         return self.role
-
+    
+    def _generate(
+        self,
+        prompt: str,
+        on_chunk: Optional[Callable[[str], None]] = None,
+        output_key: Optional[str] = None,
+        **kwargs
+    ) -> str:
+        """Generate text, optionally streaming chunks to a callback.
+        
+        With an output tracker, max_tokens is treated as a ceiling: the
+        request asks for the budget measured from earlier outputs of this
+        agent and model, and a response truncated at that budget is retried
+        with a larger one. Streamed output can't be taken back once shown,
+        so streaming calls keep the full max_tokens and are only measured.
+        
+        Args:
+            prompt: The input prompt
+            on_chunk: Optional callback invoked with each text chunk as it
+                arrives (uses the provider's stream_text)
+            output_key: Name under which output lengths are tracked
+                (default: the agent's role)
+            **kwargs: Generation parameters (temperature, max_tokens, etc.)
+            
+        Returns:
+            Full generated text
+        """
+        provider_name, model = provider_model(self.llm_provider)
+        key = (output_key or self.role, provider_name, kwargs.get('model') or model or '')
+        
+        if on_chunk is not None:
+            chunks = []
+            for chunk in self.llm_provider.stream_text(prompt, **kwargs):
+                chunks.append(chunk)
+                on_chunk(chunk)
+            text = "".join(chunks)
+            self._record_output(key, text)
+            return text
+        
+        ceiling = kwargs.get('max_tokens')
+        if self.output_tracker is None or ceiling is None:
+            return self.llm_provider.generate_text(prompt, **kwargs)
+        
+        max_tokens = self.output_tracker.max_tokens(key, ceiling)
+        while True:
+            try:
+                text = self.llm_provider.generate_text(
+                    prompt,
+                    **{**kwargs, 'max_tokens': max_tokens, 'fail_on_truncation': max_tokens < ceiling}
+                )
+            except TruncatedResponseError as e:
+                # The provider may have sent more than asked (Gemini's output
+                # floor); grow from the budget the response actually hit
+                used = max(max_tokens, e.max_tokens or 0)
+                self.output_tracker.record_truncation(key, used)
+                larger = self.output_tracker.retry_budget(used, ceiling)
+                if larger is None:
+                    if max_tokens < ceiling and e.partial_text:
+                        # A request at the ceiling would be sent with the same
+                        # budget, and return this partial text
+                        return e.partial_text
+                    raise
+                print(f"[OutputBudget] {self.role}: response truncated at {used} tokens, retrying with {larger}")
+                max_tokens = larger
+                continue
+            
+            self._record_output(key, text)
+            return text
+    
+    def _record_output(self, key: Tuple[str, str, str], text: str) -> None:
+        """Record the length of a complete output with the output tracker."""
+        if self.output_tracker is not None:
+            self.output_tracker.record(key, get_token_counter(key[1], key[2] or None).count(text))
+    
+    def _fit_prompt(
+        self,
+        build: Callable[..., str],
+        parts: List[PromptPart],
+        max_tokens: int
+    ) -> Dict[str, str]:
+        """Shorten the variable parts of a prompt to fit the token budget.
+        
+        The budget is the provider model's context window less max_tokens
+        for the response (or the prompt_budget setting). What was removed
+        is logged and kept in last_budget_report.
+        
+        Args:
+            build: Builds the full prompt from the parts, by part name
+            parts: Variable parts of the prompt
+            max_tokens: Tokens requested for the response
+            
+        Returns:
+            Fitted text of each part, by part name
+        """
+        budgeter = PromptBudgeter.for_provider(
+            self.llm_provider,
+            max_output_tokens=max_tokens,
+            budget=self.config.get('prompt_budget')
+        )
+        result = budgeter.fit(parts, overhead=build(**{part.name: "" for part in parts}))
+        
+        self.last_budget_report = result.report
+        if result.report.removed:
+            print(f"[PromptBudget] {self.role}: {result.report.describe()}")
+        return result.texts
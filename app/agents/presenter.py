@@ -1,8 +1,9 @@
 """Presenter agent implementation."""
 
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Callable
 from app.agents.base_agent import BaseAgent
 from app.llm.base_provider import BaseLLMProvider
+from app.llm.token_budget import PromptPart
 
 
 class PresenterAgent(BaseAgent):
@@ -99,6 +100,7 @@ Address all feedback points while maintaining clarity and professionalism."""
             **kwargs: Additional configuration
                 - temperature: LLM temperature (default: 0.7)
                 - max_tokens: Maximum tokens to generate (default: 12000)
+                - prompt_budget: Prompt token budget (default: from the model's context window)
         """
         super().__init__(llm_provider, role="presenter", **kwargs)
         self.temperature = kwargs.get('temperature', 0.7)
@@ -109,7 +111,8 @@ Address all feedback points while maintaining clarity and professionalism."""
         requirements: str,
         feedback: Optional[List[str]] = None,
         previous_output: Optional[str] = None,
-        file_summaries: Optional[List[str]] = None
+        file_summaries: Optional[List[str]] = None,
+        on_chunk: Optional[Callable[[str], None]] = None
     ) -> str:
         """Generate content based on requirements and optional feedback.
         
@@ -118,6 +121,7 @@ Address all feedback points while maintaining clarity and professionalism."""
             feedback: Optional list of approved feedback from reviewers
             previous_output: Previous presenter output (for refinement)
             file_summaries: Optional summaries of uploaded files
+            on_chunk: Optional callback receiving output chunks as they stream in
             
         Returns:
             Generated content string (structured summary)
@@ -130,25 +134,31 @@ Address all feedback points while maintaining clarity and professionalism."""
                 file_context += f"{i}. {summary}\n"
             file_context += "\n"
         
-        # Choose prompt based on whether this is initial or refinement
+        # Choose prompt based on whether this is initial or refinement.
+        # Over the token budget, the previous version is summarized before
+        # feedback lines are dropped, and file context goes before requirements.
         if feedback and previous_output:
             # Refinement iteration
             feedback_text = "\n".join([f"- {f}" for f in feedback])
-            prompt = self.REFINEMENT_PROMPT_TEMPLATE.format(
-                previous_output=previous_output,
-                feedback=feedback_text
-            )
+            template = self.REFINEMENT_PROMPT_TEMPLATE
+            parts = [
+                PromptPart('previous_output', previous_output, priority=0, strategy='outline'),
+                PromptPart('feedback', feedback_text, priority=1, strategy='lines'),
+            ]
         else:
             # Initial generation
-            prompt = self.INITIAL_PROMPT_TEMPLATE.format(
-                requirements=requirements,
-                file_context=file_context
-            )
+            template = self.INITIAL_PROMPT_TEMPLATE
+            parts = [
+                PromptPart('file_context', file_context, priority=0, strategy='lines'),
+                PromptPart('requirements', requirements, priority=1),
+            ]
+        prompt = template.format(**self._fit_prompt(template.format, parts, self.max_tokens))
         
         # Generate using LLM
         try:
-            result = self.llm_provider.generate_text(
+            result = self._generate(
                 prompt,
+                on_chunk=on_chunk,
                 temperature=self.temperature,
                 max_tokens=self.max_tokens
             )
@@ -1,9 +1,150 @@
 """Reviewer agent implementation."""
 
-from typing import List, Dict
+import json
+import re
+from typing import Any, List, Dict, Optional, Callable, Tuple
 from app.agents.base_agent import BaseAgent
 from app.llm.base_provider import BaseLLMProvider
-from app.models.feedback import Feedback
+from app.llm.token_budget import PromptPart, output_limit, provider_model
+from app.models.feedback import Feedback, Finding, SEVERITIES, VERDICTS
+
+
+# JSON schemas for structured reviewer output. Only the subset understood by
+# every JSON mode in use (OpenAI json_schema, Gemini responseSchema) is used.
+FINDING_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "severity": {"type": "string", "enum": list(SEVERITIES)},
+        "description": {"type": "string"},
+    },
+    "required": ["severity", "description"],
+}
+
+REVIEW_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "verdict": {"type": "string", "enum": list(VERDICTS)},
+        "findings": {"type": "array", "items": FINDING_SCHEMA},
+        "improvements": {"type": "array", "items": {"type": "string"}},
+    },
+    "required": ["verdict", "findings"],
+}
+
+# Improvement tracking lists of the iterative schema
+TRACKING_KEYS = ('fixed', 'partially_fixed', 'not_addressed')
+
+ITERATIVE_REVIEW_SCHEMA = {
+    "type": "object",
+    "properties": {
+        **REVIEW_SCHEMA["properties"],
+        **{key: {"type": "array", "items": {"type": "string"}} for key in TRACKING_KEYS},
+    },
+    "required": ["verdict", "findings", *TRACKING_KEYS],
+}
+
+_SEVERITY_PREFIX = re.compile(r'^\[?\s*Severity:\s*(\w+)\s*\]?\s*', re.IGNORECASE)
+
+
+def _extract_json_object(result: str) -> Dict[str, Any]:
+    """Extract the JSON object from raw LLM output.
+    
+    Tolerates markdown fences or chatter around the object.
+    
+    Args:
+        result: Raw LLM output
+        
+    Returns:
+        Parsed object
+        
+    Raises:
+        ValueError: If the output holds no valid JSON object
+    """
+    start, end = result.find('{'), result.rfind('}')
+    if start == -1 or end < start:
+        raise ValueError("Response contains no JSON object")
+    
+    try:
+        data = json.loads(result[start:end + 1])
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Response contains invalid JSON: {e}")
+    
+    if not isinstance(data, dict):
+        raise ValueError("Response JSON is not an object")
+    return data
+
+
+def _normalize_severity(severity: Any) -> str:
+    """Upper-case a severity, mapping unknown or missing values to MEDIUM."""
+    severity = str(severity or '').strip().upper()
+    return severity if severity in SEVERITIES else 'MEDIUM'
+
+
+def _normalize_verdict(verdict: Any) -> Optional[str]:
+    """Normalize a verdict, mapping unknown or missing values to None."""
+    if not isinstance(verdict, str):
+        return None
+    verdict = verdict.strip().upper().replace('_', ' ')
+    return verdict if verdict in VERDICTS else None
+
+
+def _parse_finding(entry: Any) -> Optional[Finding]:
+    """Build a Finding from a schema object or a "[Severity: X] ..." string.
+    
+    Unknown severities (e.g. "INFO") count as MEDIUM rather than failing
+    the whole review.
+    """
+    if isinstance(entry, dict):
+        finding = Finding(
+            severity=_normalize_severity(entry.get('severity')),
+            description=str(entry.get('description', '')).strip()
+        )
+    elif isinstance(entry, str):
+        match = _SEVERITY_PREFIX.match(entry.strip())
+        severity = _normalize_severity(match.group(1) if match else None)
+        finding = Finding(severity=severity, description=entry.strip()[match.end() if match else 0:].strip())
+    else:
+        raise ValueError("Finding is neither an object nor a string")
+    
+    # Same minimum meaningful length as the free-text parser
+    return finding if len(finding.description) > 10 else None
+
+
+def structured_feedback(data: Dict[str, Any], reviewer_role: str, iteration: int) -> Feedback:
+    """Convert one reviewer's structured output into Feedback.
+    
+    Args:
+        data: Parsed object following REVIEW_SCHEMA or ITERATIVE_REVIEW_SCHEMA
+        reviewer_role: Role identifier of the reviewer
+        iteration: Iteration number
+        
+    Returns:
+        Feedback with verdict, typed findings and improvement tracking set
+        
+    Raises:
+        ValueError: If the object does not follow the schema
+    """
+    if not isinstance(data.get('findings'), list):
+        raise ValueError("Structured review has no findings list")
+    
+    findings = [finding for finding in map(_parse_finding, data['findings']) if finding][:8]  # Trim to max 8
+    
+    tracking = None
+    if any(key in data for key in TRACKING_KEYS):
+        tracking = {
+            key: [str(item) for item in data.get(key) or [] if str(item).strip()]
+            for key in TRACKING_KEYS
+        }
+    
+    return Feedback(
+        reviewer_role=reviewer_role,
+        feedback_points=[finding.to_text() for finding in findings] or ["No specific feedback provided"],
+        iteration=iteration,
+        approved=False,
+        modified=False,
+        verdict=_normalize_verdict(data.get('verdict')),
+        findings=findings,
+        improvement_tracking=tracking
+    )
 
 
 class ReviewerAgent(BaseAgent):
@@ -11,15 +152,38 @@ class ReviewerAgent(BaseAgent):
     
     Reviewers analyze content from the presenter and provide structured
     feedback (5-8 bullet points maximum).
+    
+    With structured_output enabled, reviewers ask for a JSON object instead
+    of free text and pass REVIEW_SCHEMA as response_schema, so providers
+    with a JSON/schema mode (OpenAI, Gemini, Ollama) constrain the output.
+    The result is parsed once into a verdict, typed findings and improvement
+    tracking on the Feedback; output that fails to parse falls back to the
+    free-text parser.
     """
     
-    # Base review prompt template (initial iteration)
-    REVIEW_PROMPT_TEMPLATE = """You are a {role_description}.
+    # Prompts are assembled as a shared prefix (the content, identical for
+    # every reviewer in an iteration) followed by the role-specific
+    # instructions, so providers with prompt caching can reuse the prefix
+    # across reviewers.
+    
+    # Shared prefix (initial iteration)
+    CONTENT_PREFIX_TEMPLATE = """CONTENT TO REVIEW:
+{content}
 
-CONTENT TO REVIEW:
+"""
+    
+    # Shared prefix (iterations after the first)
+    ITERATIVE_CONTENT_PREFIX_TEMPLATE = """ITERATION {iteration}: REVIEWING UPDATED CONTENT
+
+UPDATED CONTENT TO REVIEW:
 {content}
 
-Your task is to review this content from your specialized perspective and provide structured feedback.
+"""
+    
+    # Base review prompt template (initial iteration)
+    REVIEW_PROMPT_TEMPLATE = """You are a {role_description}.
+
+Your task is to review the content above from your specialized perspective and provide structured feedback.
 
 Provide your feedback in the following format:
 
@@ -41,16 +205,11 @@ Be specific, actionable, and constructive. Focus on {focus_areas}."""
     # Iterative review prompt template (for iterations after the first)
     ITERATIVE_REVIEW_PROMPT_TEMPLATE = """You are a {role_description}.
 
-ITERATION {iteration}: REVIEWING UPDATED CONTENT
-
 PREVIOUS FEEDBACK (from iteration {previous_iteration}):
 {previous_feedback}
 
-UPDATED CONTENT TO REVIEW:
-{content}
-
 Your task is to:
-1. Check if the previous issues were addressed
+1. Check if the previous issues were addressed in the updated content above
 2. Identify any NEW issues introduced
 3. Recognize improvements made
 4. Provide updated feedback
@@ -74,6 +233,48 @@ SUGGESTED IMPROVEMENTS:
 - Specific improvement 2
 ...
 
+Be specific about what improved and what didn't. Focus on {focus_areas}."""
+    
+    # Structured review prompt template (initial iteration)
+    STRUCTURED_REVIEW_PROMPT_TEMPLATE = """You are a {role_description}.
+
+Your task is to review the content above from your specialized perspective and provide structured feedback.
+
+Respond with ONLY a JSON object (no markdown fences, no commentary) in this format:
+{{
+  "verdict": "APPROVE" or "NEEDS REVISION" or "REJECT",
+  "findings": [
+    {{"severity": "CRITICAL" or "HIGH" or "MEDIUM" or "LOW", "description": "Finding description and specific issue"}}
+  ],
+  "improvements": ["Specific improvement", ...]
+}}
+
+Provide 5-8 specific, actionable findings. Be specific, actionable, and constructive. Focus on {focus_areas}."""
+    
+    # Structured review prompt template (for iterations after the first)
+    STRUCTURED_ITERATIVE_REVIEW_PROMPT_TEMPLATE = """You are a {role_description}.
+
+PREVIOUS FEEDBACK (from iteration {previous_iteration}):
+{previous_feedback}
+
+Your task is to:
+1. Check if the previous issues were addressed in the updated content above
+2. Identify any NEW issues introduced
+3. Recognize improvements made
+4. Provide updated feedback
+
+Respond with ONLY a JSON object (no markdown fences, no commentary) in this format:
+{{
+  "verdict": "APPROVE" or "NEEDS REVISION" or "REJECT",
+  "fixed": ["Issue from previous iteration that was successfully addressed", ...],
+  "partially_fixed": ["Issue that was partially addressed but needs more work", ...],
+  "not_addressed": ["Issue from previous iteration that still exists", ...],
+  "findings": [
+    {{"severity": "CRITICAL" or "HIGH" or "MEDIUM" or "LOW", "description": "NEW issue not present in previous iteration"}}
+  ],
+  "improvements": ["Specific improvement", ...]
+}}
+
 Be specific about what improved and what didn't. Focus on {focus_areas}."""
     
     def __init__(self, llm_provider: BaseLLMProvider, role: str = "reviewer", **kwargs):
@@ -87,20 +288,31 @@ Be specific about what improved and what didn't. Focus on {focus_areas}."""
                 - focus_areas: What this reviewer should focus on
                 - temperature: LLM temperature (default: 0.5)
                 - max_tokens: Maximum tokens (default: 5000)
+                - structured_output: Request JSON output with typed findings
+                  (default: False)
+                - prompt_budget: Prompt token budget (default: from the model's context window)
         """
         super().__init__(llm_provider, role=role, **kwargs)
         self.role_description = kwargs.get('role_description', 'professional reviewer')
         self.focus_areas = kwargs.get('focus_areas', 'quality and accuracy')
         self.temperature = kwargs.get('temperature', 0.5)
         self.max_tokens = kwargs.get('max_tokens', 5000)  # Increased from 1500 to 5000 for Gemini 2.5 thinking tokens compatibility
+        self.structured_output = kwargs.get('structured_output', False)
     
-    def review(self, content: str, iteration: int, previous_feedback: str = None) -> Feedback:
+    def review(
+        self,
+        content: str,
+        iteration: int,
+        previous_feedback: str = None,
+        on_chunk: Optional[Callable[[str], None]] = None
+    ) -> Feedback:
         """Review content and provide feedback.
         
         Args:
             content: Content to review (from presenter)
             iteration: Current iteration number
             previous_feedback: Optional feedback from previous iteration for tracking improvements
+            on_chunk: Optional callback receiving raw review chunks as they stream in
             
         Returns:
             Feedback object with review points
@@ -116,32 +328,77 @@ Be specific about what improved and what didn't. Focus on {focus_areas}."""
             # Iterative review needs more tokens
             max_tokens = max(self.max_tokens, 5000)
             
-            prompt = self.ITERATIVE_REVIEW_PROMPT_TEMPLATE.format(
-                role_description=self.role_description,
-                iteration=iteration,
-                previous_iteration=iteration - 1,
-                previous_feedback=previous_feedback,
-                content=content,
-                focus_areas=self.focus_areas
+            template = (
+                self.STRUCTURED_ITERATIVE_REVIEW_PROMPT_TEMPLATE if self.structured_output
+                else self.ITERATIVE_REVIEW_PROMPT_TEMPLATE
             )
+            schema = ITERATIVE_REVIEW_SCHEMA
+            
+            def build(content: str, previous_feedback: str) -> Tuple[str, str]:
+                prefix = self.ITERATIVE_CONTENT_PREFIX_TEMPLATE.format(
+                    iteration=iteration,
+                    content=content
+                )
+                instructions = template.format(
+                    role_description=self.role_description,
+                    previous_iteration=iteration - 1,
+                    previous_feedback=previous_feedback,
+                    focus_areas=self.focus_areas
+                )
+                return prefix, instructions
+            
+            # Over the token budget, previous feedback gives way before the content
+            output_key = f"{self.role}/iterative"  # Longer outputs with improvement tracking
+            parts = [
+                PromptPart('previous_feedback', previous_feedback, priority=0, strategy='lines'),
+                PromptPart('content', content, priority=1),
+            ]
         else:
             # Initial review uses standard token allocation
             max_tokens = self.max_tokens
             
-            prompt = self.REVIEW_PROMPT_TEMPLATE.format(
-                role_description=self.role_description,
-                content=content,
-                focus_areas=self.focus_areas
+            template = (
+                self.STRUCTURED_REVIEW_PROMPT_TEMPLATE if self.structured_output
+                else self.REVIEW_PROMPT_TEMPLATE
             )
+            schema = REVIEW_SCHEMA
+            
+            def build(content: str) -> Tuple[str, str]:
+                prefix = self.CONTENT_PREFIX_TEMPLATE.format(content=content)
+                instructions = template.format(
+                    role_description=self.role_description,
+                    focus_areas=self.focus_areas
+                )
+                return prefix, instructions
+            
+            output_key = self.role
+            parts = [PromptPart('content', content, priority=1)]
+        
+        fitted = self._fit_prompt(lambda **texts: "".join(build(**texts)), parts, max_tokens)
+        prefix, instructions = build(**fitted)
+        
+        generation_kwargs = {}
+        if self.structured_output:
+            generation_kwargs['response_schema'] = schema
         
         # Generate review using LLM
         try:
-            result = self.llm_provider.generate_text(
-                prompt,
+            result = self._generate(
+                prefix + instructions,
+                on_chunk=on_chunk,
+                output_key=output_key,
                 temperature=self.temperature,
-                max_tokens=max_tokens
+                max_tokens=max_tokens,
+                cacheable_prefix=prefix,
+                **generation_kwargs
             )
             
+            if self.structured_output:
+                try:
+                    return structured_feedback(_extract_json_object(result), self.role, iteration)
+                except (ValueError, TypeError):
+                    pass  # Not valid structured output - fall back to the free-text parser
+            
             # Parse the result
             feedback_points = self._parse_review_result(result)
             
@@ -321,3 +578,218 @@ class UXReviewer(ReviewerAgent):
         )
         super().__init__(llm_provider, role="ux_reviewer", **kwargs)
 
+
+class MultiRoleReviewer(BaseAgent):
+    """Runs several reviewer roles in a single structured LLM call.
+    
+    The content is sent once, with every role's description and focus, and
+    the model answers with a JSON object keyed by role name (constrained by
+    a response_schema where the provider supports it). This trades
+    some per-role depth for one request instead of one per role, which
+    matters for local models and rate-limited free tiers.
+    """
+    
+    # Combined review prompt (follows the shared content prefix)
+    COMBINED_REVIEW_PROMPT_TEMPLATE = """You are a review board of {count} independent specialized reviewers. Review the content above separately from EACH reviewer's perspective below.
+
+REVIEWERS:
+{reviewer_sections}
+
+Respond with ONLY a JSON object (no markdown fences, no commentary) that has exactly one key per reviewer name listed above:
+{{
+  "<reviewer name>": {{
+    "verdict": "APPROVE" or "NEEDS REVISION" or "REJECT",
+    "findings": [
+      {{"severity": "CRITICAL" or "HIGH" or "MEDIUM" or "LOW", "description": "Finding description and specific issue"}}
+    ],
+    "improvements": ["Specific improvement", ...]
+  }}
+}}
+
+Give each reviewer 5-8 specific, actionable findings. Be specific, actionable, and constructive."""
+    
+    # Per-role section of the combined prompt
+    REVIEWER_SECTION_TEMPLATE = """### {name}
+Role: {role_description}
+Focus: {focus_areas}"""
+    
+    # Appended to a role's section from the second iteration on
+    PREVIOUS_FEEDBACK_TEMPLATE = """Previous feedback (from iteration {previous_iteration}) - check whether it was addressed and report NEW issues:
+{previous_feedback}"""
+    
+    # Appended to the instructions when any role has previous feedback
+    TRACKING_INSTRUCTIONS = """
+
+For each reviewer with previous feedback, also include in its object:
+  "fixed": ["Issue from previous iteration that was successfully addressed", ...],
+  "partially_fixed": ["Issue that was partially addressed but needs more work", ...],
+  "not_addressed": ["Issue from previous iteration that still exists", ...]"""
+    
+    # Output budget of the combined call (before the model's output limit)
+    DEFAULT_MAX_TOKENS = 8000
+    
+    def __init__(self, llm_provider: BaseLLMProvider, reviewers: Dict[str, ReviewerAgent], **kwargs):
+        """Initialize the multi-role reviewer.
+        
+        Args:
+            llm_provider: LLM provider instance
+            reviewers: Reviewer agents keyed by role name (e.g. 'Technical Reviewer')
+            **kwargs: Additional configuration
+                - max_tokens: Output budget of the combined call (default
+                  8000), capped at the provider model's output limit
+        """
+        super().__init__(llm_provider, role="multi_role_reviewer", **kwargs)
+        self.reviewers = reviewers
+        self.max_tokens = kwargs.get('max_tokens', self.DEFAULT_MAX_TOKENS)
+    
+    def review(
+        self,
+        content: str,
+        iteration: int,
+        previous_feedback: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Feedback]:
+        """Review content from every role in one call.
+        
+        Args:
+            content: Content to review (from presenter)
+            iteration: Current iteration number
+            previous_feedback: Optional previous feedback by role name
+            
+        Returns:
+            Dictionary mapping role name to Feedback
+            
+        Raises:
+            ValueError: If the response is not a JSON object covering every role
+            Exception: If generation fails
+        """
+        previous_feedback = previous_feedback or {}
+        iterative = iteration > 1 and any(previous_feedback.get(name) for name in self.reviewers)
+        # Role names of the previous feedback parts, by part name
+        tracked = {
+            f"previous_feedback_{index}": name
+            for index, name in enumerate(self.reviewers)
+            if iterative and previous_feedback.get(name)
+        }
+        
+        def build(content: str, **feedback_texts: str) -> Tuple[str, str]:
+            # Same shared prefix as the per-role prompts, so either path reuses the cache
+            if iterative:
+                prefix = ReviewerAgent.ITERATIVE_CONTENT_PREFIX_TEMPLATE.format(iteration=iteration, content=content)
+            else:
+                prefix = ReviewerAgent.CONTENT_PREFIX_TEMPLATE.format(content=content)
+            
+            feedback_by_role = {name: feedback_texts[part] for part, name in tracked.items()}
+            sections = []
+            for name, reviewer in self.reviewers.items():
+                section = self.REVIEWER_SECTION_TEMPLATE.format(
+                    name=name,
+                    role_description=reviewer.role_description,
+                    focus_areas=reviewer.focus_areas
+                )
+                if name in feedback_by_role:
+                    section += "\n" + self.PREVIOUS_FEEDBACK_TEMPLATE.format(
+                        previous_iteration=iteration - 1,
+                        previous_feedback=feedback_by_role[name]
+                    )
+                sections.append(section)
+            
+            instructions = self.COMBINED_REVIEW_PROMPT_TEMPLATE.format(
+                count=len(self.reviewers),
+                reviewer_sections="\n\n".join(sections)
+            )
+            if tracked:
+                instructions += self.TRACKING_INSTRUCTIONS
+            return prefix, instructions
+        
+        max_tokens = self._output_budget()
+        
+        # Over the token budget, previous feedback gives way before the content
+        parts = [
+            PromptPart(part, previous_feedback[name], priority=0, strategy='lines')
+            for part, name in tracked.items()
+        ]
+        parts.append(PromptPart('content', content, priority=1))
+        fitted = self._fit_prompt(lambda **texts: "".join(build(**texts)), parts, max_tokens)
+        prefix, instructions = build(**fitted)
+        
+        result = self._generate(
+            prefix + instructions,
+            output_key=f"{self.role}/{len(self.reviewers)}",
+            temperature=next(iter(self.reviewers.values())).temperature,
+            max_tokens=max_tokens,
+            cacheable_prefix=prefix,
+            response_schema=self._response_schema(set(tracked.values()))
+        )
+        
+        return self._parse_combined_result(result, iteration)
+    
+    def _output_budget(self) -> int:
+        """Get max_tokens of the combined call.
+        
+        Returns:
+            max_tokens setting, capped at the provider model's output limit
+            (requests above it are rejected by OpenAI and Anthropic)
+        """
+        limit = output_limit(*provider_model(self.llm_provider))
+        return min(self.max_tokens, limit) if limit else self.max_tokens
+    
+    def _response_schema(self, tracked_roles: Optional[set] = None) -> Dict[str, Any]:
+        """Build the JSON schema of the combined response.
+        
+        Args:
+            tracked_roles: Role names with previous feedback, whose objects
+                follow ITERATIVE_REVIEW_SCHEMA
+        
+        Returns:
+            Object schema with one required property per role
+        """
+        tracked_roles = tracked_roles or set()
+        return {
+            "type": "object",
+            "properties": {
+                name: ITERATIVE_REVIEW_SCHEMA if name in tracked_roles else REVIEW_SCHEMA
+                for name in self.reviewers
+            },
+            "required": list(self.reviewers),
+        }
+    
+    def _parse_combined_result(self, result: str, iteration: int) -> Dict[str, Feedback]:
+        """Parse the JSON response into Feedback by role name.
+        
+        Args:
+            result: Raw LLM output
+            iteration: Iteration number
+            
+        Returns:
+            Dictionary mapping role name to Feedback
+            
+        Raises:
+            ValueError: If the output is not valid JSON or misses a role
+        """
+        data = _extract_json_object(result)
+        
+        feedback = {}
+        for name, reviewer in self.reviewers.items():
+            entry = data.get(name)
+            if not isinstance(entry, dict):
+                raise ValueError(f"Combined review has no findings for {name}")
+            try:
+                feedback[name] = structured_feedback(entry, reviewer.role, iteration)
+            except (ValueError, TypeError) as e:
+                raise ValueError(f"Combined review for {name} is malformed: {e}")
+        
+        return feedback
+    
+    def execute(self, *args, **kwargs) -> Dict[str, Feedback]:
+        """Execute the multi-role reviewer.
+        
+        Args:
+            *args: Positional arguments
+            **kwargs: Keyword arguments (should include 'content' and 'iteration')
+            
+        Returns:
+            Dictionary mapping role name to Feedback
+        """
+        content = kwargs.get('content', '')
+        iteration = kwargs.get('iteration', 0)
+        return self.review(content, iteration, kwargs.get('previous_feedback'))
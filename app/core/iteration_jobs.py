@@ -0,0 +1,258 @@
+"""Background iteration jobs that outlive Streamlit script runs."""
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+from app.core.orchestrator import IterationResult, Orchestrator
+
+
+class IterationJob:
+    """One orchestrator iteration running in the background.
+    
+    Progress and partial agent output are written from worker threads and
+    read by the page through snapshot(), so later script runs can render the
+    job where it is without recomputing it.
+    """
+    
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    
+    def __init__(self, session_id: str):
+        """Initialize a queued job.
+        
+        Args:
+            session_id: Session the iteration belongs to
+        """
+        self.session_id = session_id
+        self.status = self.QUEUED
+        self.stage: Optional[str] = None
+        self.result: Optional[IterationResult] = None
+        self.error: Optional[str] = None
+        self.acknowledged = False
+        self.future: Optional[Future] = None
+        
+        self.created_at = time.monotonic()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        
+        self._lock = threading.Lock()
+        self._progress: Dict[str, Tuple[int, int]] = {}
+        self._partial_output: Dict[str, str] = {}
+    
+    @property
+    def done(self) -> bool:
+        """Whether the iteration has finished, successfully or not."""
+        return self.status in (self.COMPLETED, self.FAILED)
+    
+    def on_stream(self, stage: str, chunk: str) -> None:
+        """Append streamed output of a stage (orchestrator on_stream callback).
+        
+        Args:
+            stage: "presenter" or a reviewer role
+            chunk: Output text
+        """
+        with self._lock:
+            self._partial_output[stage] = self._partial_output.get(stage, "") + chunk
+    
+    def on_progress(self, stage: str, completed: int, total: int) -> None:
+        """Record stage progress (orchestrator on_progress callback).
+        
+        Args:
+            stage: "presenter", "reviewers" or "confidence"
+            completed: Completed units of the stage
+            total: Total units of the stage
+        """
+        with self._lock:
+            self.stage = stage
+            self._progress[stage] = (completed, total)
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Get a consistent copy of the job's state for rendering.
+        
+        Returns:
+            Dictionary with status, stage, progress ({stage: (completed,
+            total)}), partial_output ({stage: text}), error and elapsed seconds
+        """
+        with self._lock:
+            end = self.finished_at if self.finished_at is not None else time.monotonic()
+            return {
+                'status': self.status,
+                'stage': self.stage,
+                'progress': dict(self._progress),
+                'partial_output': dict(self._partial_output),
+                'error': self.error,
+                'elapsed': end - (self.started_at or end),
+            }
+    
+    def _start(self) -> None:
+        """Mark the job as running."""
+        with self._lock:
+            self.status = self.RUNNING
+            self.started_at = time.monotonic()
+    
+    def _finish(self, result: Optional[IterationResult], error: Optional[str]) -> None:
+        """Mark the job as finished.
+        
+        Args:
+            result: Iteration result (None if the orchestrator raised)
+            error: Error message if the iteration failed
+        """
+        with self._lock:
+            self.result = result
+            self.error = error
+            self.status = self.FAILED if error else self.COMPLETED
+            self.finished_at = time.monotonic()
+
+
+class IterationJobRunner:
+    """Runs orchestrator iterations on background threads, one job per session.
+    
+    Jobs are kept in memory by session ID until replaced or discarded, so a
+    page can submit an iteration, return, and poll its progress on later
+    script runs instead of blocking the script thread. Submitting while a
+    session's job is still running returns the running job rather than
+    starting the iteration again.
+    
+    Jobs run on their own pool: a job waits on reviewer tasks in the shared
+    reviewer executor, so running jobs on that executor could deadlock it.
+    """
+    
+    DEFAULT_MAX_WORKERS = 4
+    
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS):
+        """Initialize the runner.
+        
+        Args:
+            max_workers: Maximum iterations running at once across sessions
+        
+        Raises:
+            ValueError: If max_workers is less than 1
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="iteration-job")
+        self._jobs: Dict[str, IterationJob] = {}
+        self._lock = threading.Lock()
+    
+    def submit(self, session_id: str, orchestrator: Orchestrator, **iteration_kwargs) -> IterationJob:
+        """Start an iteration in the background.
+        
+        Args:
+            session_id: Session the iteration belongs to
+            orchestrator: Orchestrator of the session
+            **iteration_kwargs: Arguments for Orchestrator.run_iteration
+                (on_stream and on_progress are supplied by the job)
+        
+        Returns:
+            The new job, or the session's job already in progress
+        """
+        with self._lock:
+            job = self._jobs.get(session_id)
+            if job is not None and not job.done:
+                return job
+            
+            job = IterationJob(session_id)
+            self._jobs[session_id] = job
+            job.future = self._executor.submit(self._run, job, orchestrator, iteration_kwargs)
+        
+        print(f"[IterationJobs] Started iteration for session {session_id}")
+        return job
+    
+    def _run(
+        self,
+        job: IterationJob,
+        orchestrator: Orchestrator,
+        iteration_kwargs: Dict[str, Any]
+    ) -> Optional[IterationResult]:
+        """Run one job's iteration (worker thread).
+        
+        Args:
+            job: Job to run
+            orchestrator: Orchestrator of the session
+            iteration_kwargs: Arguments for Orchestrator.run_iteration
+        
+        Returns:
+            Iteration result, or None if the orchestrator raised
+        """
+        job._start()
+        try:
+            result = orchestrator.run_iteration(
+                on_stream=job.on_stream,
+                on_progress=job.on_progress,
+                **iteration_kwargs
+            )
+        except Exception as e:
+            print(f"[IterationJobs] Iteration for session {job.session_id} failed: {str(e)}")
+            job._finish(None, str(e))
+            return None
+        
+        job._finish(result, result.error)
+        return result
+    
+    def get_job(self, session_id: str) -> Optional[IterationJob]:
+        """Get the latest job of a session.
+        
+        Args:
+            session_id: Session ID
+        
+        Returns:
+            Running or finished job, or None if the session has none
+        """
+        with self._lock:
+            return self._jobs.get(session_id)
+    
+    def is_running(self, session_id: str) -> bool:
+        """Check whether a session has an iteration in progress.
+        
+        Args:
+            session_id: Session ID
+        
+        Returns:
+            True if the session's latest job hasn't finished
+        """
+        job = self.get_job(session_id)
+        return job is not None and not job.done
+    
+    def discard(self, session_id: str) -> None:
+        """Forget a session's job.
+        
+        A running iteration isn't interrupted; it finishes in the background
+        and its job is no longer reachable.
+        
+        Args:
+            session_id: Session ID
+        """
+        with self._lock:
+            self._jobs.pop(session_id, None)
+    
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting jobs and release the threads.
+        
+        Args:
+            wait: Whether to wait for running jobs to finish
+        """
+        self._executor.shutdown(wait=wait)
+
+
+_job_runner: Optional[IterationJobRunner] = None
+_job_runner_lock = threading.Lock()
+
+
+def get_job_runner() -> IterationJobRunner:
+    """Get the process-wide iteration job runner, creating it if needed.
+    
+    Lives outside st.session_state, so jobs survive script reruns.
+    
+    Returns:
+        Shared IterationJobRunner
+    """
+    global _job_runner
+    with _job_runner_lock:
+        if _job_runner is None:
+            _job_runner = IterationJobRunner()
+        return _job_runner
@@ -1,6 +1,9 @@
 """Orchestrator for managing agent iteration cycles."""
 
-from typing import List, Dict, Optional, Any
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import List, Dict, Optional, Any, Callable, Tuple
 from app.core.session_manager import SessionManager
 from app.agents.presenter import PresenterAgent
 from app.agents.reviewer import (
@@ -10,6 +13,7 @@ from app.agents.reviewer import (
 from app.agents.confidence import ConfidenceAgent
 from app.llm.base_provider import BaseLLMProvider
 from app.models.feedback import Feedback
+from app.utils.executor_service import ExecutorSaturatedError, ExecutorService, get_executor_service
 
 
 class IterationResult:
@@ -40,6 +44,24 @@ class IterationResult:
         self.human_gate_approved = False
 
 
+# (requirements, feedback, previous_output, file_summaries) of a presenter call
+RefinementKey = Tuple[str, Tuple[str, ...], Optional[str], Tuple[str, ...]]
+
+
+class SpeculativeRefinement:
+    """Presenter refinement started in the background before the HITL gate."""
+    
+    def __init__(self, key: RefinementKey, future: Future):
+        """Initialize speculative refinement.
+        
+        Args:
+            key: Presenter inputs the refinement was started with
+            future: Future of the presenter output
+        """
+        self.key = key
+        self.future = future
+
+
 class Orchestrator:
     """Orchestrates the agent review cycle.
     
@@ -48,8 +70,33 @@ class Orchestrator:
     - Enforce HITL gates
     - Handle errors gracefully
     - Store iteration history
+    
+    Reviewers run concurrently by default so that iteration latency is bounded
+    by the slowest reviewer rather than the sum of all reviewer latencies.
+    
+    Callers can pass an on_stream callback to run_iteration to receive
+    presenter and reviewer output incrementally. It is invoked as
+    on_stream(stage, chunk), where stage is "presenter" or the reviewer role
+    name; reviewer chunks arrive from worker threads.
+    
+    An on_progress callback is invoked as on_progress(stage, completed, total)
+    when each stage starts and as it advances: "presenter" and "confidence"
+    go from 0 to 1 of 1, "reviewers" counts finished reviewers out of all
+    selected roles.
+    
+    With speculative_refinement enabled, the next presenter refinement is
+    started in the background as soon as an iteration finishes, assuming all
+    of its feedback is approved unchanged. The next run_iteration uses it only
+    if its presenter inputs match exactly; edited, partial or rejected
+    feedback discards it. Nothing is shown to the user before approval, so
+    the HITL gate is unaffected; a discarded refinement still runs to
+    completion and costs its tokens.
     """
     
+    # Default reviewer fan-out configuration
+    DEFAULT_MAX_WORKERS = 5
+    DEFAULT_REVIEWER_TIMEOUT = None  # No reviewer fan-out timeout
+    
     # Map role names to reviewer classes
     REVIEWER_CLASSES = {
         'Technical Reviewer': TechnicalReviewer,
@@ -62,25 +109,61 @@ class Orchestrator:
     def __init__(
         self,
         session_manager: SessionManager,
-        llm_provider: BaseLLMProvider
+        llm_provider: BaseLLMProvider,
+        parallel_reviewers: bool = True,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        reviewer_timeout: Optional[float] = DEFAULT_REVIEWER_TIMEOUT,
+        executor: Optional[ExecutorService] = None,
+        speculative_refinement: bool = False
     ):
         """Initialize orchestrator.
         
         Args:
             session_manager: Session manager instance
             llm_provider: LLM provider for all agents
+            parallel_reviewers: Whether to run reviewers concurrently (default True)
+            max_workers: Maximum number of reviewers running at once (default 5)
+            reviewer_timeout: Optional timeout in seconds for the reviewer
+                fan-out, measured from submission, so reviewers still queued
+                in a busy executor expire too (None = wait indefinitely)
+            executor: Executor reviewers run on (default: the shared
+                process-wide executor, which caps concurrency across sessions)
+            speculative_refinement: Whether to start the next presenter
+                refinement while the user reviews feedback (default False)
         """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        
         self.session_manager = session_manager
         self.llm_provider = llm_provider
+        self.parallel_reviewers = parallel_reviewers
+        self.max_workers = max_workers
+        self.reviewer_timeout = reviewer_timeout
+        self.executor = executor if executor is not None else get_executor_service()
+        
+        # Reviewer agents by role, reused across iterations
+        self._reviewers: Dict[str, ReviewerAgent] = {}
+        self._reviewers_lock = threading.Lock()
+        
         self.iteration_history: List[IterationResult] = []
         self.current_iteration_result: Optional[IterationResult] = None
+        
+        # Speculative presenter refinement (own single thread, so it never
+        # competes with reviewers for the shared executor)
+        self.speculative_refinement = speculative_refinement
+        self._speculation: Optional[SpeculativeRefinement] = None
+        self._speculation_executor: Optional[ThreadPoolExecutor] = None
+        self._speculation_stats = {'started': 0, 'hits': 0, 'discarded': 0, 'failed': 0}
+        self._closed = False
     
     def run_iteration(
         self,
         requirements: str,
         selected_roles: List[str],
         file_summaries: Optional[List[str]] = None,
-        approved_feedback: Optional[List[str]] = None
+        approved_feedback: Optional[List[str]] = None,
+        on_stream: Optional[Callable[[str, str], None]] = None,
+        on_progress: Optional[Callable[[str, int, int], None]] = None
     ) -> IterationResult:
         """Run a complete iteration cycle.
         
@@ -89,6 +172,10 @@ class Orchestrator:
             selected_roles: List of reviewer roles
             file_summaries: Optional file summaries
             approved_feedback: Optional approved feedback from previous iteration
+            on_stream: Optional callback on_stream(stage, chunk) receiving
+                presenter and reviewer output as it is generated
+            on_progress: Optional callback on_progress(stage, completed, total)
+                receiving stage progress
             
         Returns:
             IterationResult object
@@ -101,24 +188,32 @@ class Orchestrator:
         
         try:
             # Step 1: Run Presenter
+            self._report_progress(on_progress, "presenter", 0, 1)
             presenter_output = self._run_presenter(
                 requirements,
                 approved_feedback,
-                file_summaries
+                file_summaries,
+                on_stream
             )
+            self._report_progress(on_progress, "presenter", 1, 1)
             
             # Step 2: Run Reviewers
+            self._report_progress(on_progress, "reviewers", 0, len(selected_roles))
             reviewer_feedback = self._run_reviewers(
                 presenter_output,
                 selected_roles,
-                iteration
+                iteration,
+                on_stream,
+                on_progress
             )
             
             # Step 3: Run Confidence Agent
+            self._report_progress(on_progress, "confidence", 0, 1)
             confidence_result = self._run_confidence(
                 presenter_output,
                 reviewer_feedback
             )
+            self._report_progress(on_progress, "confidence", 1, 1)
             
             # Create result
             result = IterationResult(
@@ -133,6 +228,9 @@ class Orchestrator:
             self.current_iteration_result = result
             self.iteration_history.append(result)
             
+            if self.speculative_refinement and not self._closed:
+                self._start_speculation(requirements, file_summaries, result)
+            
             return result
         
         except Exception as e:
@@ -156,7 +254,8 @@ class Orchestrator:
         self,
         requirements: str,
         approved_feedback: Optional[List[str]],
-        file_summaries: Optional[List[str]]
+        file_summaries: Optional[List[str]],
+        on_stream: Optional[Callable[[str, str], None]] = None
     ) -> str:
         """Run the presenter agent.
         
@@ -164,31 +263,172 @@ class Orchestrator:
             requirements: User requirements
             approved_feedback: Optional approved feedback
             file_summaries: Optional file summaries
+            on_stream: Optional streaming callback (stage "presenter")
             
         Returns:
             Presenter output string
         """
-        presenter = PresenterAgent(self.llm_provider)
-        
         # Get previous output if this is a refinement
         previous_output = None
         if len(self.iteration_history) > 0:
             previous_output = self.iteration_history[-1].presenter_output
         
+        key = self._refinement_key(requirements, approved_feedback, previous_output, file_summaries)
+        speculative_output = self._take_speculation(key)
+        if speculative_output is not None:
+            on_chunk = self._stage_callback(on_stream, "presenter")
+            if on_chunk is not None:
+                on_chunk(speculative_output)
+            return speculative_output
+        
+        presenter = PresenterAgent(self.llm_provider)
         output = presenter.generate(
             requirements=requirements,
             feedback=approved_feedback,
             previous_output=previous_output,
-            file_summaries=file_summaries
+            file_summaries=file_summaries,
+            on_chunk=self._stage_callback(on_stream, "presenter")
         )
         
         return output
     
+    def _refinement_key(
+        self,
+        requirements: str,
+        feedback: Optional[List[str]],
+        previous_output: Optional[str],
+        file_summaries: Optional[List[str]]
+    ) -> RefinementKey:
+        """Build the key identifying a presenter call's inputs.
+        
+        Args:
+            requirements: User requirements
+            feedback: Feedback the presenter refines with
+            previous_output: Previous presenter output
+            file_summaries: Optional file summaries
+            
+        Returns:
+            Hashable key (no feedback and empty feedback are equivalent)
+        """
+        return (requirements, tuple(feedback or ()), previous_output, tuple(file_summaries or ()))
+    
+    def _start_speculation(
+        self,
+        requirements: str,
+        file_summaries: Optional[List[str]],
+        result: IterationResult
+    ) -> None:
+        """Start the refinement that follows approving result without edits.
+        
+        Args:
+            requirements: User requirements
+            file_summaries: Optional file summaries
+            result: Iteration that just finished
+        """
+        self.discard_speculation()
+        
+        feedback = [point for item in result.reviewer_feedback for point in item.feedback_points]
+        if not feedback:
+            return
+        
+        if self._speculation_executor is None:
+            self._speculation_executor = ThreadPoolExecutor(
+                max_workers=1,
+                thread_name_prefix="speculative-presenter"
+            )
+        
+        def refine() -> str:
+            return PresenterAgent(self.llm_provider).generate(
+                requirements=requirements,
+                feedback=feedback,
+                previous_output=result.presenter_output,
+                file_summaries=file_summaries
+            )
+        
+        key = self._refinement_key(requirements, feedback, result.presenter_output, file_summaries)
+        self._speculation = SpeculativeRefinement(key, self._speculation_executor.submit(refine))
+        self._speculation_stats['started'] += 1
+        print(f"[Orchestrator] Started speculative refinement with {len(feedback)} feedback points")
+    
+    def _take_speculation(self, key: RefinementKey) -> Optional[str]:
+        """Claim the speculative refinement if it was started with these inputs.
+        
+        Waits for it if it is still running. A speculation with other inputs
+        is discarded.
+        
+        Args:
+            key: Presenter inputs of the call about to be made
+            
+        Returns:
+            Speculative presenter output, or None if there is none to use
+        """
+        speculation, self._speculation = self._speculation, None
+        if speculation is None:
+            return None
+        
+        if speculation.key != key:
+            speculation.future.cancel()
+            self._speculation_stats['discarded'] += 1
+            print("[Orchestrator] Discarded speculative refinement: feedback was changed")
+            return None
+        
+        try:
+            output = speculation.future.result()
+        except Exception as e:
+            self._speculation_stats['failed'] += 1
+            print(f"[Orchestrator] Speculative refinement failed, regenerating: {str(e)}")
+            return None
+        
+        self._speculation_stats['hits'] += 1
+        print("[Orchestrator] Using speculative refinement")
+        return output
+    
+    def discard_speculation(self) -> None:
+        """Drop the pending speculative refinement, if any.
+        
+        A refinement that already started finishes in the background and its
+        output is ignored.
+        """
+        speculation, self._speculation = self._speculation, None
+        if speculation is not None:
+            speculation.future.cancel()
+            self._speculation_stats['discarded'] += 1
+    
+    def close(self) -> None:
+        """Release the orchestrator's background resources when its session ends.
+        
+        Drops the pending speculative refinement and shuts down its thread;
+        no further refinements are started.
+        """
+        self._closed = True
+        self.discard_speculation()
+        executor, self._speculation_executor = self._speculation_executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def has_speculation(self) -> bool:
+        """Check whether a speculative refinement is pending.
+        
+        Returns:
+            True if a refinement was started for the current iteration
+        """
+        return self._speculation is not None
+    
+    def get_speculation_stats(self) -> Dict[str, int]:
+        """Get speculative refinement counters.
+        
+        Returns:
+            Dictionary with started, hits, discarded and failed counts
+        """
+        return dict(self._speculation_stats)
+    
     def _run_reviewers(
         self,
         content: str,
         selected_roles: List[str],
-        iteration: int
+        iteration: int,
+        on_stream: Optional[Callable[[str, str], None]] = None,
+        on_progress: Optional[Callable[[str, int, int], None]] = None
     ) -> List[Feedback]:
         """Run all reviewer agents.
         
@@ -196,12 +436,12 @@ class Orchestrator:
             content: Content to review
             selected_roles: List of reviewer roles
             iteration: Current iteration number
+            on_stream: Optional streaming callback (stage = reviewer role)
+            on_progress: Optional progress callback (stage "reviewers")
             
         Returns:
-            List of Feedback objects
+            List of Feedback objects, in the same order as selected_roles
         """
-        feedback_list = []
-        
         # Get previous feedback for iterative review
         previous_feedback_by_role = {}
         if len(self.iteration_history) > 0:
@@ -211,34 +451,255 @@ class Orchestrator:
                 feedback_text = "\n".join([f"- {point}" for point in feedback.feedback_points])
                 previous_feedback_by_role[feedback.reviewer_role] = feedback_text
         
+        if self.parallel_reviewers and len(selected_roles) > 1:
+            return self._run_reviewers_parallel(
+                content,
+                selected_roles,
+                iteration,
+                previous_feedback_by_role,
+                on_stream,
+                on_progress
+            )
+        
+        feedback_list = []
+        
         for role in selected_roles:
             try:
-                # Get reviewer class
-                reviewer_class = self.REVIEWER_CLASSES.get(role, ReviewerAgent)
-                
-                # Create reviewer instance
-                reviewer = reviewer_class(self.llm_provider)
-                
-                # Get previous feedback for this role
-                previous_feedback = previous_feedback_by_role.get(role, None)
-                
-                # Get feedback (with previous context if available)
-                feedback = reviewer.review(content, iteration, previous_feedback=previous_feedback)
+                feedback = self._run_single_reviewer(
+                    role,
+                    content,
+                    iteration,
+                    previous_feedback_by_role.get(role, None),
+                    self._stage_callback(on_stream, role)
+                )
                 feedback_list.append(feedback)
             
             except Exception as e:
-                # Create error feedback
-                error_feedback = Feedback(
-                    reviewer_role=role,
-                    feedback_points=[f"Review failed: {str(e)}"],
-                    iteration=iteration,
-                    approved=False,
-                    modified=False
+                feedback_list.append(
+                    self._error_feedback(role, iteration, f"Review failed: {str(e)}")
                 )
-                feedback_list.append(error_feedback)
+            
+            self._report_progress(on_progress, "reviewers", len(feedback_list), len(selected_roles))
         
         return feedback_list
     
+    def _run_reviewers_parallel(
+        self,
+        content: str,
+        selected_roles: List[str],
+        iteration: int,
+        previous_feedback_by_role: Dict[str, str],
+        on_stream: Optional[Callable[[str, str], None]] = None,
+        on_progress: Optional[Callable[[str, int, int], None]] = None
+    ) -> List[Feedback]:
+        """Run reviewer agents concurrently on the shared executor.
+        
+        All reviewers share one deadline, reviewer_timeout (if configured)
+        after the fan-out starts, whether they are running or still waiting
+        for a worker. Reviewers that miss it are reported as timed out
+        instead of blocking the iteration. At most max_workers reviewers of
+        this call are submitted at a time, so one session can't fill the
+        shared queue by itself.
+        
+        A timed-out reviewer that is still queued is cancelled. One that is
+        already running can't be interrupted: it keeps its shared worker
+        until the provider call returns, and its result is discarded.
+        
+        Args:
+            content: Content to review
+            selected_roles: List of reviewer roles
+            iteration: Current iteration number
+            previous_feedback_by_role: Previous feedback text keyed by role
+            on_stream: Optional streaming callback (stage = reviewer role)
+            on_progress: Optional progress callback (stage "reviewers"),
+                called from the calling thread as reviewers finish
+            
+        Returns:
+            List of Feedback objects, in the same order as selected_roles
+        """
+        results: Dict[int, Feedback] = {}
+        deadline = None
+        if self.reviewer_timeout is not None:
+            deadline = time.monotonic() + self.reviewer_timeout
+        
+        def run(role: str) -> Feedback:
+            return self._run_single_reviewer(
+                role,
+                content,
+                iteration,
+                previous_feedback_by_role.get(role, None),
+                self._stage_callback(on_stream, role)
+            )
+        
+        queued = list(enumerate(selected_roles))
+        future_to_index: Dict[Any, int] = {}
+        pending: set = set()
+        
+        def submit_next() -> None:
+            while queued and len(pending) < self.max_workers:
+                index, role = queued.pop(0)
+                remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+                try:
+                    # Waiting for a slot in a full shared queue counts against the deadline
+                    future = self.executor.try_submit(remaining, run, role)
+                except ExecutorSaturatedError as e:
+                    if deadline is not None and time.monotonic() >= deadline:
+                        results[index] = self._error_feedback(
+                            role, iteration, f"Review timed out after {self.reviewer_timeout}s"
+                        )
+                    else:
+                        results[index] = self._error_feedback(role, iteration, f"Review failed: {str(e)}")
+                    continue
+                except Exception as e:
+                    results[index] = self._error_feedback(role, iteration, f"Review failed: {str(e)}")
+                    continue
+                future_to_index[future] = index
+                pending.add(future)
+        
+        try:
+            submit_next()
+            
+            while pending:
+                timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                
+                for future in done:
+                    index = future_to_index[future]
+                    try:
+                        results[index] = future.result()
+                    except Exception as e:
+                        results[index] = self._error_feedback(
+                            selected_roles[index], iteration, f"Review failed: {str(e)}"
+                        )
+                
+                # Past the deadline, every reviewer without a result times out
+                if deadline is not None and time.monotonic() >= deadline:
+                    late = [future_to_index[future] for future in pending] + [index for index, _ in queued]
+                    for future in pending:
+                        future.cancel()
+                    pending = set()
+                    queued.clear()
+                    for index in late:
+                        results[index] = self._error_feedback(
+                            selected_roles[index],
+                            iteration,
+                            f"Review timed out after {self.reviewer_timeout}s"
+                        )
+                
+                self._report_progress(on_progress, "reviewers", len(results), len(selected_roles))
+                submit_next()
+        finally:
+            # Don't block on reviewers that timed out; they finish in the background
+            for future in pending:
+                future.cancel()
+        
+        return [results[index] for index in range(len(selected_roles))]
+    
+    def _run_single_reviewer(
+        self,
+        role: str,
+        content: str,
+        iteration: int,
+        previous_feedback: Optional[str],
+        on_chunk: Optional[Callable[[str], None]] = None
+    ) -> Feedback:
+        """Run a single (cached) reviewer agent.
+        
+        Args:
+            role: Reviewer role name
+            content: Content to review
+            iteration: Current iteration number
+            previous_feedback: Optional previous feedback from this reviewer
+            on_chunk: Optional callback receiving review chunks as they stream in
+            
+        Returns:
+            Feedback object from the reviewer
+        """
+        reviewer = self._get_reviewer(role)
+        
+        # Get feedback (with previous context if available)
+        return reviewer.review(
+            content,
+            iteration,
+            previous_feedback=previous_feedback,
+            on_chunk=on_chunk
+        )
+    
+    def _get_reviewer(self, role: str) -> ReviewerAgent:
+        """Get the cached reviewer agent for a role, creating it on first use.
+        
+        Args:
+            role: Reviewer role name
+            
+        Returns:
+            Reviewer agent bound to the LLM provider
+        """
+        with self._reviewers_lock:
+            reviewer = self._reviewers.get(role)
+            if reviewer is None:
+                reviewer = self.REVIEWER_CLASSES.get(role, ReviewerAgent)(self.llm_provider)
+                self._reviewers[role] = reviewer
+            return reviewer
+    
+    def _stage_callback(
+        self,
+        on_stream: Optional[Callable[[str, str], None]],
+        stage: str
+    ) -> Optional[Callable[[str], None]]:
+        """Bind a streaming callback to one stage of the iteration.
+        
+        Args:
+            on_stream: Optional callback on_stream(stage, chunk)
+            stage: Stage name ("presenter" or a reviewer role)
+            
+        Returns:
+            Single-argument chunk callback, or None if streaming is disabled
+        """
+        if on_stream is None:
+            return None
+        
+        def on_chunk(chunk: str) -> None:
+            on_stream(stage, chunk)
+        
+        return on_chunk
+    
+    def _report_progress(
+        self,
+        on_progress: Optional[Callable[[str, int, int], None]],
+        stage: str,
+        completed: int,
+        total: int
+    ) -> None:
+        """Report stage progress, if a progress callback was given.
+        
+        Args:
+            on_progress: Optional callback on_progress(stage, completed, total)
+            stage: Stage name ("presenter", "reviewers" or "confidence")
+            completed: Completed units of the stage
+            total: Total units of the stage
+        """
+        if on_progress is not None:
+            on_progress(stage, completed, total)
+    
+    def _error_feedback(self, role: str, iteration: int, message: str) -> Feedback:
+        """Build a Feedback object describing a reviewer failure.
+        
+        Args:
+            role: Reviewer role name
+            iteration: Current iteration number
+            message: Error description
+            
+        Returns:
+            Feedback object carrying the error message
+        """
+        return Feedback(
+            reviewer_role=role,
+            feedback_points=[message],
+            iteration=iteration,
+            approved=False,
+            modified=False
+        )
+    
     def _run_confidence(
         self,
         content: str,
@@ -289,11 +750,13 @@ class Orchestrator:
     def reject_current_iteration(self):
         """Reject the current iteration.
         
-        This marks the iteration as rejected and allows regeneration.
+        This marks the iteration as rejected and allows regeneration. The
+        speculative refinement of the rejected iteration is dropped.
         """
         if not self.current_iteration_result:
             raise ValueError("No current iteration to reject")
         
+        self.discard_speculation()
         self.current_iteration_result.human_gate_approved = False
     
     def can_proceed_to_next_iteration(self) -> bool:
@@ -341,6 +804,7 @@ class Orchestrator:
     
     def reset(self):
         """Reset orchestrator state."""
+        self.discard_speculation()
         self.iteration_history.clear()
         self.current_iteration_result = None
 
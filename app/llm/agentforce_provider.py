@@ -1,9 +1,11 @@
 """Salesforce Agentforce LLM provider implementation."""
 
+import asyncio
 import time
 import json
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from app.llm.base_provider import BaseLLMProvider
+from app.llm.retry_policy import parse_retry_after
 
 try:
     import httpx
@@ -117,7 +119,7 @@ class AgentforceProvider(BaseLLMProvider):
         self.max_retries = kwargs.get('max_retries', self.MAX_RETRIES)
         
         # Initialize HTTP client
-        self.client = httpx.Client(timeout=self.timeout)
+        self.client = httpx.Client(timeout=self.timeout, limits=self._httpx_limits())
         
         # Cache for access token
         self._access_token = None
@@ -266,57 +268,30 @@ class AgentforceProvider(BaseLLMProvider):
                 f"→ Falling back to placeholder mode."
             )
         
-        # Build dynamic endpoint
-        instance_url = self.instance_url.rstrip("/")
-        endpoint = f"{instance_url}/services/data/{self.API_VERSION}/agentforce/agents/{self.agent_id}/execute"
-        
-        # Build request
-        headers = {
-            "Authorization": f"Bearer {access_token}",
-            "Content-Type": "application/json"
-        }
-        
-        payload = {
-            "input": {
-                "text": prompt,
-                "context": self.system_prompt  # NOTE: Some agents use "instructions" instead of "context"
-            }
-        }
-        # NOTE: If the agent ignores context, switch the key to: "instructions": self.system_prompt
+        endpoint, headers, payload = self._build_request(prompt, access_token)
         
         # Debug logging
         print(f"[Agentforce] Calling agent {self.agent_id} at {endpoint}")
         
         # Retry logic
+        retry = self._begin_retry()
         last_exception = None
-        for attempt in range(self.MAX_RETRIES):
+        for _ in range(self.max_retries):
             try:
+                self._acquire_rate_limit(prompt)
                 response = self.client.post(endpoint, json=payload, headers=headers)
                 
                 if response.status_code == 200:
-                    data = response.json()
-                    
-                    # Parse standard Salesforce response format
-                    if "output" in data and "text" in data["output"]:
-                        result_text = data["output"]["text"]
-                        print(f"[Agentforce] Received {len(result_text)} chars")
-                        return result_text
-                    else:
-                        return (
-                            f"[Agentforce Warning] Unexpected response format:\n"
-                            f"{json.dumps(data, indent=2)}"
-                        )
+                    return self._extract_text(response.json())
                 
                 else:
                     error_text = response.text
                     last_exception = Exception(f"HTTP {response.status_code}: {error_text}")
                     
-                    # Retry on server errors (500+)
-                    if response.status_code >= 500:
-                        if attempt < self.MAX_RETRIES - 1:
-                            wait_time = self.RETRY_DELAY * (2 ** attempt)
-                            print(f"[Agentforce] Server error, retrying in {wait_time}s...")
-                            time.sleep(wait_time)
+                    # Retry on rate limits (429) and server errors (500+)
+                    if response.status_code == 429 or response.status_code >= 500:
+                        print(f"[Agentforce] HTTP {response.status_code}, backing off...")
+                        if retry.wait(parse_retry_after(response.headers)):
                             continue
                     
                     # Don't retry on client errors (401, 403, 404)
@@ -324,17 +299,147 @@ class AgentforceProvider(BaseLLMProvider):
             
             except Exception as e:
                 last_exception = e
-                if attempt < self.MAX_RETRIES - 1:
-                    print(f"[Agentforce] Error, retrying...")
-                    time.sleep(self.RETRY_DELAY)
+                print(f"[Agentforce] Error, retrying...")
+                if retry.wait():
+                    continue
+                break
+        
+        # All retries failed - return error as text (don't raise)
+        return self._api_error_text(endpoint, last_exception, prompt)
+    
+    async def agenerate_text(self, prompt: str, **kwargs) -> str:
+        """Generate text using Salesforce Agentforce without blocking.
+        
+        Uses a native httpx.AsyncClient for the agent call; the (rare) OAuth
+        token exchange is offloaded to a worker thread. Like generate_text,
+        failures are returned as error text rather than raised.
+        
+        Args:
+            prompt: The input prompt for the agent
+            **kwargs: Additional parameters (currently unused)
+                
+        Returns:
+            Generated text string from Agentforce agent (or error message on failure)
+        """
+        # Get access token (prefer session_id, fallback to OAuth)
+        try:
+            if self.session_id:
+                access_token = self.session_id
+            else:
+                access_token = await asyncio.to_thread(self._get_access_token)
+        except Exception as e:
+            return (
+                f"[Agentforce Authentication Error]\n"
+                f"Failed to get access token: {str(e)}\n"
+                f"→ Falling back to placeholder mode."
+            )
+        
+        endpoint, headers, payload = self._build_request(prompt, access_token)
+        client = self._get_async_client()
+        
+        print(f"[Agentforce] Calling agent {self.agent_id} at {endpoint}")
+        
+        # Retry logic
+        retry = self._begin_retry()
+        last_exception = None
+        for _ in range(self.max_retries):
+            try:
+                await self._aacquire_rate_limit(prompt)
+                response = await client.post(endpoint, json=payload, headers=headers)
+                
+                if response.status_code == 200:
+                    return self._extract_text(response.json())
+                
+                last_exception = Exception(f"HTTP {response.status_code}: {response.text}")
+                
+                # Retry on rate limits (429) and server errors (500+)
+                if response.status_code == 429 or response.status_code >= 500:
+                    print(f"[Agentforce] HTTP {response.status_code}, backing off...")
+                    if await retry.await_wait(parse_retry_after(response.headers)):
+                        continue
+                
+                # Don't retry on client errors (401, 403, 404)
+                break
+            
+            except Exception as e:
+                last_exception = e
+                print(f"[Agentforce] Error, retrying...")
+                if await retry.await_wait():
                     continue
                 break
         
         # All retries failed - return error as text (don't raise)
+        return self._api_error_text(endpoint, last_exception, prompt)
+    
+    def _build_request(
+        self,
+        prompt: str,
+        access_token: str
+    ) -> Tuple[str, Dict[str, str], Dict[str, Any]]:
+        """Build endpoint, headers and payload for an agent execute call.
+        
+        Args:
+            prompt: The input prompt for the agent
+            access_token: Salesforce access token or session ID
+            
+        Returns:
+            Tuple of (endpoint, headers, payload)
+        """
+        # Build dynamic endpoint
+        instance_url = self.instance_url.rstrip("/")
+        endpoint = f"{instance_url}/services/data/{self.API_VERSION}/agentforce/agents/{self.agent_id}/execute"
+        
+        # Build request
+        headers = {
+            "Authorization": f"Bearer {access_token}",
+            "Content-Type": "application/json"
+        }
+        
+        payload = {
+            "input": {
+                "text": prompt,
+                "context": self.system_prompt  # NOTE: Some agents use "instructions" instead of "context"
+            }
+        }
+        # NOTE: If the agent ignores context, switch the key to: "instructions": self.system_prompt
+        
+        return endpoint, headers, payload
+    
+    def _extract_text(self, data: Dict[str, Any]) -> str:
+        """Extract agent output text from an execute response.
+        
+        Args:
+            data: Parsed JSON response
+            
+        Returns:
+            Agent output text, or a warning if the format is unexpected
+        """
+        # Parse standard Salesforce response format
+        if "output" in data and "text" in data["output"]:
+            result_text = data["output"]["text"]
+            print(f"[Agentforce] Received {len(result_text)} chars")
+            return result_text
+        
+        return (
+            f"[Agentforce Warning] Unexpected response format:\n"
+            f"{json.dumps(data, indent=2)}"
+        )
+    
+    def _api_error_text(self, endpoint: str, error: Optional[Exception], prompt: str) -> str:
+        """Format the placeholder text returned when all retries fail.
+        
+        Args:
+            endpoint: Agent endpoint that was called
+            error: Last exception encountered
+            prompt: Prompt that was sent
+            
+        Returns:
+            Error description text
+        """
         return (
             f"[Agentforce API Error]\n"
             f"Endpoint: {endpoint}\n"
-            f"Error: {str(last_exception)}\n\n"
+            f"Error: {str(error)}\n\n"
             f"→ Falling back to placeholder output.\n"
             f"Prompt sent: {prompt[:200]}..."
         )
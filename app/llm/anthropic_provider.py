@@ -1,9 +1,20 @@
 """Anthropic LLM provider implementation."""
 
+import asyncio
+import hashlib
+import json
+import threading
 import time
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple, Iterator
 import requests
 from app.llm.base_provider import BaseLLMProvider
+from app.llm.retry_policy import parse_retry_after
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
 
 
 class AnthropicProvider(BaseLLMProvider):
@@ -11,6 +22,18 @@ class AnthropicProvider(BaseLLMProvider):
     
     This provider implements the BaseLLMProvider interface for Anthropic's API,
     including support for retries, timeouts, and error mapping.
+    
+    A cacheable_prefix passed with a call is sent as its own content block
+    with a cache_control breakpoint, so repeated prefixes (the document all
+    reviewers read) are billed and processed as cache reads after the first
+    call. Cache read/write token counts are reported in last_usage and
+    get_usage_stats().
+    
+    A cache entry only becomes readable once the response that writes it has
+    started, so concurrent calls sharing a prefix would each pay the cache
+    write premium. The first call with a prefix therefore goes alone; calls
+    made while it is in flight wait for its response to start and then read
+    the cache.
     """
     
     API_BASE = "https://api.anthropic.com/v1"
@@ -19,6 +42,7 @@ class AnthropicProvider(BaseLLMProvider):
     MAX_RETRIES = 3
     RETRY_DELAY = 1
     ANTHROPIC_VERSION = "2023-06-01"
+    CACHE_TTL = 300  # Lifetime of an ephemeral cache entry, in seconds
     
     def __init__(self, api_key: Optional[str] = None, **kwargs):
         """Initialize Anthropic provider.
@@ -31,6 +55,8 @@ class AnthropicProvider(BaseLLMProvider):
                 - max_retries: Maximum number of retries
                 - temperature: Default temperature
                 - max_tokens: Default max tokens
+                - prompt_caching: Add cache_control breakpoints for
+                  cacheable_prefix (default True)
         """
         super().__init__(api_key, **kwargs)
         
@@ -42,6 +68,12 @@ class AnthropicProvider(BaseLLMProvider):
         self.max_retries = kwargs.get('max_retries', self.MAX_RETRIES)
         self.temperature = kwargs.get('temperature', 0.7)
         self.max_tokens_default = kwargs.get('max_tokens', 2000)
+        self.prompt_caching = kwargs.get('prompt_caching', True)
+        
+        # Cached prefixes by key: (event set once the writing response has
+        # started, time the write began)
+        self._cache_writes: Dict[str, Tuple[threading.Event, float]] = {}
+        self._cache_writes_lock = threading.Lock()
     
     def generate_text(self, prompt: str, **kwargs) -> str:
         """Generate text from a prompt using Anthropic API.
@@ -52,6 +84,7 @@ class AnthropicProvider(BaseLLMProvider):
                 - model: Override default model
                 - temperature: Override default temperature
                 - max_tokens: Override default max tokens
+                - cacheable_prefix: Leading part of prompt to cache
                 
         Returns:
             Generated text string
@@ -59,30 +92,157 @@ class AnthropicProvider(BaseLLMProvider):
         Raises:
             Exception: If generation fails after all retries
         """
-        model = kwargs.get('model', self.model)
-        temperature = kwargs.get('temperature', self.temperature)
-        max_tokens = kwargs.get('max_tokens', self.max_tokens_default)
+        headers, payload = self._build_request(prompt, **kwargs)
+        cache_write, owner = self._claim_cache_write(payload)
+        if cache_write is not None and not owner:
+            cache_write.wait(timeout=self.timeout)
+        try:
+            return self._post_with_retries(headers, payload, prompt, kwargs)
+        finally:
+            if owner:
+                cache_write.set()
+    
+    def _post_with_retries(
+        self,
+        headers: Dict[str, str],
+        payload: Dict[str, Any],
+        prompt: str,
+        kwargs: Dict[str, Any]
+    ) -> str:
+        """Send a messages request, retrying rate limits and transient failures.
         
-        headers = {
-            "x-api-key": self.api_key,
-            "anthropic-version": self.ANTHROPIC_VERSION,
-            "Content-Type": "application/json"
-        }
+        Args:
+            headers: Request headers
+            payload: Request payload
+            prompt: The input prompt (for rate limiting)
+            kwargs: generate_text's generation parameters
+            
+        Returns:
+            Generated text string
+            
+        Raises:
+            Exception: If generation fails after all retries
+        """
+        # Retry logic
+        retry = self._begin_retry()
+        last_exception = None
+        for _ in range(self.max_retries):
+            try:
+                self._acquire_rate_limit(prompt)
+                response = self._get_session().post(
+                    f"{self.API_BASE}/messages",
+                    headers=headers,
+                    json=payload,
+                    timeout=self.timeout
+                )
+                
+                if response.status_code == 200:
+                    return self._extract_text(
+                        response.json(),
+                        fail_on_truncation=kwargs.get('fail_on_truncation', False),
+                        max_tokens=payload['max_tokens']
+                    )
+                
+                elif response.status_code == 429:
+                    # Rate limit - back off (at least as long as the server asks) and retry
+                    last_exception = Exception("Anthropic API rate limit exceeded")
+                    if retry.wait(parse_retry_after(response.headers)):
+                        continue
+                    break
+                
+                elif response.status_code == 401:
+                    raise ValueError("Invalid API key")
+                
+                elif response.status_code >= 500:
+                    # Server error - retry
+                    if retry.wait(parse_retry_after(response.headers)):
+                        continue
+                    raise Exception(f"Anthropic API server error: {response.status_code}")
+                
+                else:
+                    # Client error - don't retry
+                    error_detail = response.json().get('error', {}).get('message', 'Unknown error')
+                    raise Exception(f"Anthropic API error: {error_detail}")
+            
+            except requests.exceptions.Timeout:
+                last_exception = Exception(f"Request timeout after {self.timeout}s")
+                if retry.wait():
+                    continue
+                break
+            
+            except requests.exceptions.ConnectionError as e:
+                last_exception = Exception(f"Connection error: {str(e)}")
+                if retry.wait():
+                    continue
+                break
+            
+            except Exception as e:
+                last_exception = e
+                # Don't retry on unexpected exceptions
+                break
         
-        payload = {
-            "model": model,
-            "messages": [
-                {"role": "user", "content": prompt}
-            ],
-            "temperature": temperature,
-            "max_tokens": max_tokens
-        }
+        # If we get here, all retries failed
+        raise last_exception or Exception("Failed to generate text")
+    
+    async def agenerate_text(self, prompt: str, **kwargs) -> str:
+        """Generate text from a prompt using Anthropic API without blocking.
+        
+        Uses a native httpx.AsyncClient; retry backoff awaits asyncio.sleep
+        instead of blocking a thread.
+        
+        Args:
+            prompt: The input prompt
+            **kwargs: Same parameters as generate_text
+                
+        Returns:
+            Generated text string
+            
+        Raises:
+            Exception: If generation fails after all retries
+        """
+        if not HTTPX_AVAILABLE:
+            return await super().agenerate_text(prompt, **kwargs)
+        
+        headers, payload = self._build_request(prompt, **kwargs)
+        cache_write, owner = self._claim_cache_write(payload)
+        if cache_write is not None and not owner:
+            await asyncio.to_thread(cache_write.wait, self.timeout)
+        try:
+            return await self._apost_with_retries(headers, payload, prompt, kwargs)
+        finally:
+            if owner:
+                cache_write.set()
+    
+    async def _apost_with_retries(
+        self,
+        headers: Dict[str, str],
+        payload: Dict[str, Any],
+        prompt: str,
+        kwargs: Dict[str, Any]
+    ) -> str:
+        """Send a messages request on the async client, retrying like _post_with_retries.
+        
+        Args:
+            headers: Request headers
+            payload: Request payload
+            prompt: The input prompt (for rate limiting)
+            kwargs: agenerate_text's generation parameters
+            
+        Returns:
+            Generated text string
+            
+        Raises:
+            Exception: If generation fails after all retries
+        """
+        client = self._get_async_client()
         
         # Retry logic
+        retry = self._begin_retry()
         last_exception = None
-        for attempt in range(self.max_retries):
+        for _ in range(self.max_retries):
             try:
-                response = requests.post(
+                await self._aacquire_rate_limit(prompt)
+                response = await client.post(
                     f"{self.API_BASE}/messages",
                     headers=headers,
                     json=payload,
@@ -90,22 +250,154 @@ class AnthropicProvider(BaseLLMProvider):
                 )
                 
                 if response.status_code == 200:
-                    data = response.json()
-                    return data['content'][0]['text']
+                    return self._extract_text(
+                        response.json(),
+                        fail_on_truncation=kwargs.get('fail_on_truncation', False),
+                        max_tokens=payload['max_tokens']
+                    )
                 
                 elif response.status_code == 429:
-                    # Rate limit - wait and retry
-                    wait_time = self.RETRY_DELAY * (2 ** attempt)
-                    time.sleep(wait_time)
+                    # Rate limit - back off (at least as long as the server asks) and retry
+                    last_exception = Exception("Anthropic API rate limit exceeded")
+                    if await retry.await_wait(parse_retry_after(response.headers)):
+                        continue
+                    break
+                
+                elif response.status_code == 401:
+                    raise ValueError("Invalid API key")
+                
+                elif response.status_code >= 500:
+                    # Server error - retry
+                    if await retry.await_wait(parse_retry_after(response.headers)):
+                        continue
+                    raise Exception(f"Anthropic API server error: {response.status_code}")
+                
+                else:
+                    # Client error - don't retry
+                    error_detail = response.json().get('error', {}).get('message', 'Unknown error')
+                    raise Exception(f"Anthropic API error: {error_detail}")
+            
+            except httpx.TimeoutException:
+                last_exception = Exception(f"Request timeout after {self.timeout}s")
+                if await retry.await_wait():
+                    continue
+                break
+            
+            except httpx.TransportError as e:
+                last_exception = Exception(f"Connection error: {str(e)}")
+                if await retry.await_wait():
                     continue
+                break
+            
+            except Exception as e:
+                last_exception = e
+                # Don't retry on unexpected exceptions
+                break
+        
+        # If we get here, all retries failed
+        raise last_exception or Exception("Failed to generate text")
+    
+    def stream_text(self, prompt: str, **kwargs) -> Iterator[str]:
+        """Generate text from a prompt, yielding tokens as Anthropic streams them.
+        
+        Args:
+            prompt: The input prompt
+            **kwargs: Same parameters as generate_text
+            
+        Yields:
+            Text chunks as they arrive
+            
+        Raises:
+            Exception: If the stream cannot be opened or reports an error
+        """
+        headers, payload = self._build_request(prompt, **kwargs)
+        payload["stream"] = True
+        
+        cache_write, owner = self._claim_cache_write(payload)
+        if cache_write is not None and not owner:
+            cache_write.wait(timeout=self.timeout)
+        try:
+            response = self._open_stream(headers, payload, prompt)
+        finally:
+            # The cache is readable once the response has started
+            if owner:
+                cache_write.set()
+        usage = {}
+        try:
+            for data in self._iter_sse_data(response.iter_lines(decode_unicode=True)):
+                event = json.loads(data)
+                event_type = event.get('type')
+                
+                if event_type == 'message_start':
+                    # Input and cache counts come first, output counts in message_delta
+                    usage.update(event.get('message', {}).get('usage') or {})
+                
+                elif event_type == 'message_delta':
+                    usage.update(event.get('usage') or {})
+                
+                elif event_type == 'content_block_delta':
+                    text = event.get('delta', {}).get('text')
+                    if text:
+                        yield text
+                
+                elif event_type == 'error':
+                    error_detail = event.get('error', {}).get('message', 'Unknown error')
+                    raise Exception(f"Anthropic API error: {error_detail}")
+                
+                elif event_type == 'message_stop':
+                    break
+        finally:
+            response.close()
+            self._record_usage(usage)
+    
+    def _open_stream(self, headers: Dict[str, str], payload: Dict[str, Any], prompt: str = "") -> Any:
+        """Open a streaming messages request, retrying like generate_text.
+        
+        Retries only happen before any output is produced; once the stream
+        is open, errors propagate to the caller.
+        
+        Args:
+            headers: Request headers
+            payload: Request payload with stream enabled
+            prompt: The input prompt (for rate limiting)
+            
+        Returns:
+            Open streaming response with status 200
+            
+        Raises:
+            Exception: If the stream cannot be opened after all retries
+        """
+        retry = self._begin_retry()
+        last_exception = None
+        for _ in range(self.max_retries):
+            try:
+                self._acquire_rate_limit(prompt)
+                response = self._get_session().post(
+                    f"{self.API_BASE}/messages",
+                    headers=headers,
+                    json=payload,
+                    timeout=self.timeout,
+                    stream=True
+                )
+                
+                if response.status_code == 200:
+                    return response
+                
+                elif response.status_code == 429:
+                    # Rate limit - back off (at least as long as the server asks) and retry
+                    response.close()
+                    last_exception = Exception("Anthropic API rate limit exceeded")
+                    if retry.wait(parse_retry_after(response.headers)):
+                        continue
+                    break
                 
                 elif response.status_code == 401:
                     raise ValueError("Invalid API key")
                 
                 elif response.status_code >= 500:
                     # Server error - retry
-                    if attempt < self.max_retries - 1:
-                        time.sleep(self.RETRY_DELAY)
+                    response.close()
+                    if retry.wait(parse_retry_after(response.headers)):
                         continue
                     raise Exception(f"Anthropic API server error: {response.status_code}")
                 
@@ -116,15 +408,15 @@ class AnthropicProvider(BaseLLMProvider):
             
             except requests.exceptions.Timeout:
                 last_exception = Exception(f"Request timeout after {self.timeout}s")
-                if attempt < self.max_retries - 1:
-                    time.sleep(self.RETRY_DELAY)
+                if retry.wait():
                     continue
+                break
             
             except requests.exceptions.ConnectionError as e:
                 last_exception = Exception(f"Connection error: {str(e)}")
-                if attempt < self.max_retries - 1:
-                    time.sleep(self.RETRY_DELAY)
+                if retry.wait():
                     continue
+                break
             
             except Exception as e:
                 last_exception = e
@@ -132,7 +424,119 @@ class AnthropicProvider(BaseLLMProvider):
                 break
         
         # If we get here, all retries failed
-        raise last_exception or Exception("Failed to generate text")
+        raise last_exception or Exception("Failed to open stream")
+    
+    def _build_request(self, prompt: str, **kwargs) -> Tuple[Dict[str, str], Dict[str, Any]]:
+        """Build headers and payload for a messages request.
+        
+        Args:
+            prompt: The input prompt
+            **kwargs: Generation overrides (model, temperature, max_tokens,
+                cacheable_prefix)
+            
+        Returns:
+            Tuple of (headers, payload)
+        """
+        model = kwargs.get('model', self.model)
+        temperature = kwargs.get('temperature', self.temperature)
+        max_tokens = kwargs.get('max_tokens', self.max_tokens_default)
+        prefix = kwargs.get('cacheable_prefix')
+        
+        headers = {
+            "x-api-key": self.api_key,
+            "anthropic-version": self.ANTHROPIC_VERSION,
+            "Content-Type": "application/json"
+        }
+        
+        payload = {
+            "model": model,
+            "messages": [
+                {"role": "user", "content": self._build_content(prompt, prefix)}
+            ],
+            "temperature": temperature,
+            "max_tokens": max_tokens
+        }
+        
+        return headers, payload
+    
+    def _build_content(self, prompt: str, prefix: Optional[str]) -> Any:
+        """Build the user message content, with a cache breakpoint after prefix.
+        
+        Args:
+            prompt: The input prompt
+            prefix: Leading part of prompt to cache, if any
+            
+        Returns:
+            The prompt string, or text blocks with the prefix marked cacheable
+        """
+        if not (self.prompt_caching and prefix and prompt.startswith(prefix)):
+            return prompt
+        
+        blocks = [{"type": "text", "text": prefix, "cache_control": {"type": "ephemeral"}}]
+        if len(prompt) > len(prefix):
+            blocks.append({"type": "text", "text": prompt[len(prefix):]})
+        return blocks
+    
+    def _claim_cache_write(self, payload: Dict[str, Any]) -> Tuple[Optional[threading.Event], bool]:
+        """Find out whether a request writes its cached prefix or reads it.
+        
+        Args:
+            payload: Request payload built by _build_request
+            
+        Returns:
+            Tuple of (event, owner). event is None if the request has no
+            cache breakpoint. If owner is True the request writes the cache
+            and must set event once its response has started; otherwise it
+            should wait for event before being sent (it is already set if
+            the cache was written earlier).
+        """
+        content = payload['messages'][0]['content']
+        if not isinstance(content, list) or 'cache_control' not in content[0]:
+            return None, False
+        
+        key = hashlib.sha256(f"{payload['model']}\0{content[0]['text']}".encode('utf-8')).hexdigest()
+        now = time.monotonic()
+        with self._cache_writes_lock:
+            # Forget entries the API has evicted, so the next call writes again
+            expired = [k for k, (_, written_at) in self._cache_writes.items() if now - written_at >= self.CACHE_TTL]
+            for k in expired:
+                del self._cache_writes[k]
+            
+            entry = self._cache_writes.get(key)
+            if entry is not None:
+                return entry[0], False
+            
+            event = threading.Event()
+            self._cache_writes[key] = (event, now)
+            return event, True
+    
+    def _extract_text(
+        self,
+        data: Dict[str, Any],
+        fail_on_truncation: bool = False,
+        max_tokens: Optional[int] = None
+    ) -> str:
+        """Extract generated text from a messages response and record its usage.
+        
+        Args:
+            data: Parsed JSON response
+            fail_on_truncation: Raise if generation stopped at max_tokens
+            max_tokens: Budget of the request
+            
+        Returns:
+            Generated text string
+            
+        Raises:
+            TruncatedResponseError: If stop_reason is 'max_tokens' and
+                fail_on_truncation is set
+        """
+        self._record_usage(data.get('usage'))
+        return self._check_truncation(
+            data['content'][0]['text'],
+            data.get('stop_reason') == 'max_tokens',
+            fail_on_truncation,
+            max_tokens
+        )
     
     def list_models(self) -> List[str]:
         """List available Anthropic models.
@@ -1,7 +1,45 @@
 """Base LLM provider interface."""
 
+import asyncio
+import hashlib
+import json
+import threading
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterator, Iterable, Tuple
+from app.llm.rate_limiter import RateLimiter, get_rate_limiter, estimate_tokens
+from app.llm.retry_policy import RetryPolicy, RetryState
+from app.llm.single_flight import coalesced, coalescing_bypassed
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+    REQUESTS_AVAILABLE = True
+except ImportError:
+    REQUESTS_AVAILABLE = False
+
+
+class TruncatedResponseError(Exception):
+    """Raised when a response stopped at its max_tokens limit.
+    
+    Providers raise it for a partial response only when the call passed
+    fail_on_truncation=True, so the caller can retry with a larger budget;
+    otherwise the partial text is returned as before.
+    
+    Attributes:
+        max_tokens: Budget the response hit, if known
+        partial_text: Text generated before the cut-off
+    """
+    
+    def __init__(self, message: str, max_tokens: Optional[int] = None, partial_text: str = ""):
+        super().__init__(message)
+        self.max_tokens = max_tokens
+        self.partial_text = partial_text
 
 
 class BaseLLMProvider(ABC):
@@ -10,17 +48,102 @@ class BaseLLMProvider(ABC):
     All provider implementations must inherit from this class and implement
     the required methods. This ensures a unified interface across different
     LLM providers (OpenAI, Anthropic, local models, etc.).
+    
+    Providers own their HTTP connection pools (a keep-alive requests.Session
+    and/or httpx clients). Call close() - or use the provider as a context
+    manager - to release them when the provider is discarded.
+    
+    The methods in COALESCED_METHODS are wrapped automatically in every
+    subclass so that identical calls already in flight - same provider
+    class, credential, configuration and arguments, from any thread or
+    session - share one upstream request and all callers get its result or
+    its exception. Pass coalesce=False to opt out.
     """
     
+    # Methods whose identical in-flight calls share one upstream request
+    COALESCED_METHODS = ('generate_text', 'agenerate_text', 'list_models', 'validate_connection')
+    
+    # Connection pool defaults (sized for a full reviewer fan-out plus
+    # the presenter, aggregator and confidence calls of one iteration)
+    DEFAULT_POOL_CONNECTIONS = 10
+    DEFAULT_POOL_MAXSIZE = 10
+    DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 10
+    DEFAULT_MAX_CONNECTIONS = 20
+    
+    # Client-side rate limits (None = unlimited); overridable per provider
+    # class and per instance via the rpm/tpm config kwargs
+    DEFAULT_RPM = None
+    DEFAULT_TPM = None
+    
+    # Retry defaults (see RetryPolicy); overridable per provider class and
+    # per instance via the max_retries/retry_delay/max_retry_delay/retry_deadline
+    # config kwargs
+    MAX_RETRIES = 3
+    RETRY_DELAY = 1
+    MAX_RETRY_DELAY = 30
+    RETRY_DEADLINE = 120
+    
     def __init__(self, api_key: Optional[str] = None, **kwargs):
         """Initialize the provider.
         
         Args:
             api_key: API key for the provider (if required)
             **kwargs: Additional provider-specific configuration
+                - pool_connections: Number of host pools kept by the session (default 10)
+                - pool_maxsize: Maximum keep-alive connections per host (default 10)
+                - pool_block: Block when the pool is exhausted instead of
+                  opening throwaway connections (default False)
+                - max_connections: httpx connection limit (default 20)
+                - max_keepalive_connections: httpx keep-alive limit (default 10)
+                - rpm: Requests per minute allowed for this provider and key
+                  (default DEFAULT_RPM; shared process-wide)
+                - tpm: Prompt tokens per minute allowed for this provider and
+                  key (default DEFAULT_TPM; shared process-wide)
+                - max_retries: Maximum requests per call (default MAX_RETRIES)
+                - retry_delay: Minimum backoff delay in seconds (default RETRY_DELAY)
+                - max_retry_delay: Maximum computed backoff delay in seconds
+                  (default MAX_RETRY_DELAY)
+                - retry_deadline: Total time budget per call in seconds, or
+                  None for no limit (default RETRY_DEADLINE)
+                - coalesce: Share identical in-flight calls (default True)
         """
         self.api_key = api_key
         self.config = kwargs
+        
+        # Shared by the sync, async and streaming paths of this provider
+        self.retry_policy = RetryPolicy(
+            max_attempts=max(1, kwargs.get('max_retries', self.MAX_RETRIES)),
+            base_delay=kwargs.get('retry_delay', self.RETRY_DELAY),
+            max_delay=kwargs.get('max_retry_delay', self.MAX_RETRY_DELAY),
+            deadline=kwargs.get('retry_deadline', self.RETRY_DEADLINE)
+        )
+        
+        # Pooled keep-alive HTTP session, created lazily and shared across threads
+        self._session = None
+        self._session_lock = threading.Lock()
+        
+        # Async HTTP client, created lazily and bound to the event loop that created it
+        self._async_client = None
+        self._async_client_loop = None
+        
+        # Shared rate limiter, resolved lazily (subclasses set their name/key first)
+        self._rate_limiter = None
+        self._rate_limiter_resolved = False
+        
+        # Token usage reported by the API (providers that expose it); the
+        # last call's usage is kept per thread so concurrent callers don't
+        # read each other's counts
+        self._usage_lock = threading.Lock()
+        self._usage_local = threading.local()
+        self._usage_totals: Dict[str, int] = {}
+    
+    def __init_subclass__(cls, **kwargs):
+        """Wrap the subclass's own COALESCED_METHODS with single-flight."""
+        super().__init_subclass__(**kwargs)
+        for name in cls.COALESCED_METHODS:
+            method = cls.__dict__.get(name)
+            if callable(method) and not getattr(method, '__isabstractmethod__', False):
+                setattr(cls, name, coalesced(method))
     
     @abstractmethod
     def generate_text(self, prompt: str, **kwargs) -> str:
@@ -29,15 +152,66 @@ class BaseLLMProvider(ABC):
         Args:
             prompt: The input prompt
             **kwargs: Additional generation parameters (temperature, max_tokens, etc.)
+                - cacheable_prefix: Leading part of prompt that is shared
+                  verbatim across calls (e.g. the reviewed document). Providers
+                  with explicit prompt caching mark it as cacheable; others
+                  ignore it.
+                - response_schema: JSON schema the response must follow.
+                  Providers with a JSON/schema output mode enforce it; others
+                  ignore it, so the prompt should still ask for JSON.
+                - fail_on_truncation: Raise TruncatedResponseError instead of
+                  returning a response cut off at max_tokens. Providers that
+                  report why generation stopped honor it; others ignore it.
             
         Returns:
             Generated text string
             
         Raises:
+            TruncatedResponseError: If the response hit max_tokens and
+                fail_on_truncation was set
             Exception: If generation fails
         """
         pass
     
+    async def agenerate_text(self, prompt: str, **kwargs) -> str:
+        """Generate text from a prompt without blocking the event loop.
+        
+        The default implementation offloads the blocking generate_text call to
+        a worker thread. Providers with a native async transport override this
+        to issue the request directly on the running event loop.
+        
+        Args:
+            prompt: The input prompt
+            **kwargs: Additional generation parameters (temperature, max_tokens, etc.)
+            
+        Returns:
+            Generated text string
+            
+        Raises:
+            Exception: If generation fails
+        """
+        return await asyncio.to_thread(self.generate_text, prompt, **kwargs)
+    
+    def stream_text(self, prompt: str, **kwargs) -> Iterator[str]:
+        """Generate text from a prompt, yielding chunks as they arrive.
+        
+        The default implementation yields the full generate_text result as a
+        single chunk. Providers with a streaming API override this to yield
+        tokens incrementally, so callers can render output before the whole
+        generation finishes.
+        
+        Args:
+            prompt: The input prompt
+            **kwargs: Additional generation parameters (temperature, max_tokens, etc.)
+            
+        Yields:
+            Text chunks; their concatenation is the generated text
+            
+        Raises:
+            Exception: If generation fails
+        """
+        yield self.generate_text(prompt, **kwargs)
+    
     @abstractmethod
     def list_models(self) -> List[str]:
         """List available models for this provider.
@@ -69,4 +243,299 @@ class BaseLLMProvider(ABC):
             Provider name string
         """
         return self.__class__.__name__.replace("Provider", "").lower()
-
+    
+    def _single_flight_key(self, method: str, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Optional[str]:
+        """Identify a call for single-flight coalescing.
+        
+        The API key only enters the digest hashed, and the digest is only
+        held in memory while the call is in flight.
+        
+        Args:
+            method: Name of the called method
+            args: Positional arguments
+            kwargs: Keyword arguments
+        
+        Returns:
+            Hex SHA-256 digest, or None if the call must not be coalesced
+        """
+        config = self.__dict__.get('config')
+        if config is None or not config.get('coalesce', True) or coalescing_bypassed():
+            return None
+        
+        material = json.dumps(
+            {
+                'class': f"{type(self).__module__}.{type(self).__qualname__}",
+                'credential': hashlib.sha256((self.api_key or "").encode('utf-8')).hexdigest(),
+                'config': config,
+                'method': method,
+                'args': args,
+                'kwargs': kwargs,
+            },
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+    
+    def _begin_retry(self) -> RetryState:
+        """Start backoff tracking for one call.
+        
+        Returns:
+            RetryState whose wait()/await_wait() must be used before each retry
+        """
+        return self.retry_policy.begin()
+    
+    def get_retry_stats(self) -> Dict[str, float]:
+        """Get retry statistics for this provider.
+        
+        Returns:
+            Dictionary with calls, attempts, retries, exhausted and total_sleep
+        """
+        return self.retry_policy.get_stats()
+    
+    @property
+    def last_usage(self) -> Optional[Dict[str, int]]:
+        """Usage of the calling thread's most recent call (None if not reported)."""
+        local = getattr(self, '_usage_local', None)
+        return getattr(local, 'usage', None)
+    
+    def _record_usage(self, usage: Optional[Dict[str, Any]]) -> None:
+        """Record the token usage the API reported for one call.
+        
+        Args:
+            usage: Usage counters from the response (e.g. input_tokens,
+                output_tokens, cache_read_input_tokens), or None
+        """
+        if not usage:
+            return
+        
+        counts = {key: value for key, value in usage.items() if isinstance(value, int)}
+        self._usage_local.usage = counts
+        if counts.get('cache_read_input_tokens') or counts.get('cache_creation_input_tokens'):
+            print(
+                f"[{self.__class__.__name__}] Prompt cache: read {counts.get('cache_read_input_tokens', 0)}, "
+                f"wrote {counts.get('cache_creation_input_tokens', 0)} input tokens"
+            )
+        with self._usage_lock:
+            self._usage_totals['requests'] = self._usage_totals.get('requests', 0) + 1
+            for key, value in counts.items():
+                self._usage_totals[key] = self._usage_totals.get(key, 0) + value
+    
+    def _check_truncation(self, text: str, truncated: bool, fail_on_truncation: bool, max_tokens: Optional[int]) -> str:
+        """Return a response, or raise if it was cut off and the caller asked to fail.
+        
+        Args:
+            text: Generated text
+            truncated: Whether generation stopped at max_tokens
+            fail_on_truncation: The call's fail_on_truncation setting
+            max_tokens: Budget of the call
+            
+        Returns:
+            text
+            
+        Raises:
+            TruncatedResponseError: If truncated and fail_on_truncation is set
+        """
+        if truncated and fail_on_truncation:
+            raise TruncatedResponseError(
+                f"{self.get_provider_name()} response truncated at max_tokens={max_tokens}",
+                max_tokens=max_tokens,
+                partial_text=text
+            )
+        return text
+    
+    def get_usage_stats(self) -> Dict[str, int]:
+        """Get token usage accumulated over this provider's calls.
+        
+        Returns:
+            Dictionary with requests and summed usage counters as reported by
+            the API (empty if the provider doesn't report usage)
+        """
+        with self._usage_lock:
+            return dict(self._usage_totals)
+    
+    def _get_rate_limiter(self) -> Optional[RateLimiter]:
+        """Get the process-wide rate limiter for this provider and API key.
+        
+        Returns:
+            Shared RateLimiter, or None if no rpm/tpm budget is configured
+        """
+        if not self._rate_limiter_resolved:
+            self._rate_limiter = get_rate_limiter(
+                self.get_provider_name(),
+                self.api_key,
+                rpm=self.config.get('rpm', self.DEFAULT_RPM),
+                tpm=self.config.get('tpm', self.DEFAULT_TPM)
+            )
+            self._rate_limiter_resolved = True
+        return self._rate_limiter
+    
+    def _acquire_rate_limit(self, prompt: str = "") -> None:
+        """Block until the shared rate limiter admits one request.
+        
+        Called before every outgoing generation request (including retries)
+        so that bursts are queued client-side instead of hitting 429s.
+        
+        Args:
+            prompt: Prompt text, used to estimate the token cost
+        """
+        limiter = self._get_rate_limiter()
+        if limiter is not None:
+            limiter.acquire(estimate_tokens(prompt))
+    
+    async def _aacquire_rate_limit(self, prompt: str = "") -> None:
+        """Await the shared rate limiter without blocking the event loop.
+        
+        Args:
+            prompt: Prompt text, used to estimate the token cost
+        """
+        limiter = self._get_rate_limiter()
+        if limiter is not None:
+            await limiter.aacquire(estimate_tokens(prompt))
+    
+    @staticmethod
+    def _iter_sse_data(lines: Iterable[Any]) -> Iterator[str]:
+        """Extract the data payloads from a server-sent events line stream.
+        
+        Args:
+            lines: Response lines (str or bytes), e.g. from iter_lines()
+            
+        Yields:
+            The data field of each event (comments and other fields skipped)
+        """
+        for line in lines:
+            if isinstance(line, bytes):
+                line = line.decode('utf-8')
+            if line.startswith('data:'):
+                yield line[5:].strip()
+    
+    def _get_async_client(self) -> "httpx.AsyncClient":
+        """Get the async HTTP client for the running event loop.
+        
+        httpx connection pools are bound to the event loop that created them,
+        so a new client is created whenever the provider is used from a
+        different loop (e.g. successive asyncio.run() calls).
+        
+        Returns:
+            httpx.AsyncClient instance
+            
+        Raises:
+            ImportError: If httpx is not installed
+        """
+        if not HTTPX_AVAILABLE:
+            raise ImportError(
+                "httpx package not installed. "
+                "Install with: pip install httpx"
+            )
+        
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_client_loop is not loop:
+            self._async_client = self._create_async_client()
+            self._async_client_loop = loop
+        
+        return self._async_client
+    
+    def _create_async_client(self) -> "httpx.AsyncClient":
+        """Create a new async HTTP client for this provider.
+        
+        Returns:
+            httpx.AsyncClient instance
+        """
+        return httpx.AsyncClient(
+            timeout=getattr(self, 'timeout', 30),
+            limits=self._httpx_limits()
+        )
+    
+    def _httpx_limits(self) -> "httpx.Limits":
+        """Build httpx connection limits from the provider configuration.
+        
+        Returns:
+            httpx.Limits instance
+        """
+        return httpx.Limits(
+            max_connections=self.config.get('max_connections', self.DEFAULT_MAX_CONNECTIONS),
+            max_keepalive_connections=self.config.get(
+                'max_keepalive_connections', self.DEFAULT_MAX_KEEPALIVE_CONNECTIONS
+            )
+        )
+    
+    def _get_session(self) -> "requests.Session":
+        """Get the pooled keep-alive HTTP session for this provider.
+        
+        The session is created on first use and reused by every call - including
+        concurrent calls from reviewer worker threads - so connections and TLS
+        sessions are not re-established per request.
+        
+        Returns:
+            requests.Session instance
+            
+        Raises:
+            ImportError: If requests is not installed
+        """
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = self._create_session()
+        return self._session
+    
+    def _create_session(self) -> "requests.Session":
+        """Create a requests.Session with a sized connection pool.
+        
+        Returns:
+            requests.Session instance
+        """
+        if not REQUESTS_AVAILABLE:
+            raise ImportError(
+                "requests package not installed. "
+                "Install with: pip install requests"
+            )
+        
+        adapter = HTTPAdapter(
+            pool_connections=self.config.get('pool_connections', self.DEFAULT_POOL_CONNECTIONS),
+            pool_maxsize=self.config.get('pool_maxsize', self.DEFAULT_POOL_MAXSIZE),
+            pool_block=self.config.get('pool_block', False)
+        )
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+    
+    def close(self) -> None:
+        """Release pooled HTTP connections held by this provider.
+        
+        Safe to call more than once. An async client bound to a running event
+        loop should be closed with aclose() from that loop instead.
+        """
+        session = self._session
+        self._session = None
+        if session is not None:
+            session.close()
+        
+        client = getattr(self, 'client', None)
+        if client is not None and HTTPX_AVAILABLE and isinstance(client, httpx.Client):
+            client.close()
+        
+        self._async_client = None
+        self._async_client_loop = None
+    
+    def __enter__(self) -> "BaseLLMProvider":
+        """Enter a context that closes the provider's connections on exit."""
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """Close the provider's connections."""
+        self.close()
+    
+    def __del__(self):
+        """Close pooled connections when the provider is garbage collected."""
+        try:
+            self.close()
+        except Exception:
+            pass
+    
+    async def aclose(self) -> None:
+        """Close the async HTTP client if it was created on the running loop."""
+        client = self._async_client
+        if client is not None and self._async_client_loop is asyncio.get_running_loop():
+            await client.aclose()
+        self._async_client = None
+        self._async_client_loop = None
@@ -0,0 +1,447 @@
+"""Content-addressed response cache wrapping any LLM provider."""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional, Dict, Any, Iterator
+
+from app.llm.base_provider import BaseLLMProvider
+
+
+class ResponseCache:
+    """Thread-safe in-memory LRU cache with per-entry TTL.
+    
+    Entries live only in process memory, so the cache complies with
+    incognito mode: nothing is written to disk and everything is gone
+    when the process exits.
+    """
+    
+    DEFAULT_MAX_ENTRIES = 512
+    DEFAULT_TTL = 3600  # seconds
+    
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl: Optional[float] = DEFAULT_TTL):
+        """Initialize the cache.
+        
+        Args:
+            max_entries: Maximum number of cached responses before the least
+                recently used entry is evicted
+            ttl: Seconds an entry stays valid (None disables expiry)
+        
+        Raises:
+            ValueError: If max_entries is less than 1
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[str]:
+        """Look up a cached response.
+        
+        Args:
+            key: Cache key
+        
+        Returns:
+            Cached response, or None on a miss or expired entry
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return None
+    
+    def set(self, key: str, value: str) -> None:
+        """Store a response.
+        
+        Args:
+            key: Cache key
+            value: Response text
+        """
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def clear(self) -> None:
+        """Remove all entries and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics.
+        
+        Returns:
+            Dictionary with hits, misses, evictions, size and hit_rate
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._entries),
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+
+class SQLiteResponseCache(ResponseCache):
+    """Response cache backed by a SQLite file.
+    
+    Opt-in only. Incognito mode forbids persisting session data, so the
+    database path should live in the session temp folder
+    (see app.utils.file_utils.create_session_temp_folder) and is removed
+    with it. Only the hashed key and the response text are stored - never
+    prompts or API keys.
+    """
+    
+    def __init__(self, path: str, max_entries: int = ResponseCache.DEFAULT_MAX_ENTRIES,
+                 ttl: Optional[float] = ResponseCache.DEFAULT_TTL):
+        """Initialize the cache.
+        
+        Args:
+            path: Path to the SQLite database file
+            max_entries: Maximum number of cached responses
+            ttl: Seconds an entry stays valid (None disables expiry)
+        """
+        super().__init__(max_entries=max_entries, ttl=ttl)
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "expires_at REAL, last_used REAL NOT NULL)"
+            )
+    
+    def get(self, key: str) -> Optional[str]:
+        """Look up a cached response.
+        
+        Args:
+            key: Cache key
+        
+        Returns:
+            Cached response, or None on a miss or expired entry
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            with self._conn:
+                if row is not None:
+                    value, expires_at = row
+                    if expires_at is None or expires_at > now:
+                        self._conn.execute(
+                            "UPDATE responses SET last_used = ? WHERE key = ?", (now, key)
+                        )
+                        self.hits += 1
+                        return value
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self.misses += 1
+            return None
+    
+    def set(self, key: str, value: str) -> None:
+        """Store a response.
+        
+        Args:
+            key: Cache key
+            value: Response text
+        """
+        now = time.time()
+        expires_at = now + self.ttl if self.ttl is not None else None
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, expires_at, last_used) "
+                "VALUES (?, ?, ?, ?)",
+                (key, value, expires_at, now)
+            )
+            overflow = self._count() - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM responses WHERE key IN ("
+                    "SELECT key FROM responses ORDER BY last_used ASC LIMIT ?)",
+                    (overflow,)
+                )
+                self.evictions += overflow
+    
+    def clear(self) -> None:
+        """Remove all entries and reset counters."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses")
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+    
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+    
+    def _count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return self._count()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics.
+        
+        Returns:
+            Dictionary with hits, misses, evictions, size and hit_rate
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': self._count(),
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+
+_default_cache: Optional[ResponseCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache() -> ResponseCache:
+    """Get the process-wide in-memory response cache.
+    
+    Shared by every provider created with cache=True so that a re-opened
+    session (which builds a fresh provider) still benefits from earlier
+    responses.
+    
+    Returns:
+        Shared ResponseCache instance
+    """
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ResponseCache()
+        return _default_cache
+
+
+class CachingProvider(BaseLLMProvider):
+    """Provider decorator that serves repeated prompts from a cache.
+    
+    Responses are keyed by a SHA-256 digest of the provider name, model,
+    temperature, max_tokens, any other generation parameters and the
+    prompt, so only byte-identical requests are served from the cache.
+    Failed generations are never cached.
+    """
+    
+    def __init__(self, provider: BaseLLMProvider, cache: Optional[ResponseCache] = None):
+        """Initialize the caching wrapper.
+        
+        Args:
+            provider: Provider that performs the real generation
+            cache: Cache backend (defaults to the process-wide in-memory cache)
+        """
+        super().__init__(provider.api_key, **provider.config)
+        self.provider = provider
+        self.cache = cache if cache is not None else get_default_cache()
+    
+    def __getattr__(self, name: str) -> Any:
+        # Expose wrapped provider attributes (model, temperature, ...)
+        if name == 'provider':
+            raise AttributeError(name)
+        return getattr(self.provider, name)
+    
+    def generate_text(self, prompt: str, **kwargs) -> str:
+        """Generate text, returning a cached response when available.
+        
+        Args:
+            prompt: The input prompt
+            **kwargs: Additional generation parameters
+        
+        Returns:
+            Generated (or cached) text string
+        
+        Raises:
+            Exception: If the wrapped provider fails
+        """
+        key = self.cache_key(prompt, **kwargs)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        
+        result = self.provider.generate_text(prompt, **kwargs)
+        self.cache.set(key, result)
+        return result
+    
+    async def agenerate_text(self, prompt: str, **kwargs) -> str:
+        """Generate text asynchronously, returning a cached response when available.
+        
+        Args:
+            prompt: The input prompt
+            **kwargs: Additional generation parameters
+        
+        Returns:
+            Generated (or cached) text string
+        
+        Raises:
+            Exception: If the wrapped provider fails
+        """
+        key = self.cache_key(prompt, **kwargs)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        
+        result = await self.provider.agenerate_text(prompt, **kwargs)
+        self.cache.set(key, result)
+        return result
+    
+    def stream_text(self, prompt: str, **kwargs) -> Iterator[str]:
+        """Stream text, replaying a cached response as a single chunk.
+        
+        On a miss the wrapped provider's chunks are passed through and the
+        joined text is cached once the stream completes.
+        
+        Args:
+            prompt: The input prompt
+            **kwargs: Additional generation parameters
+            
+        Yields:
+            Text chunks
+            
+        Raises:
+            Exception: If the wrapped provider fails
+        """
+        key = self.cache_key(prompt, **kwargs)
+        cached = self.cache.get(key)
+        if cached is not None:
+            yield cached
+            return
+        
+        chunks = []
+        for chunk in self.provider.stream_text(prompt, **kwargs):
+            chunks.append(chunk)
+            yield chunk
+        self.cache.set(key, "".join(chunks))
+    
+    def cache_key(self, prompt: str, **kwargs) -> str:
+        """Compute the content-addressed cache key for a request.
+        
+        Model, temperature and max_tokens fall back to the wrapped provider's
+        defaults so that explicit and implicit defaults share an entry.
+        Requests made with fail_on_truncation are keyed without max_tokens.
+        
+        The key also covers the endpoint, the agent (Agentforce) and the
+        credential, so a shared cache never answers one account, server or
+        agent with another's response. Credentials only enter the key hashed.
+        
+        Args:
+            prompt: The input prompt
+            **kwargs: Generation parameters
+        
+        Returns:
+            Hex SHA-256 digest
+        """
+        # The prefix is part of the prompt already; it only steers provider caching
+        params = {key: value for key, value in kwargs.items() if key not in ('cacheable_prefix', 'fail_on_truncation')}
+        params['model'] = kwargs.get('model', getattr(self.provider, 'model', None))
+        params['temperature'] = kwargs.get('temperature', getattr(self.provider, 'temperature', None))
+        if kwargs.get('fail_on_truncation'):
+            # A response checked for truncation is complete whatever its
+            # budget, so measured budgets don't split the cache
+            params.pop('max_tokens', None)
+        else:
+            params['max_tokens'] = kwargs.get('max_tokens', self._default_max_tokens())
+        
+        material = json.dumps(
+            {
+                'provider': self.provider.get_provider_name(),
+                'endpoint': self._endpoint(),
+                'agent_id': getattr(self.provider, 'agent_id', None),
+                'credential': self._credential_hash(),
+                'params': params,
+                'prompt': prompt,
+            },
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+    
+    def _endpoint(self) -> Optional[str]:
+        """Get the base URL the wrapped provider sends requests to."""
+        for attr in ('api_base', 'instance_url', 'API_BASE', 'API_BASE_URL'):
+            value = getattr(self.provider, attr, None)
+            if value:
+                return value
+        return None
+    
+    def _credential_hash(self) -> str:
+        """Hash the wrapped provider's credentials (API key, or OAuth client/user)."""
+        credentials = [getattr(self.provider, attr, None) for attr in ('api_key', 'client_id', 'username')]
+        return hashlib.sha256(json.dumps(credentials, default=str).encode('utf-8')).hexdigest()
+    
+    def _default_max_tokens(self) -> Optional[int]:
+        """Get the wrapped provider's default max token setting."""
+        for attr in ('max_tokens_default', 'max_new_tokens', 'max_tokens'):
+            value = getattr(self.provider, attr, None)
+            if value is not None:
+                return value
+        return None
+    
+    def list_models(self) -> List[str]:
+        """List available models of the wrapped provider.
+        
+        Returns:
+            List of model names/identifiers
+        """
+        return self.provider.list_models()
+    
+    def validate_connection(self) -> bool:
+        """Validate the wrapped provider's connection.
+        
+        Returns:
+            True if connection is valid, False otherwise
+        """
+        return self.provider.validate_connection()
+    
+    def get_provider_name(self) -> str:
+        """Get the name of the wrapped provider.
+        
+        Returns:
+            Provider name string
+        """
+        return self.provider.get_provider_name()
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get hit/miss statistics of the underlying cache.
+        
+        Returns:
+            Cache statistics dictionary
+        """
+        return self.cache.get_stats()
+    
+    def close(self) -> None:
+        """Release the wrapped provider's connections."""
+        if 'provider' in self.__dict__:
+            self.provider.close()
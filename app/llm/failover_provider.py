@@ -0,0 +1,420 @@
+"""Provider chain that fails over between LLM providers behind circuit breakers."""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from app.llm.base_provider import BaseLLMProvider, TruncatedResponseError
+
+
+class CircuitBreaker:
+    """Per-provider circuit breaker driven by error rate and latency.
+    
+    CLOSED: calls flow normally while outcomes are recorded in a rolling
+    window. The circuit OPENs after failure_threshold consecutive failures,
+    or once the window holds at least min_calls outcomes and the error rate
+    reaches error_rate_threshold. Calls slower than slow_call_threshold count
+    as failures, so a provider that still answers but has degraded is routed
+    around as well.
+    
+    OPEN: calls are rejected immediately until reset_timeout has elapsed,
+    then the circuit goes HALF_OPEN.
+    
+    HALF_OPEN: a single probe call is let through. Success closes the
+    circuit with a fresh window; failure opens it again.
+    """
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    DEFAULT_FAILURE_THRESHOLD = 3
+    DEFAULT_ERROR_RATE_THRESHOLD = 0.5
+    DEFAULT_WINDOW_SIZE = 20
+    DEFAULT_MIN_CALLS = 10
+    DEFAULT_RESET_TIMEOUT = 30.0  # seconds
+    
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        error_rate_threshold: float = DEFAULT_ERROR_RATE_THRESHOLD,
+        window_size: int = DEFAULT_WINDOW_SIZE,
+        min_calls: int = DEFAULT_MIN_CALLS,
+        reset_timeout: float = DEFAULT_RESET_TIMEOUT,
+        slow_call_threshold: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """Initialize a closed circuit.
+        
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            error_rate_threshold: Failure ratio in the window that opens the circuit
+            window_size: Number of recent calls kept for the error rate
+            min_calls: Calls required in the window before the error rate applies
+            reset_timeout: Seconds the circuit stays open before probing
+            slow_call_threshold: Latency in seconds above which a successful
+                call counts as a failure (None = latency never trips the circuit)
+            clock: Monotonic clock function (injectable for tests)
+        
+        Raises:
+            ValueError: If a threshold is out of range
+        """
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be at least 1")
+        if not 0 < error_rate_threshold <= 1:
+            raise ValueError("error_rate_threshold must be in (0, 1]")
+        if window_size < 1 or min_calls < 1:
+            raise ValueError("window_size and min_calls must be at least 1")
+        
+        self.failure_threshold = failure_threshold
+        self.error_rate_threshold = error_rate_threshold
+        self.min_calls = min_calls
+        self.reset_timeout = reset_timeout
+        self.slow_call_threshold = slow_call_threshold
+        self._clock = clock
+        self._lock = threading.Lock()
+        
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._window: "deque[bool]" = deque(maxlen=window_size)
+        self._consecutive_failures = 0
+        
+        self.calls = 0
+        self.failures = 0
+        self.rejected = 0
+        self.times_opened = 0
+        self.total_latency = 0.0
+    
+    @property
+    def state(self) -> str:
+        """Current circuit state (CLOSED, OPEN or HALF_OPEN)."""
+        with self._lock:
+            return self._current_state()
+    
+    def _current_state(self) -> str:
+        """Resolve an expired OPEN state to HALF_OPEN (lock held)."""
+        if self._state == self.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+    
+    def allow_request(self) -> bool:
+        """Check whether a call may be sent to the provider.
+        
+        In HALF_OPEN state only the first caller is admitted as the probe;
+        it must report its outcome via record_success/record_failure.
+        
+        Returns:
+            True if the call may proceed
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self.rejected += 1
+            return False
+    
+    def record_success(self, latency: float) -> None:
+        """Record a completed call.
+        
+        Args:
+            latency: Call duration in seconds
+        """
+        if self.slow_call_threshold is not None and latency > self.slow_call_threshold:
+            self.record_failure(latency)
+            return
+        
+        with self._lock:
+            self._record(latency, failed=False)
+            self._consecutive_failures = 0
+            if self._state == self.HALF_OPEN:
+                # Probe succeeded - start over with a clean window
+                self._state = self.CLOSED
+                self._probe_in_flight = False
+                self._window.clear()
+    
+    def record_failure(self, latency: float) -> None:
+        """Record a failed (or too slow) call.
+        
+        Args:
+            latency: Call duration in seconds
+        """
+        with self._lock:
+            self._record(latency, failed=True)
+            self._consecutive_failures += 1
+            
+            if self._state == self.HALF_OPEN:
+                self._open()
+            elif self._state == self.CLOSED and self._should_open():
+                self._open()
+    
+    def _record(self, latency: float, failed: bool) -> None:
+        """Update counters and the rolling window (lock held)."""
+        self.calls += 1
+        self.total_latency += latency
+        if failed:
+            self.failures += 1
+        self._window.append(failed)
+    
+    def _error_rate(self) -> float:
+        """Failure ratio in the rolling window (lock held)."""
+        if not self._window:
+            return 0.0
+        return sum(self._window) / len(self._window)
+    
+    def _should_open(self) -> bool:
+        """Check the trip conditions (lock held)."""
+        if self._consecutive_failures >= self.failure_threshold:
+            return True
+        return len(self._window) >= self.min_calls and self._error_rate() >= self.error_rate_threshold
+    
+    def _open(self) -> None:
+        """Open the circuit (lock held)."""
+        self._state = self.OPEN
+        self._opened_at = self._clock()
+        self._probe_in_flight = False
+        self.times_opened += 1
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get circuit statistics.
+        
+        Returns:
+            Dictionary with state, calls, failures, rejected, times_opened,
+            error_rate (rolling window) and avg_latency
+        """
+        with self._lock:
+            return {
+                'state': self._current_state(),
+                'calls': self.calls,
+                'failures': self.failures,
+                'rejected': self.rejected,
+                'times_opened': self.times_opened,
+                'error_rate': self._error_rate(),
+                'avg_latency': self.total_latency / self.calls if self.calls else 0.0,
+            }
+
+
+class FailoverProvider(BaseLLMProvider):
+    """Provider that routes each call to the first healthy provider in a chain.
+    
+    Providers are tried in order (e.g. Anthropic, then OpenAI, then Ollama).
+    Each has its own CircuitBreaker: once a provider keeps failing, its
+    circuit opens and calls skip straight to the next provider instead of
+    waiting through its retries and timeouts again. After the reset timeout
+    a single probe call checks whether it has recovered.
+    
+    A per-call 'model' parameter only applies to the first provider, since
+    model names are provider-specific; fallbacks use their own defaults.
+    TruncatedResponseError is passed to the caller without failing over.
+    """
+    
+    def __init__(
+        self,
+        providers: List[BaseLLMProvider],
+        clock: Callable[[], float] = time.monotonic,
+        **breaker_kwargs
+    ):
+        """Initialize the failover chain.
+        
+        Args:
+            providers: Providers in order of preference
+            clock: Monotonic clock used for latency and circuit timing
+            **breaker_kwargs: CircuitBreaker settings applied to every provider
+                (failure_threshold, error_rate_threshold, window_size,
+                min_calls, reset_timeout, slow_call_threshold)
+        
+        Raises:
+            ValueError: If no providers are given
+        """
+        if not providers:
+            raise ValueError("FailoverProvider requires at least one provider")
+        
+        primary = providers[0]
+        super().__init__(primary.api_key, **primary.config)
+        self.providers = list(providers)
+        self.breakers = [CircuitBreaker(clock=clock, **breaker_kwargs) for _ in self.providers]
+        self._clock = clock
+    
+    def __getattr__(self, name: str) -> Any:
+        # Expose the primary provider's attributes (model, temperature, ...)
+        if name == 'providers':
+            raise AttributeError(name)
+        return getattr(self.providers[0], name)
+    
+    def _available(self, errors: List[str]) -> Iterator[Tuple[int, BaseLLMProvider, CircuitBreaker]]:
+        """Yield providers whose circuit admits a call, noting skipped ones."""
+        for index, (provider, breaker) in enumerate(zip(self.providers, self.breakers)):
+            if breaker.allow_request():
+                yield index, provider, breaker
+            else:
+                errors.append(f"{provider.get_provider_name()}: circuit open")
+    
+    @staticmethod
+    def _call_kwargs(index: int, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Drop the provider-specific model override for fallback providers."""
+        if index == 0 or 'model' not in kwargs:
+            return kwargs
+        return {key: value for key, value in kwargs.items() if key != 'model'}
+    
+    def _record_failure(
+        self,
+        provider: BaseLLMProvider,
+        breaker: CircuitBreaker,
+        started: float,
+        error: Exception,
+        errors: List[str]
+    ) -> None:
+        """Record a failed call and note it for the final error."""
+        breaker.record_failure(self._clock() - started)
+        name = provider.get_provider_name()
+        errors.append(f"{name}: {error}")
+        print(f"[Failover] {name} failed ({error}), trying next provider")
+    
+    @staticmethod
+    def _exhausted(errors: List[str]) -> Exception:
+        """Build the error raised when no provider could serve the call."""
+        return Exception("All providers failed: " + "; ".join(errors))
+    
+    def generate_text(self, prompt: str, **kwargs) -> str:
+        """Generate text with the first healthy provider that succeeds.
+        
+        Args:
+            prompt: The input prompt
+            **kwargs: Additional generation parameters
+        
+        Returns:
+            Generated text string
+        
+        Raises:
+            Exception: If every provider failed or has an open circuit
+        """
+        errors = []
+        for index, provider, breaker in self._available(errors):
+            started = self._clock()
+            try:
+                result = provider.generate_text(prompt, **self._call_kwargs(index, kwargs))
+            except TruncatedResponseError:
+                # The provider answered; the caller decides on a larger budget
+                breaker.record_success(self._clock() - started)
+                raise
+            except Exception as e:
+                self._record_failure(provider, breaker, started, e, errors)
+                continue
+            breaker.record_success(self._clock() - started)
+            return result
+        
+        raise self._exhausted(errors)
+    
+    async def agenerate_text(self, prompt: str, **kwargs) -> str:
+        """Generate text asynchronously with the first healthy provider that succeeds.
+        
+        Args:
+            prompt: The input prompt
+            **kwargs: Additional generation parameters
+        
+        Returns:
+            Generated text string
+        
+        Raises:
+            Exception: If every provider failed or has an open circuit
+        """
+        errors = []
+        for index, provider, breaker in self._available(errors):
+            started = self._clock()
+            try:
+                result = await provider.agenerate_text(prompt, **self._call_kwargs(index, kwargs))
+            except TruncatedResponseError:
+                # The provider answered; the caller decides on a larger budget
+                breaker.record_success(self._clock() - started)
+                raise
+            except Exception as e:
+                self._record_failure(provider, breaker, started, e, errors)
+                continue
+            breaker.record_success(self._clock() - started)
+            return result
+        
+        raise self._exhausted(errors)
+    
+    def stream_text(self, prompt: str, **kwargs) -> Iterator[str]:
+        """Stream text from the first healthy provider that succeeds.
+        
+        Fails over only before the first chunk; once output has been
+        yielded, errors propagate to the caller.
+        
+        Args:
+            prompt: The input prompt
+            **kwargs: Additional generation parameters
+        
+        Yields:
+            Text chunks
+        
+        Raises:
+            Exception: If every provider failed or has an open circuit
+        """
+        errors = []
+        for index, provider, breaker in self._available(errors):
+            started = self._clock()
+            yielded = False
+            try:
+                for chunk in provider.stream_text(prompt, **self._call_kwargs(index, kwargs)):
+                    yielded = True
+                    yield chunk
+            except GeneratorExit:
+                # Consumer stopped early - the provider itself was fine
+                breaker.record_success(self._clock() - started)
+                raise
+            except Exception as e:
+                self._record_failure(provider, breaker, started, e, errors)
+                if yielded:
+                    raise
+                continue
+            breaker.record_success(self._clock() - started)
+            return
+        
+        raise self._exhausted(errors)
+    
+    def list_models(self) -> List[str]:
+        """List available models of the primary provider.
+        
+        Returns:
+            List of model names/identifiers
+        """
+        return self.providers[0].list_models()
+    
+    def validate_connection(self) -> bool:
+        """Check whether any provider in the chain is reachable.
+        
+        Returns:
+            True if at least one provider validates, False otherwise
+        """
+        return any(provider.validate_connection() for provider in self.providers)
+    
+    def get_provider_name(self) -> str:
+        """Get the name of this provider.
+        
+        Returns:
+            'failover' followed by the chain, e.g. 'failover(anthropic>openai)'
+        """
+        chain = ">".join(provider.get_provider_name() for provider in self.providers)
+        return f"failover({chain})"
+    
+    def get_health(self) -> Dict[str, Dict[str, Any]]:
+        """Get circuit statistics for every provider in the chain.
+        
+        Returns:
+            Dictionary mapping provider name to its circuit statistics
+        """
+        return {
+            provider.get_provider_name(): breaker.get_stats()
+            for provider, breaker in zip(self.providers, self.breakers)
+        }
+    
+    def close(self) -> None:
+        """Release the connection pools of every provider in the chain."""
+        for provider in self.__dict__.get('providers', []):
+            provider.close()
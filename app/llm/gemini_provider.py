@@ -1,9 +1,9 @@
 """Google Gemini LLM provider implementation."""
 
-import time
 import json
-from typing import List, Optional, Dict, Any
-from app.llm.base_provider import BaseLLMProvider
+from typing import List, Optional, Dict, Any, Tuple, Iterator
+from app.llm.base_provider import BaseLLMProvider, TruncatedResponseError
+from app.llm.retry_policy import parse_duration, parse_retry_after
 
 try:
     import httpx
@@ -35,6 +35,10 @@ class GeminiProvider(BaseLLMProvider):
     DEFAULT_TIMEOUT = 30
     MAX_RETRIES = 3
     RETRY_DELAY = 1
+    DEFAULT_RPM = 15  # Free tier request quota, enforced client-side
+    # Gemini 2.5 uses ~1500 tokens for "thinking" out of maxOutputTokens, so
+    # smaller budgets end in MAX_TOKENS with no output
+    MIN_OUTPUT_TOKENS = 3000
     
     AVAILABLE_MODELS = [
         "gemini-2.5-flash",       # FREE - Latest, fast, good for most tasks
@@ -55,6 +59,9 @@ class GeminiProvider(BaseLLMProvider):
                 - max_retries: Maximum number of retries
                 - temperature: Default temperature
                 - max_tokens: Default max tokens (called max_output_tokens in Gemini)
+                - min_output_tokens: Floor applied to every request's max
+                  tokens (default MIN_OUTPUT_TOKENS; lower it for models
+                  without thinking)
         
         Raises:
             ValueError: If API key is missing
@@ -78,9 +85,10 @@ class GeminiProvider(BaseLLMProvider):
         self.temperature = kwargs.get('temperature', 0.7)
         # Gemini 2.5 uses ~1500 tokens for "thinking", so we need more total tokens
         self.max_output_tokens = kwargs.get('max_tokens', 4000)
+        self.min_output_tokens = kwargs.get('min_output_tokens', self.MIN_OUTPUT_TOKENS)
         
         # Initialize HTTP client
-        self.client = httpx.Client(timeout=self.timeout)
+        self.client = httpx.Client(timeout=self.timeout, limits=self._httpx_limits())
     
     def generate_text(self, prompt: str, **kwargs) -> str:
         """Generate text from a prompt using Gemini REST API v1.
@@ -98,13 +106,179 @@ class GeminiProvider(BaseLLMProvider):
         Raises:
             Exception: If generation fails after all retries
         """
+        url, payload, model_name = self._build_request(prompt, **kwargs)
+        
+        # Retry logic
+        retry = self._begin_retry()
+        last_exception = None
+        for _ in range(self.max_retries):
+            try:
+                # Wait for the shared rate limiter, then make POST request
+                self._acquire_rate_limit(prompt)
+                response = self.client.post(
+                    url,
+                    json=payload,
+                    headers={"Content-Type": "application/json"}
+                )
+                
+                return self._handle_generate_response(
+                    response,
+                    model_name,
+                    fail_on_truncation=kwargs.get('fail_on_truncation', False),
+                    max_tokens=payload["generationConfig"]["maxOutputTokens"]
+                )
+            
+            except (ValueError, TruncatedResponseError) as e:
+                # Don't retry for 404, invalid model or truncation errors
+                raise e
+            
+            except Exception as e:
+                last_exception, retryable = self._classify_generate_error(e)
+                if not retryable or not retry.wait(getattr(e, 'retry_after', None)):
+                    break
+        
+        # All retries failed
+        raise last_exception or Exception("Failed to generate text with Gemini")
+    
+    async def agenerate_text(self, prompt: str, **kwargs) -> str:
+        """Generate text from a prompt using Gemini REST API v1 without blocking.
+        
+        Uses a native httpx.AsyncClient; rate-limit backoff is awaited
+        instead of blocking a thread.
+        
+        Args:
+            prompt: The input prompt
+            **kwargs: Same parameters as generate_text
+                
+        Returns:
+            Generated text string
+            
+        Raises:
+            Exception: If generation fails after all retries
+        """
+        url, payload, model_name = self._build_request(prompt, **kwargs)
+        client = self._get_async_client()
+        
+        # Retry logic
+        retry = self._begin_retry()
+        last_exception = None
+        for _ in range(self.max_retries):
+            try:
+                await self._aacquire_rate_limit(prompt)
+                response = await client.post(
+                    url,
+                    json=payload,
+                    headers={"Content-Type": "application/json"}
+                )
+                
+                return self._handle_generate_response(
+                    response,
+                    model_name,
+                    fail_on_truncation=kwargs.get('fail_on_truncation', False),
+                    max_tokens=payload["generationConfig"]["maxOutputTokens"]
+                )
+            
+            except (ValueError, TruncatedResponseError) as e:
+                # Don't retry for 404, invalid model or truncation errors
+                raise e
+            
+            except Exception as e:
+                last_exception, retryable = self._classify_generate_error(e)
+                if not retryable or not await retry.await_wait(getattr(e, 'retry_after', None)):
+                    break
+        
+        # All retries failed
+        raise last_exception or Exception("Failed to generate text with Gemini")
+    
+    def stream_text(self, prompt: str, **kwargs) -> Iterator[str]:
+        """Generate text from a prompt, yielding chunks via streamGenerateContent.
+        
+        Failed attempts are retried like generate_text as long as no output
+        has been yielded yet.
+        
+        Args:
+            prompt: The input prompt
+            **kwargs: Same parameters as generate_text
+            
+        Yields:
+            Text chunks as they arrive
+            
+        Raises:
+            Exception: If streaming fails after all retries
+        """
+        url, payload, model_name = self._build_request(prompt, **kwargs)
+        url = url.replace(":generateContent?", ":streamGenerateContent?alt=sse&", 1)
+        
+        # Retry logic
+        retry = self._begin_retry()
+        last_exception = None
+        for _ in range(self.max_retries):
+            yielded = False
+            try:
+                self._acquire_rate_limit(prompt)
+                with self.client.stream(
+                    "POST",
+                    url,
+                    json=payload,
+                    headers={"Content-Type": "application/json"}
+                ) as response:
+                    if response.status_code != 200:
+                        # Raises the same errors as a non-streaming request
+                        response.read()
+                        self._handle_generate_response(
+                            response, model_name, max_tokens=payload["generationConfig"]["maxOutputTokens"]
+                        )
+                    
+                    finish_reason = None
+                    for data in self._iter_sse_data(response.iter_lines()):
+                        chunk = json.loads(data)
+                        candidate = (chunk.get("candidates") or [{}])[0]
+                        finish_reason = candidate.get("finishReason", finish_reason)
+                        
+                        for part in candidate.get("content", {}).get("parts", []):
+                            text = part.get("text")
+                            if text:
+                                yielded = True
+                                yield text
+                    
+                    if not yielded:
+                        raise Exception(
+                            f"Empty text in Gemini response. Finish reason: {finish_reason or 'UNKNOWN'}"
+                        )
+                return
+            
+            except (ValueError, TruncatedResponseError) as e:
+                # Don't retry for 404, invalid model or truncation errors
+                raise e
+            
+            except Exception as e:
+                if yielded:
+                    # Output already delivered - can't transparently retry
+                    raise
+                last_exception, retryable = self._classify_generate_error(e)
+                if not retryable or not retry.wait(getattr(e, 'retry_after', None)):
+                    break
+        
+        # All retries failed
+        raise last_exception or Exception("Failed to stream text with Gemini")
+    
+    def _build_request(self, prompt: str, **kwargs) -> Tuple[str, Dict[str, Any], str]:
+        """Build URL and payload for a generateContent request.
+        
+        Args:
+            prompt: The input prompt
+            **kwargs: Generation overrides (model, temperature, max_tokens,
+                response_schema)
+            
+        Returns:
+            Tuple of (url, payload, model_name)
+        """
         model_name = kwargs.get('model', self.model)
         temperature = kwargs.get('temperature', self.temperature)
         requested_tokens = kwargs.get('max_tokens', self.max_output_tokens)
         
-        # Gemini 2.5 uses ~1500 tokens for "thinking", so enforce minimum
-        # to avoid MAX_TOKENS errors with no output
-        max_tokens = max(requested_tokens, 3000)
+        # Leave room for thinking tokens (see MIN_OUTPUT_TOKENS)
+        max_tokens = max(requested_tokens, self.min_output_tokens)
         
         # Debug logging
         print(f"[Gemini] Using model: {model_name}")
@@ -127,110 +301,165 @@ class GeminiProvider(BaseLLMProvider):
             }
         }
         
-        # Retry logic
-        last_exception = None
-        for attempt in range(self.max_retries):
-            try:
-                # Make POST request
-                response = self.client.post(
-                    url,
-                    json=payload,
-                    headers={"Content-Type": "application/json"}
-                )
-                
-                # Handle HTTP errors
-                if response.status_code == 404:
-                    raise ValueError(
-                        f"Model not supported for API v1. "
-                        f"Try gemini-1.5-flash or gemini-1.5-pro. "
-                        f"(Status: 404, Model: {model_name})"
-                    )
-                
-                if response.status_code != 200:
-                    error_detail = response.text
-                    raise Exception(
-                        f"Gemini API error (Status {response.status_code}): {error_detail}"
-                    )
+        # Constrain output to JSON matching the schema
+        response_schema = kwargs.get('response_schema')
+        if response_schema:
+            payload["generationConfig"]["responseMimeType"] = "application/json"
+            payload["generationConfig"]["responseSchema"] = response_schema
+        
+        return url, payload, model_name
+    
+    def _handle_generate_response(
+        self,
+        response: Any,
+        model_name: str,
+        fail_on_truncation: bool = False,
+        max_tokens: Optional[int] = None
+    ) -> str:
+        """Extract text from a generateContent response or raise.
+        
+        Args:
+            response: httpx response
+            model_name: Model used for the request
+            fail_on_truncation: Raise if the response stopped at maxOutputTokens
+            max_tokens: maxOutputTokens actually sent (after min_output_tokens),
+                reported in TruncatedResponseError
+            
+        Returns:
+            Generated text string
+            
+        Raises:
+            ValueError: If the model is not supported (404)
+            TruncatedResponseError: If the response hit maxOutputTokens with no
+                output, or with partial output and fail_on_truncation set
+            Exception: For any other API or format error
+        """
+        # Handle HTTP errors
+        if response.status_code == 404:
+            raise ValueError(
+                f"Model not supported for API v1. "
+                f"Try gemini-1.5-flash or gemini-1.5-pro. "
+                f"(Status: 404, Model: {model_name})"
+            )
+        
+        if response.status_code != 200:
+            error_detail = response.text
+            error = Exception(
+                f"Gemini API error (Status {response.status_code}): {error_detail}"
+            )
+            # Server-requested backoff, honored by the retry policy
+            error.retry_after = self._server_retry_delay(response)
+            raise error
+        
+        # Parse response
+        try:
+            response_data = response.json()
+        except json.JSONDecodeError as e:
+            raise Exception(
+                f"Invalid JSON response from Gemini API. "
+                f"Raw response: {response.text[:500]}"
+            )
+        
+        # Extract text from response
+        try:
+            content = response_data["candidates"][0]["content"]
+            
+            # Check if parts exist (might be missing if MAX_TOKENS hit)
+            if "parts" not in content or not content["parts"]:
+                finish_reason = response_data["candidates"][0].get("finishReason", "UNKNOWN")
                 
-                # Parse response
-                try:
-                    response_data = response.json()
-                except json.JSONDecodeError as e:
-                    raise Exception(
-                        f"Invalid JSON response from Gemini API. "
-                        f"Raw response: {response.text[:500]}"
+                if finish_reason == "MAX_TOKENS":
+                    raise TruncatedResponseError(
+                        f"Gemini response truncated due to MAX_TOKENS limit. "
+                        f"The model used all tokens for thinking/processing. "
+                        f"Try increasing max_tokens (current request may have been too low). "
+                        f"Thinking tokens used: {response_data.get('usageMetadata', {}).get('thoughtsTokenCount', 'unknown')}",
+                        max_tokens=max_tokens
                     )
-                
-                # Extract text from response
-                try:
-                    content = response_data["candidates"][0]["content"]
-                    
-                    # Check if parts exist (might be missing if MAX_TOKENS hit)
-                    if "parts" not in content or not content["parts"]:
-                        finish_reason = response_data["candidates"][0].get("finishReason", "UNKNOWN")
-                        
-                        if finish_reason == "MAX_TOKENS":
-                            raise Exception(
-                                f"Gemini response truncated due to MAX_TOKENS limit. "
-                                f"The model used all tokens for thinking/processing. "
-                                f"Try increasing max_tokens (current request may have been too low). "
-                                f"Thinking tokens used: {response_data.get('usageMetadata', {}).get('thoughtsTokenCount', 'unknown')}"
-                            )
-                        else:
-                            raise Exception(
-                                f"Gemini response has no content parts. Finish reason: {finish_reason}. "
-                                f"Raw response: {json.dumps(response_data, indent=2)[:1000]}"
-                            )
-                    
-                    text = content["parts"][0]["text"]
-                    
-                    if text:
-                        return text
-                    else:
-                        raise Exception("Empty text in Gemini response")
-                
-                except (KeyError, IndexError, TypeError) as e:
+                else:
                     raise Exception(
-                        f"Invalid response format from Gemini API. "
-                        f"Expected structure: candidates[0].content.parts[0].text. "
+                        f"Gemini response has no content parts. Finish reason: {finish_reason}. "
                         f"Raw response: {json.dumps(response_data, indent=2)[:1000]}"
                     )
             
-            except ValueError as e:
-                # Don't retry for 404 or invalid model errors
-                raise e
+            text = content["parts"][0]["text"]
             
-            except Exception as e:
-                error_str = str(e).lower()
-                
-                # Rate limit - retry
-                if 'rate limit' in error_str or 'quota' in error_str or '429' in error_str:
-                    last_exception = Exception(f"Gemini rate limit exceeded: {str(e)}")
-                    if attempt < self.max_retries - 1:
-                        wait_time = self.RETRY_DELAY * (2 ** attempt)
-                        print(f"[Gemini] Rate limited, retrying in {wait_time}s...")
-                        time.sleep(wait_time)
-                        continue
-                
-                # Invalid API key - don't retry
-                elif 'api key' in error_str or 'invalid' in error_str or '401' in error_str or '403' in error_str:
-                    raise ValueError(f"Invalid Gemini API key: {str(e)}")
-                
-                # Server error - retry
-                elif 'server' in error_str or '500' in error_str or '502' in error_str or '503' in error_str:
-                    last_exception = e
-                    if attempt < self.max_retries - 1:
-                        print(f"[Gemini] Server error, retrying...")
-                        time.sleep(self.RETRY_DELAY)
-                        continue
-                
-                # Other error - don't retry
-                else:
-                    last_exception = e
-                    break
+            if text:
+                truncated = response_data["candidates"][0].get("finishReason") == "MAX_TOKENS"
+                return self._check_truncation(text, truncated, fail_on_truncation, max_tokens)
+            else:
+                raise Exception("Empty text in Gemini response")
         
-        # All retries failed
-        raise last_exception or Exception("Failed to generate text with Gemini")
+        except (KeyError, IndexError, TypeError) as e:
+            raise Exception(
+                f"Invalid response format from Gemini API. "
+                f"Expected structure: candidates[0].content.parts[0].text. "
+                f"Raw response: {json.dumps(response_data, indent=2)[:1000]}"
+            )
+    
+    def _server_retry_delay(self, response: Any) -> Optional[float]:
+        """Extract the retry delay requested by a failed Gemini response.
+        
+        Gemini reports it as a google.rpc.RetryInfo detail in the error body
+        (e.g. "retryDelay": "13s"); a Retry-After header is honored as well.
+        
+        Args:
+            response: httpx response with a non-200 status
+            
+        Returns:
+            Delay in seconds, or None if the server did not specify one
+        """
+        delays = []
+        
+        header_delay = parse_retry_after(getattr(response, 'headers', None))
+        if header_delay is not None:
+            delays.append(header_delay)
+        
+        try:
+            details = json.loads(response.text).get("error", {}).get("details", [])
+        except (TypeError, ValueError, AttributeError):
+            details = []
+        
+        for detail in details if isinstance(details, list) else []:
+            retry_delay = detail.get("retryDelay") if isinstance(detail, dict) else None
+            if isinstance(retry_delay, str):
+                body_delay = parse_duration(retry_delay)
+                if body_delay is not None:
+                    delays.append(body_delay)
+        
+        return max(delays) if delays else None
+    
+    def _classify_generate_error(self, error: Exception) -> Tuple[Exception, bool]:
+        """Decide whether a failed generation attempt should be retried.
+        
+        Args:
+            error: Exception raised by the attempt
+            
+        Returns:
+            Tuple of (exception to report, whether the error is retryable);
+            backoff timing is left to the retry policy
+            
+        Raises:
+            ValueError: If the error indicates an invalid API key
+        """
+        error_str = str(error).lower()
+        
+        # Rate limit - retry
+        if 'rate limit' in error_str or 'quota' in error_str or '429' in error_str:
+            print(f"[Gemini] Rate limited, backing off...")
+            return Exception(f"Gemini rate limit exceeded: {str(error)}"), True
+        
+        # Invalid API key - don't retry
+        if 'api key' in error_str or 'invalid' in error_str or '401' in error_str or '403' in error_str:
+            raise ValueError(f"Invalid Gemini API key: {str(error)}")
+        
+        # Server error - retry
+        if 'server' in error_str or '500' in error_str or '502' in error_str or '503' in error_str:
+            print(f"[Gemini] Server error, backing off...")
+            return error, True
+        
+        # Other error - don't retry
+        return error, False
     
     def list_models(self) -> List[str]:
         """List available Gemini models.
@@ -307,6 +536,7 @@ class GeminiProvider(BaseLLMProvider):
                 }
             }
             
+            self._acquire_rate_limit(text)
             response = self.client.post(
                 url,
                 json=payload,
@@ -0,0 +1,335 @@
+"""Hedged requests: duplicate slow calls to cut tail latency."""
+
+import asyncio
+import math
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from app.llm.base_provider import BaseLLMProvider
+from app.llm.rate_limiter import estimate_tokens
+from app.llm.single_flight import no_coalescing
+
+
+class LatencyTracker:
+    """Thread-safe rolling window of call latencies."""
+    
+    DEFAULT_WINDOW_SIZE = 100
+    
+    def __init__(self, window_size: int = DEFAULT_WINDOW_SIZE):
+        """Initialize an empty tracker.
+        
+        Args:
+            window_size: Number of recent latencies kept
+        """
+        self._samples: "deque[float]" = deque(maxlen=window_size)
+        self._lock = threading.Lock()
+    
+    def record(self, latency: float) -> None:
+        """Record one call latency in seconds."""
+        with self._lock:
+            self._samples.append(latency)
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._samples)
+    
+    def percentile(self, q: float) -> Optional[float]:
+        """Get a latency percentile (nearest-rank).
+        
+        Args:
+            q: Percentile as a fraction (0.9 for p90)
+        
+        Returns:
+            Latency in seconds, or None if nothing was recorded yet
+        """
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        rank = max(1, math.ceil(q * len(samples)))
+        return samples[rank - 1]
+
+
+class HedgedProvider(BaseLLMProvider):
+    """Provider decorator that hedges slow calls with a duplicate request.
+    
+    If a call has not answered by the hedge delay - the configured
+    percentile (p90 by default) of recent latencies - the same request is
+    sent again, to the same provider or a secondary one. The first
+    successful response wins and the other request is cancelled. Only the
+    slowest ~10% of calls are duplicated, so the tail is cut at a small
+    extra token cost, which is reported by get_hedge_stats().
+    
+    No call is hedged until min_samples latencies have been observed,
+    unless initial_delay is given. Requests run on the wrapped providers'
+    native async transport (agenerate_text), so cancelling the loser aborts
+    its HTTP request; sync callers are served from a private event loop
+    thread. Streaming calls are passed through without hedging.
+    """
+    
+    DEFAULT_PERCENTILE = 0.9
+    DEFAULT_MIN_SAMPLES = 10
+    
+    def __init__(
+        self,
+        provider: BaseLLMProvider,
+        hedge_provider: Optional[BaseLLMProvider] = None,
+        percentile: float = DEFAULT_PERCENTILE,
+        min_samples: int = DEFAULT_MIN_SAMPLES,
+        initial_delay: Optional[float] = None,
+        latency_tracker: Optional[LatencyTracker] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """Initialize the hedging wrapper.
+        
+        Args:
+            provider: Provider that serves the primary request
+            hedge_provider: Provider for the duplicate request (defaults to provider)
+            percentile: Latency percentile used as the hedge delay (0 < p < 1)
+            min_samples: Latencies required before the percentile is trusted
+            initial_delay: Hedge delay in seconds until min_samples is reached
+                (None = don't hedge until then)
+            latency_tracker: Tracker to share across wrappers (default: own)
+            clock: Monotonic clock function (injectable for tests)
+        
+        Raises:
+            ValueError: If percentile is not between 0 and 1
+        """
+        if not 0 < percentile < 1:
+            raise ValueError("percentile must be between 0 and 1")
+        
+        super().__init__(provider.api_key, **provider.config)
+        self.provider = provider
+        self.hedge_provider = hedge_provider if hedge_provider is not None else provider
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.initial_delay = initial_delay
+        self.latency = latency_tracker if latency_tracker is not None else LatencyTracker()
+        self._clock = clock
+        
+        self._stats_lock = threading.Lock()
+        self.requests = 0
+        self.hedged_requests = 0
+        self.hedge_wins = 0
+        self.extra_prompt_tokens = 0
+        self.extra_output_tokens = 0
+        
+        # Private event loop serving sync callers, started lazily
+        self._loop = None
+        self._loop_thread = None
+        self._loop_lock = threading.Lock()
+    
+    def __getattr__(self, name: str) -> Any:
+        # Expose wrapped provider attributes (model, temperature, ...)
+        if name == 'provider':
+            raise AttributeError(name)
+        return getattr(self.provider, name)
+    
+    def hedge_delay(self) -> Optional[float]:
+        """Get the current hedge delay.
+        
+        Returns:
+            Seconds to wait before hedging, or None to not hedge
+        """
+        if len(self.latency) < self.min_samples:
+            return self.initial_delay
+        return self.latency.percentile(self.percentile)
+    
+    def generate_text(self, prompt: str, **kwargs) -> str:
+        """Generate text, hedging the request if it is slow.
+        
+        Args:
+            prompt: The input prompt
+            **kwargs: Additional generation parameters
+        
+        Returns:
+            Text from whichever request answered first
+        
+        Raises:
+            Exception: If the request (and its hedge, if sent) failed
+        """
+        future = asyncio.run_coroutine_threadsafe(self.agenerate_text(prompt, **kwargs), self._get_loop())
+        return future.result()
+    
+    async def agenerate_text(self, prompt: str, **kwargs) -> str:
+        """Generate text asynchronously, hedging the request if it is slow.
+        
+        Args:
+            prompt: The input prompt
+            **kwargs: Additional generation parameters
+        
+        Returns:
+            Text from whichever request answered first
+        
+        Raises:
+            Exception: If the request (and its hedge, if sent) failed
+        """
+        with self._stats_lock:
+            self.requests += 1
+        
+        delay = self.hedge_delay()
+        started = self._clock()
+        primary = asyncio.ensure_future(self.provider.agenerate_text(prompt, **kwargs))
+        tasks = [primary]
+        
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done:
+                # The hedge must be a real second request, not join the primary
+                with no_coalescing():
+                    hedge = asyncio.ensure_future(self.hedge_provider.agenerate_text(prompt, **self._hedge_kwargs(kwargs)))
+                tasks.append(hedge)
+                with self._stats_lock:
+                    self.hedged_requests += 1
+                    self.extra_prompt_tokens += estimate_tokens(prompt)
+                print(f"[Hedged] No response after {delay:.2f}s, sent hedge request")
+            
+            winner = await self._first_success(tasks)
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+        
+        # Raises if every request failed
+        result = winner.result()
+        
+        if len(tasks) > 1:
+            loser = tasks[1] if winner is primary else primary
+            with self._stats_lock:
+                self.extra_output_tokens += self._loser_output_tokens(loser, result)
+                if winner is not primary:
+                    self.hedge_wins += 1
+        self.latency.record(self._clock() - started)
+        return result
+    
+    @staticmethod
+    def _loser_output_tokens(loser: "asyncio.Future", result: str) -> int:
+        """Estimate the output tokens the losing request was billed for.
+        
+        A loser that finished is counted exactly. A cancelled one was
+        generating a comparable answer, and the server may finish (and bill)
+        it after the client disconnects, so the winner's output stands in.
+        """
+        if loser.done() and not loser.cancelled() and loser.exception() is None:
+            return estimate_tokens(loser.result())
+        if loser.done() and not loser.cancelled():
+            return 0  # Failed: no output
+        return estimate_tokens(result)
+    
+    @staticmethod
+    async def _first_success(tasks: List["asyncio.Future"]) -> "asyncio.Future":
+        """Wait for the first task that succeeds, or the last failure."""
+        pending = set(tasks)
+        failed = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            # Prefer the primary when both finish in the same step
+            for task in sorted(done, key=tasks.index):
+                if task.exception() is None:
+                    return task
+                failed = task
+        return failed
+    
+    def _hedge_kwargs(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Drop the provider-specific model override for a secondary provider."""
+        if self.hedge_provider is self.provider or 'model' not in kwargs:
+            return kwargs
+        return {key: value for key, value in kwargs.items() if key != 'model'}
+    
+    def stream_text(self, prompt: str, **kwargs) -> Iterator[str]:
+        """Stream text from the wrapped provider (not hedged).
+        
+        Args:
+            prompt: The input prompt
+            **kwargs: Additional generation parameters
+        
+        Yields:
+            Text chunks
+        """
+        yield from self.provider.stream_text(prompt, **kwargs)
+    
+    def list_models(self) -> List[str]:
+        """List available models of the wrapped provider.
+        
+        Returns:
+            List of model names/identifiers
+        """
+        return self.provider.list_models()
+    
+    def validate_connection(self) -> bool:
+        """Validate the wrapped provider's connection.
+        
+        Returns:
+            True if connection is valid, False otherwise
+        """
+        return self.provider.validate_connection()
+    
+    def get_provider_name(self) -> str:
+        """Get the name of the wrapped provider.
+        
+        Returns:
+            Provider name string
+        """
+        return self.provider.get_provider_name()
+    
+    def get_hedge_stats(self) -> Dict[str, Any]:
+        """Get hedging statistics, including the extra token cost.
+        
+        Returns:
+            Dictionary with requests, hedged_requests, hedge_wins, hedge_rate,
+            extra_prompt_tokens (estimated input of hedge requests),
+            extra_output_tokens (estimated output of the requests that lost),
+            extra_tokens (their sum) and the current hedge_delay
+        """
+        with self._stats_lock:
+            stats = {
+                'requests': self.requests,
+                'hedged_requests': self.hedged_requests,
+                'hedge_wins': self.hedge_wins,
+                'hedge_rate': self.hedged_requests / self.requests if self.requests else 0.0,
+                'extra_prompt_tokens': self.extra_prompt_tokens,
+                'extra_output_tokens': self.extra_output_tokens,
+                'extra_tokens': self.extra_prompt_tokens + self.extra_output_tokens,
+            }
+        stats['hedge_delay'] = self.hedge_delay()
+        return stats
+    
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        """Get the private event loop, starting its thread if needed."""
+        with self._loop_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="hedged-provider-loop", daemon=True)
+                thread.start()
+                self._loop, self._loop_thread = loop, thread
+            return self._loop
+    
+    def close(self) -> None:
+        """Stop the private event loop.
+        
+        Async clients the wrapped providers created on that loop are closed;
+        the providers themselves are left open since they may be shared.
+        """
+        lock = self.__dict__.get('_loop_lock')
+        if lock is None:
+            return
+        
+        with lock:
+            loop, thread = self._loop, self._loop_thread
+            self._loop = self._loop_thread = None
+        
+        if loop is None:
+            return
+        
+        for provider in {id(p): p for p in (self.provider, self.hedge_provider)}.values():
+            try:
+                asyncio.run_coroutine_threadsafe(provider.aclose(), loop).result(timeout=5)
+            except Exception:
+                pass
+        
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=5)
+        if not thread.is_alive():
+            loop.close()
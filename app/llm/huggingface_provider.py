@@ -1,9 +1,15 @@
 """HuggingFace Inference API provider implementation."""
 
-import time
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 import requests
 from app.llm.base_provider import BaseLLMProvider
+from app.llm.retry_policy import parse_retry_after
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
 
 
 class HuggingFaceProvider(BaseLLMProvider):
@@ -74,31 +80,101 @@ class HuggingFaceProvider(BaseLLMProvider):
         Raises:
             Exception: If generation fails after all retries
         """
-        model = kwargs.get('model', self.model)
-        temperature = kwargs.get('temperature', self.temperature)
-        max_tokens = kwargs.get('max_tokens', self.max_new_tokens)
+        url, headers, payload = self._build_request(prompt, **kwargs)
         
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
+        # Retry logic
+        retry = self._begin_retry()
+        last_exception = None
+        for _ in range(self.max_retries):
+            try:
+                self._acquire_rate_limit(prompt)
+                response = self._get_session().post(
+                    url,
+                    headers=headers,
+                    json=payload,
+                    timeout=self.timeout
+                )
+                
+                if response.status_code == 200:
+                    return self._extract_text(response.json())
+                
+                elif response.status_code == 503:
+                    # Model loading - wait as long as the server estimates and retry
+                    error_data = response.json()
+                    if 'estimated_time' in error_data:
+                        retry_after = min(error_data['estimated_time'], 20)
+                    else:
+                        retry_after = parse_retry_after(response.headers)
+                    
+                    if retry.wait(retry_after):
+                        continue
+                    raise Exception("Model is loading, please try again in a moment")
+                
+                elif response.status_code == 429:
+                    # Rate limit - back off (at least as long as the server asks) and retry
+                    if retry.wait(parse_retry_after(response.headers)):
+                        continue
+                    raise Exception("Rate limit exceeded for HuggingFace API")
+                
+                elif response.status_code == 401:
+                    raise ValueError("Invalid HuggingFace API key")
+                
+                else:
+                    error_msg = response.json().get('error', 'Unknown error')
+                    raise Exception(f"HuggingFace API error: {error_msg}")
+            
+            except requests.exceptions.Timeout:
+                last_exception = Exception(f"Request timeout after {self.timeout}s")
+                if retry.wait():
+                    continue
+                break
+            
+            except requests.exceptions.ConnectionError as e:
+                last_exception = Exception(f"Connection error: {str(e)}")
+                if retry.wait():
+                    continue
+                break
+            
+            except ValueError:
+                # Don't retry on auth errors
+                raise
+            
+            except Exception as e:
+                last_exception = e
+                # Don't retry on unexpected exceptions
+                break
         
-        payload = {
-            "inputs": prompt,
-            "parameters": {
-                "temperature": temperature,
-                "max_new_tokens": max_tokens,
-                "return_full_text": False
-            }
-        }
+        raise last_exception or Exception("Failed to generate text")
+    
+    async def agenerate_text(self, prompt: str, **kwargs) -> str:
+        """Generate text from a prompt using HuggingFace API without blocking.
         
-        url = f"{self.API_BASE}/{model}"
+        Uses a native httpx.AsyncClient; model-loading and retry waits are
+        awaited instead of blocking a thread.
+        
+        Args:
+            prompt: The input prompt
+            **kwargs: Same parameters as generate_text
+                
+        Returns:
+            Generated text string
+            
+        Raises:
+            Exception: If generation fails after all retries
+        """
+        if not HTTPX_AVAILABLE:
+            return await super().agenerate_text(prompt, **kwargs)
+        
+        url, headers, payload = self._build_request(prompt, **kwargs)
+        client = self._get_async_client()
         
         # Retry logic
+        retry = self._begin_retry()
         last_exception = None
-        for attempt in range(self.max_retries):
+        for _ in range(self.max_retries):
             try:
-                response = requests.post(
+                await self._aacquire_rate_limit(prompt)
+                response = await client.post(
                     url,
                     headers=headers,
                     json=payload,
@@ -106,39 +182,23 @@ class HuggingFaceProvider(BaseLLMProvider):
                 )
                 
                 if response.status_code == 200:
-                    data = response.json()
-                    
-                    # Handle different response formats
-                    if isinstance(data, list) and len(data) > 0:
-                        if 'generated_text' in data[0]:
-                            return data[0]['generated_text'].strip()
-                        elif 'text' in data[0]:
-                            return data[0]['text'].strip()
-                    elif isinstance(data, dict):
-                        if 'generated_text' in data:
-                            return data['generated_text'].strip()
-                    
-                    # Fallback
-                    return str(data).strip()
+                    return self._extract_text(response.json())
                 
                 elif response.status_code == 503:
-                    # Model loading - wait and retry
+                    # Model loading - wait as long as the server estimates and retry
                     error_data = response.json()
                     if 'estimated_time' in error_data:
-                        wait_time = min(error_data['estimated_time'], 20)
+                        retry_after = min(error_data['estimated_time'], 20)
                     else:
-                        wait_time = self.RETRY_DELAY * (2 ** attempt)
+                        retry_after = parse_retry_after(response.headers)
                     
-                    if attempt < self.max_retries - 1:
-                        time.sleep(wait_time)
+                    if await retry.await_wait(retry_after):
                         continue
                     raise Exception("Model is loading, please try again in a moment")
                 
                 elif response.status_code == 429:
-                    # Rate limit - wait and retry
-                    wait_time = self.RETRY_DELAY * (2 ** attempt)
-                    if attempt < self.max_retries - 1:
-                        time.sleep(wait_time)
+                    # Rate limit - back off (at least as long as the server asks) and retry
+                    if await retry.await_wait(parse_retry_after(response.headers)):
                         continue
                     raise Exception("Rate limit exceeded for HuggingFace API")
                 
@@ -149,17 +209,17 @@ class HuggingFaceProvider(BaseLLMProvider):
                     error_msg = response.json().get('error', 'Unknown error')
                     raise Exception(f"HuggingFace API error: {error_msg}")
             
-            except requests.exceptions.Timeout:
+            except httpx.TimeoutException:
                 last_exception = Exception(f"Request timeout after {self.timeout}s")
-                if attempt < self.max_retries - 1:
-                    time.sleep(self.RETRY_DELAY)
+                if await retry.await_wait():
                     continue
+                break
             
-            except requests.exceptions.ConnectionError as e:
+            except httpx.TransportError as e:
                 last_exception = Exception(f"Connection error: {str(e)}")
-                if attempt < self.max_retries - 1:
-                    time.sleep(self.RETRY_DELAY)
+                if await retry.await_wait():
                     continue
+                break
             
             except ValueError:
                 # Don't retry on auth errors
@@ -172,6 +232,58 @@ class HuggingFaceProvider(BaseLLMProvider):
         
         raise last_exception or Exception("Failed to generate text")
     
+    def _build_request(self, prompt: str, **kwargs) -> Tuple[str, Dict[str, str], Dict[str, Any]]:
+        """Build URL, headers and payload for an inference request.
+        
+        Args:
+            prompt: The input prompt
+            **kwargs: Generation overrides (model, temperature, max_tokens)
+            
+        Returns:
+            Tuple of (url, headers, payload)
+        """
+        model = kwargs.get('model', self.model)
+        temperature = kwargs.get('temperature', self.temperature)
+        max_tokens = kwargs.get('max_tokens', self.max_new_tokens)
+        
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+        
+        payload = {
+            "inputs": prompt,
+            "parameters": {
+                "temperature": temperature,
+                "max_new_tokens": max_tokens,
+                "return_full_text": False
+            }
+        }
+        
+        return f"{self.API_BASE}/{model}", headers, payload
+    
+    def _extract_text(self, data: Any) -> str:
+        """Extract generated text from an inference response.
+        
+        Args:
+            data: Parsed JSON response (list or dict depending on model)
+            
+        Returns:
+            Generated text string
+        """
+        # Handle different response formats
+        if isinstance(data, list) and len(data) > 0:
+            if 'generated_text' in data[0]:
+                return data[0]['generated_text'].strip()
+            elif 'text' in data[0]:
+                return data[0]['text'].strip()
+        elif isinstance(data, dict):
+            if 'generated_text' in data:
+                return data['generated_text'].strip()
+        
+        # Fallback
+        return str(data).strip()
+    
     def list_models(self) -> List[str]:
         """List available HuggingFace models.
         
@@ -261,7 +373,8 @@ class HuggingFaceProvider(BaseLLMProvider):
         url = f"{self.API_BASE}/{model}"
         
         try:
-            response = requests.post(
+            self._acquire_rate_limit(text)
+            response = self._get_session().post(
                 url,
                 headers=headers,
                 json=payload,
@@ -1,6 +1,7 @@
 """Mock LLM provider for testing."""
 
-from typing import List, Optional
+import re
+from typing import List, Optional, Iterator
 from app.llm.base_provider import BaseLLMProvider
 
 
@@ -65,6 +66,20 @@ class MockLLMProvider(BaseLLMProvider):
         response_index = (self.call_count - 1) % len(responses)
         return responses[response_index]
     
+    def stream_text(self, prompt: str, **kwargs) -> Iterator[str]:
+        """Stream the deterministic mock response word by word.
+        
+        Args:
+            prompt: Input prompt (stored for testing)
+            **kwargs: Ignored for mock provider
+            
+        Yields:
+            Words of the mock response, each with its trailing whitespace
+        """
+        text = self.generate_text(prompt, **kwargs)
+        for match in re.finditer(r'\S+\s*', text):
+            yield match.group(0)
+    
     def list_models(self) -> List[str]:
         """List mock models.
         
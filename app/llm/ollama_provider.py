@@ -1,10 +1,17 @@
 """Ollama local LLM provider implementation."""
 
+import json
 import time
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple, Iterator
 import requests
 from app.llm.base_provider import BaseLLMProvider
 
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
 
 class OllamaProvider(BaseLLMProvider):
     """Ollama local LLM provider - completely free and runs locally.
@@ -76,7 +83,115 @@ class OllamaProvider(BaseLLMProvider):
                 - model: Override default model
                 - temperature: Override default temperature
                 - max_tokens: Override default max tokens
-                - stream: Enable streaming (default: False)
+                - stream: Stream the response from Ollama and join the
+                  chunks (default: False); use stream_text to consume them
+                  incrementally
+                
+        Returns:
+            Generated text string
+            
+        Raises:
+            Exception: If generation fails or Ollama is not running
+        """
+        if kwargs.get('stream', False):
+            return "".join(self.stream_text(prompt, **kwargs)).strip()
+        
+        url, payload = self._build_request(prompt, **kwargs)
+        
+        try:
+            self._acquire_rate_limit(prompt)
+            response = self._get_session().post(
+                url,
+                json=payload,
+                timeout=self.timeout
+            )
+            
+            return self._handle_generate_response(
+                response,
+                payload['model'],
+                fail_on_truncation=kwargs.get('fail_on_truncation', False),
+                max_tokens=payload['options']['num_predict']
+            )
+        
+        except requests.exceptions.ConnectionError:
+            raise Exception(
+                "Cannot connect to Ollama. "
+                "Make sure Ollama is installed and running. "
+                "Download from: https://ollama.com/download"
+            )
+        
+        except requests.exceptions.Timeout:
+            raise Exception(f"Request timeout after {self.timeout}s")
+    
+    def stream_text(self, prompt: str, **kwargs) -> Iterator[str]:
+        """Generate text from a prompt, yielding chunks as Ollama produces them.
+        
+        Ollama streams newline-delimited JSON objects, each carrying the next
+        piece of the response.
+        
+        Args:
+            prompt: The input prompt
+            **kwargs: Same parameters as generate_text
+            
+        Yields:
+            Text chunks as they arrive
+            
+        Raises:
+            Exception: If generation fails or Ollama is not running
+        """
+        kwargs['stream'] = True
+        url, payload = self._build_request(prompt, **kwargs)
+        
+        try:
+            self._acquire_rate_limit(prompt)
+            response = self._get_session().post(
+                url,
+                json=payload,
+                timeout=self.timeout,
+                stream=True
+            )
+        
+        except requests.exceptions.ConnectionError:
+            raise Exception(
+                "Cannot connect to Ollama. "
+                "Make sure Ollama is installed and running. "
+                "Download from: https://ollama.com/download"
+            )
+        
+        except requests.exceptions.Timeout:
+            raise Exception(f"Request timeout after {self.timeout}s")
+        
+        try:
+            if response.status_code != 200:
+                # Raises a descriptive error for 404 and other failures
+                self._handle_generate_response(response, payload['model'])
+            
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                
+                data = json.loads(line)
+                if 'error' in data:
+                    raise Exception(f"Ollama API error: {data['error']}")
+                
+                text = data.get('response', '')
+                if text:
+                    yield text
+                
+                if data.get('done'):
+                    break
+        finally:
+            response.close()
+    
+    async def agenerate_text(self, prompt: str, **kwargs) -> str:
+        """Generate text from a prompt using Ollama without blocking.
+        
+        Uses a native httpx.AsyncClient so that many concurrent calls to a
+        local Ollama server can share one event loop.
+        
+        Args:
+            prompt: The input prompt
+            **kwargs: Same parameters as generate_text
                 
         Returns:
             Generated text string
@@ -84,6 +199,50 @@ class OllamaProvider(BaseLLMProvider):
         Raises:
             Exception: If generation fails or Ollama is not running
         """
+        if not HTTPX_AVAILABLE:
+            return await super().agenerate_text(prompt, **kwargs)
+        
+        # The full text is returned either way, so request it in one piece
+        kwargs.pop('stream', None)
+        url, payload = self._build_request(prompt, **kwargs)
+        client = self._get_async_client()
+        
+        try:
+            await self._aacquire_rate_limit(prompt)
+            response = await client.post(
+                url,
+                json=payload,
+                timeout=self.timeout
+            )
+            
+            return self._handle_generate_response(
+                response,
+                payload['model'],
+                fail_on_truncation=kwargs.get('fail_on_truncation', False),
+                max_tokens=payload['options']['num_predict']
+            )
+        
+        except httpx.ConnectError:
+            raise Exception(
+                "Cannot connect to Ollama. "
+                "Make sure Ollama is installed and running. "
+                "Download from: https://ollama.com/download"
+            )
+        
+        except httpx.TimeoutException:
+            raise Exception(f"Request timeout after {self.timeout}s")
+    
+    def _build_request(self, prompt: str, **kwargs) -> Tuple[str, Dict[str, Any]]:
+        """Build URL and payload for a generate request.
+        
+        Args:
+            prompt: The input prompt
+            **kwargs: Generation overrides (model, temperature, max_tokens, stream,
+                response_schema)
+            
+        Returns:
+            Tuple of (url, payload)
+        """
         model = kwargs.get('model', self.model)
         temperature = kwargs.get('temperature', self.temperature)
         num_predict = kwargs.get('max_tokens', self.num_predict)
@@ -99,38 +258,53 @@ class OllamaProvider(BaseLLMProvider):
             }
         }
         
-        url = f"{self.api_base}/generate"
+        # JSON mode; the schema itself is described in the prompt
+        if kwargs.get('response_schema'):
+            payload["format"] = "json"
         
-        try:
-            response = requests.post(
-                url,
-                json=payload,
-                timeout=self.timeout
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                return data.get('response', '').strip()
+        return f"{self.api_base}/generate", payload
+    
+    def _handle_generate_response(
+        self,
+        response: Any,
+        model: str,
+        fail_on_truncation: bool = False,
+        max_tokens: Optional[int] = None
+    ) -> str:
+        """Turn a generate response into text or raise a descriptive error.
+        
+        Args:
+            response: HTTP response (requests or httpx)
+            model: Model name used for the request
+            fail_on_truncation: Raise if generation stopped at num_predict
+            max_tokens: num_predict of the request
             
-            elif response.status_code == 404:
-                raise Exception(
-                    f"Model '{model}' not found. "
-                    f"Pull it first: ollama pull {model}"
-                )
+        Returns:
+            Generated text string
             
-            else:
-                error_msg = response.json().get('error', 'Unknown error')
-                raise Exception(f"Ollama API error: {error_msg}")
+        Raises:
+            TruncatedResponseError: If done_reason is 'length' and
+                fail_on_truncation is set
+            Exception: If the response indicates an error
+        """
+        if response.status_code == 200:
+            data = response.json()
+            return self._check_truncation(
+                data.get('response', '').strip(),
+                data.get('done_reason') == 'length',
+                fail_on_truncation,
+                max_tokens
+            )
         
-        except requests.exceptions.ConnectionError:
+        elif response.status_code == 404:
             raise Exception(
-                "Cannot connect to Ollama. "
-                "Make sure Ollama is installed and running. "
-                "Download from: https://ollama.com/download"
+                f"Model '{model}' not found. "
+                f"Pull it first: ollama pull {model}"
             )
         
-        except requests.exceptions.Timeout:
-            raise Exception(f"Request timeout after {self.timeout}s")
+        else:
+            error_msg = response.json().get('error', 'Unknown error')
+            raise Exception(f"Ollama API error: {error_msg}")
     
     def list_models(self) -> List[str]:
         """List available Ollama models.
@@ -141,7 +315,7 @@ class OllamaProvider(BaseLLMProvider):
         url = f"{self.api_base}/tags"
         
         try:
-            response = requests.get(url, timeout=5)
+            response = self._get_session().get(url, timeout=5)
             
             if response.status_code == 200:
                 data = response.json()
@@ -170,7 +344,7 @@ class OllamaProvider(BaseLLMProvider):
         url = f"{self.api_base}/tags"
         
         try:
-            response = requests.get(url, timeout=5)
+            response = self._get_session().get(url, timeout=5)
             return response.status_code == 200
         except Exception:
             return False
@@ -204,7 +378,7 @@ class OllamaProvider(BaseLLMProvider):
         }
         
         try:
-            response = requests.post(
+            response = self._get_session().post(
                 url,
                 json=payload,
                 timeout=self.timeout
@@ -244,7 +418,7 @@ class OllamaProvider(BaseLLMProvider):
         }
         
         try:
-            response = requests.post(
+            response = self._get_session().post(
                 url,
                 json=payload,
                 timeout=self.timeout
@@ -300,7 +474,7 @@ class OllamaProvider(BaseLLMProvider):
         url = f"{self.api_base}/version"
         
         try:
-            response = requests.get(url, timeout=5)
+            response = self._get_session().get(url, timeout=5)
             if response.status_code == 200:
                 return response.json().get('version', 'unknown')
         except Exception:
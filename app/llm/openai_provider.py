@@ -1,9 +1,16 @@
 """OpenAI LLM provider implementation."""
 
-import time
-from typing import List, Optional, Dict, Any
+import json
+from typing import List, Optional, Dict, Any, Tuple, Iterator
 import requests
 from app.llm.base_provider import BaseLLMProvider
+from app.llm.retry_policy import parse_retry_after
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
 
 
 class OpenAIProvider(BaseLLMProvider):
@@ -51,7 +58,6 @@ class OpenAIProvider(BaseLLMProvider):
                 - model: Override default model
                 - temperature: Override default temperature
                 - max_tokens: Override default max tokens
-                - stream: Enable streaming (not yet implemented)
                 
         Returns:
             Generated text string
@@ -59,29 +65,98 @@ class OpenAIProvider(BaseLLMProvider):
         Raises:
             Exception: If generation fails after all retries
         """
-        model = kwargs.get('model', self.model)
-        temperature = kwargs.get('temperature', self.temperature)
-        max_tokens = kwargs.get('max_tokens', self.max_tokens_default)
+        headers, payload = self._build_request(prompt, **kwargs)
         
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
+        # Retry logic
+        retry = self._begin_retry()
+        last_exception = None
+        for _ in range(self.max_retries):
+            try:
+                self._acquire_rate_limit(prompt)
+                response = self._get_session().post(
+                    f"{self.API_BASE}/chat/completions",
+                    headers=headers,
+                    json=payload,
+                    timeout=self.timeout
+                )
+                
+                if response.status_code == 200:
+                    return self._extract_text(
+                        response.json(),
+                        fail_on_truncation=kwargs.get('fail_on_truncation', False),
+                        max_tokens=payload['max_tokens']
+                    )
+                
+                elif response.status_code == 429:
+                    # Rate limit - back off (at least as long as the server asks) and retry
+                    last_exception = Exception("OpenAI API rate limit exceeded")
+                    if retry.wait(parse_retry_after(response.headers)):
+                        continue
+                    break
+                
+                elif response.status_code == 401:
+                    raise ValueError("Invalid API key")
+                
+                elif response.status_code >= 500:
+                    # Server error - retry
+                    if retry.wait(parse_retry_after(response.headers)):
+                        continue
+                    raise Exception(f"OpenAI API server error: {response.status_code}")
+                
+                else:
+                    # Client error - don't retry
+                    error_detail = response.json().get('error', {}).get('message', 'Unknown error')
+                    raise Exception(f"OpenAI API error: {error_detail}")
+            
+            except requests.exceptions.Timeout:
+                last_exception = Exception(f"Request timeout after {self.timeout}s")
+                if retry.wait():
+                    continue
+                break
+            
+            except requests.exceptions.ConnectionError as e:
+                last_exception = Exception(f"Connection error: {str(e)}")
+                if retry.wait():
+                    continue
+                break
+            
+            except Exception as e:
+                last_exception = e
+                # Don't retry on unexpected exceptions
+                break
         
-        payload = {
-            "model": model,
-            "messages": [
-                {"role": "user", "content": prompt}
-            ],
-            "temperature": temperature,
-            "max_tokens": max_tokens
-        }
+        # If we get here, all retries failed
+        raise last_exception or Exception("Failed to generate text")
+    
+    async def agenerate_text(self, prompt: str, **kwargs) -> str:
+        """Generate text from a prompt using OpenAI API without blocking.
+        
+        Uses a native httpx.AsyncClient; retry backoff awaits asyncio.sleep
+        instead of blocking a thread.
+        
+        Args:
+            prompt: The input prompt
+            **kwargs: Same parameters as generate_text
+                
+        Returns:
+            Generated text string
+            
+        Raises:
+            Exception: If generation fails after all retries
+        """
+        if not HTTPX_AVAILABLE:
+            return await super().agenerate_text(prompt, **kwargs)
+        
+        headers, payload = self._build_request(prompt, **kwargs)
+        client = self._get_async_client()
         
         # Retry logic
+        retry = self._begin_retry()
         last_exception = None
-        for attempt in range(self.max_retries):
+        for _ in range(self.max_retries):
             try:
-                response = requests.post(
+                await self._aacquire_rate_limit(prompt)
+                response = await client.post(
                     f"{self.API_BASE}/chat/completions",
                     headers=headers,
                     json=payload,
@@ -89,22 +164,129 @@ class OpenAIProvider(BaseLLMProvider):
                 )
                 
                 if response.status_code == 200:
-                    data = response.json()
-                    return data['choices'][0]['message']['content']
+                    return self._extract_text(
+                        response.json(),
+                        fail_on_truncation=kwargs.get('fail_on_truncation', False),
+                        max_tokens=payload['max_tokens']
+                    )
                 
                 elif response.status_code == 429:
-                    # Rate limit - wait and retry
-                    wait_time = self.RETRY_DELAY * (2 ** attempt)
-                    time.sleep(wait_time)
+                    # Rate limit - back off (at least as long as the server asks) and retry
+                    last_exception = Exception("OpenAI API rate limit exceeded")
+                    if await retry.await_wait(parse_retry_after(response.headers)):
+                        continue
+                    break
+                
+                elif response.status_code == 401:
+                    raise ValueError("Invalid API key")
+                
+                elif response.status_code >= 500:
+                    # Server error - retry
+                    if await retry.await_wait(parse_retry_after(response.headers)):
+                        continue
+                    raise Exception(f"OpenAI API server error: {response.status_code}")
+                
+                else:
+                    # Client error - don't retry
+                    error_detail = response.json().get('error', {}).get('message', 'Unknown error')
+                    raise Exception(f"OpenAI API error: {error_detail}")
+            
+            except httpx.TimeoutException:
+                last_exception = Exception(f"Request timeout after {self.timeout}s")
+                if await retry.await_wait():
                     continue
+                break
+            
+            except httpx.TransportError as e:
+                last_exception = Exception(f"Connection error: {str(e)}")
+                if await retry.await_wait():
+                    continue
+                break
+            
+            except Exception as e:
+                last_exception = e
+                # Don't retry on unexpected exceptions
+                break
+        
+        # If we get here, all retries failed
+        raise last_exception or Exception("Failed to generate text")
+    
+    def stream_text(self, prompt: str, **kwargs) -> Iterator[str]:
+        """Generate text from a prompt, yielding tokens as OpenAI streams them.
+        
+        Args:
+            prompt: The input prompt
+            **kwargs: Same parameters as generate_text
+            
+        Yields:
+            Text chunks as they arrive
+            
+        Raises:
+            Exception: If the stream cannot be opened after all retries
+        """
+        headers, payload = self._build_request(prompt, **kwargs)
+        payload["stream"] = True
+        
+        response = self._open_stream(headers, payload)
+        try:
+            for data in self._iter_sse_data(response.iter_lines(decode_unicode=True)):
+                if data == "[DONE]":
+                    break
+                
+                choices = json.loads(data).get('choices') or [{}]
+                text = choices[0].get('delta', {}).get('content')
+                if text:
+                    yield text
+        finally:
+            response.close()
+    
+    def _open_stream(self, headers: Dict[str, str], payload: Dict[str, Any]) -> Any:
+        """Open a streaming chat completion, retrying like generate_text.
+        
+        Retries only happen before any output is produced; once the stream
+        is open, errors propagate to the caller.
+        
+        Args:
+            headers: Request headers
+            payload: Request payload with stream enabled
+            
+        Returns:
+            Open streaming response with status 200
+            
+        Raises:
+            Exception: If the stream cannot be opened after all retries
+        """
+        retry = self._begin_retry()
+        last_exception = None
+        for _ in range(self.max_retries):
+            try:
+                self._acquire_rate_limit(payload["messages"][0]["content"])
+                response = self._get_session().post(
+                    f"{self.API_BASE}/chat/completions",
+                    headers=headers,
+                    json=payload,
+                    timeout=self.timeout,
+                    stream=True
+                )
+                
+                if response.status_code == 200:
+                    return response
+                
+                elif response.status_code == 429:
+                    # Rate limit - back off (at least as long as the server asks) and retry
+                    response.close()
+                    last_exception = Exception("OpenAI API rate limit exceeded")
+                    if retry.wait(parse_retry_after(response.headers)):
+                        continue
+                    break
                 
                 elif response.status_code == 401:
                     raise ValueError("Invalid API key")
                 
                 elif response.status_code >= 500:
                     # Server error - retry
-                    if attempt < self.max_retries - 1:
-                        time.sleep(self.RETRY_DELAY)
+                    response.close()
+                    if retry.wait(parse_retry_after(response.headers)):
                         continue
                     raise Exception(f"OpenAI API server error: {response.status_code}")
                 
@@ -115,15 +297,15 @@ class OpenAIProvider(BaseLLMProvider):
             
             except requests.exceptions.Timeout:
                 last_exception = Exception(f"Request timeout after {self.timeout}s")
-                if attempt < self.max_retries - 1:
-                    time.sleep(self.RETRY_DELAY)
+                if retry.wait():
                     continue
+                break
             
             except requests.exceptions.ConnectionError as e:
                 last_exception = Exception(f"Connection error: {str(e)}")
-                if attempt < self.max_retries - 1:
-                    time.sleep(self.RETRY_DELAY)
+                if retry.wait():
                     continue
+                break
             
             except Exception as e:
                 last_exception = e
@@ -131,7 +313,74 @@ class OpenAIProvider(BaseLLMProvider):
                 break
         
         # If we get here, all retries failed
-        raise last_exception or Exception("Failed to generate text")
+        raise last_exception or Exception("Failed to open stream")
+    
+    def _build_request(self, prompt: str, **kwargs) -> Tuple[Dict[str, str], Dict[str, Any]]:
+        """Build headers and payload for a chat completion request.
+        
+        Args:
+            prompt: The input prompt
+            **kwargs: Generation overrides (model, temperature, max_tokens,
+                response_schema)
+            
+        Returns:
+            Tuple of (headers, payload)
+        """
+        model = kwargs.get('model', self.model)
+        temperature = kwargs.get('temperature', self.temperature)
+        max_tokens = kwargs.get('max_tokens', self.max_tokens_default)
+        
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+        
+        payload = {
+            "model": model,
+            "messages": [
+                {"role": "user", "content": prompt}
+            ],
+            "temperature": temperature,
+            "max_tokens": max_tokens
+        }
+        
+        # Structured Outputs (needs a model that supports json_schema, e.g. gpt-4o)
+        response_schema = kwargs.get('response_schema')
+        if response_schema:
+            payload["response_format"] = {
+                "type": "json_schema",
+                "json_schema": {"name": "response", "schema": response_schema}
+            }
+        
+        return headers, payload
+    
+    def _extract_text(
+        self,
+        data: Dict[str, Any],
+        fail_on_truncation: bool = False,
+        max_tokens: Optional[int] = None
+    ) -> str:
+        """Extract generated text from a chat completion response.
+        
+        Args:
+            data: Parsed JSON response
+            fail_on_truncation: Raise if generation stopped at max_tokens
+            max_tokens: Budget of the request
+            
+        Returns:
+            Generated text string
+            
+        Raises:
+            TruncatedResponseError: If finish_reason is 'length' and
+                fail_on_truncation is set
+        """
+        choice = data['choices'][0]
+        return self._check_truncation(
+            choice['message']['content'],
+            choice.get('finish_reason') == 'length',
+            fail_on_truncation,
+            max_tokens
+        )
     
     def list_models(self) -> List[str]:
         """List available OpenAI models.
@@ -147,7 +396,7 @@ class OpenAIProvider(BaseLLMProvider):
         }
         
         try:
-            response = requests.get(
+            response = self._get_session().get(
                 f"{self.API_BASE}/models",
                 headers=headers,
                 timeout=self.timeout
@@ -0,0 +1,194 @@
+"""max_tokens budgets sized from measured output lengths."""
+
+import math
+import threading
+from collections import deque
+from typing import Any, Dict, Optional, Tuple
+
+
+# (agent, provider name, model)
+OutputKey = Tuple[str, str, str]
+
+
+class OutputLengthTracker:
+    """Sizes max_tokens from the completion lengths actually observed.
+    
+    Keeps a rolling window of output lengths (in tokens) per agent,
+    provider and model. Until min_samples outputs have been seen the
+    configured max_tokens is used unchanged; after that the budget is the
+    given percentile of recent lengths times headroom, clamped between
+    min_tokens and the configured max_tokens. A truncated response counts
+    as a sample at the budget it hit, so budgets that prove too small grow.
+    """
+    
+    DEFAULT_PERCENTILE = 0.95
+    DEFAULT_HEADROOM = 1.25
+    DEFAULT_MIN_SAMPLES = 5
+    DEFAULT_WINDOW_SIZE = 50
+    DEFAULT_MIN_TOKENS = 256
+    RETRY_GROWTH = 2  # Budget multiplier when retrying a truncated response
+    
+    def __init__(
+        self,
+        percentile: float = DEFAULT_PERCENTILE,
+        headroom: float = DEFAULT_HEADROOM,
+        min_samples: int = DEFAULT_MIN_SAMPLES,
+        window_size: int = DEFAULT_WINDOW_SIZE,
+        min_tokens: int = DEFAULT_MIN_TOKENS
+    ):
+        """Initialize an empty tracker.
+        
+        Args:
+            percentile: Percentile of recent output lengths to cover (0.95 for p95)
+            headroom: Multiplier applied on top of the percentile
+            min_samples: Outputs observed before budgets are sized from them
+            window_size: Recent outputs kept per key
+            min_tokens: Smallest budget ever requested
+        
+        Raises:
+            ValueError: If percentile is not in (0, 1] or headroom is below 1
+        """
+        if not 0 < percentile <= 1:
+            raise ValueError("percentile must be between 0 and 1")
+        if headroom < 1:
+            raise ValueError("headroom must be at least 1")
+        
+        self.percentile = percentile
+        self.headroom = headroom
+        self.min_samples = min_samples
+        self.window_size = window_size
+        self.min_tokens = min_tokens
+        
+        self._lock = threading.Lock()
+        self._samples: Dict[OutputKey, "deque[int]"] = {}
+        self._truncations: Dict[OutputKey, int] = {}
+    
+    def record(self, key: OutputKey, tokens: int) -> None:
+        """Record the length of one complete output.
+        
+        Args:
+            key: (agent, provider name, model)
+            tokens: Output length in tokens
+        """
+        with self._lock:
+            self._window(key).append(tokens)
+    
+    def record_truncation(self, key: OutputKey, max_tokens: int) -> None:
+        """Record an output that was cut off at its budget.
+        
+        Args:
+            key: (agent, provider name, model)
+            max_tokens: Budget the output hit
+        """
+        with self._lock:
+            self._window(key).append(max_tokens)
+            self._truncations[key] = self._truncations.get(key, 0) + 1
+    
+    def _window(self, key: OutputKey) -> "deque[int]":
+        """Get the sample window of a key, creating it (caller holds the lock)."""
+        if key not in self._samples:
+            self._samples[key] = deque(maxlen=self.window_size)
+        return self._samples[key]
+    
+    def max_tokens(self, key: OutputKey, ceiling: int) -> int:
+        """Get the budget to request for the next output.
+        
+        Args:
+            key: (agent, provider name, model)
+            ceiling: Configured max_tokens, never exceeded
+        
+        Returns:
+            Measured budget, or ceiling if too few outputs were observed
+        """
+        with self._lock:
+            samples = sorted(self._samples.get(key, ()))
+        if len(samples) < self.min_samples:
+            return ceiling
+        
+        rank = max(1, math.ceil(self.percentile * len(samples)))
+        budget = math.ceil(samples[rank - 1] * self.headroom)
+        return min(ceiling, max(self.min_tokens, budget))
+    
+    def retry_budget(self, max_tokens: int, ceiling: int) -> Optional[int]:
+        """Get the larger budget to retry a truncated output with.
+        
+        Args:
+            max_tokens: Budget the output was truncated at
+            ceiling: Configured max_tokens
+        
+        Returns:
+            RETRY_GROWTH times the budget (at most ceiling), or None if
+            the budget was already at the ceiling
+        """
+        if max_tokens >= ceiling:
+            return None
+        return min(ceiling, max_tokens * self.RETRY_GROWTH)
+    
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get output length statistics.
+        
+        Returns:
+            Dictionary keyed by "agent@provider/model" with samples, p50,
+            max (observed tokens) and truncations
+        """
+        with self._lock:
+            windows = {key: sorted(samples) for key, samples in self._samples.items()}
+            truncations = dict(self._truncations)
+        
+        stats = {}
+        for (agent, provider, model), samples in windows.items():
+            stats[f"{agent}@{provider}/{model}"] = {
+                'samples': len(samples),
+                'p50': samples[(len(samples) - 1) // 2] if samples else None,
+                'max': samples[-1] if samples else None,
+                'truncations': truncations.get((agent, provider, model), 0),
+            }
+        return stats
+    
+    def reset(self) -> None:
+        """Forget all recorded outputs."""
+        with self._lock:
+            self._samples.clear()
+            self._truncations.clear()
+
+
+_output_tracker: Optional[OutputLengthTracker] = None
+_output_tracker_lock = threading.Lock()
+
+
+def get_output_tracker() -> OutputLengthTracker:
+    """Get the process-wide output length tracker, creating it if needed.
+    
+    Shared by every session of a Streamlit server process, so budgets are
+    learned from all of its calls.
+    
+    Returns:
+        Shared OutputLengthTracker
+    """
+    global _output_tracker
+    with _output_tracker_lock:
+        if _output_tracker is None:
+            _output_tracker = OutputLengthTracker()
+        return _output_tracker
+
+
+def configure_output_tracker(
+    percentile: float = OutputLengthTracker.DEFAULT_PERCENTILE,
+    headroom: float = OutputLengthTracker.DEFAULT_HEADROOM,
+    min_samples: int = OutputLengthTracker.DEFAULT_MIN_SAMPLES
+) -> OutputLengthTracker:
+    """Replace the process-wide output length tracker with a new configuration.
+    
+    Args:
+        percentile: Percentile of recent output lengths to cover
+        headroom: Multiplier applied on top of the percentile
+        min_samples: Outputs observed before budgets are sized from them
+    
+    Returns:
+        New shared OutputLengthTracker (with no recorded outputs)
+    """
+    global _output_tracker
+    tracker = OutputLengthTracker(percentile=percentile, headroom=headroom, min_samples=min_samples)
+    with _output_tracker_lock:
+        _output_tracker = tracker
+    return tracker
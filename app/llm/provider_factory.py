@@ -1,7 +1,9 @@
 """LLM Provider Factory for dynamic provider instantiation."""
 
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Union
 from app.llm.base_provider import BaseLLMProvider
+from app.llm.cache_provider import CachingProvider, ResponseCache
+from app.llm.failover_provider import FailoverProvider
 from app.llm.mock_provider import MockLLMProvider
 from app.llm.openai_provider import OpenAIProvider
 from app.llm.anthropic_provider import AnthropicProvider
@@ -48,6 +50,7 @@ class ProviderFactory:
         cls,
         provider_name: str,
         api_key: Optional[str] = None,
+        cache: Union[bool, ResponseCache, None] = None,
         **kwargs
     ) -> BaseLLMProvider:
         """Create a provider instance.
@@ -56,6 +59,9 @@ class ProviderFactory:
             provider_name: Name of the provider
                 ('mock', 'openai', 'anthropic', 'gemini', 'huggingface', 'ollama', 'agentforce')
             api_key: API key for the provider (not required for mock/ollama/agentforce)
+            cache: Response caching - True for the shared in-memory cache, a
+                ResponseCache instance (e.g. SQLiteResponseCache) for a specific
+                backend, or None/False to disable (default)
             **kwargs: Additional provider-specific configuration
             
         Returns:
@@ -78,13 +84,55 @@ class ProviderFactory:
         # Providers that don't require API key
         # Agentforce uses its own auth (OAuth/Session ID), not API key
         if provider_name in ('mock', 'ollama', 'agentforce'):
-            return provider_class(**kwargs)
+            provider = provider_class(**kwargs)
+        else:
+            # Real providers require API key
+            if not api_key:
+                raise ValueError(f"API key required for {provider_name} provider")
+            
+            provider = provider_class(api_key=api_key, **kwargs)
+        
+        if cache is None or cache is False:
+            return provider
+        
+        return CachingProvider(provider, cache=None if cache is True else cache)
+    
+    @classmethod
+    def create_failover_provider(
+        cls,
+        chain: List[Dict[str, Any]],
+        **breaker_kwargs
+    ) -> FailoverProvider:
+        """Create a provider that fails over along a chain of providers.
+        
+        Args:
+            chain: Provider configurations in order of preference, each a dict
+                with 'provider' (name), optional 'api_key' and any other
+                provider kwargs, e.g.
+                [{'provider': 'anthropic', 'api_key': ...},
+                 {'provider': 'openai', 'api_key': ...},
+                 {'provider': 'ollama'}]
+            **breaker_kwargs: CircuitBreaker settings (failure_threshold,
+                error_rate_threshold, window_size, min_calls, reset_timeout,
+                slow_call_threshold)
+            
+        Returns:
+            FailoverProvider wrapping the created providers
+            
+        Raises:
+            ValueError: If the chain is empty or a provider cannot be created
+        """
+        if not chain:
+            raise ValueError("Failover chain requires at least one provider")
         
-        # Real providers require API key
-        if not api_key:
-            raise ValueError(f"API key required for {provider_name} provider")
+        providers = []
+        for entry in chain:
+            config = dict(entry)
+            provider_name = config.pop('provider')
+            api_key = config.pop('api_key', None)
+            providers.append(cls.create_provider(provider_name, api_key=api_key, **config))
         
-        return provider_class(api_key=api_key, **kwargs)
+        return FailoverProvider(providers, **breaker_kwargs)
     
     @classmethod
     def get_available_providers(cls) -> list:
@@ -0,0 +1,207 @@
+"""Client-side token-bucket rate limiting shared per provider and credential."""
+
+import asyncio
+import hashlib
+import math
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+
+class TokenBucket:
+    """Token bucket that hands out reservations instead of rejecting.
+    
+    The balance may go negative: each caller reserves its cost immediately
+    and is told how long to wait until the reservation is covered. Because
+    every reservation pushes the balance further down, callers are admitted
+    in the order they reserved (FIFO), regardless of which session or thread
+    they come from.
+    """
+    
+    def __init__(self, capacity: float, per_minute: float, clock: Callable[[], float] = time.monotonic):
+        """Initialize a full bucket.
+        
+        Args:
+            capacity: Maximum burst size
+            per_minute: Refill rate in units per minute
+            clock: Monotonic clock function (injectable for tests)
+        """
+        self.capacity = capacity
+        self.rate = per_minute / 60.0
+        self._clock = clock
+        self._tokens = capacity
+        self._updated_at = clock()
+    
+    def reserve(self, cost: float) -> float:
+        """Reserve capacity and return the delay before it is available.
+        
+        Costs larger than the bucket are clamped to its capacity so that an
+        oversized request waits for a full bucket instead of forever.
+        
+        Args:
+            cost: Units to reserve
+        
+        Returns:
+            Seconds the caller must wait before proceeding
+        """
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+        
+        self._tokens -= min(cost, self.capacity)
+        if self._tokens >= 0:
+            return 0.0
+        return -self._tokens / self.rate
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute limiter.
+    
+    Calls block (or await) until both budgets allow them, so bursts from
+    parallel reviewers are smoothed out before they reach the API instead of
+    failing with 429 and retrying.
+    """
+    
+    def __init__(
+        self,
+        rpm: Optional[float] = None,
+        tpm: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        """Initialize the limiter.
+        
+        Args:
+            rpm: Requests per minute (None = unlimited)
+            tpm: Tokens per minute (None = unlimited)
+            clock: Monotonic clock function (injectable for tests)
+            sleep: Blocking sleep function (injectable for tests)
+        
+        Raises:
+            ValueError: If a budget is not positive
+        """
+        for name, value in (('rpm', rpm), ('tpm', tpm)):
+            if value is not None and value <= 0:
+                raise ValueError(f"{name} must be positive")
+        
+        self.rpm = rpm
+        self.tpm = tpm
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._request_bucket = TokenBucket(rpm, rpm, clock) if rpm else None
+        self._token_bucket = TokenBucket(tpm, tpm, clock) if tpm else None
+        self.total_wait = 0.0
+        self.throttled_requests = 0
+    
+    def _reserve(self, tokens: int) -> float:
+        """Reserve one request and the given tokens; return the wait."""
+        with self._lock:
+            wait = 0.0
+            if self._request_bucket is not None:
+                wait = max(wait, self._request_bucket.reserve(1))
+            if self._token_bucket is not None and tokens > 0:
+                wait = max(wait, self._token_bucket.reserve(tokens))
+            if wait > 0:
+                self.total_wait += wait
+                self.throttled_requests += 1
+            return wait
+    
+    def acquire(self, tokens: int = 0) -> float:
+        """Block until a request of the given size may be sent.
+        
+        Args:
+            tokens: Estimated tokens consumed by the request
+        
+        Returns:
+            Seconds spent waiting
+        """
+        wait = self._reserve(tokens)
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+    
+    async def aacquire(self, tokens: int = 0) -> float:
+        """Wait without blocking the event loop until a request may be sent.
+        
+        Args:
+            tokens: Estimated tokens consumed by the request
+        
+        Returns:
+            Seconds spent waiting
+        """
+        wait = self._reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+    
+    def get_stats(self) -> Dict[str, float]:
+        """Get throttling statistics.
+        
+        Returns:
+            Dictionary with rpm, tpm, throttled_requests and total_wait
+        """
+        with self._lock:
+            return {
+                'rpm': self.rpm,
+                'tpm': self.tpm,
+                'throttled_requests': self.throttled_requests,
+                'total_wait': self.total_wait,
+            }
+
+
+def estimate_tokens(text: str) -> int:
+    """Roughly estimate the token count of a prompt (~4 characters per token).
+    
+    Args:
+        text: Prompt text
+    
+    Returns:
+        Estimated number of tokens
+    """
+    return math.ceil(len(text) / 4)
+
+
+_limiters: Dict[Tuple[str, str], RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(
+    provider_name: str,
+    api_key: Optional[str],
+    rpm: Optional[float] = None,
+    tpm: Optional[float] = None
+) -> Optional[RateLimiter]:
+    """Get the process-wide limiter for a provider and credential.
+    
+    Every provider instance using the same provider and API key - across
+    reviewer threads and concurrent sessions - shares one limiter, since the
+    upstream quota is enforced per key. The key is hashed and never stored.
+    The budgets of the first caller for a key are kept.
+    
+    Args:
+        provider_name: Provider name (e.g. 'gemini')
+        api_key: Credential the quota applies to (None for keyless providers)
+        rpm: Requests per minute (None = unlimited)
+        tpm: Tokens per minute (None = unlimited)
+    
+    Returns:
+        Shared RateLimiter, or None if no budget is configured
+    """
+    if not rpm and not tpm:
+        return None
+    
+    credential = hashlib.sha256((api_key or "").encode('utf-8')).hexdigest()
+    key = (provider_name, credential)
+    
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = RateLimiter(rpm=rpm, tpm=tpm)
+            _limiters[key] = limiter
+        return limiter
+
+
+def reset_rate_limiters() -> None:
+    """Forget all shared limiters (used by tests)."""
+    with _limiters_lock:
+        _limiters.clear()
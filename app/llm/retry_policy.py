@@ -0,0 +1,326 @@
+"""Shared retry policy: jittered exponential backoff honoring server delays."""
+
+import asyncio
+import random
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Mapping, Optional
+
+
+# Reset headers sent alongside 429s by the supported APIs, in addition to
+# the standard Retry-After (OpenAI: x-ratelimit-reset-*, Anthropic:
+# anthropic-ratelimit-*-reset)
+RESET_HEADERS = (
+    'retry-after-ms',
+    'retry-after',
+    'x-ratelimit-reset-requests',
+    'x-ratelimit-reset-tokens',
+    'anthropic-ratelimit-requests-reset',
+    'anthropic-ratelimit-tokens-reset',
+    'x-ratelimit-reset',
+)
+
+_DURATION_PART = re.compile(r'(\d+(?:\.\d+)?)(ms|h|m|s)')
+_DURATION = re.compile(r'(?:\d+(?:\.\d+)?(?:ms|h|m|s))+')
+_DURATION_UNITS = {'ms': 0.001, 's': 1.0, 'm': 60.0, 'h': 3600.0}
+
+
+def parse_duration(value: str) -> Optional[float]:
+    """Parse a Go/protobuf-style duration such as "1s", "6m0s" or "20ms".
+    
+    Args:
+        value: Duration string
+    
+    Returns:
+        Duration in seconds, or None if the value is not a duration
+    """
+    value = value.strip()
+    if not _DURATION.fullmatch(value):
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in _DURATION_PART.findall(value))
+
+
+def _parse_delay(name: str, value: str, now: float) -> Optional[float]:
+    """Convert one reset header value into seconds from now."""
+    value = value.strip()
+    if not value:
+        return None
+    
+    try:
+        seconds = float(value)
+    except ValueError:
+        seconds = None
+    
+    if seconds is not None:
+        if name == 'retry-after-ms':
+            return seconds / 1000.0
+        # Large bare numbers are epoch timestamps (x-ratelimit-reset)
+        if seconds > 1e9:
+            return seconds - now
+        return seconds
+    
+    duration = parse_duration(value)
+    if duration is not None:
+        return duration
+    
+    # RFC 3339 timestamps (Anthropic)
+    try:
+        reset_at = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        if reset_at.tzinfo is None:
+            reset_at = reset_at.replace(tzinfo=timezone.utc)
+        return reset_at.timestamp() - now
+    except ValueError:
+        pass
+    
+    # HTTP-dates (Retry-After)
+    try:
+        return parsedate_to_datetime(value).timestamp() - now
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def parse_retry_after(headers: Optional[Mapping[str, Any]]) -> Optional[float]:
+    """Extract the server-requested retry delay from response headers.
+    
+    Understands Retry-After (seconds or HTTP-date), retry-after-ms, the
+    OpenAI x-ratelimit-reset-* durations and the Anthropic RFC 3339 reset
+    timestamps. When several are present the longest delay wins, since the
+    request cannot succeed before every exhausted budget has reset.
+    
+    Args:
+        headers: Response headers (case-insensitive mapping or plain dict)
+    
+    Returns:
+        Delay in seconds, or None if the server did not specify one
+    """
+    if not headers:
+        return None
+    
+    try:
+        lowered = {str(key).lower(): value for key, value in headers.items()}
+    except (AttributeError, TypeError):
+        return None
+    
+    now = time.time()
+    delays = []
+    for name in RESET_HEADERS:
+        value = lowered.get(name)
+        if not isinstance(value, (str, bytes, int, float)):
+            continue
+        if isinstance(value, bytes):
+            value = value.decode('latin-1')
+        delay = _parse_delay(name, str(value), now)
+        if delay is not None:
+            delays.append(max(0.0, delay))
+    
+    return max(delays) if delays else None
+
+
+class RetryState:
+    """Backoff state for a single call.
+    
+    Created by RetryPolicy.begin(). Providers keep their own error
+    classification and ask the state to wait before each retry; a False
+    result means the call is out of attempts or out of deadline and the last
+    error should be raised.
+    """
+    
+    def __init__(self, policy: 'RetryPolicy'):
+        """Start tracking a call.
+        
+        Args:
+            policy: Policy supplying the limits and recording the counters
+        """
+        self.policy = policy
+        self.retries = 0
+        self._previous_delay = policy.base_delay
+        self._started_at = policy._clock()
+    
+    @property
+    def remaining(self) -> Optional[float]:
+        """Seconds left in the call's deadline budget (None = unlimited)."""
+        if self.policy.deadline is None:
+            return None
+        return self.policy.deadline - (self.policy._clock() - self._started_at)
+    
+    def next_delay(self, retry_after: Optional[float] = None) -> Optional[float]:
+        """Compute the delay before the next attempt.
+        
+        Uses decorrelated jitter - a random delay between the base delay and
+        three times the previous one, capped at max_delay - so concurrent
+        callers that failed together spread out instead of retrying in
+        lockstep. A server-provided delay is a lower bound.
+        
+        Args:
+            retry_after: Delay requested by the server, if any
+        
+        Returns:
+            Delay in seconds, or None if no retry should be attempted
+        """
+        policy = self.policy
+        if self.retries >= policy.max_attempts - 1:
+            return None
+        
+        upper = max(policy.base_delay, self._previous_delay * 3)
+        delay = min(policy.max_delay, policy._random.uniform(policy.base_delay, upper))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        
+        remaining = self.remaining
+        if remaining is not None and delay > remaining:
+            return None
+        
+        return delay
+    
+    def _record(self, delay: float) -> None:
+        """Advance the backoff and update the policy counters."""
+        self.retries += 1
+        self._previous_delay = delay
+        self.policy._record_retry(delay)
+    
+    def wait(self, retry_after: Optional[float] = None) -> bool:
+        """Sleep before the next attempt if one is allowed.
+        
+        Args:
+            retry_after: Delay requested by the server, if any
+        
+        Returns:
+            True if the caller should retry, False if it should give up
+        """
+        delay = self.next_delay(retry_after)
+        if delay is None:
+            self.policy._record_exhausted()
+            return False
+        
+        self._record(delay)
+        self.policy._sleep(delay)
+        return True
+    
+    async def await_wait(self, retry_after: Optional[float] = None) -> bool:
+        """Await before the next attempt without blocking the event loop.
+        
+        Args:
+            retry_after: Delay requested by the server, if any
+        
+        Returns:
+            True if the caller should retry, False if it should give up
+        """
+        delay = self.next_delay(retry_after)
+        if delay is None:
+            self.policy._record_exhausted()
+            return False
+        
+        self._record(delay)
+        await self.policy._async_sleep(delay)
+        return True
+
+
+class RetryPolicy:
+    """Retry limits and counters shared by a provider's calls.
+    
+    Every generation path (sync, async and streaming) of every provider uses
+    the same policy, so backoff behaviour and accounting are uniform:
+    
+    - at most max_attempts requests per call
+    - decorrelated-jitter exponential backoff between base_delay and max_delay
+    - server-provided delays (Retry-After and rate-limit reset headers) honored
+    - no wait that would exceed the per-call deadline budget
+    """
+    
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        deadline: Optional[float] = 120.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Optional[Callable[[float], None]] = None,
+        async_sleep: Optional[Callable[[float], Any]] = None,
+        rng: Optional[random.Random] = None
+    ):
+        """Initialize the policy.
+        
+        Args:
+            max_attempts: Maximum requests per call, including the first
+            base_delay: Minimum delay between attempts in seconds
+            max_delay: Maximum computed delay in seconds
+            deadline: Total time budget per call in seconds (None = unlimited)
+            clock: Monotonic clock function (injectable for tests)
+            sleep: Blocking sleep function (default time.sleep)
+            async_sleep: Coroutine sleep function (default asyncio.sleep)
+            rng: Random generator for jitter (injectable for tests)
+        
+        Raises:
+            ValueError: If a limit is out of range
+        """
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        if base_delay < 0 or max_delay < base_delay:
+            raise ValueError("Delays must satisfy 0 <= base_delay <= max_delay")
+        if deadline is not None and deadline <= 0:
+            raise ValueError("deadline must be positive")
+        
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self._clock = clock
+        self._sleep_fn = sleep
+        self._async_sleep_fn = async_sleep
+        self._random = rng or random.Random()
+        
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.attempts = 0
+        self.retries = 0
+        self.exhausted = 0
+        self.total_sleep = 0.0
+    
+    def begin(self) -> RetryState:
+        """Start a call and return its backoff state.
+        
+        Returns:
+            RetryState for the call
+        """
+        with self._lock:
+            self.calls += 1
+            self.attempts += 1
+        return RetryState(self)
+    
+    def _sleep(self, delay: float) -> None:
+        """Block for the given delay."""
+        (self._sleep_fn or time.sleep)(delay)
+    
+    async def _async_sleep(self, delay: float) -> None:
+        """Await the given delay."""
+        await (self._async_sleep_fn or asyncio.sleep)(delay)
+    
+    def _record_retry(self, delay: float) -> None:
+        """Count a retry and the time it will spend sleeping."""
+        with self._lock:
+            self.attempts += 1
+            self.retries += 1
+            self.total_sleep += delay
+    
+    def _record_exhausted(self) -> None:
+        """Count a call that gave up on retrying."""
+        with self._lock:
+            self.exhausted += 1
+    
+    def get_stats(self) -> Dict[str, float]:
+        """Get retry statistics.
+        
+        Returns:
+            Dictionary with calls, attempts, retries, exhausted and total_sleep
+        """
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'attempts': self.attempts,
+                'retries': self.retries,
+                'exhausted': self.exhausted,
+                'total_sleep': self.total_sleep,
+            }
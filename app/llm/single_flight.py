@@ -0,0 +1,230 @@
+"""Single-flight coalescing of identical in-flight provider calls."""
+
+import asyncio
+import contextlib
+import contextvars
+import functools
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional, Tuple
+
+
+# Keys led by the current thread/task, so a coalesced method calling another
+# coalesced method with the same key (e.g. via super()) runs directly
+# instead of waiting on itself
+_leading: contextvars.ContextVar = contextvars.ContextVar('single_flight_leading', default=frozenset())
+
+# Set while coalescing is bypassed (see no_coalescing)
+_bypass: contextvars.ContextVar = contextvars.ContextVar('single_flight_bypass', default=False)
+
+
+class _LeaderAborted(Exception):
+    """Raised to followers when the leader was cancelled or interrupted."""
+
+
+class SingleFlight:
+    """Shares one execution among concurrent callers with the same key.
+    
+    The first caller for a key (the leader) runs the call; callers arriving
+    while it is in flight (followers) wait for it and receive its result or
+    its exception. Nothing is kept once the call finishes - this is not a
+    cache, so later callers run the call again.
+    
+    Works across threads and event loops: sync followers block on the
+    leader's future, async followers await it. If the leader is cancelled
+    (e.g. the losing request of a hedge), followers run the call themselves
+    instead of failing.
+    """
+    
+    def __init__(self):
+        """Initialize with no calls in flight."""
+        self._calls: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.coalesced = 0
+    
+    def _join(self, key: str) -> Tuple[bool, Future]:
+        """Register as leader for key, or get the in-flight call to wait for."""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return False, future
+            
+            future = Future()
+            # Running futures can't be cancelled by a follower
+            future.set_running_or_notify_cancel()
+            self._calls[key] = future
+            self.leaders += 1
+            return True, future
+    
+    def _finish(self, key: str, future: Future, result: Any = None, error: Optional[BaseException] = None) -> None:
+        """Remove the call from the in-flight table and publish its outcome."""
+        with self._lock:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+        
+        if error is None:
+            future.set_result(result)
+        elif isinstance(error, Exception):
+            future.set_exception(error)
+        else:
+            future.set_exception(_LeaderAborted())
+    
+    @contextlib.contextmanager
+    def _as_leader(self, key: str) -> Iterator[None]:
+        """Mark key as led by the current context."""
+        token = _leading.set(_leading.get() | {key})
+        try:
+            yield
+        finally:
+            _leading.reset(token)
+    
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """Run fn once for all concurrent callers with the same key.
+        
+        Args:
+            key: Identity of the call
+            fn: Function performing the call
+        
+        Returns:
+            Result of the (shared) call
+        
+        Raises:
+            Exception: Whatever the shared call raised
+        """
+        if key in _leading.get():
+            return fn()
+        
+        while True:
+            leader, future = self._join(key)
+            if leader:
+                try:
+                    with self._as_leader(key):
+                        result = fn()
+                except BaseException as e:
+                    self._finish(key, future, error=e)
+                    raise
+                self._finish(key, future, result=result)
+                return result
+            
+            try:
+                return future.result()
+            except _LeaderAborted:
+                continue
+    
+    async def ado(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Await fn once for all concurrent callers with the same key.
+        
+        Args:
+            key: Identity of the call
+            fn: Coroutine function performing the call
+        
+        Returns:
+            Result of the (shared) call
+        
+        Raises:
+            Exception: Whatever the shared call raised
+        """
+        if key in _leading.get():
+            return await fn()
+        
+        while True:
+            leader, future = self._join(key)
+            if leader:
+                try:
+                    with self._as_leader(key):
+                        result = await fn()
+                except BaseException as e:
+                    self._finish(key, future, error=e)
+                    raise
+                self._finish(key, future, result=result)
+                return result
+            
+            try:
+                # Shielded so a cancelled follower doesn't affect the others
+                return await asyncio.shield(asyncio.wrap_future(future))
+            except _LeaderAborted:
+                continue
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Get coalescing statistics.
+        
+        Returns:
+            Dictionary with leaders (upstream calls made), coalesced
+            (callers that shared another call) and in_flight
+        """
+        with self._lock:
+            return {
+                'leaders': self.leaders,
+                'coalesced': self.coalesced,
+                'in_flight': len(self._calls),
+            }
+
+
+# Process-wide, so concurrent sessions and reruns share in-flight calls
+_single_flight = SingleFlight()
+
+
+def get_single_flight() -> SingleFlight:
+    """Get the process-wide SingleFlight instance.
+    
+    Returns:
+        Shared SingleFlight
+    """
+    return _single_flight
+
+
+def coalescing_bypassed() -> bool:
+    """Check whether coalescing is disabled in the current context."""
+    return _bypass.get()
+
+
+@contextlib.contextmanager
+def no_coalescing() -> Iterator[None]:
+    """Disable coalescing for calls made (or tasks created) in this block.
+    
+    Used where a duplicate request is intended, such as a hedge.
+    """
+    token = _bypass.set(True)
+    try:
+        yield
+    finally:
+        _bypass.reset(token)
+
+
+def coalesced(method: Callable) -> Callable:
+    """Wrap a provider method so identical concurrent calls share one execution.
+    
+    The provider's _single_flight_key() decides the call identity; a None
+    key runs the method directly.
+    
+    Args:
+        method: Sync or async provider method
+    
+    Returns:
+        Wrapped method
+    """
+    if getattr(method, '__single_flight__', False):
+        return method
+    
+    if asyncio.iscoroutinefunction(method):
+        @functools.wraps(method)
+        async def async_wrapper(self, *args, **kwargs):
+            key = self._single_flight_key(method.__name__, args, kwargs)
+            if key is None:
+                return await method(self, *args, **kwargs)
+            return await _single_flight.ado(key, lambda: method(self, *args, **kwargs))
+        
+        async_wrapper.__single_flight__ = True
+        return async_wrapper
+    
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = self._single_flight_key(method.__name__, args, kwargs)
+        if key is None:
+            return method(self, *args, **kwargs)
+        return _single_flight.do(key, lambda: method(self, *args, **kwargs))
+    
+    wrapper.__single_flight__ = True
+    return wrapper
@@ -0,0 +1,503 @@
+"""Token counting and budget-aware prompt assembly."""
+
+import functools
+import hashlib
+import os
+import re
+import tempfile
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+from app.llm.rate_limiter import estimate_tokens
+
+try:
+    import tiktoken
+    import tiktoken.model
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+
+# Context windows by model name prefix; the first match wins, so more
+# specific prefixes come first
+MODEL_CONTEXT_WINDOWS = (
+    ('gpt-4.1', 1047576),
+    ('gpt-4o', 128000),
+    ('gpt-4-turbo', 128000),
+    ('gpt-4-32k', 32768),
+    ('gpt-4', 8192),
+    ('gpt-3.5-turbo', 16385),
+    ('o1', 128000),
+    ('o3', 200000),
+    ('o4', 200000),
+    ('claude', 200000),
+    ('gemini-1.0', 32760),
+    ('gemini-pro', 32760),
+    ('gemini', 1048576),
+    ('llama3.1', 131072),
+    ('llama3.2', 131072),
+    ('llama3', 8192),
+    ('mistral', 32768),
+    ('tiiuae/falcon', 2048),
+)
+
+# Context windows for models not in the table, by provider
+PROVIDER_CONTEXT_WINDOWS = {
+    'openai': 128000,
+    'anthropic': 200000,
+    'gemini': 1048576,
+    'ollama': 8192,
+    'huggingface': 8192,
+    'agentforce': 32768,
+}
+
+DEFAULT_CONTEXT_WINDOW = 32768
+
+# Maximum output (completion) tokens by model name prefix; the first match
+# wins, so more specific prefixes come first
+MODEL_OUTPUT_LIMITS = (
+    ('gpt-4.1', 32768),
+    ('gpt-4o', 16384),
+    ('gpt-4-turbo', 4096),
+    ('gpt-4', 8192),
+    ('gpt-3.5-turbo', 4096),
+    ('o1', 32768),
+    ('o3', 100000),
+    ('o4', 100000),
+    ('claude-3-5', 8192),
+    ('claude-3-7', 64000),
+    ('claude-3', 4096),
+    ('claude', 32000),
+    ('gemini-1.0', 2048),
+    ('gemini-pro', 2048),
+    ('gemini-2.5', 65536),
+    ('gemini', 8192),
+)
+
+# Output limits for models not in the table, by provider. Providers missing
+# here (e.g. Ollama, whose num_predict has no hard limit) are not capped.
+PROVIDER_OUTPUT_LIMITS = {
+    'openai': 4096,
+    'anthropic': 4096,
+    'gemini': 8192,
+}
+
+# Text put in place of a part that was dropped entirely
+OMITTED_NOTE = "[Omitted to fit the context window]"
+TRUNCATED_NOTE = "\n[... truncated to fit the context window ...]"
+
+_SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+
+
+def context_window(provider_name: str, model: Optional[str] = None) -> int:
+    """Get the context window of a provider's model, in tokens.
+    
+    Args:
+        provider_name: Provider name (e.g. 'openai')
+        model: Model name, if known
+    
+    Returns:
+        Context window size in tokens
+    """
+    if model:
+        name = model.lower()
+        if name.startswith('models/'):
+            name = name[len('models/'):]
+        for prefix, window in MODEL_CONTEXT_WINDOWS:
+            if name.startswith(prefix):
+                return window
+    return PROVIDER_CONTEXT_WINDOWS.get(provider_name, DEFAULT_CONTEXT_WINDOW)
+
+
+def output_limit(provider_name: str, model: Optional[str] = None) -> Optional[int]:
+    """Get the most output tokens a provider's model accepts as max_tokens.
+    
+    Args:
+        provider_name: Provider name (e.g. 'openai')
+        model: Model name, if known
+    
+    Returns:
+        Output token limit, or None if the provider has no known limit
+    """
+    if model:
+        name = model.lower()
+        if name.startswith('models/'):
+            name = name[len('models/'):]
+        for prefix, limit in MODEL_OUTPUT_LIMITS:
+            if name.startswith(prefix):
+                return limit
+    return PROVIDER_OUTPUT_LIMITS.get(provider_name)
+
+
+# Where tiktoken fetches each encoding's BPE file from (and caches it under)
+ENCODING_FILE_URLS = {
+    'cl100k_base': "https://openaipublic.blob.core.windows.net/encodings/cl100k_base.tiktoken",
+    'o200k_base': "https://openaipublic.blob.core.windows.net/encodings/o200k_base.tiktoken",
+    'p50k_base': "https://openaipublic.blob.core.windows.net/encodings/p50k_base.tiktoken",
+    'r50k_base': "https://openaipublic.blob.core.windows.net/encodings/r50k_base.tiktoken",
+}
+
+# Set to "1" to let tiktoken download encodings that aren't cached locally
+ENCODING_DOWNLOAD_ENV = "TOKEN_BUDGET_DOWNLOAD_ENCODINGS"
+
+
+def _encoding_file_cached(name: str) -> bool:
+    """Check whether tiktoken can load an encoding without the network.
+    
+    Mirrors tiktoken's file cache: TIKTOKEN_CACHE_DIR, then
+    DATA_GYM_CACHE_DIR, then data-gym-cache in the temp directory, with
+    files named by the SHA-1 of their URL.
+    """
+    url = ENCODING_FILE_URLS.get(name)
+    if url is None:
+        return False
+    
+    if "TIKTOKEN_CACHE_DIR" in os.environ:
+        cache_dir = os.environ["TIKTOKEN_CACHE_DIR"]
+    elif "DATA_GYM_CACHE_DIR" in os.environ:
+        cache_dir = os.environ["DATA_GYM_CACHE_DIR"]
+    else:
+        cache_dir = os.path.join(tempfile.gettempdir(), "data-gym-cache")
+    if not cache_dir:
+        return False  # Caching disabled: every load downloads
+    return os.path.exists(os.path.join(cache_dir, hashlib.sha1(url.encode()).hexdigest()))
+
+
+@functools.lru_cache(maxsize=None)
+def _get_encoding(name: str) -> Any:
+    """Load a tiktoken encoding by name, or None if unavailable.
+    
+    Only encodings already in tiktoken's local cache are loaded, since a
+    download has no timeout and would stall token counting; set
+    ENCODING_DOWNLOAD_ENV to allow downloads. Failures are cached too, so
+    each encoding is only tried once per process.
+    """
+    if not TIKTOKEN_AVAILABLE:
+        return None
+    if not _encoding_file_cached(name) and os.environ.get(ENCODING_DOWNLOAD_ENV) != "1":
+        print(f"[TokenBudget] tiktoken encoding {name} not cached locally, estimating tokens from length")
+        return None
+    try:
+        return tiktoken.get_encoding(name)
+    except Exception as e:
+        print(f"[TokenBudget] tiktoken encoding {name} unavailable ({type(e).__name__}), estimating tokens from length")
+        return None
+
+
+def _encoding_name(provider_name: str, model: Optional[str]) -> str:
+    """Get the tiktoken encoding name for a provider's model.
+    
+    OpenAI models use their own encoding; other providers don't ship a
+    local tokenizer, so cl100k_base serves as a close approximation.
+    """
+    if TIKTOKEN_AVAILABLE and provider_name == 'openai' and model:
+        try:
+            return tiktoken.model.encoding_name_for_model(model)
+        except KeyError:
+            pass
+    return 'cl100k_base'
+
+
+class TokenCounter:
+    """Counts and truncates text in model tokens.
+    
+    Uses a tiktoken encoding when one is given, otherwise the length-based
+    estimate (~4 characters per token) the rate limiter uses.
+    """
+    
+    def __init__(self, encoding: Any = None):
+        """Initialize counter.
+        
+        Args:
+            encoding: tiktoken encoding (None = estimate from length)
+        """
+        self.encoding = encoding
+    
+    @property
+    def exact(self) -> bool:
+        """Whether counts come from a real tokenizer."""
+        return self.encoding is not None
+    
+    def count(self, text: str) -> int:
+        """Count the tokens of a text.
+        
+        Args:
+            text: Text to count
+        
+        Returns:
+            Number of tokens
+        """
+        if self.encoding is None:
+            return estimate_tokens(text)
+        return len(self.encoding.encode(text, disallowed_special=()))
+    
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Cut a text to at most max_tokens, ending on a line or word break.
+        
+        Args:
+            text: Text to cut
+            max_tokens: Token limit, including the truncation note
+        
+        Returns:
+            Text unchanged if it fits, otherwise its head plus TRUNCATED_NOTE
+            (empty if not even the note fits)
+        """
+        if self.count(text) <= max_tokens:
+            return text
+        
+        limit = max_tokens - self.count(TRUNCATED_NOTE)
+        if limit <= 0:
+            return ""
+        
+        if self.encoding is None:
+            head = text[:limit * 4]
+        else:
+            head = self.encoding.decode(self.encoding.encode(text, disallowed_special=())[:limit])
+        # Drop the partial last line (or word) rather than ending mid-token
+        cut = max(head.rfind("\n"), head.rfind(" "))
+        if cut > len(head) // 2:
+            head = head[:cut]
+        return head.rstrip() + TRUNCATED_NOTE
+
+
+def provider_model(provider: Any) -> Tuple[str, Optional[str]]:
+    """Get the provider name and default model of a provider.
+    
+    Args:
+        provider: LLM provider (wrappers expose the wrapped model)
+    
+    Returns:
+        Tuple of (provider name, model name or None)
+    """
+    provider_name = provider.get_provider_name()
+    model = getattr(provider, 'model', None)
+    return (
+        provider_name if isinstance(provider_name, str) else '',
+        model if isinstance(model, str) else None
+    )
+
+
+def get_token_counter(provider_name: str, model: Optional[str] = None) -> TokenCounter:
+    """Get a token counter for a provider and model.
+    
+    Args:
+        provider_name: Provider name (e.g. 'openai')
+        model: Model name, if known
+    
+    Returns:
+        TokenCounter (exact if tiktoken is installed and loads)
+    """
+    return TokenCounter(_get_encoding(_encoding_name(provider_name, model)))
+
+
+@dataclass
+class PromptPart:
+    """A variable part of a prompt that may be shortened to fit the budget.
+    
+    Attributes:
+        name: Key of the part (e.g. 'previous_output')
+        text: Full text
+        priority: Parts with lower priority are shortened first
+        strategy: How to shorten the part:
+            'lines' - drop trailing lines (lists, feedback)
+            'outline' - keep headings and the leading sentences of each
+              section, then truncate (documents)
+            'truncate' - keep the head
+            'keep' - never shorten
+    """
+    
+    name: str
+    text: str
+    priority: int = 0
+    strategy: str = 'truncate'
+
+
+@dataclass
+class BudgetReport:
+    """What the budgeter changed to fit a prompt.
+    
+    Attributes:
+        budget: Prompt token budget
+        original_tokens: Prompt tokens before fitting
+        final_tokens: Prompt tokens after fitting
+        removed: One entry per shortened part, e.g.
+            "feedback: dropped 4 of 12 lines (900 -> 610 tokens)"
+        exact: Whether counts come from a real tokenizer
+    """
+    
+    budget: int
+    original_tokens: int
+    final_tokens: int
+    removed: List[str] = field(default_factory=list)
+    exact: bool = False
+    
+    @property
+    def fits(self) -> bool:
+        """Whether the fitted prompt is within the budget."""
+        return self.final_tokens <= self.budget
+    
+    def describe(self) -> str:
+        """Summarize the report in one line."""
+        changes = "; ".join(self.removed) if self.removed else "nothing removed"
+        return f"{self.original_tokens} -> {self.final_tokens}/{self.budget} tokens ({changes})"
+
+
+class PromptBudgeter:
+    """Fits prompt parts into a token budget, shortening the least important first.
+    
+    The budget is the model's context window minus the output allowance
+    and a reserve. When the prompt is over budget, parts are shortened in
+    ascending priority - each only as much as needed - according to their
+    strategy; a part that can't be usefully shortened is replaced by
+    OMITTED_NOTE. Every change is listed in the BudgetReport.
+    """
+    
+    DEFAULT_RESERVE_TOKENS = 256
+    MIN_PART_TOKENS = 32  # Shorter remainders are dropped instead
+    
+    def __init__(self, budget: int, counter: Optional[TokenCounter] = None):
+        """Initialize budgeter.
+        
+        Args:
+            budget: Prompt token budget
+            counter: Token counter (default: length-based estimate)
+        """
+        self.budget = budget
+        self.counter = counter if counter is not None else TokenCounter()
+    
+    @classmethod
+    def for_provider(
+        cls,
+        provider: Any,
+        max_output_tokens: int = 0,
+        budget: Optional[int] = None,
+        reserve_tokens: int = DEFAULT_RESERVE_TOKENS
+    ) -> 'PromptBudgeter':
+        """Create a budgeter for a provider's model.
+        
+        Args:
+            provider: LLM provider (its get_provider_name() and model are used)
+            max_output_tokens: Tokens requested for the response; at most
+                half the context window is set aside for them
+            budget: Explicit prompt budget overriding the computed one
+            reserve_tokens: Extra headroom kept free
+        
+        Returns:
+            PromptBudgeter
+        """
+        provider_name, model = provider_model(provider)
+        counter = get_token_counter(provider_name, model)
+        
+        if budget is None:
+            window = context_window(provider_name, model)
+            budget = window - min(max_output_tokens, window // 2) - reserve_tokens
+        return cls(budget, counter)
+    
+    def fit(self, parts: List[PromptPart], overhead: str = "") -> 'BudgetResult':
+        """Shorten parts until the prompt fits the budget.
+        
+        Args:
+            parts: Variable parts of the prompt
+            overhead: Fixed text of the prompt (the template without parts)
+        
+        Returns:
+            BudgetResult with the fitted text of each part and the report
+        """
+        available = self.budget - self.counter.count(overhead)
+        texts = {part.name: part.text for part in parts}
+        tokens = {part.name: self.counter.count(part.text) for part in parts}
+        original = total = sum(tokens.values())
+        removed = []
+        
+        for part in sorted(parts, key=lambda part: part.priority):
+            excess = total - available
+            if excess <= 0:
+                break
+            if part.strategy == 'keep' or not part.text:
+                continue
+            
+            allowed = tokens[part.name] - excess
+            text, action = self._shorten(part, allowed)
+            new_tokens = self.counter.count(text)
+            removed.append(f"{part.name}: {action} ({tokens[part.name]} -> {new_tokens} tokens)")
+            total += new_tokens - tokens[part.name]
+            texts[part.name], tokens[part.name] = text, new_tokens
+        
+        overhead_tokens = self.budget - available
+        report = BudgetReport(
+            budget=self.budget,
+            original_tokens=original + overhead_tokens,
+            final_tokens=total + overhead_tokens,
+            removed=removed,
+            exact=self.counter.exact
+        )
+        return BudgetResult(texts=texts, report=report)
+    
+    def _shorten(self, part: PromptPart, allowed: int) -> Tuple[str, str]:
+        """Shorten one part to at most allowed tokens, returning (text, action)."""
+        if allowed < self.MIN_PART_TOKENS:
+            return OMITTED_NOTE, "dropped"
+        
+        if part.strategy == 'lines':
+            lines = part.text.split("\n")
+            for keep in range(len(lines) - 1, 0, -1):
+                note = f"[... {len(lines) - keep} more lines omitted ...]"
+                text = "\n".join(lines[:keep] + [note])
+                if self.counter.count(text) <= allowed:
+                    return text, f"dropped {len(lines) - keep} of {len(lines)} lines"
+            return OMITTED_NOTE, "dropped"
+        
+        if part.strategy == 'outline':
+            for sentences in (3, 2, 1):
+                text = outline(part.text, sentences)
+                if text and self.counter.count(text) <= allowed:
+                    return text, f"summarized to headings and {sentences} sentence(s) per section"
+            text = self.counter.truncate(outline(part.text, 1) or part.text, allowed)
+            return (text, "summarized and truncated") if text else (OMITTED_NOTE, "dropped")
+        
+        text = self.counter.truncate(part.text, allowed)
+        return (text, "truncated") if text else (OMITTED_NOTE, "dropped")
+
+
+@dataclass
+class BudgetResult:
+    """Fitted prompt parts and what was changed.
+    
+    Attributes:
+        texts: Fitted text by part name
+        report: BudgetReport
+    """
+    
+    texts: Dict[str, str]
+    report: BudgetReport
+
+
+def outline(document: str, sentences: int = 1) -> str:
+    """Compact a markdown document to its headings and leading sentences.
+    
+    Args:
+        document: Document with '#' headings
+        sentences: Sentences kept from the start of each section
+    
+    Returns:
+        Outline, or "" if the document has no headings
+    """
+    lines = []
+    body: List[str] = []
+    found_heading = False
+    
+    def flush() -> None:
+        text = " ".join(" ".join(body).split())
+        if text:
+            lines.append(" ".join(_SENTENCE_END.split(text)[:sentences]))
+        body.clear()
+    
+    for line in document.split("\n"):
+        if line.lstrip().startswith("#"):
+            flush()
+            lines.append(line.strip())
+            found_heading = True
+        elif found_heading:
+            body.append(line.strip())
+    flush()
+    
+    return "\n".join(lines) if found_heading else ""
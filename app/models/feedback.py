@@ -1,10 +1,40 @@
 """Feedback models for reviewer output."""
 
-from typing import List, Optional
+from typing import Dict, List, Optional
 from pydantic import BaseModel, Field, field_validator, ConfigDict
 from datetime import datetime
 
 
+# Allowed structured review values
+SEVERITIES = ('CRITICAL', 'HIGH', 'MEDIUM', 'LOW')
+VERDICTS = ('APPROVE', 'NEEDS REVISION', 'REJECT')
+
+
+class Finding(BaseModel):
+    """A single structured reviewer finding.
+    
+    Attributes:
+        severity: CRITICAL, HIGH, MEDIUM or LOW
+        description: Finding description and specific issue
+    """
+    
+    severity: str = Field(..., description="Finding severity")
+    description: str = Field(..., description="Finding description")
+    
+    @field_validator('severity')
+    @classmethod
+    def validate_severity(cls, v):
+        """Normalize severity and check it is a known level."""
+        v = v.strip().upper()
+        if v not in SEVERITIES:
+            raise ValueError(f"Severity must be one of {', '.join(SEVERITIES)}")
+        return v
+    
+    def to_text(self) -> str:
+        """Render the finding in the free-text review format."""
+        return f"[Severity: {self.severity}] {self.description}"
+
+
 class Feedback(BaseModel):
     """Represents feedback from a reviewer agent.
     
@@ -16,6 +46,10 @@ class Feedback(BaseModel):
         modified: Whether feedback was modified by human
         timestamp: When feedback was created
         confidence_score: Optional confidence score for this feedback
+        verdict: Reviewer verdict (structured output only)
+        findings: Typed findings mirroring feedback_points (structured output only)
+        improvement_tracking: Previous issues by status - fixed,
+            partially_fixed, not_addressed (structured iterative output only)
     """
     
     model_config = ConfigDict(arbitrary_types_allowed=True)
@@ -27,6 +61,9 @@ class Feedback(BaseModel):
     modified: bool = Field(default=False, description="Modified by human flag")
     timestamp: datetime = Field(default_factory=datetime.now, description="Creation timestamp")
     confidence_score: Optional[float] = Field(default=None, ge=0.0, le=1.0, description="Confidence score")
+    verdict: Optional[str] = Field(default=None, description="Structured verdict")
+    findings: Optional[List[Finding]] = Field(default=None, description="Structured findings")
+    improvement_tracking: Optional[Dict[str, List[str]]] = Field(default=None, description="Structured improvement tracking")
     
     @field_validator('feedback_points')
     @classmethod
@@ -37,6 +74,17 @@ class Feedback(BaseModel):
         if len(v) > 8:
             raise ValueError("Maximum 8 feedback points allowed")
         return v
+    
+    @field_validator('verdict')
+    @classmethod
+    def validate_verdict(cls, v):
+        """Normalize verdict and check it is a known value."""
+        if v is None:
+            return v
+        v = v.strip().upper().replace('_', ' ')
+        if v not in VERDICTS:
+            raise ValueError(f"Verdict must be one of {', '.join(VERDICTS)}")
+        return v
 
 
 class ReviewerFeedbackCollection(BaseModel):
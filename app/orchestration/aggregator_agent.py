@@ -2,6 +2,7 @@
 
 from typing import Dict, List, Optional
 from app.llm.base_provider import BaseLLMProvider
+from app.orchestration.local_aggregator import LocalAggregationPolicy, LocalAggregator
 
 
 class AggregatorAgent:
@@ -83,10 +84,19 @@ Be concise, specific, and actionable. Focus on creating a clear action plan."""
             **kwargs: Additional configuration
                 - temperature: Generation temperature (default 0.3 for consistency)
                 - max_tokens: Maximum tokens (default 2000)
+                - local_policy: LocalAggregationPolicy deciding when to skip
+                  the LLM call and aggregate locally (default None = always LLM)
+                - local_aggregator: LocalAggregator used for local and
+                  fallback aggregation (default LocalAggregator())
         """
         self.llm_provider = llm_provider
         self.temperature = kwargs.get('temperature', 0.3)  # Lower temp for consistency
         self.max_tokens = kwargs.get('max_tokens', 2000)
+        self.local_policy: Optional[LocalAggregationPolicy] = kwargs.get('local_policy')
+        self.local_aggregator: LocalAggregator = kwargs.get('local_aggregator') or LocalAggregator()
+        
+        # How the last decision was made: 'llm', 'local' or 'fallback'
+        self.last_mode: Optional[str] = None
     
     def aggregate(
         self,
@@ -105,6 +115,15 @@ Be concise, specific, and actionable. Focus on creating a clear action plan."""
         if not reviewer_feedback or len(reviewer_feedback) == 0:
             return "No reviewer feedback available. Cannot aggregate."
         
+        # Skip the LLM round-trip when the rule-based decision is good enough
+        if self.local_policy is not None:
+            analysis = self.local_aggregator.analyze(reviewer_feedback)
+            reason = self.local_policy.reason(analysis)
+            if reason:
+                print(f"[AggregatorAgent] Using local aggregation ({reason})")
+                self.last_mode = 'local'
+                return self.local_aggregator.render(analysis)
+        
         # Build feedback summary
         feedback_text = self._format_reviewer_feedback(reviewer_feedback)
         
@@ -121,10 +140,13 @@ Be concise, specific, and actionable. Focus on creating a clear action plan."""
                 max_tokens=self.max_tokens
             )
             
+            self.last_mode = 'llm'
             return result.strip()
         
         except Exception as e:
-            # Fallback to simple aggregation if LLM fails
+            # Fallback to rule-based aggregation if LLM fails
+            print(f"[AggregatorAgent] LLM aggregation failed, using fallback: {e}")
+            self.last_mode = 'fallback'
             return self._fallback_aggregation(reviewer_feedback)
     
     def _format_reviewer_feedback(self, reviewer_feedback: Dict[str, str]) -> str:
@@ -148,71 +170,15 @@ Be concise, specific, and actionable. Focus on creating a clear action plan."""
     def _fallback_aggregation(self, reviewer_feedback: Dict[str, str]) -> str:
         """Fallback aggregation when LLM is unavailable.
         
-        Uses deterministic rules to combine feedback.
+        Uses the deterministic local aggregator.
         
         Args:
             reviewer_feedback: Dictionary of feedback
             
         Returns:
-            Basic aggregated feedback string
+            Aggregated feedback string in the board decision format
         """
-        lines = []
-        
-        lines.append("BOARD DECISION (Fallback Mode)")
-        lines.append("=" * 50)
-        lines.append("")
-        
-        lines.append(f"TOTAL REVIEWERS: {len(reviewer_feedback)}")
-        lines.append("")
-        
-        # Count approvals and rejections
-        approvals = 0
-        rejections = 0
-        revisions = 0
-        
-        for feedback in reviewer_feedback.values():
-            feedback_upper = feedback.upper()
-            if 'APPROVE' in feedback_upper and 'REJECT' not in feedback_upper:
-                approvals += 1
-            elif 'REJECT' in feedback_upper:
-                rejections += 1
-            elif 'REVISION' in feedback_upper:
-                revisions += 1
-        
-        lines.append("VERDICT SUMMARY:")
-        lines.append(f"- Approvals: {approvals}")
-        lines.append(f"- Needs Revision: {revisions}")
-        lines.append(f"- Rejections: {rejections}")
-        lines.append("")
-        
-        # Extract all issues
-        all_issues = []
-        for role, feedback in reviewer_feedback.items():
-            # Simple extraction
-            for line in feedback.split('\n'):
-                line = line.strip()
-                if line and (
-                    line.startswith('-') or 
-                    line.startswith('•') or 
-                    any(c.isdigit() and '.' in line[:5] for c in line[:5])
-                ):
-                    all_issues.append(f"[{role}] {line}")
-        
-        if all_issues:
-            lines.append("ALL IDENTIFIED ISSUES:")
-            for issue in all_issues[:15]:  # Limit to 15
-                lines.append(issue)
-            lines.append("")
-        
-        # Simple recommendation
-        if rejections > len(reviewer_feedback) / 2:
-            lines.append("RECOMMENDATION: NEEDS MAJOR REVISION")
-        elif approvals > len(reviewer_feedback) / 2:
-            lines.append("RECOMMENDATION: APPROVE WITH MINOR CHANGES")
-        else:
-            lines.append("RECOMMENDATION: NEEDS REVISION")
-        
-        return "\n".join(lines)
+        return self.local_aggregator.aggregate(reviewer_feedback, title="BOARD DECISION (Fallback Mode)")
 
 
 def detect_conflicts(reviewer_feedback: Dict[str, str]) -> List[str]:
@@ -1,17 +1,239 @@
 """Confidence scoring model for multi-agent review convergence."""
 
-from typing import Dict, List, Optional
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from operator import attrgetter
+from typing import Dict, FrozenSet, List, Optional, Sequence
 import re
+from app.models.feedback import Feedback
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
 
 
 # Confidence threshold for iteration convergence
 CONFIDENCE_THRESHOLD = 0.82
 
+# Factor weights for the first iteration and for iterations with
+# improvement tracking (shared by calculate_confidence and the batch API)
+FIRST_ITERATION_WEIGHTS = {'agreement': 0.40, 'sentiment': 0.25, 'severity': 0.25, 'quality': 0.10}
+ITERATIVE_WEIGHTS = {'agreement': 0.30, 'sentiment': 0.20, 'severity': 0.20, 'quality': 0.10, 'improvement': 0.20}
+
+# Iterations scored per chunk by calculate_confidence_batch (bounds the
+# memory held by per-reviewer features)
+BATCH_CHUNK_SIZE = 2048
+
+# Structured verdicts mapped to the labels of the text heuristics
+_VERDICT_LABELS = {'APPROVE': 'approve', 'REJECT': 'reject', 'NEEDS REVISION': 'revision'}
+
+# Verdict labels as integer codes for batch scoring
+_VERDICT_CODES = {'approve': 0, 'reject': 1, 'revision': 2, 'neutral': 3}
+
+# Sentiment keywords (matched in the lowercased feedback)
+POSITIVE_KEYWORDS = ('good', 'excellent', 'strong', 'clear', 'well', 'approve', 'solid')
+NEGATIVE_KEYWORDS = ('issue', 'problem', 'error', 'missing', 'unclear', 'weak', 'reject', 'critical')
+
+# Structural and tracking markers (matched in the uppercased feedback)
+SEVERITY_KEYWORDS = ('CRITICAL', 'HIGH', 'MEDIUM', 'LOW')
+IMPROVEMENT_MARKERS = ('FIXED:', 'PARTIALLY FIXED:', 'NOT ADDRESSED:', 'IMPROVEMENT TRACKING')
+_UPPER_KEYWORDS = SEVERITY_KEYWORDS + IMPROVEMENT_MARKERS + (
+    'APPROVE', 'REJECT', 'NEEDS REVISION', 'NEEDS_REVISION',
+    'VERDICT', 'FINDING', 'ISSUE', 'SUGGEST', 'RECOMMEND',
+    '✅ FIXED', '⚠️ PARTIALLY FIXED', '❌ NOT ADDRESSED', 'NEW FINDINGS',
+)
+
+# Words of 4+ characters used for keyword overlap
+_WORD_PATTERN = re.compile(r'\w{4,}')
+
+# Feature extraction results kept per distinct feedback string, so history
+# entries re-scored on every dashboard render are only scanned once
+FEATURE_CACHE_SIZE = 512
+
+
+@dataclass(frozen=True)
+class FeedbackFeatures:
+    """Everything the confidence scorers need from one reviewer's feedback.
+    
+    Extracted once per feedback string - the text is case-folded once and
+    each keyword counted once - so the scorers no longer re-scan it.
+    
+    Attributes:
+        length: Length of the feedback text
+        verdict: approve, reject, revision or neutral
+        words: Distinct lowercase words of 4+ characters
+        positive_count: Number of distinct positive keywords present
+        negative_count: Number of distinct negative keywords present
+        critical_count: CRITICAL mentions
+        high_count: HIGH mentions
+        medium_count: MEDIUM mentions
+        low_count: LOW mentions
+        has_verdict: Mentions a verdict
+        has_findings: Mentions findings or issues
+        has_suggestions: Mentions suggestions or recommendations
+        has_improvement_tracking: Contains improvement tracking markers
+        fixed_count: Issues marked fixed
+        partially_fixed_count: Issues marked partially fixed
+        not_addressed_count: Issues marked not addressed
+        new_critical_count: CRITICAL severities in the NEW FINDINGS section
+        new_high_count: HIGH severities in the NEW FINDINGS section
+    """
+    
+    length: int
+    verdict: str
+    words: FrozenSet[str]
+    positive_count: int
+    negative_count: int
+    critical_count: int
+    high_count: int
+    medium_count: int
+    low_count: int
+    has_verdict: bool
+    has_findings: bool
+    has_suggestions: bool
+    has_improvement_tracking: bool
+    fixed_count: int
+    partially_fixed_count: int
+    not_addressed_count: int
+    new_critical_count: int
+    new_high_count: int
+    
+    @classmethod
+    def from_text(cls, feedback: str) -> "FeedbackFeatures":
+        """Extract features from a feedback string (cached per string).
+        
+        Args:
+            feedback: Reviewer feedback text
+        
+        Returns:
+            Extracted features
+        """
+        return _features_from_text(feedback)
+    
+    def with_structured(self, feedback: Feedback) -> "FeedbackFeatures":
+        """Override text-derived features with structured reviewer output.
+        
+        Args:
+            feedback: Feedback carrying typed findings
+        
+        Returns:
+            Features whose verdict, severities and improvement tracking come
+            from the typed fields where present
+        """
+        severities = [finding.severity for finding in feedback.findings]
+        overrides = {
+            'critical_count': severities.count('CRITICAL'),
+            'high_count': severities.count('HIGH'),
+            'medium_count': severities.count('MEDIUM'),
+            'low_count': severities.count('LOW'),
+        }
+        if feedback.verdict:
+            overrides['verdict'] = _VERDICT_LABELS[feedback.verdict]
+        if feedback.improvement_tracking is not None:
+            # Structured iterative findings are all new issues
+            overrides.update(
+                has_improvement_tracking=True,
+                fixed_count=len(feedback.improvement_tracking.get('fixed', [])),
+                partially_fixed_count=len(feedback.improvement_tracking.get('partially_fixed', [])),
+                not_addressed_count=len(feedback.improvement_tracking.get('not_addressed', [])),
+                new_critical_count=overrides['critical_count'],
+                new_high_count=overrides['high_count'],
+            )
+        return replace(self, **overrides)
+
+
+@lru_cache(maxsize=FEATURE_CACHE_SIZE)
+def _features_from_text(feedback: str) -> FeedbackFeatures:
+    """Extract FeedbackFeatures from text (see FeedbackFeatures.from_text)."""
+    feedback_upper = feedback.upper()
+    feedback_lower = feedback.lower()
+    # One C-level count per keyword over the case-folded text
+    counts = {keyword: feedback_upper.count(keyword) for keyword in _UPPER_KEYWORDS}
+    
+    if counts['APPROVE'] and not counts['REJECT']:
+        verdict = 'approve'
+    elif counts['REJECT']:
+        verdict = 'reject'
+    elif counts['NEEDS REVISION'] or counts['NEEDS_REVISION']:
+        verdict = 'revision'
+    else:
+        verdict = 'neutral'
+    
+    # Severities in the NEW FINDINGS section (up to a repeated marker, if any)
+    new_critical_count = new_high_count = 0
+    if counts['NEW FINDINGS']:
+        start = feedback_upper.index('NEW FINDINGS') + len('NEW FINDINGS')
+        end = feedback_upper.find('NEW FINDINGS', start)
+        if end == -1:
+            end = len(feedback_upper)
+        new_critical_count = feedback_upper.count('[SEVERITY: CRITICAL', start, end)
+        new_high_count = feedback_upper.count('[SEVERITY: HIGH', start, end)
+    
+    return FeedbackFeatures(
+        length=len(feedback),
+        verdict=verdict,
+        words=frozenset(_WORD_PATTERN.findall(feedback_lower)),
+        positive_count=sum(1 for keyword in POSITIVE_KEYWORDS if keyword in feedback_lower),
+        negative_count=sum(1 for keyword in NEGATIVE_KEYWORDS if keyword in feedback_lower),
+        critical_count=counts['CRITICAL'],
+        high_count=counts['HIGH'],
+        medium_count=counts['MEDIUM'],
+        low_count=counts['LOW'],
+        has_verdict=bool(counts['VERDICT'] or counts['APPROVE'] or counts['REJECT']),
+        has_findings=bool(counts['FINDING'] or counts['ISSUE']),
+        has_suggestions=bool(counts['SUGGEST'] or counts['RECOMMEND']),
+        has_improvement_tracking=any(counts[marker] for marker in IMPROVEMENT_MARKERS),
+        fixed_count=counts['✅ FIXED'] + counts['FIXED:'],
+        partially_fixed_count=counts['⚠️ PARTIALLY FIXED'] + counts['PARTIALLY FIXED:'],
+        not_addressed_count=counts['❌ NOT ADDRESSED'] + counts['NOT ADDRESSED:'],
+        new_critical_count=new_critical_count,
+        new_high_count=new_high_count,
+    )
+
+
+# Numeric FeedbackFeatures fields, the columns of the batch feature matrix
+_BATCH_COLUMN_NAMES = (
+    'length', 'positive_count', 'negative_count',
+    'critical_count', 'high_count', 'medium_count', 'low_count',
+    'has_verdict', 'has_findings', 'has_suggestions', 'has_improvement_tracking',
+    'fixed_count', 'partially_fixed_count', 'not_addressed_count',
+    'new_critical_count', 'new_high_count',
+)
+_BATCH_COLUMNS = attrgetter(*_BATCH_COLUMN_NAMES)
+
+
+def extract_features(
+    reviewer_feedback: Dict[str, str],
+    structured_feedback: Optional[Dict[str, Feedback]] = None
+) -> Dict[str, FeedbackFeatures]:
+    """Extract scoring features for every reviewer.
+    
+    Args:
+        reviewer_feedback: Dictionary mapping reviewer role to feedback string
+        structured_feedback: Optional Feedback objects by role; roles with
+            typed findings take verdicts, severities and improvement tracking
+            from them
+        
+    Returns:
+        Dictionary mapping reviewer role to FeedbackFeatures
+    """
+    features = {}
+    for role, feedback in reviewer_feedback.items():
+        role_features = FeedbackFeatures.from_text(feedback)
+        typed = structured_feedback.get(role) if structured_feedback else None
+        if typed is not None and typed.findings is not None:
+            role_features = role_features.with_structured(typed)
+        features[role] = role_features
+    return features
+
 
 def calculate_confidence(
     reviewer_feedback: Dict[str, str],
     aggregated_feedback: str,
-    previous_feedback: Dict[str, str] = None
+    previous_feedback: Dict[str, str] = None,
+    structured_feedback: Optional[Dict[str, Feedback]] = None
 ) -> float:
     """Calculate confidence score based on reviewer agreement and quality.
     
@@ -32,10 +254,17 @@ def calculate_confidence(
     - Feedback quality: Length and detail level (10%)
     - Improvement tracking: Issues fixed vs new issues (20%)
     
+    Each reviewer's feedback is scanned once (see extract_features) and all
+    factors are computed from the extracted features.
+    
     Args:
         reviewer_feedback: Dictionary mapping reviewer role to feedback string
         aggregated_feedback: Unified feedback from aggregator
         previous_feedback: Optional previous iteration feedback for improvement tracking
+        structured_feedback: Optional Feedback objects by reviewer role. For
+            roles with structured output (typed findings), verdicts, severities
+            and improvement tracking are read from the typed fields instead of
+            being re-parsed from the feedback string.
         
     Returns:
         Confidence score between 0.0 and 1.0
@@ -43,67 +272,248 @@ def calculate_confidence(
     if not reviewer_feedback or len(reviewer_feedback) == 0:
         return 0.5  # Neutral confidence with no feedback
     
+    features = extract_features(reviewer_feedback, structured_feedback)
+    
     # Check if this is an iterative review with improvement tracking
-    has_improvement_data = previous_feedback and _has_improvement_tracking(reviewer_feedback)
+    has_improvement_data = previous_feedback and _has_improvement_tracking(reviewer_feedback, features=features)
     
     if has_improvement_data:
         # Iteration 2+: Include improvement tracking
         # Factor 1: Agreement ratio (30% weight - reduced)
-        agreement_score = _calculate_agreement_ratio(reviewer_feedback)
+        agreement_score = _calculate_agreement_ratio(reviewer_feedback, features=features)
         
         # Factor 2: Sentiment consistency (20% weight - reduced)
-        sentiment_score = _calculate_sentiment_consistency(reviewer_feedback)
+        sentiment_score = _calculate_sentiment_consistency(reviewer_feedback, features=features)
         
         # Factor 3: Issue severity (20% weight - reduced)
-        severity_score = _calculate_severity_score(reviewer_feedback)
+        severity_score = _calculate_severity_score(reviewer_feedback, features=features)
         
         # Factor 4: Feedback quality (10% weight)
-        quality_score = _calculate_feedback_quality(reviewer_feedback)
+        quality_score = _calculate_feedback_quality(reviewer_feedback, features=features)
         
         # Factor 5: Improvement tracking (20% weight - NEW)
-        improvement_score = _calculate_improvement_score(reviewer_feedback)
+        improvement_score = _calculate_improvement_score(reviewer_feedback, features=features)
         
         # Weighted average with improvement tracking
+        weights = ITERATIVE_WEIGHTS
         confidence = (
-            agreement_score * 0.30 +
-            sentiment_score * 0.20 +
-            severity_score * 0.20 +
-            quality_score * 0.10 +
-            improvement_score * 0.20
+            agreement_score * weights['agreement'] +
+            sentiment_score * weights['sentiment'] +
+            severity_score * weights['severity'] +
+            quality_score * weights['quality'] +
+            improvement_score * weights['improvement']
         )
     else:
         # Iteration 1: Original scoring
         # Factor 1: Agreement ratio (40% weight)
-        agreement_score = _calculate_agreement_ratio(reviewer_feedback)
+        agreement_score = _calculate_agreement_ratio(reviewer_feedback, features=features)
         
         # Factor 2: Sentiment consistency (25% weight)
-        sentiment_score = _calculate_sentiment_consistency(reviewer_feedback)
+        sentiment_score = _calculate_sentiment_consistency(reviewer_feedback, features=features)
         
         # Factor 3: Issue severity (25% weight)
-        severity_score = _calculate_severity_score(reviewer_feedback)
+        severity_score = _calculate_severity_score(reviewer_feedback, features=features)
         
         # Factor 4: Feedback quality (10% weight)
-        quality_score = _calculate_feedback_quality(reviewer_feedback)
+        quality_score = _calculate_feedback_quality(reviewer_feedback, features=features)
         
         # Weighted average
+        weights = FIRST_ITERATION_WEIGHTS
         confidence = (
-            agreement_score * 0.40 +
-            sentiment_score * 0.25 +
-            severity_score * 0.25 +
-            quality_score * 0.10
+            agreement_score * weights['agreement'] +
+            sentiment_score * weights['sentiment'] +
+            severity_score * weights['severity'] +
+            quality_score * weights['quality']
         )
     
     # Clamp to [0.0, 1.0]
     return max(0.0, min(1.0, confidence))
 
 
-def _calculate_agreement_ratio(reviewer_feedback: Dict[str, str]) -> float:
+def calculate_confidence_batch(
+    reviewer_feedbacks: Sequence[Dict[str, str]],
+    previous_feedbacks: Optional[Sequence[Optional[Dict[str, str]]]] = None,
+    structured_feedbacks: Optional[Sequence[Optional[Dict[str, Feedback]]]] = None,
+    chunk_size: int = BATCH_CHUNK_SIZE
+) -> "np.ndarray":
+    """Calculate confidence scores for many iterations at once.
+    
+    Gives the same scores as calling calculate_confidence() per iteration,
+    for re-scoring stored sessions offline (e.g. after tuning
+    FIRST_ITERATION_WEIGHTS or ITERATIVE_WEIGHTS). Each reviewer feedback
+    becomes a row of keyword counts and flags in a feature matrix; severity
+    penalties, variance terms and the weighted factors are then computed
+    with NumPy array operations over all iterations of a chunk.
+    
+    Args:
+        reviewer_feedbacks: Reviewer feedback dictionary per iteration
+        previous_feedbacks: Optional previous feedback per iteration
+            (entries may be None)
+        structured_feedbacks: Optional structured Feedback by role per
+            iteration (entries may be None)
+        chunk_size: Iterations scored per chunk
+        
+    Returns:
+        Array of confidence scores, one per iteration
+        
+    Raises:
+        ImportError: If numpy is not installed
+        ValueError: If the optional sequences differ in length from reviewer_feedbacks
+    """
+    if not NUMPY_AVAILABLE:
+        raise ImportError("numpy is required for batch confidence scoring")
+    
+    reviewer_feedbacks = list(reviewer_feedbacks)
+    total = len(reviewer_feedbacks)
+    previous_feedbacks = list(previous_feedbacks) if previous_feedbacks is not None else [None] * total
+    structured_feedbacks = list(structured_feedbacks) if structured_feedbacks is not None else [None] * total
+    if len(previous_feedbacks) != total or len(structured_feedbacks) != total:
+        raise ValueError("previous_feedbacks and structured_feedbacks must match reviewer_feedbacks in length")
+    
+    scores = np.empty(total)
+    for start in range(0, total, chunk_size):
+        end = start + chunk_size
+        scores[start:end] = _score_batch_chunk(
+            reviewer_feedbacks[start:end],
+            previous_feedbacks[start:end],
+            structured_feedbacks[start:end]
+        )
+    return scores
+
+
+def _score_batch_chunk(
+    reviewer_feedbacks: List[Dict[str, str]],
+    previous_feedbacks: List[Optional[Dict[str, str]]],
+    structured_feedbacks: List[Optional[Dict[str, Feedback]]]
+) -> "np.ndarray":
+    """Score one chunk of iterations (see calculate_confidence_batch).
+    
+    Every reviewer feedback of the chunk is a row of a feature matrix;
+    per-iteration sums use np.bincount over the row's iteration index.
+    """
+    iteration_count = len(reviewer_feedbacks)
+    sizes = np.array([len(feedback) for feedback in reviewer_feedbacks], dtype=np.int64)
+    if not sizes.any():
+        return np.full(iteration_count, 0.5)
+    
+    groups = np.repeat(np.arange(iteration_count), sizes)
+    features = [
+        extract_features(feedback, structured)
+        for feedback, structured in zip(reviewer_feedbacks, structured_feedbacks)
+    ]
+    rows = [role_features for iteration_features in features for role_features in iteration_features.values()]
+    matrix = np.array([_BATCH_COLUMNS(role_features) for role_features in rows], dtype=float)
+    columns = {name: matrix[:, index] for index, name in enumerate(_BATCH_COLUMN_NAMES)}
+    verdicts = np.array([_VERDICT_CODES[role_features.verdict] for role_features in rows], dtype=np.int64)
+    
+    reviewers = np.maximum(sizes, 1).astype(float)
+    
+    def per_iteration(values: "np.ndarray") -> "np.ndarray":
+        return np.bincount(groups, weights=values, minlength=iteration_count)
+    
+    # Agreement: verdict agreement and keyword overlap
+    verdict_counts = np.bincount(
+        groups * len(_VERDICT_CODES) + verdicts, minlength=iteration_count * len(_VERDICT_CODES)
+    ).reshape(iteration_count, len(_VERDICT_CODES))
+    verdict_agreement = verdict_counts.max(axis=1) / reviewers
+    
+    # Keyword overlap stays on C-level set operations per iteration
+    keyword_overlap = np.full(iteration_count, 0.5)
+    for index, iteration_features in enumerate(features):
+        word_sets = [role_features.words for role_features in iteration_features.values()]
+        all_words = frozenset().union(*word_sets)
+        if len(word_sets) > 1 and all_words:
+            keyword_overlap[index] = len(frozenset.intersection(*word_sets)) / len(all_words)
+    agreement_score = np.where(sizes < 2, 1.0, (verdict_agreement * 0.7) + (keyword_overlap * 0.3))
+    
+    # Sentiment: variance of positive/negative keyword counts
+    def consistency(values: "np.ndarray") -> "np.ndarray":
+        mean = per_iteration(values) / reviewers
+        variance = per_iteration((values - mean[groups]) ** 2) / reviewers
+        return 1.0 - np.minimum(variance / 10.0, 1.0)
+    
+    sentiment_score = (consistency(columns['positive_count']) + consistency(columns['negative_count'])) / 2
+    
+    # Severity: weighted penalty per reviewer
+    critical = per_iteration(columns['critical_count'])
+    high = per_iteration(columns['high_count'])
+    medium = per_iteration(columns['medium_count'])
+    low = per_iteration(columns['low_count'])
+    penalty = critical * 1.0 + high * 0.6 + medium * 0.3 + low * 0.1
+    severity_score = np.where(
+        critical + high + medium + low == 0, 1.0, 1.0 - np.minimum(penalty / reviewers / 5.0, 1.0)
+    )
+    
+    # Quality: length and structure
+    lengths = columns['length']
+    length_score = np.where(
+        lengths < 50,
+        lengths / 50,
+        np.where(lengths > 2000, 1.0 - np.minimum((lengths - 2000) / 2000, 0.5), 1.0)
+    )
+    structure_score = (
+        np.where(columns['has_verdict'] > 0, 0.4, 0.0) +
+        np.where(columns['has_findings'] > 0, 0.3, 0.0) +
+        np.where(columns['has_suggestions'] > 0, 0.3, 0.0)
+    )
+    quality_score = per_iteration((length_score * 0.4) + (structure_score * 0.6)) / reviewers
+    
+    # Improvement: fixed vs not addressed and new issues
+    net_improvement = (
+        (per_iteration(columns['fixed_count']) * 1.0) + (per_iteration(columns['partially_fixed_count']) * 0.5)
+    ) - (
+        (per_iteration(columns['not_addressed_count']) * 0.3) +
+        (per_iteration(columns['new_critical_count']) * 0.4) +
+        (per_iteration(columns['new_high_count']) * 0.2)
+    )
+    improvement_score = np.where(
+        net_improvement >= 5.0, 1.0, np.where(net_improvement <= -5.0, 0.0, 0.5 + (net_improvement / 10.0))
+    )
+    
+    has_previous = np.array([bool(previous) for previous in previous_feedbacks])
+    iterative = has_previous & (per_iteration(columns['has_improvement_tracking']) > 0)
+    
+    first_weights, iterative_weights = FIRST_ITERATION_WEIGHTS, ITERATIVE_WEIGHTS
+    confidence = np.where(
+        iterative,
+        agreement_score * iterative_weights['agreement'] +
+        sentiment_score * iterative_weights['sentiment'] +
+        severity_score * iterative_weights['severity'] +
+        quality_score * iterative_weights['quality'] +
+        improvement_score * iterative_weights['improvement'],
+        agreement_score * first_weights['agreement'] +
+        sentiment_score * first_weights['sentiment'] +
+        severity_score * first_weights['severity'] +
+        quality_score * first_weights['quality']
+    )
+    
+    return np.where(sizes > 0, np.clip(confidence, 0.0, 1.0), 0.5)
+
+
+def _features(
+    reviewer_feedback: Dict[str, str],
+    structured_feedback: Optional[Dict[str, Feedback]],
+    features: Optional[Dict[str, FeedbackFeatures]]
+) -> List[FeedbackFeatures]:
+    """Get per-reviewer features, extracting them if not precomputed."""
+    if features is None:
+        features = extract_features(reviewer_feedback, structured_feedback)
+    return [features[role] for role in reviewer_feedback]
+
+
+def _calculate_agreement_ratio(
+    reviewer_feedback: Dict[str, str],
+    structured_feedback: Optional[Dict[str, Feedback]] = None,
+    features: Optional[Dict[str, FeedbackFeatures]] = None
+) -> float:
     """Calculate how much reviewers agree with each other.
     
     Uses keyword overlap and verdict similarity.
     
     Args:
         reviewer_feedback: Reviewer feedback dictionary
+        structured_feedback: Optional structured Feedback by role
+        features: Optional precomputed features by role
         
     Returns:
         Agreement score (0.0 to 1.0)
@@ -111,20 +521,10 @@ def _calculate_agreement_ratio(reviewer_feedback: Dict[str, str]) -> float:
     if len(reviewer_feedback) < 2:
         return 1.0  # Single reviewer = perfect agreement
     
-    feedback_list = list(reviewer_feedback.values())
+    feature_list = _features(reviewer_feedback, structured_feedback, features)
     
     # Extract verdicts
-    verdicts = []
-    for feedback in feedback_list:
-        feedback_upper = feedback.upper()
-        if 'APPROVE' in feedback_upper and 'REJECT' not in feedback_upper:
-            verdicts.append('approve')
-        elif 'REJECT' in feedback_upper:
-            verdicts.append('reject')
-        elif 'NEEDS REVISION' in feedback_upper or 'NEEDS_REVISION' in feedback_upper:
-            verdicts.append('revision')
-        else:
-            verdicts.append('neutral')
+    verdicts = [role_features.verdict for role_features in feature_list]
     
     # Calculate verdict agreement
     if verdicts:
@@ -134,17 +534,12 @@ def _calculate_agreement_ratio(reviewer_feedback: Dict[str, str]) -> float:
         verdict_agreement = 0.5
     
     # Calculate keyword overlap
-    all_words = set()
-    word_sets = []
-    
-    for feedback in feedback_list:
-        words = set(re.findall(r'\b\w{4,}\b', feedback.lower()))  # Words 4+ chars
-        word_sets.append(words)
-        all_words.update(words)
+    word_sets = [role_features.words for role_features in feature_list]
+    all_words = frozenset().union(*word_sets)
     
     # Common words across all reviewers
     if len(word_sets) > 1 and all_words:
-        common_words = set.intersection(*word_sets)
+        common_words = frozenset.intersection(*word_sets)
         keyword_overlap = len(common_words) / len(all_words) if all_words else 0.0
     else:
         keyword_overlap = 0.5
@@ -155,11 +550,15 @@ def _calculate_agreement_ratio(reviewer_feedback: Dict[str, str]) -> float:
     return agreement
 
 
-def _calculate_sentiment_consistency(reviewer_feedback: Dict[str, str]) -> float:
+def _calculate_sentiment_consistency(
+    reviewer_feedback: Dict[str, str],
+    features: Optional[Dict[str, FeedbackFeatures]] = None
+) -> float:
     """Calculate sentiment consistency across reviewers.
     
     Args:
         reviewer_feedback: Reviewer feedback dictionary
+        features: Optional precomputed features by role
         
     Returns:
         Sentiment consistency score (0.0 to 1.0)
@@ -168,20 +567,9 @@ def _calculate_sentiment_consistency(reviewer_feedback: Dict[str, str]) -> float
         return 0.5
     
     # Count positive and negative indicators
-    positive_counts = []
-    negative_counts = []
-    
-    positive_keywords = ['good', 'excellent', 'strong', 'clear', 'well', 'approve', 'solid']
-    negative_keywords = ['issue', 'problem', 'error', 'missing', 'unclear', 'weak', 'reject', 'critical']
-    
-    for feedback in reviewer_feedback.values():
-        feedback_lower = feedback.lower()
-        
-        positive_count = sum(1 for word in positive_keywords if word in feedback_lower)
-        negative_count = sum(1 for word in negative_keywords if word in feedback_lower)
-        
-        positive_counts.append(positive_count)
-        negative_counts.append(negative_count)
+    feature_list = _features(reviewer_feedback, None, features)
+    positive_counts = [role_features.positive_count for role_features in feature_list]
+    negative_counts = [role_features.negative_count for role_features in feature_list]
     
     # Calculate variance in sentiment
     if positive_counts and negative_counts:
@@ -203,11 +591,17 @@ def _calculate_sentiment_consistency(reviewer_feedback: Dict[str, str]) -> float
     return 0.5
 
 
-def _calculate_severity_score(reviewer_feedback: Dict[str, str]) -> float:
+def _calculate_severity_score(
+    reviewer_feedback: Dict[str, str],
+    structured_feedback: Optional[Dict[str, Feedback]] = None,
+    features: Optional[Dict[str, FeedbackFeatures]] = None
+) -> float:
     """Calculate severity score (fewer critical issues = higher score).
     
     Args:
         reviewer_feedback: Reviewer feedback dictionary
+        structured_feedback: Optional structured Feedback by role
+        features: Optional precomputed features by role
         
     Returns:
         Severity score (0.0 to 1.0)
@@ -216,17 +610,11 @@ def _calculate_severity_score(reviewer_feedback: Dict[str, str]) -> float:
         return 0.5
     
     # Count severity levels
-    critical_count = 0
-    high_count = 0
-    medium_count = 0
-    low_count = 0
-    
-    for feedback in reviewer_feedback.values():
-        feedback_upper = feedback.upper()
-        critical_count += feedback_upper.count('CRITICAL')
-        high_count += feedback_upper.count('HIGH')
-        medium_count += feedback_upper.count('MEDIUM')
-        low_count += feedback_upper.count('LOW')
+    feature_list = _features(reviewer_feedback, structured_feedback, features)
+    critical_count = sum(role_features.critical_count for role_features in feature_list)
+    high_count = sum(role_features.high_count for role_features in feature_list)
+    medium_count = sum(role_features.medium_count for role_features in feature_list)
+    low_count = sum(role_features.low_count for role_features in feature_list)
     
     # Total issues
     total_issues = critical_count + high_count + medium_count + low_count
@@ -253,11 +641,15 @@ def _calculate_severity_score(reviewer_feedback: Dict[str, str]) -> float:
     return severity_score
 
 
-def _calculate_feedback_quality(reviewer_feedback: Dict[str, str]) -> float:
+def _calculate_feedback_quality(
+    reviewer_feedback: Dict[str, str],
+    features: Optional[Dict[str, FeedbackFeatures]] = None
+) -> float:
     """Calculate feedback quality based on length and detail.
     
     Args:
         reviewer_feedback: Reviewer feedback dictionary
+        features: Optional precomputed features by role
         
     Returns:
         Quality score (0.0 to 1.0)
@@ -267,9 +659,9 @@ def _calculate_feedback_quality(reviewer_feedback: Dict[str, str]) -> float:
     
     quality_scores = []
     
-    for feedback in reviewer_feedback.values():
+    for role_features in _features(reviewer_feedback, None, features):
         # Length indicator (not too short, not too verbose)
-        length = len(feedback)
+        length = role_features.length
         if length < 50:
             length_score = length / 50  # Too short
         elif length > 2000:
@@ -278,14 +670,10 @@ def _calculate_feedback_quality(reviewer_feedback: Dict[str, str]) -> float:
             length_score = 1.0  # Good length
         
         # Structure indicators
-        has_verdict = 'VERDICT' in feedback.upper() or 'APPROVE' in feedback.upper() or 'REJECT' in feedback.upper()
-        has_findings = 'FINDING' in feedback.upper() or 'ISSUE' in feedback.upper()
-        has_suggestions = 'SUGGEST' in feedback.upper() or 'RECOMMEND' in feedback.upper()
-        
         structure_score = (
-            (0.4 if has_verdict else 0.0) +
-            (0.3 if has_findings else 0.0) +
-            (0.3 if has_suggestions else 0.0)
+            (0.4 if role_features.has_verdict else 0.0) +
+            (0.3 if role_features.has_findings else 0.0) +
+            (0.3 if role_features.has_suggestions else 0.0)
         )
         
         # Combined quality
@@ -330,7 +718,13 @@ def is_ready_for_finalization(confidence: float, threshold: float = CONFIDENCE_T
     return confidence >= threshold
 
 
-def _has_improvement_tracking(reviewer_feedback: Dict[str, str]) -> bool:
+
+
+def _has_improvement_tracking(
+    reviewer_feedback: Dict[str, str],
+    structured_feedback: Optional[Dict[str, Feedback]] = None,
+    features: Optional[Dict[str, FeedbackFeatures]] = None
+) -> bool:
     """Check if reviewer feedback contains improvement tracking data.
     
     Improvement tracking includes markers like:
@@ -341,21 +735,23 @@ def _has_improvement_tracking(reviewer_feedback: Dict[str, str]) -> bool:
     
     Args:
         reviewer_feedback: Dictionary of reviewer feedback
+        structured_feedback: Optional structured Feedback by role
+        features: Optional precomputed features by role
         
     Returns:
         True if improvement tracking is present, False otherwise
     """
-    improvement_markers = ['FIXED:', 'PARTIALLY FIXED:', 'NOT ADDRESSED:', 'IMPROVEMENT TRACKING']
-    
-    for feedback in reviewer_feedback.values():
-        feedback_upper = feedback.upper()
-        if any(marker in feedback_upper for marker in improvement_markers):
-            return True
-    
-    return False
+    return any(
+        role_features.has_improvement_tracking
+        for role_features in _features(reviewer_feedback, structured_feedback, features)
+    )
 
 
-def _calculate_improvement_score(reviewer_feedback: Dict[str, str]) -> float:
+def _calculate_improvement_score(
+    reviewer_feedback: Dict[str, str],
+    structured_feedback: Optional[Dict[str, Feedback]] = None,
+    features: Optional[Dict[str, FeedbackFeatures]] = None
+) -> float:
     """Calculate improvement score based on issue tracking.
     
     Rewards:
@@ -369,38 +765,18 @@ def _calculate_improvement_score(reviewer_feedback: Dict[str, str]) -> float:
     
     Args:
         reviewer_feedback: Dictionary of reviewer feedback
+        structured_feedback: Optional structured Feedback by role
+        features: Optional precomputed features by role
         
     Returns:
         Improvement score (0.0 to 1.0)
     """
-    fixed_count = 0
-    partially_fixed_count = 0
-    not_addressed_count = 0
-    new_critical_count = 0
-    new_high_count = 0
-    
-    for feedback in reviewer_feedback.values():
-        feedback_upper = feedback.upper()
-        
-        # Count fixed issues
-        fixed_count += feedback_upper.count('✅ FIXED')
-        fixed_count += feedback_upper.count('FIXED:')
-        
-        # Count partially fixed issues
-        partially_fixed_count += feedback_upper.count('⚠️ PARTIALLY FIXED')
-        partially_fixed_count += feedback_upper.count('PARTIALLY FIXED:')
-        
-        # Count not addressed issues
-        not_addressed_count += feedback_upper.count('❌ NOT ADDRESSED')
-        not_addressed_count += feedback_upper.count('NOT ADDRESSED:')
-        
-        # Count new issues by severity
-        # Look for "NEW FINDINGS" section and count severities there
-        if 'NEW FINDINGS' in feedback_upper:
-            new_findings_section = feedback_upper.split('NEW FINDINGS')[1] if len(feedback_upper.split('NEW FINDINGS')) > 1 else ''
-            # Only count in new findings section, not in improvement tracking
-            new_critical_count += new_findings_section.count('[SEVERITY: CRITICAL')
-            new_high_count += new_findings_section.count('[SEVERITY: HIGH')
+    feature_list = _features(reviewer_feedback, structured_feedback, features)
+    fixed_count = sum(role_features.fixed_count for role_features in feature_list)
+    partially_fixed_count = sum(role_features.partially_fixed_count for role_features in feature_list)
+    not_addressed_count = sum(role_features.not_addressed_count for role_features in feature_list)
+    new_critical_count = sum(role_features.new_critical_count for role_features in feature_list)
+    new_high_count = sum(role_features.new_high_count for role_features in feature_list)
     
     # Calculate score
     # Positive contributions
@@ -424,4 +800,3 @@ def _calculate_improvement_score(reviewer_feedback: Dict[str, str]) -> float:
     else:
         # Linear scale from 0.5 (no change) to 0-1
         return 0.5 + (net_improvement / (2 * max_improvement))
-
@@ -1,7 +1,7 @@
 """Iteration state dataclass for tracking multi-agent workflow state."""
 
 from dataclasses import dataclass, field
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 
 
@@ -26,6 +26,7 @@ class IterationState:
         approved: Whether human has approved this iteration
         timestamp: When iteration was created
         error: Error message if iteration failed
+        timed_out: Reviewer roles (and 'Aggregator') that ran out of time
     """
     
     iteration: int
@@ -36,6 +37,7 @@ class IterationState:
     approved: bool = False
     timestamp: datetime = field(default_factory=datetime.now)
     error: Optional[str] = None
+    timed_out: List[str] = field(default_factory=list)
     
     def is_approved(self) -> bool:
         """Check if iteration is approved by human.
@@ -78,7 +80,8 @@ class IterationState:
             'confidence': self.confidence,
             'approved': self.approved,
             'timestamp': self.timestamp.isoformat(),
-            'error': self.error
+            'error': self.error,
+            'timed_out': self.timed_out
         }
     
     @classmethod
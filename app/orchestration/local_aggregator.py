@@ -0,0 +1,419 @@
+"""Deterministic local aggregation of reviewer feedback (no LLM call)."""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from app.orchestration.confidence_model import FeedbackFeatures
+from app.utils.similarity import MinHashLSH
+
+
+# Severity order, lowest to highest
+PRIORITIES = ('LOW', 'MEDIUM', 'HIGH', 'CRITICAL')
+
+# Priorities that make a change required rather than optional
+REQUIRED_PRIORITIES = ('CRITICAL', 'HIGH')
+
+_LIST_ITEM = re.compile(r'^(?:\d+[.)]|[-•*])\s+(.+)$')
+_SEVERITY_TAG = re.compile(r'\[Severity:\s*(CRITICAL|HIGH|MEDIUM|LOW)\]\s*', re.IGNORECASE)
+_TRACKING_LABEL = re.compile(r'^[^\w\[]*(PARTIALLY FIXED|NOT ADDRESSED|FIXED)\s*:\s*', re.IGNORECASE)
+_HEADER = re.compile(r'^([A-Z][A-Z ]+?)\s*(?:\(.*\))?\s*:$')
+
+# Placeholder items copied from the prompt format instead of real content
+_PLACEHOLDER = re.compile(r'^(?:none\b|n/a\b|\[list )', re.IGNORECASE)
+
+
+@dataclass
+class ReviewItem:
+    """One finding, suggestion or fixed issue from a reviewer.
+    
+    Attributes:
+        reviewer: Reviewer role
+        text: Description without list markers or severity tags
+        priority: CRITICAL, HIGH, MEDIUM or LOW
+        kind: 'issue', 'suggestion' or 'fixed'
+    """
+    
+    reviewer: str
+    text: str
+    priority: str
+    kind: str
+
+
+@dataclass
+class IssueGroup:
+    """Near-duplicate items raised by one or more reviewers.
+    
+    Attributes:
+        items: Items in the order they were raised
+    """
+    
+    items: List[ReviewItem] = field(default_factory=list)
+    
+    @property
+    def text(self) -> str:
+        """First occurrence, used when reporting the group."""
+        return self.items[0].text
+    
+    @property
+    def reviewers(self) -> List[str]:
+        """Distinct reviewers who raised the item, in order."""
+        return list(dict.fromkeys(item.reviewer for item in self.items))
+    
+    @property
+    def priority(self) -> str:
+        """Highest priority any reviewer gave the item."""
+        return max((item.priority for item in self.items), key=PRIORITIES.index)
+    
+    @property
+    def lowest_priority(self) -> str:
+        """Lowest priority any reviewer gave the item."""
+        return min((item.priority for item in self.items), key=PRIORITIES.index)
+
+
+@dataclass
+class BoardAnalysis:
+    """Parsed and clustered reviewer feedback.
+    
+    Attributes:
+        verdicts: Verdict per reviewer (approve, reject, revision or neutral)
+        items: All parsed items
+        issues: Issue groups, most important first
+        suggestions: Suggestion groups, in order raised
+        total_chars: Total length of the reviewer feedback
+    """
+    
+    verdicts: Dict[str, str]
+    items: List[ReviewItem]
+    issues: List[IssueGroup]
+    suggestions: List[IssueGroup]
+    total_chars: int
+    
+    def reviewers_with(self, verdict: str) -> List[str]:
+        """Get the reviewers who gave a verdict."""
+        return [role for role, given in self.verdicts.items() if given == verdict]
+    
+    @property
+    def unanimous(self) -> bool:
+        """Whether every reviewer gave the same explicit verdict."""
+        return len(set(self.verdicts.values())) == 1 and 'neutral' not in self.verdicts.values()
+    
+    @property
+    def split(self) -> bool:
+        """Whether some reviewers approve while others object."""
+        verdicts = set(self.verdicts.values())
+        return 'approve' in verdicts and bool(verdicts & {'reject', 'revision'})
+    
+    @property
+    def issue_count(self) -> int:
+        """Number of issues raised, before clustering."""
+        return sum(1 for item in self.items if item.kind == 'issue')
+
+
+class LocalAggregator:
+    """Rule-and-similarity based board decision, without an LLM call.
+    
+    Reviewer feedback is parsed into findings, suggestions and fixed issues;
+    near-duplicate findings are clustered with MinHash/LSH so issues raised
+    by several reviewers become consensus issues. Priorities come from the
+    highest severity given to an issue, conflicts from opposing verdicts and
+    diverging severities, and the recommendation from fixed rules. The output
+    follows the BOARD DECISION format of the LLM aggregator.
+    """
+    
+    DEFAULT_MAX_ITEMS = 10  # Per output section
+    
+    def __init__(self, clusterer: Optional[MinHashLSH] = None, max_items: int = DEFAULT_MAX_ITEMS):
+        """Initialize local aggregator.
+        
+        Args:
+            clusterer: Near-duplicate clusterer (default: MinHashLSH())
+            max_items: Maximum entries listed per output section
+        """
+        self.clusterer = clusterer if clusterer is not None else MinHashLSH()
+        self.max_items = max_items
+    
+    def analyze(self, reviewer_feedback: Dict[str, str]) -> BoardAnalysis:
+        """Parse and cluster reviewer feedback.
+        
+        Args:
+            reviewer_feedback: Dictionary mapping reviewer role to feedback string
+        
+        Returns:
+            BoardAnalysis of the feedback
+        """
+        verdicts = {}
+        items = []
+        for role, feedback in reviewer_feedback.items():
+            verdicts[role] = FeedbackFeatures.from_text(feedback).verdict
+            items.extend(parse_review_items(role, feedback))
+        
+        issues = self._group([item for item in items if item.kind == 'issue'])
+        # Most important first: priority, then how many reviewers raised it
+        issues.sort(key=lambda group: (-PRIORITIES.index(group.priority), -len(group.reviewers)))
+        suggestions = self._group([item for item in items if item.kind == 'suggestion'])
+        
+        return BoardAnalysis(
+            verdicts=verdicts,
+            items=items,
+            issues=issues,
+            suggestions=suggestions,
+            total_chars=sum(len(feedback) for feedback in reviewer_feedback.values())
+        )
+    
+    def aggregate(self, reviewer_feedback: Dict[str, str], title: str = "BOARD DECISION") -> str:
+        """Aggregate feedback into a board decision.
+        
+        Args:
+            reviewer_feedback: Dictionary mapping reviewer role to feedback string
+            title: Heading of the decision
+        
+        Returns:
+            Board decision string
+        """
+        return self.render(self.analyze(reviewer_feedback), title)
+    
+    def render(self, analysis: BoardAnalysis, title: str = "BOARD DECISION") -> str:
+        """Format an analysis as a board decision.
+        
+        Args:
+            analysis: Analysis from analyze()
+            title: Heading of the decision
+        
+        Returns:
+            Board decision string
+        """
+        limit = self.max_items
+        consensus = [group for group in analysis.issues if len(group.reviewers) >= 2]
+        unique = [group for group in analysis.issues if len(group.reviewers) < 2]
+        required = [group for group in analysis.issues if group.priority in REQUIRED_PRIORITIES]
+        optional = [group for group in analysis.issues if group.priority not in REQUIRED_PRIORITIES] + analysis.suggestions
+        
+        lines = [title, "=" * len(title), ""]
+        
+        lines.append(f"TOTAL REVIEWERS: {len(analysis.verdicts)}")
+        lines.append("")
+        lines.append("VERDICT SUMMARY:")
+        lines.append(f"- Approvals: {len(analysis.reviewers_with('approve'))}")
+        lines.append(f"- Needs Revision: {len(analysis.reviewers_with('revision'))}")
+        lines.append(f"- Rejections: {len(analysis.reviewers_with('reject'))}")
+        lines.append("")
+        
+        lines.append("CONSENSUS ISSUES (mentioned by 2+ reviewers):")
+        lines.extend(
+            f"- [Priority: {group.priority}] {group.text} ({', '.join(group.reviewers)})"
+            for group in consensus[:limit]
+        )
+        lines.extend(["- None"] if not consensus else [])
+        lines.append("")
+        
+        lines.append("UNIQUE CONCERNS:")
+        lines.extend(f"- [Reviewer: {group.reviewers[0]}] {group.text}" for group in unique[:limit])
+        lines.extend(["- None"] if not unique else [])
+        lines.append("")
+        
+        lines.append("CONFLICTING OPINIONS:")
+        lines.extend(self._conflicts(analysis, required) or ["- None"])
+        lines.append("")
+        
+        lines.append("REQUIRED CHANGES:")
+        lines.extend(
+            f"{i}. [Priority: {group.priority}] {group.text} (raised by {', '.join(group.reviewers)})"
+            for i, group in enumerate(required[:limit], 1)
+        )
+        lines.extend(["- None"] if not required else [])
+        lines.append("")
+        
+        lines.append("OPTIONAL IMPROVEMENTS:")
+        lines.extend(
+            f"{i}. [Priority: {group.priority}] {group.text}"
+            for i, group in enumerate(optional[:limit], 1)
+        )
+        lines.extend(["- None"] if not optional else [])
+        lines.append("")
+        
+        lines.append("IDENTIFIED STRENGTHS:")
+        strengths = [f"- Fixed: {item.text} ({item.reviewer})" for item in analysis.items if item.kind == 'fixed']
+        approvers = analysis.reviewers_with('approve')
+        if approvers:
+            strengths.append(f"- Approved by {', '.join(approvers)}")
+        lines.extend(strengths[:limit] or ["- None noted"])
+        lines.append("")
+        
+        lines.append("RISK ASSESSMENT:")
+        lines.extend(self._risks(analysis))
+        lines.append("")
+        
+        lines.append("RECOMMENDATION:")
+        lines.append(self._recommendation(analysis))
+        
+        return "\n".join(lines)
+    
+    def _group(self, items: List[ReviewItem]) -> List[IssueGroup]:
+        """Cluster near-duplicate items."""
+        return [
+            IssueGroup(items=[items[index] for index in indices])
+            for indices in self.clusterer.cluster([item.text for item in items])
+        ]
+    
+    def _conflicts(self, analysis: BoardAnalysis, required: List[IssueGroup]) -> List[str]:
+        """Describe verdict and severity conflicts with a rule-based resolution."""
+        lines = []
+        
+        if analysis.split:
+            approvers = analysis.reviewers_with('approve')
+            objectors = analysis.reviewers_with('reject') + analysis.reviewers_with('revision')
+            lines.append(
+                f"- Conflict: {', '.join(approvers)} approve(s), while {', '.join(objectors)} "
+                f"request(s) changes or reject(s)"
+            )
+            if required:
+                lines.append(f"- Resolution: Address the {len(required)} required change(s) before approving")
+            else:
+                lines.append("- Resolution: No critical or high-priority issue backs the objection; apply the optional improvements")
+        
+        for group in analysis.issues:
+            if len(group.reviewers) >= 2 and group.priority != group.lowest_priority:
+                lines.append(
+                    f"- Conflict: Reviewers rate \"{group.text}\" from {group.lowest_priority} to {group.priority}"
+                )
+                lines.append(f"- Resolution: Treat it as {group.priority}")
+        
+        return lines
+    
+    def _risks(self, analysis: BoardAnalysis) -> List[str]:
+        """Assess risk from open issue priorities and rejections."""
+        lines = []
+        
+        critical = [group for group in analysis.issues if group.priority == 'CRITICAL']
+        high = [group for group in analysis.issues if group.priority == 'HIGH']
+        if critical:
+            lines.append(f"- [Risk Level: HIGH] {len(critical)} critical issue(s) open, e.g. {critical[0].text}")
+        if high:
+            lines.append(f"- [Risk Level: MEDIUM] {len(high)} high-priority issue(s) open, e.g. {high[0].text}")
+        
+        rejecters = analysis.reviewers_with('reject')
+        if rejecters:
+            lines.append(f"- [Risk Level: HIGH] Rejected by {', '.join(rejecters)}")
+        
+        return lines or ["- [Risk Level: LOW] No critical or high-priority issues raised"]
+    
+    @staticmethod
+    def _recommendation(analysis: BoardAnalysis) -> str:
+        """Pick the recommendation from verdicts and issue priorities."""
+        reviewer_count = len(analysis.verdicts)
+        rejections = len(analysis.reviewers_with('reject'))
+        priorities = {group.priority for group in analysis.issues}
+        
+        if reviewer_count and rejections > reviewer_count / 2:
+            return "REJECT"
+        if rejections or 'CRITICAL' in priorities:
+            return "NEEDS MAJOR REVISION"
+        if 'HIGH' in priorities or analysis.reviewers_with('revision'):
+            return "APPROVE WITH CHANGES"
+        if analysis.reviewers_with('approve'):
+            return "APPROVE"
+        return "APPROVE WITH CHANGES" if analysis.issues else "NEEDS REVISION"
+
+
+class LocalAggregationPolicy:
+    """Decides when the local aggregator can replace the LLM aggregator call.
+    
+    Local aggregation is used when all reviewers gave the same verdict (no
+    conflict to resolve), or when the feedback is small and not split
+    between approval and objection, so an LLM synthesis adds little over the
+    rule-based one.
+    """
+    
+    DEFAULT_MAX_ISSUES = 6
+    DEFAULT_MAX_CHARS = 1500
+    
+    def __init__(
+        self,
+        when_unanimous: bool = True,
+        max_issues: int = DEFAULT_MAX_ISSUES,
+        max_chars: int = DEFAULT_MAX_CHARS
+    ):
+        """Initialize policy.
+        
+        Args:
+            when_unanimous: Aggregate locally when all verdicts agree
+            max_issues: Aggregate locally when at most this many issues were
+                raised in total (0 disables the size rule)
+            max_chars: ...and the feedback is at most this many characters
+        """
+        self.when_unanimous = when_unanimous
+        self.max_issues = max_issues
+        self.max_chars = max_chars
+    
+    def reason(self, analysis: BoardAnalysis) -> Optional[str]:
+        """Get why the feedback can be aggregated locally.
+        
+        Args:
+            analysis: Analysis of the reviewer feedback
+        
+        Returns:
+            Reason string, or None if the LLM aggregator should be used
+        """
+        if self.when_unanimous and analysis.unanimous:
+            verdict = next(iter(analysis.verdicts.values()))
+            return f"unanimous {verdict} verdicts"
+        if (
+            self.max_issues
+            and not analysis.split
+            and analysis.issue_count <= self.max_issues
+            and analysis.total_chars <= self.max_chars
+        ):
+            return f"small feedback ({analysis.issue_count} issues)"
+        return None
+
+
+def parse_review_items(reviewer: str, feedback: str) -> List[ReviewItem]:
+    """Parse one reviewer's feedback into items.
+    
+    List items under FINDINGS / NEW FINDINGS become issues, items under
+    SUGGESTED IMPROVEMENTS become suggestions, and improvement tracking
+    items become fixed issues (✅) or open issues (⚠️ MEDIUM, ❌ HIGH).
+    Outside known sections only items with a severity tag are kept.
+    
+    Args:
+        reviewer: Reviewer role
+        feedback: Feedback string
+    
+    Returns:
+        Parsed items in order
+    """
+    items = []
+    section = None
+    
+    for line in feedback.split('\n'):
+        line = line.strip()
+        header = _HEADER.match(line)
+        if header:
+            section = header.group(1).strip().upper()
+            continue
+        
+        match = _LIST_ITEM.match(line)
+        if not match:
+            continue
+        text = match.group(1).strip()
+        
+        tracking = _TRACKING_LABEL.match(text)
+        if tracking:
+            label = tracking.group(1).upper()
+            text = text[tracking.end():].strip()
+            kind = 'fixed' if label == 'FIXED' else 'issue'
+            default_priority = 'HIGH' if label == 'NOT ADDRESSED' else 'MEDIUM'
+        elif section and 'SUGGEST' in section:
+            kind, default_priority = 'suggestion', 'LOW'
+        elif section and 'FINDING' in section or _SEVERITY_TAG.search(text):
+            kind, default_priority = 'issue', 'MEDIUM'
+        else:
+            continue
+        
+        severity = _SEVERITY_TAG.search(text)
+        priority = severity.group(1).upper() if severity else default_priority
+        text = _SEVERITY_TAG.sub('', text).strip()
+        if text and not _PLACEHOLDER.match(text):
+            items.append(ReviewItem(reviewer=reviewer, text=text, priority=priority, kind=kind))
+    
+    return items
@@ -1,10 +1,13 @@
 """Reviewer manager for parallel multi-agent execution."""
 
 import asyncio
-from typing import Dict, List
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, as_completed
 from app.agents.reviewer import (
     ReviewerAgent,
+    MultiRoleReviewer,
     TechnicalReviewer,
     ClarityReviewer,
     SecurityReviewer,
@@ -12,7 +15,17 @@ from app.agents.reviewer import (
     UXReviewer
 )
 from app.llm.base_provider import BaseLLMProvider
+from app.llm.hedged_provider import HedgedProvider
 from app.models.feedback import Feedback
+from app.orchestration.section_diff import (
+    SectionDiff,
+    carry_forward,
+    diff_sections,
+    format_diff_excerpt,
+    merge_carried_points,
+    split_carried_points
+)
+from app.utils.executor_service import ExecutorSaturatedError, ExecutorService, get_executor_service
 
 
 # Map role names to reviewer classes
@@ -24,21 +37,82 @@ REVIEWER_CLASS_MAP = {
     'UX Reviewer': UXReviewer,
 }
 
+# Feedback recorded for a reviewer that did not finish within its budget
+REVIEW_TIMEOUT_MESSAGE = "Review timed out after {timeout:g}s"
+
 
 class ReviewerManager:
     """Manages parallel execution of multiple reviewer agents.
     
     This class coordinates the execution of multiple specialized reviewer agents,
     running them in parallel when possible to improve performance.
+    
+    Parallel reviews run on the process-wide ExecutorService, so concurrent
+    sessions share one bounded pool instead of each starting its own threads.
+    Reviewer agents are created once per role and reused across iterations.
+    
+    In diff review mode, iterations after the first send each reviewer only
+    the sections that changed since the previous iteration (plus a summary
+    of the unchanged ones) and the previous findings about them; findings
+    about unchanged sections carry forward without being re-reviewed.
     """
     
-    def __init__(self, llm_provider: BaseLLMProvider):
+    def __init__(
+        self,
+        llm_provider: BaseLLMProvider,
+        hedge_percentile: Optional[float] = None,
+        hedge_provider: Optional[BaseLLMProvider] = None,
+        combined: bool = False,
+        structured_output: bool = False,
+        executor: Optional[ExecutorService] = None,
+        diff_review: bool = False
+    ):
         """Initialize reviewer manager.
         
         Args:
             llm_provider: LLM provider for all reviewers
+            hedge_percentile: Opt-in request hedging - reviewer calls still
+                running at this latency percentile (e.g. 0.9) are duplicated
+                and the first response wins (None = disabled)
+            hedge_provider: Provider for hedge requests (default llm_provider)
+            combined: Review all selected roles in one structured call that
+                returns JSON keyed by role, falling back to per-role calls if
+                it fails or can't be parsed (default False)
+            structured_output: Have reviewers return JSON with a verdict and
+                typed findings, using provider JSON/schema modes where
+                available (default False)
+            executor: Executor for parallel reviews (default: the shared
+                process-wide executor)
+            diff_review: Re-review only changed sections in iterations after
+                the first, when run_reviewers gets the previous content
+                (default False; not used by combined reviews)
         """
         self.llm_provider = llm_provider
+        self.combined = combined
+        self.structured_output = structured_output
+        self.diff_review = diff_review
+        self.executor = executor if executor is not None else get_executor_service()
+        
+        # Reviewer agents by role; they hold no per-review state
+        self._reviewers: Dict[str, ReviewerAgent] = {}
+        self._reviewers_lock = threading.Lock()
+        
+        # Feedback objects of the last run_reviewers call, by role
+        self.last_feedback: Dict[str, Feedback] = {}
+        
+        # Roles of the last run_reviewers call that ran out of time
+        self.timed_out_roles: List[str] = []
+        
+        # Reviewer calls go through the hedging wrapper when enabled, so a
+        # single straggler no longer sets the latency of the whole fan-out
+        if hedge_percentile is not None:
+            self.reviewer_provider = HedgedProvider(
+                llm_provider,
+                hedge_provider=hedge_provider,
+                percentile=hedge_percentile
+            )
+        else:
+            self.reviewer_provider = llm_provider
     
     def run_reviewers(
         self,
@@ -46,7 +120,9 @@ class ReviewerManager:
         selected_roles: List[str],
         iteration: int,
         parallel: bool = True,
-        previous_feedback: Dict[str, str] = None
+        previous_feedback: Dict[str, str] = None,
+        timeout: Optional[float] = None,
+        previous_content: Optional[str] = None
     ) -> Dict[str, str]:
         """Run multiple reviewers and collect their feedback.
         
@@ -56,74 +132,265 @@ class ReviewerManager:
             iteration: Current iteration number
             parallel: Whether to run reviewers in parallel (default True)
             previous_feedback: Optional dict of previous feedback by role for iteration tracking
+            timeout: Optional budget in seconds for all reviews. Reviewers
+                not done by then are cancelled (or abandoned if already
+                running), get REVIEW_TIMEOUT_MESSAGE as feedback and are
+                listed in timed_out_roles (None = wait indefinitely)
+            previous_content: Presenter output of the previous iteration; in
+                diff review mode, reviewers whose previous Feedback is still
+                in last_feedback review only the changed sections
             
         Returns:
-            Dictionary mapping reviewer role to feedback string
+            Dictionary mapping reviewer role to feedback string (the
+            Feedback objects are kept in last_feedback)
         """
+        diff, previous_results = self._plan_diff_review(presenter_output, previous_content, iteration)
+        self.last_feedback = {}
+        self.timed_out_roles = []
+        
+        if timeout is not None and timeout <= 0:
+            return self._mark_timed_out(selected_roles, timeout)
+        
+        # One deadline for the whole run: a failed combined call spends part
+        # of the budget, and the per-role fallback only gets what is left
+        deadline = None if timeout is None else time.monotonic() + timeout
+        
+        if self.combined and len(selected_roles) > 1:
+            feedback_dict = self._run_reviewers_combined(
+                presenter_output, selected_roles, iteration, previous_feedback, timeout, deadline=deadline
+            )
+            if feedback_dict is not None:
+                return feedback_dict
+            if deadline is not None and self._remaining(deadline) <= 0:
+                return self._mark_timed_out(selected_roles, timeout)
+        
         if parallel:
-            return self._run_reviewers_parallel(presenter_output, selected_roles, iteration, previous_feedback)
+            return self._run_reviewers_parallel(
+                presenter_output, selected_roles, iteration, previous_feedback, timeout,
+                diff=diff, previous_results=previous_results, deadline=deadline
+            )
+        elif timeout is not None:
+            # One private thread keeps reviews sequential while letting the
+            # budget abandon a hung call
+            executor = ThreadPoolExecutor(max_workers=1)
+            try:
+                return self._run_reviewers_parallel(
+                    presenter_output, selected_roles, iteration, previous_feedback, timeout, executor=executor,
+                    diff=diff, previous_results=previous_results, deadline=deadline
+                )
+            finally:
+                executor.shutdown(wait=False, cancel_futures=True)
         else:
-            return self._run_reviewers_sequential(presenter_output, selected_roles, iteration, previous_feedback)
+            return self._run_reviewers_sequential(
+                presenter_output, selected_roles, iteration, previous_feedback,
+                diff=diff, previous_results=previous_results
+            )
     
+    def _plan_diff_review(
+        self,
+        presenter_output: str,
+        previous_content: Optional[str],
+        iteration: int
+    ) -> Tuple[Optional[SectionDiff], Dict[str, Feedback]]:
+        """Decide whether this run can review only the changed sections.
+        
+        Args:
+            presenter_output: Content to review
+            previous_content: Previous iteration's content, if known
+            iteration: Iteration number
+            
+        Returns:
+            Tuple of (section diff or None for a full review, previous
+            Feedback by role to carry findings forward from)
+        """
+        if not self.diff_review or not previous_content or iteration < 2:
+            return None, {}
+        
+        previous_results = {
+            role: feedback for role, feedback in self.last_feedback.items()
+            if feedback.iteration == iteration - 1
+        }
+        if not previous_results:
+            return None, {}
+        
+        diff = diff_sections(previous_content, presenter_output)
+        if diff.has_changes and not diff.worth_it:
+            print(f"[ReviewerManager] {diff.changed_ratio:.0%} of the content changed, running full reviews")
+            return None, {}
+        
+        print(
+            f"[ReviewerManager] Diff review: {len(diff.changed)} changed, "
+            f"{len(diff.unchanged)} unchanged, {len(diff.removed)} removed sections"
+        )
+        return diff, previous_results
+
     def _run_reviewers_parallel(
         self,
         presenter_output: str,
         selected_roles: List[str],
         iteration: int,
-        previous_feedback: Dict[str, str] = None
+        previous_feedback: Dict[str, str] = None,
+        timeout: Optional[float] = None,
+        executor: Optional[Any] = None,
+        diff: Optional[SectionDiff] = None,
+        previous_results: Optional[Dict[str, Feedback]] = None,
+        deadline: Optional[float] = None
     ) -> Dict[str, str]:
-        """Run reviewers in parallel using thread pool.
+        """Run reviewers in parallel on the shared executor.
+        
+        The budget covers waiting for a slot in a full shared queue as well
+        as the reviews themselves: it is measured from before the first
+        submit, and roles that can't be queued before it runs out time out.
         
         Args:
             presenter_output: Content to review
             selected_roles: List of reviewer roles
             iteration: Iteration number
             previous_feedback: Optional dict of previous feedback by role
+            timeout: Optional budget in seconds for all reviews
+            executor: Executor to submit to (default self.executor)
+            diff: Section diff for diff reviews (None = full reviews)
+            previous_results: Previous Feedback by role, for diff reviews
+            deadline: time.monotonic() by which the budget runs out
+                (default: timeout from now)
             
         Returns:
             Dictionary of reviewer feedback
         """
         feedback_dict = {}
+        executor = executor if executor is not None else self.executor
+        if deadline is None and timeout is not None:
+            deadline = time.monotonic() + timeout
         
         # Handle empty list
         if len(selected_roles) == 0:
             return feedback_dict
         
-        # Use thread pool for parallel execution
-        with ThreadPoolExecutor(max_workers=min(len(selected_roles), 5)) as executor:
-            # Submit all reviewer tasks
-            future_to_role = {}
+        # Submit all reviewer tasks (waits while the shared queue is full,
+        # but not past the deadline)
+        future_to_role = {}
+        unqueued = []
+        
+        for role in selected_roles:
+            # Get previous feedback for this role
+            prev_fb = previous_feedback.get(role) if previous_feedback else None
             
-            for role in selected_roles:
-                # Get previous feedback for this role
-                prev_fb = previous_feedback.get(role) if previous_feedback else None
-                
-                future = executor.submit(
+            try:
+                future = self._submit(
+                    executor,
+                    deadline,
                     self._execute_single_reviewer,
                     role,
                     presenter_output,
                     iteration,
-                    prev_fb
+                    prev_fb,
+                    diff,
+                    (previous_results or {}).get(role)
                 )
-                future_to_role[future] = role
-            
-            # Collect results as they complete
-            for future in as_completed(future_to_role):
+            except ExecutorSaturatedError as e:
+                if deadline is not None and time.monotonic() >= deadline:
+                    unqueued.append(role)
+                else:
+                    feedback_dict[role] = f"Review failed: {str(e)}"
+                continue
+            except Exception as e:
+                feedback_dict[role] = f"Review failed: {str(e)}"
+                continue
+            future_to_role[future] = role
+        
+        if unqueued:
+            feedback_dict.update(self._mark_timed_out(unqueued, timeout))
+        
+        # Collect results as they complete, until the budget runs out
+        try:
+            for future in as_completed(future_to_role, timeout=self._remaining(deadline)):
                 role = future_to_role[future]
                 try:
                     feedback = future.result()
+                    self.last_feedback[role] = feedback
                     feedback_dict[role] = self._feedback_to_string(feedback)
                 except Exception as e:
                     feedback_dict[role] = f"Review failed: {str(e)}"
+        except FuturesTimeoutError:
+            late = [future for future in future_to_role if not future.done()]
+            for future in late:
+                future.cancel()
+            feedback_dict.update(self._mark_timed_out([future_to_role[future] for future in late], timeout))
         
-        return feedback_dict
+        # Keep the selected_roles order
+        return {role: feedback_dict[role] for role in selected_roles if role in feedback_dict}
+    
+    def _run_reviewers_combined(
+        self,
+        presenter_output: str,
+        selected_roles: List[str],
+        iteration: int,
+        previous_feedback: Dict[str, str] = None,
+        timeout: Optional[float] = None,
+        deadline: Optional[float] = None
+    ) -> Optional[Dict[str, str]]:
+        """Run all reviewers in a single multi-role call.
+        
+        Args:
+            presenter_output: Content to review
+            selected_roles: List of reviewer roles
+            iteration: Iteration number
+            previous_feedback: Optional dict of previous feedback by role
+            timeout: Optional budget in seconds; if the call exceeds it,
+                every role is marked timed out (no per-role fallback)
+            deadline: time.monotonic() by which the budget runs out
+                (default: timeout from now)
+            
+        Returns:
+            Dictionary of reviewer feedback, or None if the combined call
+            failed and per-role calls should be used instead
+        """
+        reviewers = {role: self._get_reviewer(role) for role in selected_roles}
+        reviewer = MultiRoleReviewer(self.reviewer_provider, reviewers)
+        if deadline is None and timeout is not None:
+            deadline = time.monotonic() + timeout
+        
+        try:
+            if timeout is None:
+                feedback = reviewer.review(presenter_output, iteration, previous_feedback=previous_feedback)
+            else:
+                try:
+                    future = self._submit(
+                        self.executor,
+                        deadline,
+                        reviewer.review,
+                        presenter_output,
+                        iteration,
+                        previous_feedback=previous_feedback
+                    )
+                except ExecutorSaturatedError:
+                    if self._remaining(deadline) > 0:
+                        raise
+                    # The shared queue stayed full for the whole budget
+                    return self._mark_timed_out(list(reviewers), timeout)
+                try:
+                    feedback = future.result(timeout=self._remaining(deadline))
+                except FuturesTimeoutError:
+                    if future.done():
+                        # The review itself raised a TimeoutError
+                        raise
+                    future.cancel()
+                    return self._mark_timed_out(list(reviewers), timeout)
+        except Exception as e:
+            print(f"[ReviewerManager] Combined review failed ({e}), falling back to per-role calls")
+            return None
+        
+        self.last_feedback.update(feedback)
+        return {role: self._feedback_to_string(feedback[role]) for role in reviewers}
     
     def _run_reviewers_sequential(
         self,
         presenter_output: str,
         selected_roles: List[str],
         iteration: int,
-        previous_feedback: Dict[str, str] = None
+        previous_feedback: Dict[str, str] = None,
+        diff: Optional[SectionDiff] = None,
+        previous_results: Optional[Dict[str, Feedback]] = None
     ) -> Dict[str, str]:
         """Run reviewers sequentially (fallback for debugging).
         
@@ -132,6 +399,8 @@ class ReviewerManager:
             selected_roles: List of reviewer roles
             iteration: Iteration number
             previous_feedback: Optional dict of previous feedback by role
+            diff: Section diff for diff reviews (None = full reviews)
+            previous_results: Previous Feedback by role, for diff reviews
             
         Returns:
             Dictionary of reviewer feedback
@@ -143,19 +412,73 @@ class ReviewerManager:
                 # Get previous feedback for this role
                 prev_fb = previous_feedback.get(role) if previous_feedback else None
                 
-                feedback = self._execute_single_reviewer(role, presenter_output, iteration, prev_fb)
+                feedback = self._execute_single_reviewer(
+                    role, presenter_output, iteration, prev_fb, diff, (previous_results or {}).get(role)
+                )
+                self.last_feedback[role] = feedback
                 feedback_dict[role] = self._feedback_to_string(feedback)
             except Exception as e:
                 feedback_dict[role] = f"Review failed: {str(e)}"
         
         return feedback_dict
     
+    @staticmethod
+    def _remaining(deadline: Optional[float]) -> Optional[float]:
+        """Seconds left until a deadline (None = no deadline)."""
+        if deadline is None:
+            return None
+        return max(0.0, deadline - time.monotonic())
+    
+    def _submit(
+        self,
+        executor: Any,
+        deadline: Optional[float],
+        fn: Callable[..., Any],
+        *args,
+        **kwargs
+    ) -> Future:
+        """Submit a task, waiting for a queue slot no longer than the deadline allows.
+        
+        Args:
+            executor: ExecutorService or plain executor
+            deadline: time.monotonic() by which the budget runs out (None = none)
+            fn: Function to run
+            *args: Positional arguments for fn
+            **kwargs: Keyword arguments for fn
+            
+        Returns:
+            Future of the task
+            
+        Raises:
+            ExecutorSaturatedError: If the shared queue stays full until the deadline
+        """
+        if isinstance(executor, ExecutorService):
+            return executor.try_submit(self._remaining(deadline), fn, *args, **kwargs)
+        return executor.submit(fn, *args, **kwargs)
+    
+    def _mark_timed_out(self, roles: List[str], timeout: float) -> Dict[str, str]:
+        """Record roles that ran out of time.
+        
+        Args:
+            roles: Reviewer roles that did not finish
+            timeout: Budget that was exceeded, in seconds
+            
+        Returns:
+            Timeout feedback string by role
+        """
+        if roles:
+            print(f"[ReviewerManager] Timed out after {timeout:g}s: {', '.join(roles)}")
+        self.timed_out_roles.extend(roles)
+        return {role: REVIEW_TIMEOUT_MESSAGE.format(timeout=timeout) for role in roles}
+    
     def _execute_single_reviewer(
         self,
         role: str,
         content: str,
         iteration: int,
-        previous_feedback: str = None
+        previous_feedback: str = None,
+        diff: Optional[SectionDiff] = None,
+        previous_result: Optional[Feedback] = None
     ) -> Feedback:
         """Execute a single reviewer agent.
         
@@ -164,21 +487,93 @@ class ReviewerManager:
             content: Content to review
             iteration: Iteration number
             previous_feedback: Optional previous feedback from this reviewer for iteration tracking
+            diff: Optional section diff against the previous iteration
+            previous_result: This reviewer's previous Feedback; together with
+                diff, only the changed sections are reviewed
             
         Returns:
             Feedback object from reviewer
         """
-        # Get reviewer class
-        reviewer_class = REVIEWER_CLASS_MAP.get(role, ReviewerAgent)
+        if diff is not None and previous_result is not None:
+            return self._execute_diff_review(role, iteration, diff, previous_result)
         
-        # Create reviewer instance
-        reviewer = reviewer_class(self.llm_provider)
+        reviewer = self._get_reviewer(role)
         
         # Execute review with previous feedback context
         feedback = reviewer.review(content, iteration, previous_feedback=previous_feedback)
         
         return feedback
     
+    def _execute_diff_review(
+        self,
+        role: str,
+        iteration: int,
+        diff: SectionDiff,
+        previous_result: Feedback
+    ) -> Feedback:
+        """Review only the changed sections, carrying other findings forward.
+        
+        Args:
+            role: Reviewer role name
+            iteration: Iteration number
+            diff: Section diff against the previous iteration
+            previous_result: This reviewer's previous Feedback
+            
+        Returns:
+            Feedback on the changed sections merged with the carried findings
+        """
+        if not diff.has_changes:
+            return carry_forward(previous_result, iteration)
+        
+        carried, recheck = split_carried_points(previous_result, diff)
+        recheck_text = "\n".join(f"- {point}" for point in recheck) or "- None of the previous findings concern the changed sections"
+        
+        feedback = self._get_reviewer(role).review(
+            format_diff_excerpt(diff, iteration - 1),
+            iteration,
+            previous_feedback=recheck_text
+        )
+        return merge_carried_points(feedback, previous_result, carried)
+    
+    def _get_reviewer(self, role: str) -> ReviewerAgent:
+        """Get the cached reviewer agent for a role, creating it on first use.
+        
+        Args:
+            role: Reviewer role name
+            
+        Returns:
+            Reviewer agent bound to the reviewer provider
+        """
+        with self._reviewers_lock:
+            reviewer = self._reviewers.get(role)
+            if reviewer is None:
+                reviewer = self._create_reviewer(role)
+                self._reviewers[role] = reviewer
+            return reviewer
+    
+    def _create_reviewer(self, role: str) -> ReviewerAgent:
+        """Create the reviewer agent for a role name.
+        
+        Args:
+            role: Reviewer role name
+            
+        Returns:
+            Reviewer agent bound to the reviewer provider
+        """
+        reviewer_class = REVIEWER_CLASS_MAP.get(role, ReviewerAgent)
+        return reviewer_class(self.reviewer_provider, structured_output=self.structured_output)
+    
+    def get_hedge_stats(self) -> Optional[Dict[str, Any]]:
+        """Get request hedging statistics for reviewer calls.
+        
+        Returns:
+            HedgedProvider statistics (including the extra token cost), or
+            None if hedging is disabled
+        """
+        if isinstance(self.reviewer_provider, HedgedProvider):
+            return self.reviewer_provider.get_hedge_stats()
+        return None
+    
     def _feedback_to_string(self, feedback: Feedback) -> str:
         """Convert Feedback object to formatted string.
         
@@ -192,8 +587,17 @@ class ReviewerManager:
         
         lines.append(f"REVIEWER: {feedback.reviewer_role}")
         lines.append(f"ITERATION: {feedback.iteration}")
+        if feedback.verdict:
+            lines.append(f"VERDICT: {feedback.verdict}")
         lines.append("")
         
+        if feedback.improvement_tracking is not None:
+            lines.append("IMPROVEMENT TRACKING:")
+            for key, label in (('fixed', "✅ FIXED"), ('partially_fixed', "⚠️ PARTIALLY FIXED"), ('not_addressed', "❌ NOT ADDRESSED")):
+                for item in feedback.improvement_tracking.get(key, []):
+                    lines.append(f"- {label}: {item}")
+            lines.append("")
+        
         lines.append("FINDINGS:")
         for i, point in enumerate(feedback.feedback_points, 1):
             lines.append(f"{i}. {point}")
@@ -0,0 +1,243 @@
+"""Section-level diffs between presenter iterations for incremental re-review."""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, FrozenSet, List, Optional, Tuple
+from app.models.feedback import Feedback
+from app.orchestration.section_stream import SectionStreamParser, merge_section_feedback
+from app.utils.similarity import MinHashLSH
+
+
+# Above this share of changed text a full review is cheaper to reason about
+MAX_CHANGED_RATIO = 0.6
+
+# Minimum share of a finding's shingles found in a section to attribute it there
+ATTRIBUTION_THRESHOLD = 0.5
+
+# Section names shorter than this (e.g. TITLE) are too generic to match by mention
+MIN_NAMED_SECTION_LENGTH = 8
+
+# Characters of an unchanged section quoted in the summary
+SUMMARY_LENGTH = 120
+
+DIFF_NOTE = (
+    "CHANGES SINCE ITERATION {previous_iteration} - only the sections below changed: {changed}.\n"
+    "Review these sections. The unchanged sections were reviewed before and "
+    "their findings carry forward, so do not repeat them or report them as missing.\n\n"
+    "UNCHANGED SECTIONS:\n{unchanged}\n\n"
+)
+
+_SHINGLER = MinHashLSH()
+
+
+@dataclass
+class SectionDiff:
+    """Section-level changes between two versions of a document.
+    
+    Attributes:
+        changed: (name, text) of new or edited sections, in document order
+        unchanged: (name, text) of sections identical to the previous version
+        removed: Names of sections that no longer exist
+    """
+    
+    changed: List[Tuple[str, str]] = field(default_factory=list)
+    unchanged: List[Tuple[str, str]] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    
+    @property
+    def has_changes(self) -> bool:
+        """Whether any section was added, edited or removed."""
+        return bool(self.changed or self.removed)
+    
+    @property
+    def changed_ratio(self) -> float:
+        """Share of the current document's text in changed sections."""
+        changed = sum(len(text) for _, text in self.changed)
+        total = changed + sum(len(text) for _, text in self.unchanged)
+        return changed / total if total else 0.0
+    
+    @property
+    def worth_it(self) -> bool:
+        """Whether a diff review beats a full review of the document.
+        
+        Requires a sectioned document (more than one section) and at most
+        MAX_CHANGED_RATIO of it changed.
+        """
+        return len(self.changed) + len(self.unchanged) > 1 and self.changed_ratio <= MAX_CHANGED_RATIO
+
+
+def split_sections(document: str) -> List[Tuple[str, str]]:
+    """Split a presenter document into its '#'/'##' headed sections.
+    
+    Args:
+        document: Full document
+    
+    Returns:
+        List of (section_name, section_text)
+    """
+    parser = SectionStreamParser()
+    return parser.feed(document) + parser.close()
+
+
+def _normalize(text: str) -> str:
+    """Collapse whitespace so reflowed text doesn't count as a change."""
+    return " ".join(text.split())
+
+
+def diff_sections(previous: str, current: str) -> SectionDiff:
+    """Compare two document versions section by section.
+    
+    Sections are matched by heading name; repeated names are matched in order.
+    
+    Args:
+        previous: Previous iteration's document
+        current: Current document
+    
+    Returns:
+        SectionDiff of current against previous
+    """
+    previous_by_name: Dict[str, List[str]] = {}
+    for name, text in split_sections(previous):
+        previous_by_name.setdefault(name, []).append(_normalize(text))
+    
+    diff = SectionDiff()
+    for name, text in split_sections(current):
+        candidates = previous_by_name.get(name)
+        if candidates and candidates.pop(0) == _normalize(text):
+            diff.unchanged.append((name, text))
+        else:
+            diff.changed.append((name, text))
+    
+    # Names left over (or all of a name's copies) no longer appear
+    current_names = {name for name, _ in diff.changed + diff.unchanged}
+    diff.removed = [name for name, texts in previous_by_name.items() if texts and name not in current_names]
+    return diff
+
+
+def format_diff_excerpt(diff: SectionDiff, previous_iteration: int) -> str:
+    """Build the reviewer input for a diff review.
+    
+    Args:
+        diff: Section diff of the current document
+        previous_iteration: Iteration the unchanged sections were reviewed in
+    
+    Returns:
+        Note on the scope, a one-line summary per unchanged section, removed
+        section names, and the full text of the changed sections
+    """
+    summaries = []
+    for name, text in diff.unchanged:
+        body = _normalize(text.split("\n", 1)[1]) if "\n" in text else ""
+        if len(body) > SUMMARY_LENGTH:
+            body = body[:SUMMARY_LENGTH].rsplit(" ", 1)[0] + " ..."
+        summaries.append(f"- {name}: {body}" if body else f"- {name}")
+    
+    excerpt = DIFF_NOTE.format(
+        previous_iteration=previous_iteration,
+        changed=", ".join(name for name, _ in diff.changed) or "none",
+        unchanged="\n".join(summaries) or "- None"
+    )
+    if diff.removed:
+        excerpt += f"REMOVED SECTIONS: {', '.join(diff.removed)}\n\n"
+    return excerpt + "\n\n".join(text for _, text in diff.changed)
+
+
+def attribute_point(point: str, section_shingles: Dict[str, FrozenSet[str]]) -> Optional[str]:
+    """Find the section a feedback point is about.
+    
+    A point naming a section heading is attributed to it; otherwise to the
+    section containing the largest share of the point's shingles, if that
+    share reaches ATTRIBUTION_THRESHOLD.
+    
+    Args:
+        point: Feedback point
+        section_shingles: Shingles of each section's text, by name
+    
+    Returns:
+        Section name, or None if the point can't be attributed
+    """
+    upper = point.upper()
+    named = [name for name in section_shingles if len(name) >= MIN_NAMED_SECTION_LENGTH and name in upper]
+    if named:
+        return max(named, key=len)
+    
+    shingles = _SHINGLER.shingles(point)
+    if not shingles or not section_shingles:
+        return None
+    
+    name, overlap = max(
+        ((name, len(shingles & section)) for name, section in section_shingles.items()),
+        key=lambda item: item[1]
+    )
+    return name if overlap / len(shingles) >= ATTRIBUTION_THRESHOLD else None
+
+
+def split_carried_points(previous: Feedback, diff: SectionDiff) -> Tuple[List[str], List[str]]:
+    """Split previous feedback into points that carry forward and points to re-check.
+    
+    Args:
+        previous: Reviewer's feedback on the previous iteration
+        diff: Section diff of the current document
+    
+    Returns:
+        Tuple of (points about unchanged sections, all other points)
+    """
+    section_shingles = {
+        name: _SHINGLER.shingles(text)
+        for name, text in diff.changed + diff.unchanged
+    }
+    for name in diff.removed:
+        section_shingles.setdefault(name, frozenset())
+    unchanged = {name for name, _ in diff.unchanged}
+    
+    carried, recheck = [], []
+    for point in previous.feedback_points:
+        if attribute_point(point, section_shingles) in unchanged:
+            carried.append(point)
+        else:
+            recheck.append(point)
+    return carried, recheck
+
+
+def carry_forward(previous: Feedback, iteration: int) -> Feedback:
+    """Reuse a reviewer's previous feedback for an unchanged document.
+    
+    Args:
+        previous: Feedback on the previous iteration
+        iteration: Current iteration number
+    
+    Returns:
+        Copy of previous for this iteration (not approved or modified)
+    """
+    return previous.model_copy(update={
+        'iteration': iteration,
+        'approved': False,
+        'modified': False,
+        'timestamp': datetime.now(),
+    })
+
+
+def merge_carried_points(feedback: Feedback, previous: Feedback, carried: List[str]) -> Feedback:
+    """Add carried-forward points to the feedback on the changed sections.
+    
+    Args:
+        feedback: New feedback on the changed sections
+        previous: Feedback on the previous iteration the points come from
+        carried: Points of previous about unchanged sections
+    
+    Returns:
+        Merged Feedback (feedback itself if nothing is carried)
+    """
+    if not carried:
+        return feedback
+    
+    findings = None
+    if previous.findings is not None:
+        findings = [finding for finding in previous.findings if finding.to_text() in carried]
+    carried_feedback = Feedback(
+        reviewer_role=feedback.reviewer_role,
+        feedback_points=carried,
+        iteration=feedback.iteration,
+        findings=findings
+    )
+    return merge_section_feedback([feedback, carried_feedback])
@@ -0,0 +1,194 @@
+"""Incremental section detection for streamed presenter output."""
+
+from typing import List, Tuple
+from app.models.feedback import Feedback
+
+
+# Deepest markdown heading level that starts a new section
+MAX_SECTION_HEADING_LEVEL = 2
+
+# Feedback points kept per reviewer after merging section-scoped reviews
+MAX_MERGED_POINTS = 8
+
+# Structured verdicts from least to most severe; merging keeps the most severe
+VERDICT_SEVERITY = ('APPROVE', 'NEEDS REVISION', 'REJECT')
+
+EXCERPT_NOTE = (
+    "DOCUMENT EXCERPT - this review covers only the sections below: {sections}.\n"
+    "The remaining sections of the document are reviewed separately, so do not "
+    "report them as missing.\n\n"
+)
+
+
+class SectionStreamParser:
+    """Detects completed markdown sections in a streamed document.
+    
+    PresenterAgent output is a sequence of '#'/'##' headed sections (TITLE,
+    EXECUTIVE SUMMARY, DETAILED DESCRIPTION, ...); deeper headings stay
+    inside their section. A section is complete as soon as the next heading
+    line starts, so completed sections can be handed to reviewers while later
+    ones are still being generated.
+    
+    Text before the first heading is reported as a 'PREAMBLE' section if it
+    is not blank.
+    """
+    
+    PREAMBLE = "PREAMBLE"
+    
+    def __init__(self):
+        """Initialize an empty parser."""
+        self._partial_line = ""
+        self._current_name = self.PREAMBLE
+        self._current_lines: List[str] = []
+    
+    def feed(self, chunk: str) -> List[Tuple[str, str]]:
+        """Consume a chunk of streamed text.
+        
+        Args:
+            chunk: Newly generated text
+        
+        Returns:
+            List of (section_name, section_text) completed by this chunk
+        """
+        completed = []
+        
+        text = self._partial_line + chunk
+        lines = text.split("\n")
+        # The last element is an unfinished line (possibly empty)
+        self._partial_line = lines.pop()
+        
+        for line in lines:
+            section = self._add_line(line)
+            if section is not None:
+                completed.append(section)
+        
+        return completed
+    
+    def close(self) -> List[Tuple[str, str]]:
+        """Flush the final section once the stream has ended.
+        
+        Returns:
+            List containing the last section, if it has any content
+        """
+        completed = []
+        
+        if self._partial_line:
+            section = self._add_line(self._partial_line)
+            self._partial_line = ""
+            if section is not None:
+                completed.append(section)
+        
+        section = self._finish_current()
+        if section is not None:
+            completed.append(section)
+        
+        return completed
+    
+    def _add_line(self, line: str):
+        """Append a full line, returning the section it completes (if any)."""
+        stripped = line.strip()
+        level = len(stripped) - len(stripped.lstrip("#"))
+        
+        # Only top-level ('#' and '##') headings delimit sections
+        if 1 <= level <= MAX_SECTION_HEADING_LEVEL:
+            heading = stripped[level:].strip()
+            if heading and stripped[level:level + 1] == " ":
+                finished = self._finish_current()
+                self._current_name = heading.upper()
+                self._current_lines = [line]
+                return finished
+        
+        self._current_lines.append(line)
+        return None
+    
+    def _finish_current(self):
+        """Close the current section, skipping a blank preamble."""
+        text = "\n".join(self._current_lines).strip()
+        name = self._current_name
+        self._current_lines = []
+        
+        if not text:
+            return None
+        
+        return name, text
+
+
+def format_section_excerpt(sections: List[Tuple[str, str]]) -> str:
+    """Build the reviewer input for a batch of completed sections.
+    
+    Args:
+        sections: List of (section_name, section_text)
+    
+    Returns:
+        Excerpt text prefixed with a note on its scope
+    """
+    names = ", ".join(name for name, _ in sections)
+    body = "\n\n".join(text for _, text in sections)
+    return EXCERPT_NOTE.format(sections=names) + body
+
+
+def merge_section_feedback(feedbacks: List[Feedback]) -> Feedback:
+    """Merge one reviewer's section-scoped reviews into a single Feedback.
+    
+    Points are interleaved across batches so every part of the document is
+    represented, exact duplicates are dropped, and the result is capped at
+    MAX_MERGED_POINTS.
+    
+    Args:
+        feedbacks: Feedback objects from the same reviewer, in document order
+    
+    Returns:
+        Merged Feedback object
+    
+    Raises:
+        ValueError: If feedbacks is empty
+    """
+    if not feedbacks:
+        raise ValueError("No feedback to merge")
+    
+    merged_points = []
+    seen = set()
+    longest = max(len(feedback.feedback_points) for feedback in feedbacks)
+    
+    for index in range(longest):
+        for feedback in feedbacks:
+            if index >= len(feedback.feedback_points):
+                continue
+            point = feedback.feedback_points[index]
+            key = point.strip().lower()
+            if key in seen:
+                continue
+            seen.add(key)
+            merged_points.append(point)
+    
+    merged_points = merged_points[:MAX_MERGED_POINTS]
+    
+    # Keep structured output: typed findings of the kept points, the most
+    # severe verdict and the union of improvement tracking
+    findings = None
+    if any(feedback.findings is not None for feedback in feedbacks):
+        by_text = {finding.to_text(): finding for feedback in feedbacks for finding in feedback.findings or []}
+        findings = [by_text[point] for point in merged_points if point in by_text]
+    
+    verdicts = [feedback.verdict for feedback in feedbacks if feedback.verdict]
+    verdict = max(verdicts, key=VERDICT_SEVERITY.index) if verdicts else None
+    
+    tracking = None
+    if any(feedback.improvement_tracking is not None for feedback in feedbacks):
+        tracking = {}
+        for feedback in feedbacks:
+            for key, items in (feedback.improvement_tracking or {}).items():
+                tracking.setdefault(key, [])
+                tracking[key].extend(item for item in items if item not in tracking[key])
+    
+    first = feedbacks[0]
+    return Feedback(
+        reviewer_role=first.reviewer_role,
+        feedback_points=merged_points,
+        iteration=first.iteration,
+        approved=False,
+        modified=False,
+        verdict=verdict,
+        findings=findings,
+        improvement_tracking=tracking
+    )
@@ -1,13 +1,51 @@
 """Workflow engine for multi-agent iterative review process."""
 
-from typing import List, Optional, Dict, Any
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, wait
+from dataclasses import dataclass
+from typing import List, Optional, Dict, Any, Callable, Tuple
 from app.orchestration.iteration_state import IterationState
 from app.orchestration.reviewer_manager import ReviewerManager
+from app.orchestration.section_stream import (
+    SectionStreamParser,
+    format_section_excerpt,
+    merge_section_feedback,
+)
 from app.orchestration.aggregator_agent import AggregatorAgent
+from app.orchestration.local_aggregator import LocalAggregationPolicy
 from app.orchestration.confidence_model import calculate_confidence, CONFIDENCE_THRESHOLD
 from app.agents.presenter import PresenterAgent
 from app.llm.base_provider import BaseLLMProvider
 from app.core.session_manager import SessionManager
+from app.utils.executor_service import ExecutorSaturatedError
+
+
+@dataclass
+class StageBudgets:
+    """Time budgets for the stages of an iteration, in seconds.
+    
+    None leaves a stage limited only by the iteration deadline.
+    
+    Attributes:
+        presenter: Presenter generation; exceeding it fails the iteration
+        reviewers: Reviewer fan-out; late reviewers are marked timed out and
+            the iteration continues with the feedback that arrived
+        aggregator: Aggregation; exceeding it falls back to local aggregation
+    """
+    
+    presenter: Optional[float] = None
+    reviewers: Optional[float] = None
+    aggregator: Optional[float] = None
+
+
+class StageTimeoutError(TimeoutError):
+    """Raised when a workflow stage does not finish within its budget."""
+    
+    def __init__(self, stage: str, timeout: float):
+        super().__init__(f"{stage} timed out after {timeout:g}s")
+        self.stage = stage
+        self.timeout = timeout
 
 
 class WorkflowEngine:
@@ -26,28 +64,85 @@ class WorkflowEngine:
     - Confidence threshold reached (0.82)
     - Human finalizes session
     - Maximum iterations reached
+    
+    In pipelined mode the presenter output is streamed and reviewers start on
+    batches of completed sections while later sections are still being
+    generated; the section-scoped reviews are merged per reviewer afterwards.
+    
+    An optional iteration deadline and per-stage budgets bound how long an
+    iteration can take: a hung provider call is abandoned instead of
+    blocking the board, reviewers that miss their budget are marked timed
+    out, and a late aggregation falls back to the local board decision.
     """
     
     MAX_ITERATIONS = 10
+    DEFAULT_SECTION_BATCH_SIZE = 3  # Sections per pipelined review call
     
     def __init__(
         self,
         llm_provider: BaseLLMProvider,
-        session_manager: SessionManager
+        session_manager: SessionManager,
+        section_batch_size: int = DEFAULT_SECTION_BATCH_SIZE,
+        hedge_percentile: Optional[float] = None,
+        combined_review: bool = False,
+        structured_output: bool = False,
+        local_aggregation: bool = True,
+        iteration_timeout: Optional[float] = None,
+        stage_budgets: Optional[StageBudgets] = None,
+        diff_review: bool = False
     ):
         """Initialize workflow engine.
         
         Args:
             llm_provider: LLM provider for all agents
             session_manager: Session manager instance
+            section_batch_size: Completed sections each reviewer gets per call
+                in pipelined mode (default 3, i.e. two calls for the standard
+                six-section presenter document)
+            hedge_percentile: Opt-in hedging of reviewer calls that are still
+                running at this latency percentile, e.g. 0.9 (None = disabled)
+            combined_review: Review all roles in one structured call instead
+                of one call per role, e.g. for local or rate-limited models
+                (default False; pipelined section reviews stay per-role)
+            structured_output: Have reviewers return JSON with a verdict and
+                typed findings, which confidence scoring reads directly
+                (default False)
+            local_aggregation: Build the board decision locally, without an
+                aggregator LLM call, when reviewers are unanimous or their
+                feedback is small (default True)
+            iteration_timeout: Default deadline in seconds for a whole
+                iteration (None = no deadline)
+            stage_budgets: Default per-stage budgets (None = unlimited)
+            diff_review: From the second iteration on, have reviewers review
+                only the sections that changed and carry their findings on
+                unchanged sections forward (default False; full reviews in
+                pipelined mode)
+            
+        Raises:
+            ValueError: If section_batch_size is less than 1
         """
+        if section_batch_size < 1:
+            raise ValueError("section_batch_size must be at least 1")
+        
         self.llm_provider = llm_provider
         self.session_manager = session_manager
+        self.section_batch_size = section_batch_size
+        self.iteration_timeout = iteration_timeout
+        self.stage_budgets = stage_budgets if stage_budgets is not None else StageBudgets()
         
         # Initialize sub-components
         self.presenter = PresenterAgent(llm_provider)
-        self.reviewer_manager = ReviewerManager(llm_provider)
-        self.aggregator = AggregatorAgent(llm_provider)
+        self.reviewer_manager = ReviewerManager(
+            llm_provider,
+            hedge_percentile=hedge_percentile,
+            combined=combined_review,
+            structured_output=structured_output,
+            diff_review=diff_review
+        )
+        self.aggregator = AggregatorAgent(
+            llm_provider,
+            local_policy=LocalAggregationPolicy() if local_aggregation else None
+        )
         
         # Iteration history (stored in memory)
         self.iteration_history: List[IterationState] = []
@@ -57,7 +152,10 @@ class WorkflowEngine:
         requirements: str,
         selected_roles: List[str],
         file_summaries: Optional[List[str]] = None,
-        use_parallel: bool = True
+        use_parallel: bool = True,
+        pipelined: bool = False,
+        timeout: Optional[float] = None,
+        stage_budgets: Optional[StageBudgets] = None
     ) -> IterationState:
         """Run a complete iteration cycle.
         
@@ -73,9 +171,15 @@ class WorkflowEngine:
             selected_roles: List of reviewer roles to use
             file_summaries: Optional file context
             use_parallel: Whether to run reviewers in parallel (default True)
+            pipelined: Whether to overlap presenter generation with
+                section-scoped reviews (default False)
+            timeout: Deadline in seconds for the whole iteration; each stage
+                gets at most the time left (default: iteration_timeout)
+            stage_budgets: Per-stage budgets (default: the engine's)
             
         Returns:
-            IterationState object for this iteration
+            IterationState object for this iteration; reviewers and stages
+            that ran out of time are listed in its timed_out field
             
         Raises:
             ValueError: If session is finalized or max iterations reached
@@ -89,47 +193,88 @@ class WorkflowEngine:
         if current_iteration > self.MAX_ITERATIONS:
             raise ValueError(f"Maximum iterations ({self.MAX_ITERATIONS}) reached")
         
+        budgets = stage_budgets if stage_budgets is not None else self.stage_budgets
+        timeout = timeout if timeout is not None else self.iteration_timeout
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        
         try:
-            # Step 1: Run Presenter
             print(f"[WorkflowEngine] Starting iteration {current_iteration}")
-            print(f"[WorkflowEngine] Step 1: Running Presenter...")
-            
-            presenter_output = self._run_presenter(
-                requirements,
-                file_summaries
-            )
             
-            # Step 2: Run Reviewers in Parallel
-            print(f"[WorkflowEngine] Step 2: Running {len(selected_roles)} Reviewers...")
-            
-            # Get previous feedback for iteration tracking
+            # Get previous feedback (and content, for diff reviews) for iteration tracking
             previous_feedback = None
+            previous_content = None
             if self.iteration_history:
                 last_iteration = self.iteration_history[-1]
                 previous_feedback = last_iteration.reviewer_feedback
+                previous_content = last_iteration.presenter_output
             
-            reviewer_feedback = self.reviewer_manager.run_reviewers(
-                presenter_output,
-                selected_roles,
-                current_iteration,
-                parallel=use_parallel,
-                previous_feedback=previous_feedback
-            )
+            if pipelined and selected_roles:
+                # Steps 1+2: Presenter streams while reviewers start on finished sections
+                print(f"[WorkflowEngine] Steps 1-2: Running Presenter pipelined with {len(selected_roles)} Reviewers...")
+                
+                presenter_output, reviewer_feedback = self._run_pipelined(
+                    requirements,
+                    file_summaries,
+                    selected_roles,
+                    current_iteration,
+                    use_parallel,
+                    previous_feedback,
+                    budgets,
+                    deadline
+                )
+            else:
+                # Step 1: Run Presenter
+                print(f"[WorkflowEngine] Step 1: Running Presenter...")
+                
+                presenter_output = self._call_with_timeout(
+                    'Presenter',
+                    lambda: self._run_presenter(requirements, file_summaries),
+                    self._stage_timeout(budgets.presenter, deadline)
+                )
+                
+                # Step 2: Run Reviewers in Parallel
+                print(f"[WorkflowEngine] Step 2: Running {len(selected_roles)} Reviewers...")
+                
+                reviewer_feedback = self.reviewer_manager.run_reviewers(
+                    presenter_output,
+                    selected_roles,
+                    current_iteration,
+                    parallel=use_parallel,
+                    previous_feedback=previous_feedback,
+                    timeout=self._stage_timeout(budgets.reviewers, deadline),
+                    previous_content=previous_content
+                )
+            
+            timed_out = list(self.reviewer_manager.timed_out_roles)
+            
+            hedge_stats = self.reviewer_manager.get_hedge_stats()
+            if hedge_stats:
+                print(
+                    f"[WorkflowEngine] Hedged {hedge_stats['hedged_requests']}/{hedge_stats['requests']} "
+                    f"reviewer calls (~{hedge_stats['extra_tokens']} extra tokens)"
+                )
             
             # Step 3: Aggregate Feedback
             print(f"[WorkflowEngine] Step 3: Aggregating Feedback...")
             
-            aggregated_feedback = self.aggregator.aggregate(
-                reviewer_feedback,
-                presenter_output
-            )
+            try:
+                aggregated_feedback = self._call_with_timeout(
+                    'Aggregator',
+                    lambda: self.aggregator.aggregate(reviewer_feedback, presenter_output),
+                    self._stage_timeout(budgets.aggregator, deadline)
+                )
+            except StageTimeoutError as e:
+                print(f"[WorkflowEngine] {e}, using local aggregation")
+                timed_out.append('Aggregator')
+                aggregated_feedback = self.aggregator._fallback_aggregation(reviewer_feedback)
             
             # Step 4: Calculate Confidence
             print(f"[WorkflowEngine] Step 4: Calculating Confidence...")
             
             confidence = calculate_confidence(
                 reviewer_feedback,
-                aggregated_feedback
+                aggregated_feedback,
+                structured_feedback=self.reviewer_manager.last_feedback
             )
             
             print(f"[WorkflowEngine] Confidence: {confidence:.2f}")
@@ -142,7 +287,8 @@ class WorkflowEngine:
                 aggregated_feedback=aggregated_feedback,
                 confidence=confidence,
                 approved=False,
-                error=None
+                error=None,
+                timed_out=timed_out
             )
             
             # Store iteration
@@ -176,13 +322,15 @@ class WorkflowEngine:
     def _run_presenter(
         self,
         requirements: str,
-        file_summaries: Optional[List[str]]
+        file_summaries: Optional[List[str]],
+        on_chunk: Optional[Callable[[str], None]] = None
     ) -> str:
         """Run presenter agent with refinement if applicable.
         
         Args:
             requirements: User requirements
             file_summaries: Optional file summaries
+            on_chunk: Optional callback receiving presenter output as it streams
             
         Returns:
             Presenter output string
@@ -206,11 +354,240 @@ class WorkflowEngine:
             requirements=requirements,
             feedback=approved_feedback,
             previous_output=previous_output,
-            file_summaries=file_summaries
+            file_summaries=file_summaries,
+            on_chunk=on_chunk
         )
         
         return output
     
+    def _run_pipelined(
+        self,
+        requirements: str,
+        file_summaries: Optional[List[str]],
+        selected_roles: List[str],
+        iteration: int,
+        use_parallel: bool,
+        previous_feedback: Optional[Dict[str, str]],
+        budgets: Optional[StageBudgets] = None,
+        deadline: Optional[float] = None
+    ) -> Tuple[str, Dict[str, str]]:
+        """Run presenter and reviewers with overlapping execution.
+        
+        The presenter output is streamed through a SectionStreamParser. Every
+        time section_batch_size sections are complete, each reviewer is
+        submitted a review of that excerpt. If the document never yields more
+        than one batch (e.g. unstructured output), reviewers simply review the
+        full document as in the non-pipelined flow.
+        
+        The reviewer budget starts when the presenter finishes, since
+        earlier reviews overlap with generation.
+        
+        Args:
+            requirements: User requirements
+            file_summaries: Optional file summaries
+            selected_roles: List of reviewer roles
+            iteration: Current iteration number
+            use_parallel: Whether reviews may run concurrently
+            previous_feedback: Optional previous feedback by role
+            budgets: Optional stage budgets
+            deadline: Optional iteration deadline (time.monotonic() value)
+            
+        Returns:
+            Tuple of (presenter_output, reviewer_feedback dict)
+            
+        Raises:
+            StageTimeoutError: If the presenter exceeds its budget
+        """
+        budgets = budgets if budgets is not None else StageBudgets()
+        parser = SectionStreamParser()
+        pending_sections: List[Tuple[str, str]] = []
+        futures_by_role: Dict[str, list] = {role: [] for role in selected_roles}
+        # Parallel reviews share the process-wide executor; serial ones get a
+        # private single thread so they still overlap with the presenter
+        executor = self.reviewer_manager.executor if use_parallel else ThreadPoolExecutor(max_workers=1)
+        # Set when the presenter times out, so its abandoned stream stops submitting reviews
+        stopped = threading.Event()
+        
+        # Reviews the saturated shared queue couldn't take during the stream:
+        # (role, position in futures_by_role[role], excerpt, previous feedback)
+        deferred: List[Tuple[str, int, str, Optional[str]]] = []
+        
+        try:
+            def submit_review(role: str, excerpt: str, prev_fb: Optional[str], slot_deadline: Optional[float]) -> Future:
+                try:
+                    return self.reviewer_manager._submit(
+                        executor,
+                        slot_deadline,
+                        self.reviewer_manager._execute_single_reviewer,
+                        role,
+                        excerpt,
+                        iteration,
+                        prev_fb
+                    )
+                except Exception as e:
+                    # Report a saturated executor as this role's review failure
+                    future = Future()
+                    future.set_exception(e)
+                    return future
+            
+            def submit_batch(sections: List[Tuple[str, str]]) -> None:
+                # Runs inside the presenter's stream callback, so it never
+                # waits for a queue slot: reviews that don't fit right away
+                # are deferred until the stream ends
+                excerpt = format_section_excerpt(sections)
+                print(f"[WorkflowEngine] Reviewing sections: {', '.join(name for name, _ in sections)}")
+                for role in selected_roles:
+                    prev_fb = previous_feedback.get(role) if previous_feedback else None
+                    future = submit_review(role, excerpt, prev_fb, time.monotonic())
+                    if future.done() and isinstance(future.exception(), ExecutorSaturatedError):
+                        deferred.append((role, len(futures_by_role[role]), excerpt, prev_fb))
+                    futures_by_role[role].append(future)
+            
+            def on_chunk(chunk: str) -> None:
+                if stopped.is_set():
+                    return
+                pending_sections.extend(parser.feed(chunk))
+                if len(pending_sections) >= self.section_batch_size:
+                    submit_batch(pending_sections[:])
+                    pending_sections.clear()
+            
+            try:
+                presenter_output = self._call_with_timeout(
+                    'Presenter',
+                    lambda: self._run_presenter(requirements, file_summaries, on_chunk=on_chunk),
+                    self._stage_timeout(budgets.presenter, deadline)
+                )
+            except StageTimeoutError:
+                stopped.set()
+                for futures in futures_by_role.values():
+                    for future in futures:
+                        future.cancel()
+                raise
+            pending_sections.extend(parser.close())
+            
+            reviewer_timeout = self._stage_timeout(budgets.reviewers, deadline)
+            reviewer_deadline = time.monotonic() + reviewer_timeout if reviewer_timeout is not None else None
+            
+            started_early = any(futures_by_role.values())
+            if started_early:
+                if pending_sections:
+                    excerpt = format_section_excerpt(pending_sections)
+                    print(f"[WorkflowEngine] Reviewing sections: {', '.join(name for name, _ in pending_sections)}")
+                    for role in selected_roles:
+                        prev_fb = previous_feedback.get(role) if previous_feedback else None
+                        deferred.append((role, len(futures_by_role[role]), excerpt, prev_fb))
+                        futures_by_role[role].append(None)
+                # Outside the stream, reviews may wait for a queue slot
+                # within the reviewer budget
+                for role, index, excerpt, prev_fb in deferred:
+                    future = submit_review(role, excerpt, prev_fb, reviewer_deadline)
+                    if future.done() and isinstance(future.exception(), ExecutorSaturatedError):
+                        # Never got a slot: still pending at the deadline, so
+                        # the role times out below
+                        future = Future()
+                    futures_by_role[role][index] = future
+        finally:
+            if not use_parallel:
+                executor.shutdown(wait=False)
+        
+        if not started_early:
+            # Nothing to overlap - review the whole document as usual
+            return presenter_output, self.reviewer_manager.run_reviewers(
+                presenter_output,
+                selected_roles,
+                iteration,
+                parallel=use_parallel,
+                previous_feedback=previous_feedback,
+                timeout=reviewer_timeout
+            )
+        
+        reviewer_feedback = {}
+        self.reviewer_manager.last_feedback = {}
+        self.reviewer_manager.timed_out_roles = []
+        for role in selected_roles:
+            futures = futures_by_role[role]
+            _, late = wait(futures, timeout=self._remaining(reviewer_deadline))
+            if late:
+                for future in futures:
+                    future.cancel()
+                reviewer_feedback.update(self.reviewer_manager._mark_timed_out([role], reviewer_timeout))
+                continue
+            
+            try:
+                feedbacks = [future.result() for future in futures]
+                merged = merge_section_feedback(feedbacks)
+                self.reviewer_manager.last_feedback[role] = merged
+                reviewer_feedback[role] = self.reviewer_manager._feedback_to_string(merged)
+            except Exception as e:
+                reviewer_feedback[role] = f"Review failed: {str(e)}"
+        
+        return presenter_output, reviewer_feedback
+    
+    @staticmethod
+    def _remaining(deadline: Optional[float]) -> Optional[float]:
+        """Get the seconds left until a time.monotonic() deadline (None = no deadline)."""
+        if deadline is None:
+            return None
+        return max(0.0, deadline - time.monotonic())
+    
+    def _stage_timeout(self, budget: Optional[float], deadline: Optional[float]) -> Optional[float]:
+        """Get a stage's timeout from its budget and the iteration deadline.
+        
+        Args:
+            budget: Stage budget in seconds (None = unlimited)
+            deadline: Iteration deadline (time.monotonic() value, or None)
+            
+        Returns:
+            Seconds the stage may take, or None if unlimited
+        """
+        remaining = self._remaining(deadline)
+        if remaining is None:
+            return budget
+        return remaining if budget is None else min(budget, remaining)
+    
+    @staticmethod
+    def _call_with_timeout(stage: str, fn: Callable[[], Any], timeout: Optional[float]) -> Any:
+        """Run a blocking stage call, giving up on it after a timeout.
+        
+        Provider calls can't be interrupted, so with a timeout the call runs
+        on a daemon thread; if it overruns, the caller moves on and the late
+        result is discarded.
+        
+        Args:
+            stage: Stage name for the error message
+            fn: Stage call
+            timeout: Seconds to wait (None = wait indefinitely)
+            
+        Returns:
+            Result of fn
+            
+        Raises:
+            StageTimeoutError: If fn does not finish in time
+        """
+        if timeout is None:
+            return fn()
+        if timeout <= 0:
+            raise StageTimeoutError(stage, 0)
+        
+        future: Future = Future()
+        
+        def target() -> None:
+            try:
+                result = fn()
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+        
+        threading.Thread(target=target, name=f"workflow-{stage.lower()}", daemon=True).start()
+        try:
+            return future.result(timeout=timeout)
+        except FuturesTimeoutError:
+            if future.done():
+                # The stage itself raised a TimeoutError
+                raise
+            raise StageTimeoutError(stage, timeout) from None
+    
     def approve_iteration(self, iteration_number: int) -> bool:
         """Approve a specific iteration (HITL gate).
         
@@ -9,11 +9,22 @@ refresh cycles after button clicks.
 import streamlit as st
 from app.core.session_manager import SessionManager
 from app.core.orchestrator import Orchestrator
+from app.core.iteration_jobs import get_job_runner
 from app.llm.provider_factory import ProviderFactory
-from app.utils.rerun_guard import RerunGuard, safe_navigation_change
+from app.utils.rerun_guard import RerunGuard, safe_navigation_change, safe_rerun
 from app.utils.report_generator import generate_final_report
 from datetime import datetime
 
+# Seconds between refreshes of a running iteration's progress
+PROGRESS_POLL_INTERVAL = 1.0
+
+# Iteration stages in the order they run
+STAGE_LABELS = {
+    'presenter': "📝 Presenter",
+    'reviewers': "🎭 Reviewers",
+    'confidence': "📊 Confidence",
+}
+
 
 def init_session_objects():
     """Initialize session manager and orchestrator if not already done."""
@@ -112,12 +123,19 @@ def render():
                     st.session_state.llm_config.get('api_key')
                 )
             
-            st.session_state.orchestrator = Orchestrator(session_manager, provider)
+            config = st.session_state.get('session_config', {})
+            st.session_state.orchestrator = Orchestrator(
+                session_manager,
+                provider,
+                speculative_refinement=config.get('speculative_refinement', False)
+            )
         except Exception as e:
             st.error(f"Failed to initialize orchestrator: {str(e)}")
             return
     
     orchestrator = st.session_state.orchestrator
+    job_runner = get_job_runner()
+    iteration_running = job_runner.is_running(current_session.session_id)
     
     # Control buttons
     col_control1, col_control2, col_control3 = st.columns([1, 1, 1])
@@ -127,14 +145,16 @@ def render():
             "▶️ Run Iteration",
             use_container_width=True,
             type="primary",
-            disabled=orchestrator.can_proceed_to_next_iteration() if current_session.iteration > 0 else False
+            disabled=iteration_running or (
+                orchestrator.can_proceed_to_next_iteration() if current_session.iteration > 0 else False
+            )
         )
     
     with col_control2:
         regenerate_clicked = st.button(
             "🔄 Regenerate",
             use_container_width=True,
-            disabled=not orchestrator.get_current_result()
+            disabled=iteration_running or not orchestrator.get_current_result()
         )
     
     with col_control3:
@@ -153,6 +173,8 @@ def render():
         run_iteration(current_session, session_manager, orchestrator)
     
     if end_session_clicked:
+        job_runner.discard(current_session.session_id)
+        orchestrator.close()
         session_manager.end_session()
         st.session_state.orchestrator = None
         st.success("✅ Session ended")
@@ -160,6 +182,17 @@ def render():
     
     st.markdown("---")
     
+    # Background iteration: poll its progress until it finishes
+    job = job_runner.get_job(current_session.session_id)
+    if job is not None and job.done and not job.acknowledged:
+        # Finished before it was ever polled - its result is rendered below
+        job.acknowledged = True
+    if job is not None and not job.acknowledged:
+        render_iteration_progress(current_session.session_id, current_session.selected_roles)
+        return
+    if job is not None and job.result is None and job.error:
+        st.error(f"❌ Failed to run iteration: {job.error}")
+    
     # Get current result
     current_result = orchestrator.get_current_result()
     
@@ -247,6 +280,8 @@ def render():
         # HITL Approval
         if current_result and not current_result.human_gate_approved:
             st.warning("⚠️ Requires Human Approval")
+            if orchestrator.has_speculation():
+                st.caption("⚡ Next refinement is being prepared in the background")
             
             if st.button(
                 "✅ Approve & Continue",
@@ -372,7 +407,11 @@ def render():
 
 
 def run_iteration(current_session, session_manager, orchestrator):
-    """Run a full iteration cycle.
+    """Start an iteration cycle in the background.
+    
+    The iteration runs as a job of the process-wide IterationJobRunner, so
+    the script thread is not blocked and the work survives reruns;
+    render_iteration_progress polls it until it finishes.
     
     ANTI-RECURSION: Protected by RerunGuard to prevent nested execution.
     
@@ -384,8 +423,6 @@ def run_iteration(current_session, session_manager, orchestrator):
     try:
         # CRITICAL: RerunGuard prevents recursive iteration calls
         with RerunGuard("run_iteration"):
-            # Get session configuration
-            config = st.session_state.get('session_config', {})
             requirements = current_session.requirements
             selected_roles = current_session.selected_roles
             
@@ -394,21 +431,15 @@ def run_iteration(current_session, session_manager, orchestrator):
             if current_session.iteration > 0 and orchestrator.can_proceed_to_next_iteration():
                 approved_feedback = orchestrator.get_approved_feedback()
             
-            # Show spinner (outside of critical section if possible)
-            with st.spinner("🤖 Running iteration... This may take a minute..."):
-                # Run iteration
-                result = orchestrator.run_iteration(
-                    requirements=requirements,
-                    selected_roles=selected_roles,
-                    approved_feedback=approved_feedback
-                )
-            
-            if result.error:
-                st.error(f"❌ Iteration failed: {result.error}")
-            else:
-                st.success("✅ Iteration complete! Review the feedback below.")
+            get_job_runner().submit(
+                current_session.session_id,
+                orchestrator,
+                requirements=requirements,
+                selected_roles=selected_roles,
+                approved_feedback=approved_feedback
+            )
             
-            # WHY NO RERUN: Streamlit naturally refreshes after button click completes
+            # WHY NO RERUN: The progress fragment below polls the job on its own
     
     except RuntimeError as e:
         if "RECURSION BLOCKED" in str(e):
@@ -420,6 +451,47 @@ def run_iteration(current_session, session_manager, orchestrator):
         st.error(f"❌ Failed to run iteration: {str(e)}")
 
 
+@st.fragment(run_every=PROGRESS_POLL_INTERVAL)
+def render_iteration_progress(session_id, selected_roles):
+    """Render a background iteration's stage progress and partial output.
+    
+    Reruns by itself every PROGRESS_POLL_INTERVAL seconds without rerunning
+    the page. When the job finishes it is marked acknowledged and the page is
+    rerun once to show the result.
+    
+    Args:
+        session_id: Session whose iteration job to show
+        selected_roles: Reviewer roles selected for the session
+    """
+    job = get_job_runner().get_job(session_id)
+    if job is None or job.acknowledged:
+        return
+    
+    if job.done:
+        # WHY SAFE: acknowledged is set first, so the rerun happens only once
+        job.acknowledged = True
+        safe_rerun(reason="Background iteration finished")
+        return
+    
+    snapshot = job.snapshot()
+    st.subheader("🤖 Running iteration...")
+    
+    for stage, label in STAGE_LABELS.items():
+        default_total = len(selected_roles) if stage == 'reviewers' else 1
+        completed, total = snapshot['progress'].get(stage, (0, default_total))
+        st.progress(completed / total if total else 1.0, text=f"{label}: {completed}/{total}")
+    st.caption(f"⏱️ {snapshot['elapsed']:.0f}s elapsed")
+    
+    # Partial output streamed so far
+    partial_output = snapshot['partial_output']
+    with st.expander("📝 Presenter", expanded=snapshot['stage'] == 'presenter'):
+        st.markdown(partial_output.get("presenter") or "_Waiting for output..._")
+    for role in selected_roles:
+        if partial_output.get(role):
+            with st.expander(f"🔍 {role}"):
+                st.markdown(partial_output[role])
+
+
 def render_reviewer_card(feedback, idx):
     """Render a reviewer feedback card.
     
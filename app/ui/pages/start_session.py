@@ -154,6 +154,15 @@ def render():
             )
             reviewer_models[role] = model
     
+    # Optional background work during human review
+    speculative_refinement = st.checkbox(
+        "⚡ Prepare the next refinement while I review feedback",
+        key="speculative_refinement",
+        help="Starts the Presenter's next draft in the background using all current feedback. "
+             "It is used instantly if you approve without edits and discarded otherwise "
+             "(the discarded draft still uses tokens)."
+    )
+    
     st.markdown("---")
     
     # Start session button
@@ -216,7 +225,8 @@ def render():
                     'uploaded_files': uploaded_files,
                     'selected_roles': selected_roles,
                     'presenter_model': presenter_model,
-                    'reviewer_models': reviewer_models
+                    'reviewer_models': reviewer_models,
+                    'speculative_refinement': speculative_refinement
                 }
                 
                 # Success and navigate
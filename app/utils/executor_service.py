@@ -0,0 +1,196 @@
+"""Process-wide bounded executor shared by reviewer fan-out."""
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+
+class ExecutorSaturatedError(RuntimeError):
+    """Raised when no queue slot frees up within the submit timeout."""
+
+
+class ExecutorService:
+    """Long-lived thread pool with a bounded queue and blocking backpressure.
+    
+    At most max_workers tasks run at once and at most max_queue more wait
+    for a thread. Once both are full, submit() blocks until a task finishes,
+    and raises ExecutorSaturatedError if none does within submit_timeout.
+    Threads are created on demand and reused across calls and sessions, so
+    the pool caps provider concurrency for the whole process instead of per
+    call.
+    """
+    
+    DEFAULT_MAX_WORKERS = 8
+    DEFAULT_MAX_QUEUE = 32
+    DEFAULT_SUBMIT_TIMEOUT = 60.0  # Seconds to wait for a free slot
+    
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        max_queue: int = DEFAULT_MAX_QUEUE,
+        submit_timeout: Optional[float] = DEFAULT_SUBMIT_TIMEOUT
+    ):
+        """Initialize the executor.
+        
+        Args:
+            max_workers: Maximum tasks running at once
+            max_queue: Maximum tasks waiting for a thread
+            submit_timeout: Seconds submit() waits for a free slot before
+                raising ExecutorSaturatedError (None = wait indefinitely)
+        
+        Raises:
+            ValueError: If max_workers is less than 1 or max_queue is negative
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        if max_queue < 0:
+            raise ValueError("max_queue must not be negative")
+        
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.submit_timeout = submit_timeout
+        
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="reviewer-pool")
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        
+        self._stats_lock = threading.Lock()
+        self.submitted = 0
+        self.rejected = 0
+        self.in_flight = 0
+    
+    def submit(self, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        """Schedule a task, waiting for a free slot if the queue is full.
+        
+        Args:
+            fn: Function to run
+            *args: Positional arguments for fn
+            **kwargs: Keyword arguments for fn
+        
+        Returns:
+            Future of the task
+        
+        Raises:
+            ExecutorSaturatedError: If no slot frees up within submit_timeout
+        """
+        return self.try_submit(None, fn, *args, **kwargs)
+    
+    def try_submit(self, timeout: Optional[float], fn: Callable[..., Any], *args, **kwargs) -> Future:
+        """Schedule a task, waiting at most timeout seconds for a free slot.
+        
+        Lets callers with their own deadline spend only what is left of it
+        waiting for the queue.
+        
+        Args:
+            timeout: Seconds to wait for a slot; the shorter of this and
+                submit_timeout applies (None = submit_timeout alone)
+            fn: Function to run
+            *args: Positional arguments for fn
+            **kwargs: Keyword arguments for fn
+        
+        Returns:
+            Future of the task
+        
+        Raises:
+            ExecutorSaturatedError: If no slot frees up in time
+        """
+        wait_for = self.submit_timeout
+        if timeout is not None:
+            timeout = max(0.0, timeout)
+            wait_for = timeout if wait_for is None else min(wait_for, timeout)
+        
+        if not self._slots.acquire(timeout=wait_for):
+            with self._stats_lock:
+                self.rejected += 1
+            raise ExecutorSaturatedError(
+                f"Reviewer executor saturated ({self.max_workers} running, {self.max_queue} queued)"
+            )
+        
+        try:
+            future = self._executor.submit(fn, *args, **kwargs)
+        except BaseException:
+            self._slots.release()
+            raise
+        
+        with self._stats_lock:
+            self.submitted += 1
+            self.in_flight += 1
+        # Also runs for tasks cancelled while queued
+        future.add_done_callback(self._release)
+        return future
+    
+    def _release(self, _future: Future) -> None:
+        """Free the slot of a finished task."""
+        with self._stats_lock:
+            self.in_flight -= 1
+        self._slots.release()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get executor statistics.
+        
+        Returns:
+            Dictionary with max_workers, max_queue, in_flight (running or
+            queued tasks), submitted and rejected
+        """
+        with self._stats_lock:
+            return {
+                'max_workers': self.max_workers,
+                'max_queue': self.max_queue,
+                'in_flight': self.in_flight,
+                'submitted': self.submitted,
+                'rejected': self.rejected,
+            }
+    
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting tasks and release the threads.
+        
+        Args:
+            wait: Whether to wait for running and queued tasks to finish
+        """
+        self._executor.shutdown(wait=wait)
+
+
+_executor_service: Optional[ExecutorService] = None
+_executor_service_lock = threading.Lock()
+
+
+def get_executor_service() -> ExecutorService:
+    """Get the process-wide executor, creating it with defaults if needed.
+    
+    Shared by every session of a Streamlit server process, so the worker
+    count is a global cap on concurrent reviewer calls.
+    
+    Returns:
+        Shared ExecutorService
+    """
+    global _executor_service
+    with _executor_service_lock:
+        if _executor_service is None:
+            _executor_service = ExecutorService()
+        return _executor_service
+
+
+def configure_executor_service(
+    max_workers: int = ExecutorService.DEFAULT_MAX_WORKERS,
+    max_queue: int = ExecutorService.DEFAULT_MAX_QUEUE,
+    submit_timeout: Optional[float] = ExecutorService.DEFAULT_SUBMIT_TIMEOUT
+) -> ExecutorService:
+    """Replace the process-wide executor with a new configuration.
+    
+    Tasks already submitted to the previous executor finish in the
+    background.
+    
+    Args:
+        max_workers: Maximum tasks running at once
+        max_queue: Maximum tasks waiting for a thread
+        submit_timeout: Seconds submit() waits for a free slot (None = forever)
+    
+    Returns:
+        New shared ExecutorService
+    """
+    global _executor_service
+    service = ExecutorService(max_workers=max_workers, max_queue=max_queue, submit_timeout=submit_timeout)
+    with _executor_service_lock:
+        previous, _executor_service = _executor_service, service
+    if previous is not None:
+        previous.shutdown(wait=False)
+    return service
@@ -1,8 +1,14 @@
 """Report generation utilities for Agent Review Board sessions."""
 
 from typing import List, Dict, Any, Optional
+from dataclasses import dataclass, field
 from datetime import datetime
 import json
+from app.utils.similarity import MinHashLSH
+
+
+# Shared clusterer for reviewer findings (deterministic, stateless)
+_ISSUE_CLUSTERER = MinHashLSH()
 
 
 class SafeJSONEncoder(json.JSONEncoder):
@@ -73,45 +79,35 @@ def aggregate_reviewer_feedback(reviewer_feedback_list: List[Dict[str, Any]]) ->
         }
     
     # Extract all feedback points
-    all_issues = []
+    all_issues = _collect_issues(reviewer_feedback_list)
     severity_counts = {"CRITICAL": 0, "HIGH": 0, "MEDIUM": 0, "LOW": 0}
     confidence_scores = []
     
+    for issue in all_issues:
+        # Count severity
+        if issue['severity'] in severity_counts:
+            severity_counts[issue['severity']] += 1
+    
     for feedback in reviewer_feedback_list:
-        if isinstance(feedback, dict):
-            points = feedback.get('feedback_points', [])
-        else:
-            # Handle Feedback objects
-            points = getattr(feedback, 'feedback_points', [])
-        
-        for point in points:
-            all_issues.append({
-                "text": point,
-                "reviewer": feedback.get('reviewer_role') if isinstance(feedback, dict) else getattr(feedback, 'reviewer_role', 'unknown'),
-                "severity": _extract_severity(point)
-            })
-            
-            # Count severity
-            severity = _extract_severity(point)
-            if severity in severity_counts:
-                severity_counts[severity] += 1
-        
         # Extract confidence if available
         if isinstance(feedback, dict) and 'confidence_score' in feedback:
             if feedback['confidence_score'] is not None:
                 confidence_scores.append(feedback['confidence_score'])
     
+    # Group near-duplicate issues once for all classifications
+    clusters = cluster_issues(all_issues)
+    
     # Find common issues (mentioned by 2+ reviewers)
-    common_issues = _find_common_issues(all_issues)
+    common_issues = _find_common_issues(all_issues, clusters)
     
     # Find unique issues
-    unique_issues = _find_unique_issues(all_issues, common_issues)
+    unique_issues = _find_unique_issues(all_issues, common_issues, clusters)
     
     # Detect disagreements (opposite sentiments)
     disagreements = _detect_disagreements(reviewer_feedback_list)
     
-    # Find consensus items (all reviewers approve)
-    consensus_items = _find_consensus(reviewer_feedback_list)
+    # Find consensus items (raised by every reviewer)
+    consensus_items = _find_consensus(reviewer_feedback_list, clusters)
     
     # Calculate average confidence
     avg_confidence = sum(confidence_scores) / len(confidence_scores) if confidence_scores else 0.0
@@ -390,54 +386,134 @@ def _extract_severity(text: str) -> str:
         return 'NONE'
 
 
-def _find_common_issues(all_issues: List[Dict[str, str]]) -> List[str]:
-    """Find issues mentioned by multiple reviewers.
+def _reviewer_role(feedback: Any) -> Optional[str]:
+    """Get the reviewer role of a feedback dict or Feedback object."""
+    if isinstance(feedback, dict):
+        return feedback.get('reviewer_role')
+    return getattr(feedback, 'reviewer_role', 'unknown')
+
+
+def _collect_issues(reviewer_feedback_list: List[Any]) -> List[Dict[str, str]]:
+    """Flatten reviewer feedback into issue dictionaries.
     
     Args:
-        all_issues: List of issue dictionaries
+        reviewer_feedback_list: List of feedback dictionaries or Feedback objects
         
     Returns:
-        List of common issue texts
+        List of issue dictionaries with text, reviewer and severity
     """
-    # Simple keyword-based similarity
-    issue_counts = {}
+    all_issues = []
     
-    for issue in all_issues:
-        text = issue['text'].lower()
-        # Extract key words (simple approach)
-        words = set(text.split())
-        key = tuple(sorted(words)[:5])  # Use first 5 words as key
+    for feedback in reviewer_feedback_list:
+        if isinstance(feedback, dict):
+            points = feedback.get('feedback_points', [])
+        else:
+            # Handle Feedback objects
+            points = getattr(feedback, 'feedback_points', [])
         
-        if key not in issue_counts:
-            issue_counts[key] = []
-        issue_counts[key].append(issue['text'])
+        for point in points:
+            all_issues.append({
+                "text": point,
+                "reviewer": _reviewer_role(feedback),
+                "severity": _extract_severity(point)
+            })
+    
+    return all_issues
+
+
+@dataclass
+class IssueCluster:
+    """Near-duplicate issues raised by one or more reviewers.
+    
+    Attributes:
+        texts: Issue texts in the order they were raised
+        reviewers: Distinct reviewers who raised them, in order
+        severity: Highest severity among the issues
+    """
     
-    # Return issues mentioned by 2+ reviewers
-    common = []
-    for key, texts in issue_counts.items():
-        if len(texts) >= 2:
-            common.append(texts[0])  # Use first occurrence
+    texts: List[str] = field(default_factory=list)
+    reviewers: List[str] = field(default_factory=list)
+    severity: str = 'NONE'
     
-    return common
+    @property
+    def representative(self) -> str:
+        """First occurrence, used when reporting the cluster."""
+        return self.texts[0]
 
 
-def _find_unique_issues(all_issues: List[Dict[str, str]], common_issues: List[str]) -> List[str]:
+# Severity order for picking a cluster's highest severity
+_SEVERITY_RANK = {'NONE': 0, 'LOW': 1, 'MEDIUM': 2, 'HIGH': 3, 'CRITICAL': 4}
+
+
+def cluster_issues(all_issues: List[Dict[str, str]], clusterer: Optional[MinHashLSH] = None) -> List[IssueCluster]:
+    """Cluster near-duplicate issues with MinHash/LSH.
+    
+    Args:
+        all_issues: List of issue dictionaries (text, reviewer, severity)
+        clusterer: Clusterer to use (default: shared MinHashLSH)
+        
+    Returns:
+        Issue clusters ordered by first occurrence
+    """
+    clusterer = clusterer if clusterer is not None else _ISSUE_CLUSTERER
+    
+    clusters = []
+    for indices in clusterer.cluster([issue['text'] for issue in all_issues]):
+        cluster = IssueCluster()
+        for index in indices:
+            issue = all_issues[index]
+            cluster.texts.append(issue['text'])
+            reviewer = issue.get('reviewer') or 'unknown'
+            if reviewer not in cluster.reviewers:
+                cluster.reviewers.append(reviewer)
+            severity = issue.get('severity') or _extract_severity(issue['text'])
+            if _SEVERITY_RANK.get(severity, 0) > _SEVERITY_RANK[cluster.severity]:
+                cluster.severity = severity
+        clusters.append(cluster)
+    return clusters
+
+
+def _find_common_issues(
+    all_issues: List[Dict[str, str]],
+    clusters: Optional[List[IssueCluster]] = None
+) -> List[str]:
+    """Find issues mentioned by multiple reviewers.
+    
+    Args:
+        all_issues: List of issue dictionaries
+        clusters: Precomputed clusters of all_issues (computed if omitted)
+        
+    Returns:
+        List of common issue texts (one per cluster)
+    """
+    if clusters is None:
+        clusters = cluster_issues(all_issues)
+    
+    return [cluster.representative for cluster in clusters if len(cluster.reviewers) >= 2]
+
+
+def _find_unique_issues(
+    all_issues: List[Dict[str, str]],
+    common_issues: List[str],
+    clusters: Optional[List[IssueCluster]] = None
+) -> List[str]:
     """Find issues mentioned by only one reviewer.
     
     Args:
         all_issues: List of all issues
         common_issues: List of common issues
+        clusters: Precomputed clusters of all_issues (computed if omitted)
         
     Returns:
-        List of unique issue texts
+        List of unique issue texts (one per cluster)
     """
-    unique = []
+    if clusters is None:
+        clusters = cluster_issues(all_issues)
     
-    for issue in all_issues:
-        if issue['text'] not in common_issues:
-            unique.append(issue['text'])
-    
-    return unique
+    return [
+        cluster.representative for cluster in clusters
+        if len(cluster.reviewers) < 2 and cluster.representative not in common_issues
+    ]
 
 
 def _detect_disagreements(reviewer_feedback_list: List[Any]) -> List[str]:
@@ -475,21 +551,29 @@ def _detect_disagreements(reviewer_feedback_list: List[Any]) -> List[str]:
     return disagreements
 
 
-def _find_consensus(reviewer_feedback_list: List[Any]) -> List[str]:
+def _find_consensus(
+    reviewer_feedback_list: List[Any],
+    clusters: Optional[List[IssueCluster]] = None
+) -> List[str]:
     """Find items all reviewers agree on.
     
+    An item is in consensus when every reviewer raised a near-duplicate of it.
+    
     Args:
         reviewer_feedback_list: List of feedback objects
+        clusters: Precomputed issue clusters of the feedback (computed if omitted)
         
     Returns:
         List of consensus items
     """
-    if len(reviewer_feedback_list) < 2:
+    reviewers = {_reviewer_role(feedback) or 'unknown' for feedback in reviewer_feedback_list}
+    if len(reviewer_feedback_list) < 2 or len(reviewers) < 2:
         return []
     
-    # For now, return empty - requires more sophisticated NLP
-    # This would need similarity scoring between feedback points
-    return []
+    if clusters is None:
+        clusters = cluster_issues(_collect_issues(reviewer_feedback_list))
+    
+    return [cluster.representative for cluster in clusters if reviewers.issubset(cluster.reviewers)]
 
 
 # Helper functions for report generation
@@ -0,0 +1,167 @@
+"""Near-duplicate text clustering with MinHash and LSH banding."""
+
+import random
+import re
+import zlib
+from typing import Dict, FrozenSet, List, Sequence, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+# Mersenne prime modulus of the MinHash permutations; products of 31-bit
+# values stay within int64
+_PRIME = (1 << 31) - 1
+
+# Severity tags and filler words that say nothing about the issue itself
+_SEVERITY_TAG = re.compile(r'\[severity:\s*\w+\]', re.IGNORECASE)
+_TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+STOPWORDS = frozenset({
+    'the', 'and', 'for', 'with', 'this', 'that', 'are', 'is', 'in', 'of', 'to',
+    'be', 'an', 'or', 'on', 'it', 'as', 'at', 'by', 'not', 'no', 'there',
+    'should', 'could', 'would', 'needs', 'need', 'has', 'have', 'was', 'were',
+})
+
+
+class MinHashLSH:
+    """Clusters near-duplicate texts in near-linear time.
+    
+    Each text is reduced to character shingles of its words (so word order
+    and inflections matter little), summarized by a MinHash signature, and
+    split into LSH bands. Only texts sharing a band bucket are compared, by
+    exact Jaccard similarity of their shingles; pairs at or above the
+    threshold are merged with union-find.
+    
+    Hashing is seeded and uses CRC32 rather than hash(), so clusters are the
+    same across processes and runs.
+    """
+    
+    DEFAULT_THRESHOLD = 0.4
+    DEFAULT_NUM_PERM = 64
+    DEFAULT_BANDS = 32
+    DEFAULT_SHINGLE_SIZE = 4
+    DEFAULT_SEED = 1
+    
+    def __init__(
+        self,
+        threshold: float = DEFAULT_THRESHOLD,
+        num_perm: int = DEFAULT_NUM_PERM,
+        bands: int = DEFAULT_BANDS,
+        shingle_size: int = DEFAULT_SHINGLE_SIZE,
+        seed: int = DEFAULT_SEED
+    ):
+        """Initialize the clusterer.
+        
+        Args:
+            threshold: Minimum Jaccard similarity of shingles to merge two texts
+            num_perm: Number of MinHash permutations (signature length)
+            bands: Number of LSH bands; must divide num_perm. More bands with
+                fewer rows each find lower-similarity candidates.
+            shingle_size: Characters per shingle
+            seed: Seed of the permutation coefficients
+        
+        Raises:
+            ValueError: If threshold is not in (0, 1] or bands does not divide num_perm
+        """
+        if not 0 < threshold <= 1:
+            raise ValueError("threshold must be between 0 and 1")
+        if bands < 1 or num_perm % bands:
+            raise ValueError("bands must divide num_perm")
+        
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        
+        rng = random.Random(seed)
+        self._coefficients = [(rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(num_perm)]
+        if NUMPY_AVAILABLE:
+            self._a = np.array([a for a, _ in self._coefficients], dtype=np.int64)[:, None]
+            self._b = np.array([b for _, b in self._coefficients], dtype=np.int64)[:, None]
+    
+    def shingles(self, text: str) -> FrozenSet[str]:
+        """Get the character shingles of a text's words.
+        
+        Severity tags and stopwords are dropped; words no longer than the
+        shingle size are kept whole.
+        
+        Args:
+            text: Text to shingle
+        
+        Returns:
+            Set of shingles
+        """
+        size = self.shingle_size
+        result = set()
+        for token in _TOKEN_PATTERN.findall(_SEVERITY_TAG.sub(' ', text).lower()):
+            if token in STOPWORDS or len(token) < 3:
+                continue
+            if len(token) <= size:
+                result.add(token)
+            else:
+                result.update(token[i:i + size] for i in range(len(token) - size + 1))
+        return frozenset(result)
+    
+    def signature(self, shingles: FrozenSet[str]) -> Tuple[int, ...]:
+        """Compute the MinHash signature of a shingle set.
+        
+        Args:
+            shingles: Shingles of a text
+        
+        Returns:
+            num_perm minimum hash values (all _PRIME for an empty set)
+        """
+        if not shingles:
+            return (_PRIME,) * self.num_perm
+        
+        hashes = [zlib.crc32(shingle.encode('utf-8')) % _PRIME for shingle in shingles]
+        if NUMPY_AVAILABLE:
+            values = (self._a * np.array(hashes, dtype=np.int64)[None, :] + self._b) % _PRIME
+            return tuple(values.min(axis=1).tolist())
+        return tuple(min((a * h + b) % _PRIME for h in hashes) for a, b in self._coefficients)
+    
+    def cluster(self, texts: Sequence[str]) -> List[List[int]]:
+        """Group near-duplicate texts.
+        
+        Args:
+            texts: Texts to cluster
+        
+        Returns:
+            Clusters as lists of text indices, each in ascending order,
+            ordered by their first index
+        """
+        shingle_sets = [self.shingles(text) for text in texts]
+        parent = list(range(len(texts)))
+        
+        def find(index: int) -> int:
+            while parent[index] != index:
+                parent[index] = parent[parent[index]]
+                index = parent[index]
+            return index
+        
+        buckets: Dict[Tuple[int, Tuple[int, ...]], List[int]] = {}
+        for index, shingle_set in enumerate(shingle_sets):
+            if not shingle_set:
+                continue
+            signature = self.signature(shingle_set)
+            for band in range(self.bands):
+                key = (band, signature[band * self.rows:(band + 1) * self.rows])
+                for other in buckets.setdefault(key, []):
+                    root, other_root = find(index), find(other)
+                    if root != other_root and self._jaccard(shingle_set, shingle_sets[other]) >= self.threshold:
+                        parent[max(root, other_root)] = min(root, other_root)
+                buckets[key].append(index)
+        
+        clusters: Dict[int, List[int]] = {}
+        for index in range(len(texts)):
+            clusters.setdefault(find(index), []).append(index)
+        return list(clusters.values())
+    
+    @staticmethod
+    def _jaccard(first: FrozenSet[str], second: FrozenSet[str]) -> float:
+        """Exact Jaccard similarity of two shingle sets."""
+        return len(first & second) / len(first | second)
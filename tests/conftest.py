@@ -9,6 +9,44 @@ project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 sys.path.insert(0, project_root)
 
 
+@pytest.fixture(autouse=True)
+def reset_shared_rate_limiters():
+    """Give every test fresh process-wide rate limiter buckets."""
+    from app.llm.rate_limiter import reset_rate_limiters
+    reset_rate_limiters()
+    yield
+    reset_rate_limiters()
+
+
+@pytest.fixture(autouse=True)
+def instant_retry_backoff(monkeypatch):
+    """Don't block on jittered backoff sleeps in provider retry loops."""
+    from functools import partial
+    from app.llm import base_provider
+    from app.llm.retry_policy import RetryPolicy
+    monkeypatch.setattr(base_provider, 'RetryPolicy', partial(RetryPolicy, sleep=lambda delay: None))
+
+
+@pytest.fixture(autouse=True)
+def reset_output_tracker():
+    """Give every test a fresh process-wide output length tracker."""
+    from app.llm.output_budget import get_output_tracker
+    get_output_tracker().reset()
+    yield
+    get_output_tracker().reset()
+
+
+@pytest.fixture(autouse=True, scope='session')
+def offline_token_counting():
+    """Estimate prompt tokens instead of loading tiktoken encodings.
+    
+    Never undone: worker threads that tests abandon on timeout may still be
+    counting tokens when the session ends.
+    """
+    from app.llm import token_budget
+    token_budget._get_encoding = lambda name: None
+
+
 @pytest.fixture
 def mock_llm_provider():
     """Fixture providing a MockLLMProvider instance."""
@@ -1,10 +1,13 @@
 """Integration tests for complete iteration loop with WorkflowEngine."""
 
+import threading
+import time
 import pytest
-from app.orchestration.workflow_engine import WorkflowEngine
+from app.orchestration.workflow_engine import StageBudgets, WorkflowEngine
 from app.orchestration.iteration_state import IterationState
 from app.core.session_manager import SessionManager
 from app.llm.mock_provider import MockLLMProvider
+from app.utils.executor_service import ExecutorService
 
 
 class TestIterationLoop:
@@ -320,6 +323,241 @@ class TestParallelReviewerExecution:
         assert result.aggregated_feedback
 
 
+class SectionStreamingProvider(MockLLMProvider):
+    """Mock provider that streams a structured presenter document slowly."""
+    
+    SECTIONS = [
+        "# TITLE\nPayment Service\n\n",
+        "## EXECUTIVE SUMMARY\nSummary of the service.\n\n",
+        "## DETAILED DESCRIPTION\nHow the service works.\n\n",
+        "## KEY REQUIREMENTS\n- Process card payments\n\n",
+        "## CONSTRAINTS\n- PCI compliance\n\n",
+        "## OPEN QUESTIONS\n- Which regions?\n",
+    ]
+    
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._lock = threading.Lock()
+        self.review_prompts = []
+        self.review_started_at = []
+        self.presenter_finished_at = None
+    
+    def stream_text(self, prompt: str, **kwargs):
+        for section in self.SECTIONS:
+            time.sleep(0.05)
+            yield section
+        self.presenter_finished_at = time.monotonic()
+    
+    def generate_text(self, prompt: str, **kwargs) -> str:
+        if "CONTENT TO REVIEW" in prompt:
+            with self._lock:
+                self.review_prompts.append(prompt)
+                self.review_started_at.append(time.monotonic())
+            section = "early" if "TITLE, EXECUTIVE SUMMARY" in prompt else "late"
+            return (
+                "VERDICT: APPROVE\n\nFINDINGS:\n"
+                f"1. [Severity: LOW] Finding about the {section} sections of the document\n"
+            )
+        return super().generate_text(prompt, **kwargs)
+
+
+class TestPipelinedIteration:
+    """Test pipelined presenter/reviewer execution."""
+    
+    ROLES = ["Technical Reviewer", "Security Reviewer"]
+    
+    @pytest.fixture
+    def session_manager(self):
+        """Create session manager."""
+        manager = SessionManager()
+        manager.create_session(
+            session_name="Pipelined Session",
+            requirements="Build a payment service",
+            selected_roles=self.ROLES,
+            models_config={"provider": "mock"}
+        )
+        return manager
+    
+    def test_reviews_start_before_presenter_finishes(self, session_manager):
+        """Test that reviewers begin on finished sections during generation."""
+        provider = SectionStreamingProvider()
+        engine = WorkflowEngine(provider, session_manager)
+        
+        result = engine.run_iteration("Build a payment service", self.ROLES, pipelined=True)
+        
+        assert result.error is None
+        assert min(provider.review_started_at) < provider.presenter_finished_at
+        # Two batches of three sections for each reviewer
+        assert len(provider.review_prompts) == 2 * len(self.ROLES)
+        assert result.presenter_output.startswith("# TITLE")
+    
+    def test_section_reviews_are_merged_per_reviewer(self, session_manager):
+        """Test that section-scoped feedback lands in the usual feedback dict."""
+        provider = SectionStreamingProvider()
+        engine = WorkflowEngine(provider, session_manager)
+        
+        result = engine.run_iteration("Build a payment service", self.ROLES, pipelined=True)
+        
+        assert set(result.reviewer_feedback) == set(self.ROLES)
+        for feedback in result.reviewer_feedback.values():
+            assert "FINDINGS:" in feedback
+            assert "early sections" in feedback
+            assert "late sections" in feedback
+    
+    def test_unstructured_output_falls_back_to_full_review(self, session_manager):
+        """Test that output without sections is reviewed as a whole."""
+        provider = MockLLMProvider()
+        engine = WorkflowEngine(provider, session_manager)
+        
+        result = engine.run_iteration("Build a payment service", self.ROLES, pipelined=True)
+        
+        assert result.error is None
+        assert len(result.reviewer_feedback) == 2
+        assert "DOCUMENT EXCERPT" not in provider.last_prompt
+    
+    def test_saturated_executor_does_not_stall_presenter_stream(self, session_manager):
+        """Test that batches the full shared queue can't take are reviewed after the stream."""
+        provider = SectionStreamingProvider()
+        engine = WorkflowEngine(provider, session_manager)
+        executor = ExecutorService(max_workers=1, max_queue=0, submit_timeout=60)
+        release = threading.Event()
+        executor.submit(release.wait, 5)  # Another session holds the only slot
+        engine.reviewer_manager.executor = executor
+        timer = threading.Timer(1.0, release.set)
+        
+        try:
+            timer.start()
+            start = time.monotonic()
+            result = engine.run_iteration("Build a payment service", self.ROLES, pipelined=True)
+        finally:
+            release.set()
+            timer.cancel()
+            executor.shutdown(wait=True)
+        
+        assert result.error is None
+        assert provider.presenter_finished_at - start < 0.8
+        assert len(provider.review_prompts) == 2 * len(self.ROLES)
+        for feedback in result.reviewer_feedback.values():
+            assert "early sections" in feedback
+            assert "late sections" in feedback
+    
+    def test_invalid_section_batch_size(self, session_manager):
+        """Test that a non-positive batch size is rejected."""
+        with pytest.raises(ValueError):
+            WorkflowEngine(MockLLMProvider(), session_manager, section_batch_size=0)
+
+
+class SlowStageProvider(MockLLMProvider):
+    """Mock provider whose presenter, aggregator or some reviewers hang."""
+    
+    def __init__(self, hang_reviewers=None, hang_presenter=False, hang_aggregator=False, **kwargs):
+        super().__init__(**kwargs)
+        self.hang_reviewers = hang_reviewers or []
+        self.hang_presenter = hang_presenter
+        self.hang_aggregator = hang_aggregator
+    
+    def generate_text(self, prompt: str, **kwargs) -> str:
+        if "CONTENT TO REVIEW" in prompt:
+            hang = any(reviewer in prompt for reviewer in self.hang_reviewers)
+        elif "Board Chair" in prompt:
+            hang = self.hang_aggregator
+        else:
+            hang = self.hang_presenter
+        if hang:
+            time.sleep(2.0)
+        return super().generate_text(prompt, **kwargs)
+
+
+class TestIterationDeadlines:
+    """Test iteration deadlines and per-stage budgets."""
+    
+    ROLES = ["Technical Reviewer", "Security Reviewer"]
+    
+    @pytest.fixture
+    def session_manager(self):
+        """Create session manager."""
+        manager = SessionManager()
+        manager.create_session(
+            session_name="Deadline Session",
+            requirements="Build a REST API",
+            selected_roles=self.ROLES,
+            models_config={"provider": "mock"}
+        )
+        return manager
+    
+    def test_late_reviewer_is_marked_timed_out(self, session_manager):
+        """Test the iteration continues without a reviewer that exceeds its budget."""
+        provider = SlowStageProvider(hang_reviewers=["security and privacy expert"])
+        engine = WorkflowEngine(provider, session_manager, stage_budgets=StageBudgets(reviewers=0.3))
+        
+        start = time.monotonic()
+        result = engine.run_iteration("Build a REST API", self.ROLES)
+        
+        assert time.monotonic() - start < 1.5
+        assert result.error is None
+        assert result.timed_out == ["Security Reviewer"]
+        assert result.reviewer_feedback["Security Reviewer"] == "Review timed out after 0.3s"
+        assert "FINDINGS:" in result.reviewer_feedback["Technical Reviewer"]
+        assert result.aggregated_feedback
+    
+    def test_iteration_deadline_bounds_reviewers(self, session_manager):
+        """Test the iteration deadline applies when no stage budget is set."""
+        provider = SlowStageProvider(hang_reviewers=["security and privacy expert"])
+        engine = WorkflowEngine(provider, session_manager)
+        
+        start = time.monotonic()
+        result = engine.run_iteration("Build a REST API", self.ROLES, timeout=0.5)
+        
+        assert time.monotonic() - start < 1.5
+        assert "Security Reviewer" in result.timed_out
+    
+    def test_presenter_timeout_fails_iteration(self, session_manager):
+        """Test a presenter that exceeds its budget fails the iteration."""
+        engine = WorkflowEngine(SlowStageProvider(hang_presenter=True), session_manager)
+        
+        start = time.monotonic()
+        result = engine.run_iteration(
+            "Build a REST API", self.ROLES, stage_budgets=StageBudgets(presenter=0.2)
+        )
+        
+        assert time.monotonic() - start < 1.5
+        assert result.error == "Presenter timed out after 0.2s"
+    
+    def test_aggregator_timeout_uses_local_aggregation(self, session_manager):
+        """Test a late aggregator falls back to the local board decision."""
+        provider = SlowStageProvider(hang_aggregator=True)
+        engine = WorkflowEngine(
+            provider,
+            session_manager,
+            local_aggregation=False,
+            stage_budgets=StageBudgets(aggregator=0.2)
+        )
+        
+        result = engine.run_iteration("Build a REST API", self.ROLES)
+        
+        assert result.error is None
+        assert result.timed_out == ["Aggregator"]
+        assert "Fallback Mode" in result.aggregated_feedback
+    
+    def test_pipelined_late_reviewer_is_marked_timed_out(self, session_manager):
+        """Test section reviews that miss the budget mark their reviewer timed out."""
+        class SlowSectionProvider(SectionStreamingProvider):
+            def generate_text(self, prompt: str, **kwargs) -> str:
+                if "CONTENT TO REVIEW" in prompt and "security and privacy expert" in prompt:
+                    time.sleep(2.0)
+                return super().generate_text(prompt, **kwargs)
+        
+        engine = WorkflowEngine(SlowSectionProvider(), session_manager)
+        
+        result = engine.run_iteration(
+            "Build a payment service", self.ROLES, pipelined=True, stage_budgets=StageBudgets(reviewers=0.3)
+        )
+        
+        assert result.error is None
+        assert result.timed_out == ["Security Reviewer"]
+        assert "early sections" in result.reviewer_feedback["Technical Reviewer"]
+
+
 class TestIterationStateManagement:
     """Test iteration state management."""
     
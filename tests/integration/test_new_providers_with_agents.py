@@ -109,7 +109,7 @@ class TestGeminiWithAgents:
 class TestHuggingFaceWithAgents:
     """Test HuggingFace provider integration with agents."""
     
-    @patch('app.llm.huggingface_provider.requests.post')
+    @patch('app.llm.huggingface_provider.requests.Session.post')
     def test_presenter_with_huggingface(self, mock_post):
         """Test PresenterAgent with HuggingFace provider."""
         from app.llm.huggingface_provider import HuggingFaceProvider
@@ -135,7 +135,7 @@ class TestHuggingFaceWithAgents:
         assert isinstance(result, str)
         assert len(result) > 0
     
-    @patch('app.llm.huggingface_provider.requests.post')
+    @patch('app.llm.huggingface_provider.requests.Session.post')
     def test_reviewer_with_huggingface(self, mock_post):
         """Test ReviewerAgent with HuggingFace provider."""
         from app.llm.huggingface_provider import HuggingFaceProvider
@@ -167,7 +167,7 @@ class TestHuggingFaceWithAgents:
 class TestOllamaWithAgents:
     """Test Ollama provider integration with agents."""
     
-    @patch('app.llm.ollama_provider.requests.post')
+    @patch('app.llm.ollama_provider.requests.Session.post')
     def test_presenter_with_ollama(self, mock_post):
         """Test PresenterAgent with Ollama provider."""
         from app.llm.ollama_provider import OllamaProvider
@@ -194,7 +194,7 @@ class TestOllamaWithAgents:
         assert isinstance(result, str)
         assert len(result) > 0
     
-    @patch('app.llm.ollama_provider.requests.post')
+    @patch('app.llm.ollama_provider.requests.Session.post')
     def test_reviewer_with_ollama(self, mock_post):
         """Test ReviewerAgent with Ollama provider."""
         from app.llm.ollama_provider import OllamaProvider
@@ -223,7 +223,7 @@ class TestOllamaWithAgents:
         assert isinstance(result, Feedback)
         assert len(result.feedback_points) > 0
     
-    @patch('app.llm.ollama_provider.requests.post')
+    @patch('app.llm.ollama_provider.requests.Session.post')
     def test_confidence_agent_with_ollama(self, mock_post):
         """Test ConfidenceAgent with Ollama provider."""
         from app.llm.ollama_provider import OllamaProvider
@@ -274,9 +274,9 @@ class TestProviderCompatibility:
     
     @patch('app.llm.gemini_provider.HTTPX_AVAILABLE', True)
     @patch('httpx.Client')
-    @patch('app.llm.huggingface_provider.requests.post')
-    @patch('app.llm.ollama_provider.requests.post')
-    @patch('app.llm.ollama_provider.requests.get')
+    @patch('app.llm.huggingface_provider.requests.Session.post')
+    @patch('app.llm.ollama_provider.requests.Session.post')
+    @patch('app.llm.ollama_provider.requests.Session.get')
     def test_all_providers_implement_base_interface(
         self, mock_ollama_get, mock_ollama_post, mock_hf_post, mock_client_class
     ):
@@ -396,8 +396,8 @@ class TestProviderCompatibility:
 class TestEndToEndWithNewProviders:
     """End-to-end tests with new providers."""
     
-    @patch('app.llm.ollama_provider.requests.post')
-    @patch('app.llm.ollama_provider.requests.get')
+    @patch('app.llm.ollama_provider.requests.Session.post')
+    @patch('app.llm.ollama_provider.requests.Session.get')
     def test_full_review_cycle_with_ollama(self, mock_get, mock_post):
         """Test complete review cycle with Ollama provider."""
         from app.llm.ollama_provider import OllamaProvider
@@ -1,7 +1,8 @@
 """Unit tests for Gemini provider with REST API v1."""
 
+import asyncio
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import AsyncMock, Mock, patch, MagicMock
 import json
 
 
@@ -362,3 +363,111 @@ class TestGeminiProvider:
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
+    
+    @patch('app.llm.gemini_provider.HTTPX_AVAILABLE', True)
+    @patch('httpx.Client')
+    def test_agenerate_text_success(self, mock_client_class):
+        """Test native async text generation."""
+        from app.llm.gemini_provider import GeminiProvider
+        
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {
+            "candidates": [{"content": {"parts": [{"text": "Async Gemini"}]}}]
+        }
+        
+        async_client = Mock()
+        async_client.post = AsyncMock(return_value=mock_response)
+        
+        provider = GeminiProvider(api_key="test-key")
+        with patch.object(provider, '_get_async_client', return_value=async_client):
+            result = asyncio.run(provider.agenerate_text("test prompt"))
+        
+        assert result == "Async Gemini"
+        mock_client_class.return_value.post.assert_not_called()
+    
+    @patch('app.llm.gemini_provider.HTTPX_AVAILABLE', True)
+    @patch('httpx.Client')
+    def test_agenerate_text_rate_limit_awaits_backoff(self, mock_client_class):
+        """Test async rate-limit retries await asyncio.sleep instead of blocking."""
+        from app.llm.gemini_provider import GeminiProvider
+        
+        rate_limited = Mock()
+        rate_limited.status_code = 429
+        rate_limited.text = "Rate limit exceeded"
+        
+        async_client = Mock()
+        async_client.post = AsyncMock(return_value=rate_limited)
+        
+        provider = GeminiProvider(api_key="test-key")
+        with patch.object(provider, '_get_async_client', return_value=async_client), \
+             patch('app.llm.retry_policy.asyncio.sleep', new=AsyncMock()) as mock_sleep, \
+             patch('app.llm.retry_policy.time.sleep') as mock_time_sleep:
+            with pytest.raises(Exception, match="rate limit"):
+                asyncio.run(provider.agenerate_text("test prompt"))
+        
+        assert async_client.post.await_count == provider.max_retries
+        assert mock_sleep.await_count == provider.max_retries - 1
+        mock_time_sleep.assert_not_called()
+    
+    @patch('app.llm.gemini_provider.HTTPX_AVAILABLE', True)
+    @patch('httpx.Client')
+    def test_stream_text_uses_sse_endpoint(self, mock_client_class):
+        """Test streaming via streamGenerateContent with alt=sse."""
+        from app.llm.gemini_provider import GeminiProvider
+        
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.iter_lines.return_value = iter([
+            'data: {"candidates": [{"content": {"parts": [{"text": "Hello"}]}}]}',
+            '',
+            'data: {"candidates": [{"content": {"parts": [{"text": " Gemini"}]}, "finishReason": "STOP"}]}',
+        ])
+        mock_client = Mock()
+        mock_client.stream.return_value.__enter__ = Mock(return_value=mock_response)
+        mock_client.stream.return_value.__exit__ = Mock(return_value=False)
+        mock_client_class.return_value = mock_client
+        
+        provider = GeminiProvider(api_key="test-key")
+        chunks = list(provider.stream_text("test prompt"))
+        
+        assert chunks == ["Hello", " Gemini"]
+        url = mock_client.stream.call_args.args[1]
+        assert ":streamGenerateContent?alt=sse&key=test-key" in url
+        mock_client.post.assert_not_called()
+    
+    @patch('app.llm.gemini_provider.HTTPX_AVAILABLE', True)
+    @patch('httpx.Client')
+    def test_stream_text_404_raises_value_error(self, mock_client_class):
+        """Test that an unsupported model fails before streaming."""
+        from app.llm.gemini_provider import GeminiProvider
+        
+        mock_response = MagicMock()
+        mock_response.status_code = 404
+        mock_client = Mock()
+        mock_client.stream.return_value.__enter__ = Mock(return_value=mock_response)
+        mock_client.stream.return_value.__exit__ = Mock(return_value=False)
+        mock_client_class.return_value = mock_client
+        
+        provider = GeminiProvider(api_key="test-key")
+        
+        with pytest.raises(ValueError, match="Model not supported"):
+            list(provider.stream_text("test prompt", model="invalid-model"))
+        
+        mock_response.read.assert_called_once()
+    
+    @patch('app.llm.gemini_provider.HTTPX_AVAILABLE', True)
+    @patch('httpx.Client')
+    def test_response_schema_enables_json_mode(self, mock_client_class):
+        """Test that response_schema sets the JSON MIME type and schema."""
+        from app.llm.gemini_provider import GeminiProvider
+        
+        provider = GeminiProvider(api_key="test-key")
+        schema = {"type": "object", "properties": {"verdict": {"type": "string"}}}
+        
+        _, payload, _ = provider._build_request("Review", response_schema=schema)
+        _, plain, _ = provider._build_request("Review")
+        
+        assert payload['generationConfig']['responseMimeType'] == "application/json"
+        assert payload['generationConfig']['responseSchema'] == schema
+        assert 'responseSchema' not in plain['generationConfig']
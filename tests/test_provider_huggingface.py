@@ -37,7 +37,7 @@ class TestHuggingFaceProvider:
         assert "tiiuae/falcon-7b-instruct" in models
         assert "mistralai/Mistral-7B-Instruct-v0.2" in models
     
-    @patch('app.llm.huggingface_provider.requests.post')
+    @patch('app.llm.huggingface_provider.requests.Session.post')
     def test_generate_text_success(self, mock_post):
         """Test successful text generation."""
         from app.llm.huggingface_provider import HuggingFaceProvider
@@ -56,7 +56,7 @@ class TestHuggingFaceProvider:
         assert result == "Generated response"
         mock_post.assert_called_once()
     
-    @patch('app.llm.huggingface_provider.requests.post')
+    @patch('app.llm.huggingface_provider.requests.Session.post')
     def test_generate_text_model_loading(self, mock_post):
         """Test handling of model loading state."""
         from app.llm.huggingface_provider import HuggingFaceProvider
@@ -75,7 +75,7 @@ class TestHuggingFaceProvider:
         with pytest.raises(Exception, match="Model is loading"):
             provider.generate_text("test prompt")
     
-    @patch('app.llm.huggingface_provider.requests.post')
+    @patch('app.llm.huggingface_provider.requests.Session.post')
     def test_generate_text_rate_limit(self, mock_post):
         """Test rate limit handling."""
         from app.llm.huggingface_provider import HuggingFaceProvider
@@ -91,7 +91,7 @@ class TestHuggingFaceProvider:
         with pytest.raises(Exception, match="Rate limit"):
             provider.generate_text("test prompt")
     
-    @patch('app.llm.huggingface_provider.requests.post')
+    @patch('app.llm.huggingface_provider.requests.Session.post')
     def test_generate_text_invalid_key(self, mock_post):
         """Test invalid API key handling."""
         from app.llm.huggingface_provider import HuggingFaceProvider
@@ -107,7 +107,7 @@ class TestHuggingFaceProvider:
         with pytest.raises(ValueError, match="Invalid HuggingFace API key"):
             provider.generate_text("test prompt")
     
-    @patch('app.llm.huggingface_provider.requests.post')
+    @patch('app.llm.huggingface_provider.requests.Session.post')
     def test_generate_text_timeout(self, mock_post):
         """Test timeout handling."""
         from app.llm.huggingface_provider import HuggingFaceProvider
@@ -119,7 +119,7 @@ class TestHuggingFaceProvider:
         with pytest.raises(Exception, match="timeout"):
             provider.generate_text("test prompt")
     
-    @patch('app.llm.huggingface_provider.requests.post')
+    @patch('app.llm.huggingface_provider.requests.Session.post')
     def test_generate_text_connection_error(self, mock_post):
         """Test connection error handling."""
         from app.llm.huggingface_provider import HuggingFaceProvider
@@ -131,7 +131,7 @@ class TestHuggingFaceProvider:
         with pytest.raises(Exception, match="Connection error"):
             provider.generate_text("test prompt")
     
-    @patch('app.llm.huggingface_provider.requests.post')
+    @patch('app.llm.huggingface_provider.requests.Session.post')
     def test_validate_connection_success(self, mock_post):
         """Test successful connection validation."""
         from app.llm.huggingface_provider import HuggingFaceProvider
@@ -146,7 +146,7 @@ class TestHuggingFaceProvider:
         provider = HuggingFaceProvider(api_key="test-token")
         assert provider.validate_connection() is True
     
-    @patch('app.llm.huggingface_provider.requests.post')
+    @patch('app.llm.huggingface_provider.requests.Session.post')
     def test_validate_connection_failure(self, mock_post):
         """Test failed connection validation."""
         from app.llm.huggingface_provider import HuggingFaceProvider
@@ -163,7 +163,7 @@ class TestHuggingFaceProvider:
         provider = HuggingFaceProvider(api_key="test-token")
         assert provider.get_provider_name() == "huggingface"
     
-    @patch('app.llm.huggingface_provider.requests.post')
+    @patch('app.llm.huggingface_provider.requests.Session.post')
     def test_chat(self, mock_post):
         """Test chat functionality."""
         from app.llm.huggingface_provider import HuggingFaceProvider
@@ -191,7 +191,7 @@ class TestHuggingFaceProvider:
         assert "User:" in str(call_args)
         assert "Assistant:" in str(call_args)
     
-    @patch('app.llm.huggingface_provider.requests.post')
+    @patch('app.llm.huggingface_provider.requests.Session.post')
     def test_embed_success(self, mock_post):
         """Test successful embedding generation."""
         from app.llm.huggingface_provider import HuggingFaceProvider
@@ -207,7 +207,7 @@ class TestHuggingFaceProvider:
         assert isinstance(result, list)
         assert len(result) == 4
     
-    @patch('app.llm.huggingface_provider.requests.post')
+    @patch('app.llm.huggingface_provider.requests.Session.post')
     def test_embed_failure(self, mock_post):
         """Test embedding failure handling."""
         from app.llm.huggingface_provider import HuggingFaceProvider
@@ -221,7 +221,7 @@ class TestHuggingFaceProvider:
         with pytest.raises(Exception, match="embedding failed"):
             provider.embed("test text")
     
-    @patch('app.llm.huggingface_provider.requests.post')
+    @patch('app.llm.huggingface_provider.requests.Session.post')
     def test_custom_model(self, mock_post):
         """Test using custom model."""
         from app.llm.huggingface_provider import HuggingFaceProvider
@@ -245,7 +245,7 @@ class TestHuggingFaceProvider:
         call_args = mock_post.call_args
         assert "mistralai/Mistral-7B-Instruct-v0.2" in call_args[0][0]
     
-    @patch('app.llm.huggingface_provider.requests.post')
+    @patch('app.llm.huggingface_provider.requests.Session.post')
     def test_response_format_variations(self, mock_post):
         """Test handling different response formats."""
         from app.llm.huggingface_provider import HuggingFaceProvider
@@ -1,7 +1,9 @@
 """Unit tests for Ollama provider."""
 
+import asyncio
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
+import httpx
 import requests
 
 
@@ -49,7 +51,7 @@ class TestOllamaProvider:
         assert "mistral" in models
         assert "phi3" in models
     
-    @patch('app.llm.ollama_provider.requests.get')
+    @patch('app.llm.ollama_provider.requests.Session.get')
     def test_list_models_from_api(self, mock_get):
         """Test listing models from running Ollama instance."""
         from app.llm.ollama_provider import OllamaProvider
@@ -72,7 +74,7 @@ class TestOllamaProvider:
         assert "mistral:7b" in models
         assert "phi3:medium" in models
     
-    @patch('app.llm.ollama_provider.requests.post')
+    @patch('app.llm.ollama_provider.requests.Session.post')
     def test_generate_text_success(self, mock_post):
         """Test successful text generation."""
         from app.llm.ollama_provider import OllamaProvider
@@ -91,7 +93,7 @@ class TestOllamaProvider:
         assert result == "Generated text response"
         mock_post.assert_called_once()
     
-    @patch('app.llm.ollama_provider.requests.post')
+    @patch('app.llm.ollama_provider.requests.Session.post')
     def test_generate_text_model_not_found(self, mock_post):
         """Test error when model is not pulled."""
         from app.llm.ollama_provider import OllamaProvider
@@ -106,7 +108,64 @@ class TestOllamaProvider:
         with pytest.raises(Exception, match="Model .* not found"):
             provider.generate_text("test prompt")
     
-    @patch('app.llm.ollama_provider.requests.post')
+    @patch('app.llm.ollama_provider.requests.Session.post')
+    def test_stream_text_yields_ndjson_chunks(self, mock_post):
+        """Test streaming newline-delimited JSON chunks."""
+        from app.llm.ollama_provider import OllamaProvider
+        
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.iter_lines.return_value = iter([
+            b'{"response": "Hello", "done": false}',
+            b'',
+            b'{"response": " world", "done": false}',
+            b'{"response": "", "done": true}',
+        ])
+        mock_post.return_value = mock_response
+        
+        provider = OllamaProvider()
+        chunks = list(provider.stream_text("test prompt"))
+        
+        assert chunks == ["Hello", " world"]
+        assert mock_post.call_args.kwargs['json']['stream'] is True
+        assert mock_post.call_args.kwargs['stream'] is True
+        mock_response.close.assert_called_once()
+    
+    @patch('app.llm.ollama_provider.requests.Session.post')
+    def test_generate_text_honours_stream_flag(self, mock_post):
+        """Test that stream=True is streamed and joined instead of ignored."""
+        from app.llm.ollama_provider import OllamaProvider
+        
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.iter_lines.return_value = iter([
+            b'{"response": "Streamed", "done": false}',
+            b'{"response": " text ", "done": true}',
+        ])
+        mock_post.return_value = mock_response
+        
+        provider = OllamaProvider()
+        result = provider.generate_text("test prompt", stream=True)
+        
+        assert result == "Streamed text"
+        mock_response.json.assert_not_called()
+    
+    @patch('app.llm.ollama_provider.requests.Session.post')
+    def test_stream_text_error_line(self, mock_post):
+        """Test that an error object in the stream is raised."""
+        from app.llm.ollama_provider import OllamaProvider
+        
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.iter_lines.return_value = iter([b'{"error": "out of memory"}'])
+        mock_post.return_value = mock_response
+        
+        provider = OllamaProvider()
+        
+        with pytest.raises(Exception, match="out of memory"):
+            list(provider.stream_text("test prompt"))
+    
+    @patch('app.llm.ollama_provider.requests.Session.post')
     def test_generate_text_connection_error(self, mock_post):
         """Test handling when Ollama is not running."""
         from app.llm.ollama_provider import OllamaProvider
@@ -118,7 +177,7 @@ class TestOllamaProvider:
         with pytest.raises(Exception, match="Cannot connect to Ollama"):
             provider.generate_text("test prompt")
     
-    @patch('app.llm.ollama_provider.requests.post')
+    @patch('app.llm.ollama_provider.requests.Session.post')
     def test_generate_text_timeout(self, mock_post):
         """Test timeout handling."""
         from app.llm.ollama_provider import OllamaProvider
@@ -130,7 +189,7 @@ class TestOllamaProvider:
         with pytest.raises(Exception, match="timeout"):
             provider.generate_text("test prompt")
     
-    @patch('app.llm.ollama_provider.requests.get')
+    @patch('app.llm.ollama_provider.requests.Session.get')
     def test_validate_connection_success(self, mock_get):
         """Test successful connection validation."""
         from app.llm.ollama_provider import OllamaProvider
@@ -142,7 +201,7 @@ class TestOllamaProvider:
         provider = OllamaProvider()
         assert provider.validate_connection() is True
     
-    @patch('app.llm.ollama_provider.requests.get')
+    @patch('app.llm.ollama_provider.requests.Session.get')
     def test_validate_connection_failure(self, mock_get):
         """Test failed connection validation."""
         from app.llm.ollama_provider import OllamaProvider
@@ -152,7 +211,7 @@ class TestOllamaProvider:
         provider = OllamaProvider()
         assert provider.validate_connection() is False
     
-    @patch('app.llm.ollama_provider.requests.get')
+    @patch('app.llm.ollama_provider.requests.Session.get')
     def test_is_running(self, mock_get):
         """Test checking if Ollama is running."""
         from app.llm.ollama_provider import OllamaProvider
@@ -176,7 +235,7 @@ class TestOllamaProvider:
         provider = OllamaProvider()
         assert provider.get_provider_name() == "ollama"
     
-    @patch('app.llm.ollama_provider.requests.post')
+    @patch('app.llm.ollama_provider.requests.Session.post')
     def test_chat_native_api(self, mock_post):
         """Test chat using native Ollama chat API."""
         from app.llm.ollama_provider import OllamaProvider
@@ -200,7 +259,7 @@ class TestOllamaProvider:
         result = provider.chat(messages)
         assert result == "Chat response"
     
-    @patch('app.llm.ollama_provider.requests.post')
+    @patch('app.llm.ollama_provider.requests.Session.post')
     def test_chat_fallback_to_generate(self, mock_post):
         """Test chat falling back to generate API."""
         from app.llm.ollama_provider import OllamaProvider
@@ -223,7 +282,7 @@ class TestOllamaProvider:
         result = provider.chat(messages)
         assert result == "Fallback response"
     
-    @patch('app.llm.ollama_provider.requests.post')
+    @patch('app.llm.ollama_provider.requests.Session.post')
     def test_embed_success(self, mock_post):
         """Test successful embedding generation."""
         from app.llm.ollama_provider import OllamaProvider
@@ -242,7 +301,7 @@ class TestOllamaProvider:
         assert len(result) == 4
         assert result == [0.1, 0.2, 0.3, 0.4]
     
-    @patch('app.llm.ollama_provider.requests.post')
+    @patch('app.llm.ollama_provider.requests.Session.post')
     def test_embed_failure(self, mock_post):
         """Test embedding failure handling."""
         from app.llm.ollama_provider import OllamaProvider
@@ -256,7 +315,7 @@ class TestOllamaProvider:
         with pytest.raises(Exception, match="embedding failed"):
             provider.embed("test text")
     
-    @patch('app.llm.ollama_provider.requests.get')
+    @patch('app.llm.ollama_provider.requests.Session.get')
     def test_get_ollama_version(self, mock_get):
         """Test getting Ollama version."""
         from app.llm.ollama_provider import OllamaProvider
@@ -271,7 +330,7 @@ class TestOllamaProvider:
         
         assert version == "0.1.23"
     
-    @patch('app.llm.ollama_provider.requests.get')
+    @patch('app.llm.ollama_provider.requests.Session.get')
     def test_get_ollama_version_failure(self, mock_get):
         """Test getting version when Ollama is not running."""
         from app.llm.ollama_provider import OllamaProvider
@@ -304,7 +363,7 @@ class TestOllamaProvider:
         assert "User: How are you?" in prompt
         assert "Assistant:" in prompt  # Prompt for next response
     
-    @patch('app.llm.ollama_provider.requests.post')
+    @patch('app.llm.ollama_provider.requests.Session.post')
     def test_custom_parameters(self, mock_post):
         """Test generation with custom parameters."""
         from app.llm.ollama_provider import OllamaProvider
@@ -336,4 +395,46 @@ class TestOllamaProvider:
         payload = call_args[1]['json']
         assert payload['options']['temperature'] == 0.9
         assert payload['options']['num_predict'] == 500
-
+    
+    def test_agenerate_text_success(self):
+        """Test native async text generation."""
+        from app.llm.ollama_provider import OllamaProvider
+        
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"response": "  Async local text  ", "done": True}
+        
+        client = Mock()
+        client.post = AsyncMock(return_value=mock_response)
+        
+        provider = OllamaProvider()
+        with patch.object(provider, '_get_async_client', return_value=client):
+            result = asyncio.run(provider.agenerate_text("test prompt", max_tokens=64))
+        
+        assert result == "Async local text"
+        payload = client.post.call_args.kwargs['json']
+        assert payload['options']['num_predict'] == 64
+    
+    def test_agenerate_text_connection_error(self):
+        """Test async handling when Ollama is not running."""
+        from app.llm.ollama_provider import OllamaProvider
+        
+        client = Mock()
+        client.post = AsyncMock(side_effect=httpx.ConnectError("Connection refused"))
+        
+        provider = OllamaProvider()
+        with patch.object(provider, '_get_async_client', return_value=client):
+            with pytest.raises(Exception, match="Cannot connect to Ollama"):
+                asyncio.run(provider.agenerate_text("test prompt"))
+    
+    def test_response_schema_enables_json_format(self):
+        """Test that response_schema switches Ollama to JSON format."""
+        from app.llm.ollama_provider import OllamaProvider
+        
+        provider = OllamaProvider()
+        
+        _, payload = provider._build_request("Review", response_schema={"type": "object"})
+        _, plain = provider._build_request("Review")
+        
+        assert payload['format'] == "json"
+        assert 'format' not in plain
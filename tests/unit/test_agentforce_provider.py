@@ -1,7 +1,8 @@
 """Unit tests for Agentforce provider."""
 
+import asyncio
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import AsyncMock, Mock, patch, MagicMock
 import json
 
 
@@ -575,4 +576,59 @@ class TestAgentforceProvider:
         oauth_calls = [call for call in mock_client.post.call_args_list 
                        if "/services/oauth2/token" in call[0][0]]
         assert len(oauth_calls) == 1  # Only the first call
-
+    
+    @patch('app.llm.agentforce_provider.HTTPX_AVAILABLE', True)
+    @patch('httpx.Client')
+    def test_agenerate_text_with_session_id(self, mock_client_class):
+        """Test native async generation with session ID auth."""
+        from app.llm.agentforce_provider import AgentforceProvider
+        
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"output": {"text": "Async agent response"}}
+        
+        async_client = Mock()
+        async_client.post = AsyncMock(return_value=mock_response)
+        
+        provider = AgentforceProvider(
+            agent_id="0XxdM0000029q33SAA",
+            instance_url="https://test.salesforce.com",
+            auth_type="session_id",
+            session_id="test-session-id"
+        )
+        
+        with patch.object(provider, '_get_async_client', return_value=async_client):
+            result = asyncio.run(provider.agenerate_text("test prompt"))
+        
+        assert result == "Async agent response"
+        call_args = async_client.post.call_args
+        assert "/execute" in call_args[0][0]
+        assert call_args[1]['headers']['Authorization'] == "Bearer test-session-id"
+        mock_client_class.return_value.post.assert_not_called()
+    
+    @patch('app.llm.agentforce_provider.HTTPX_AVAILABLE', True)
+    @patch('httpx.Client')
+    def test_agenerate_text_returns_error_text(self, mock_client_class):
+        """Test async client errors are returned as text, not raised."""
+        from app.llm.agentforce_provider import AgentforceProvider
+        
+        mock_response = Mock()
+        mock_response.status_code = 404
+        mock_response.text = "Not found"
+        
+        async_client = Mock()
+        async_client.post = AsyncMock(return_value=mock_response)
+        
+        provider = AgentforceProvider(
+            agent_id="0XxdM0000029q33SAA",
+            instance_url="https://test.salesforce.com",
+            auth_type="session_id",
+            session_id="test-session-id"
+        )
+        
+        with patch.object(provider, '_get_async_client', return_value=async_client):
+            result = asyncio.run(provider.agenerate_text("test prompt"))
+        
+        assert "[Agentforce API Error]" in result
+        assert "HTTP 404" in result
+        assert async_client.post.await_count == 1
@@ -1,9 +1,13 @@
 """Unit tests for agents."""
 
+import json
 import pytest
 from app.agents.base_agent import BaseAgent
 from app.agents.presenter import PresenterAgent
-from app.agents.reviewer import ReviewerAgent, TechnicalReviewer, ClarityReviewer, SecurityReviewer
+from app.agents.reviewer import (
+    ReviewerAgent, TechnicalReviewer, ClarityReviewer, SecurityReviewer,
+    REVIEW_SCHEMA, ITERATIVE_REVIEW_SCHEMA
+)
 from app.agents.confidence import ConfidenceAgent
 from app.llm.mock_provider import MockLLMProvider
 from app.models.feedback import Feedback
@@ -39,6 +43,18 @@ class TestPresenterAgent:
         result = agent.execute(requirements="Test requirements")
         
         assert isinstance(result, str)
+    
+    def test_presenter_streams_chunks_to_callback(self):
+        """Test that on_chunk receives the output as it is generated."""
+        provider = MockLLMProvider()
+        agent = PresenterAgent(provider)
+        chunks = []
+        
+        result = agent.generate("Test requirements", on_chunk=chunks.append)
+        
+        assert len(chunks) > 1
+        assert "".join(chunks).strip() == result
+        assert provider.call_count == 1
 
 
 class TestReviewerAgent:
@@ -85,6 +101,143 @@ class TestReviewerAgent:
         assert isinstance(result, Feedback)
 
 
+    def test_reviewer_streams_chunks_to_callback(self):
+        """Test that review passes streamed chunks to on_chunk."""
+        provider = MockLLMProvider()
+        agent = ReviewerAgent(provider, role="test_reviewer")
+        chunks = []
+        
+        feedback = agent.review("Content", iteration=1, on_chunk=chunks.append)
+        
+        assert isinstance(feedback, Feedback)
+        assert "".join(chunks) == "This is a mock response from the LLM provider."
+    
+    def test_reviewers_share_cacheable_prefix(self):
+        """Test that the content leads the prompt and is identical across roles."""
+        provider = MockLLMProvider()
+        calls = []
+        provider.generate_text = lambda prompt, **kwargs: calls.append((prompt, kwargs)) or "FINDINGS:"
+        
+        TechnicalReviewer(provider).review("Shared document", iteration=1)
+        ClarityReviewer(provider).review("Shared document", iteration=1)
+        
+        prefixes = [kwargs['cacheable_prefix'] for _, kwargs in calls]
+        assert prefixes[0] == prefixes[1]
+        assert "Shared document" in prefixes[0]
+        for prompt, kwargs in calls:
+            assert prompt.startswith(kwargs['cacheable_prefix'])
+        assert calls[0][0] != calls[1][0]
+    
+    def test_iterative_prefix_excludes_role_feedback(self):
+        """Test that per-role previous feedback comes after the shared prefix."""
+        provider = MockLLMProvider()
+        calls = []
+        provider.generate_text = lambda prompt, **kwargs: calls.append((prompt, kwargs)) or "FINDINGS:"
+        
+        ReviewerAgent(provider).review("Updated document", iteration=2, previous_feedback="Fix the intro")
+        
+        prompt, kwargs = calls[0]
+        assert "Updated document" in kwargs['cacheable_prefix']
+        assert "Fix the intro" not in kwargs['cacheable_prefix']
+        assert "Fix the intro" in prompt
+
+
+class TestStructuredReviewOutput:
+    """Tests for the structured JSON reviewer output mode."""
+    
+    def _reviewer(self, response):
+        provider = MockLLMProvider()
+        calls = []
+        provider.generate_text = lambda prompt, **kwargs: calls.append((prompt, kwargs)) or response
+        return ReviewerAgent(provider, role="technical_reviewer", structured_output=True), calls
+    
+    def test_typed_findings_parsed_once(self):
+        """Test that JSON output becomes a verdict and typed findings."""
+        reviewer, calls = self._reviewer(json.dumps({
+            "verdict": "NEEDS REVISION",
+            "findings": [
+                {"severity": "critical", "description": "No authentication on the admin API"},
+                {"severity": "LOW", "description": "Inconsistent naming in the diagrams"},
+            ],
+            "improvements": ["Add OAuth"]
+        }))
+        
+        feedback = reviewer.review("Design", iteration=1)
+        
+        assert calls[0][1]['response_schema'] == REVIEW_SCHEMA
+        assert feedback.verdict == "NEEDS REVISION"
+        assert [finding.severity for finding in feedback.findings] == ["CRITICAL", "LOW"]
+        assert feedback.feedback_points[0] == "[Severity: CRITICAL] No authentication on the admin API"
+        assert feedback.improvement_tracking is None
+    
+    def test_iterative_tracking(self):
+        """Test that iterative output carries improvement tracking."""
+        reviewer, calls = self._reviewer(json.dumps({
+            "verdict": "APPROVE",
+            "fixed": ["Authentication added"],
+            "partially_fixed": [],
+            "not_addressed": ["Naming still inconsistent"],
+            "findings": []
+        }))
+        
+        feedback = reviewer.review("Design v2", iteration=2, previous_feedback="Add authentication")
+        
+        assert calls[0][1]['response_schema'] == ITERATIVE_REVIEW_SCHEMA
+        assert feedback.improvement_tracking == {
+            'fixed': ["Authentication added"], 'partially_fixed': [], 'not_addressed': ["Naming still inconsistent"]
+        }
+        assert feedback.findings == []
+        assert feedback.feedback_points == ["No specific feedback provided"]
+    
+    def test_unknown_severity_keeps_other_findings(self):
+        """Test that an out-of-range or missing severity doesn't drop the review."""
+        reviewer, _ = self._reviewer(json.dumps({
+            "verdict": "NEEDS REVISION",
+            "findings": [
+                {"severity": "HIGH", "description": "Retry logic is missing entirely"},
+                {"severity": "INFO", "description": "Diagram legend could be larger"},
+                {"description": "Glossary omits the settlement terms"},
+            ]
+        }))
+        
+        feedback = reviewer.review("Design", iteration=1)
+        
+        assert [finding.severity for finding in feedback.findings] == ["HIGH", "MEDIUM", "MEDIUM"]
+        assert feedback.feedback_points[1] == "[Severity: MEDIUM] Diagram legend could be larger"
+        assert feedback.verdict == "NEEDS REVISION"
+    
+    def test_invalid_verdict_is_dropped(self):
+        """Test that an unknown verdict becomes None instead of failing the review."""
+        reviewer, _ = self._reviewer(json.dumps({
+            "verdict": "LOOKS GOOD",
+            "findings": [{"severity": "low", "description": "Inconsistent naming in the diagrams"}]
+        }))
+        
+        feedback = reviewer.review("Design", iteration=1)
+        
+        assert feedback.verdict is None
+        assert feedback.findings[0].severity == "LOW"
+    
+    def test_invalid_json_falls_back_to_text_parser(self):
+        """Test that non-JSON output is parsed as free text."""
+        reviewer, _ = self._reviewer("FINDINGS:\n1. [Severity: HIGH] Retry logic is missing entirely")
+        
+        feedback = reviewer.review("Design", iteration=1)
+        
+        assert feedback.findings is None
+        assert feedback.feedback_points == ["[Severity: HIGH] Retry logic is missing entirely"]
+    
+    def test_text_mode_sends_no_schema(self):
+        """Test that the default mode does not request JSON output."""
+        provider = MockLLMProvider()
+        calls = []
+        provider.generate_text = lambda prompt, **kwargs: calls.append(kwargs) or "FINDINGS:"
+        
+        ReviewerAgent(provider).review("Design", iteration=1)
+        
+        assert 'response_schema' not in calls[0]
+
+
 class TestSpecializedReviewers:
     """Tests for specialized reviewer subclasses."""
     
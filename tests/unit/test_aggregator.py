@@ -8,6 +8,11 @@ from app.orchestration.aggregator_agent import (
     identify_consensus,
     extract_required_changes
 )
+from app.orchestration.local_aggregator import (
+    LocalAggregationPolicy,
+    LocalAggregator,
+    parse_review_items
+)
 from app.llm.mock_provider import MockLLMProvider
 
 
@@ -266,3 +271,146 @@ class TestAggregatorLLMFallback:
         assert "BOARD DECISION" in result
         assert "Fallback Mode" in result
 
+
+TECHNICAL_FEEDBACK = """REVIEWER: Technical Reviewer
+ITERATION: 2
+VERDICT: NEEDS_REVISION
+
+IMPROVEMENT TRACKING:
+- ✅ FIXED: Added retry logic to the API client
+- ❌ NOT ADDRESSED: Database connection pooling is missing
+
+FINDINGS:
+1. [Severity: CRITICAL] SQL injection risk in the login query
+2. [Severity: LOW] Logging is verbose
+
+STATUS: ⏸️ PENDING APPROVAL"""
+
+SECURITY_FEEDBACK = """REVIEWER: Security Reviewer
+ITERATION: 2
+VERDICT: APPROVE
+
+FINDINGS:
+1. [Severity: HIGH] SQL injection risk in login query handling
+2. [Severity: MEDIUM] Missing rate limiting on endpoints
+
+STATUS: ⏸️ PENDING APPROVAL"""
+
+
+class TestLocalAggregator:
+    """Test deterministic local aggregation."""
+    
+    def test_parse_review_items(self):
+        """Test findings and improvement tracking are parsed into items."""
+        items = parse_review_items("Technical Reviewer", TECHNICAL_FEEDBACK)
+        
+        assert [(item.kind, item.priority, item.text) for item in items] == [
+            ('fixed', 'MEDIUM', 'Added retry logic to the API client'),
+            ('issue', 'HIGH', 'Database connection pooling is missing'),
+            ('issue', 'CRITICAL', 'SQL injection risk in the login query'),
+            ('issue', 'LOW', 'Logging is verbose'),
+        ]
+    
+    def test_parse_suggestions_and_placeholders(self):
+        """Test suggestions are parsed and placeholder items skipped."""
+        feedback = (
+            "NEW FINDINGS (issues not previously identified):\n"
+            "- None\n"
+            "SUGGESTED IMPROVEMENTS:\n"
+            "- Add a sequence diagram\n"
+        )
+        items = parse_review_items("R1", feedback)
+        
+        assert [(item.kind, item.priority) for item in items] == [('suggestion', 'LOW')]
+    
+    def test_board_decision_format(self):
+        """Test the local decision contains every board decision section."""
+        result = LocalAggregator().aggregate({"R1": "APPROVE: Good"})
+        
+        for section in (
+            "BOARD DECISION", "CONSENSUS ISSUES", "UNIQUE CONCERNS", "CONFLICTING OPINIONS",
+            "REQUIRED CHANGES", "OPTIONAL IMPROVEMENTS", "IDENTIFIED STRENGTHS",
+            "RISK ASSESSMENT", "RECOMMENDATION"
+        ):
+            assert section in result
+    
+    def test_consensus_and_priorities(self):
+        """Test near-duplicate findings merge and take the highest severity."""
+        result = LocalAggregator().aggregate({
+            "Technical Reviewer": TECHNICAL_FEEDBACK,
+            "Security Reviewer": SECURITY_FEEDBACK,
+        })
+        consensus = result.split("CONSENSUS ISSUES")[1].split("UNIQUE CONCERNS")[0]
+        required = result.split("REQUIRED CHANGES:")[1].split("OPTIONAL IMPROVEMENTS")[0]
+        
+        assert "[Priority: CRITICAL] SQL injection risk" in consensus
+        assert "Technical Reviewer, Security Reviewer" in consensus
+        assert "1. [Priority: CRITICAL]" in required
+        assert "2. [Priority: HIGH] Database connection pooling" in required
+        assert "Missing rate limiting" not in required
+        assert "from HIGH to CRITICAL" in result
+        assert "Fixed: Added retry logic" in result
+        assert result.strip().endswith("NEEDS MAJOR REVISION")
+    
+    def test_recommendation_rules(self):
+        """Test the recommendation follows verdicts and severities."""
+        aggregator = LocalAggregator()
+        
+        def recommendation(feedback):
+            return aggregator.aggregate(feedback).strip().split("\n")[-1]
+        
+        assert recommendation({"R1": "APPROVE", "R2": "APPROVE"}) == "APPROVE"
+        assert recommendation({"R1": "REJECT", "R2": "REJECT", "R3": "APPROVE"}) == "REJECT"
+        assert recommendation({"R1": "VERDICT: APPROVE\n- [Severity: HIGH] No backups"}) == "APPROVE WITH CHANGES"
+        assert recommendation({"R1": "VERDICT: NEEDS_REVISION"}) == "APPROVE WITH CHANGES"
+
+
+class TestLocalAggregationPolicy:
+    """Test when the aggregator LLM call is skipped."""
+    
+    def test_unanimous_verdicts_go_local(self):
+        """Test unanimous verdicts are aggregated locally regardless of size."""
+        policy = LocalAggregationPolicy(max_issues=0)
+        analysis = LocalAggregator().analyze({"R1": "APPROVE: Good", "R2": "APPROVE: Fine"})
+        
+        assert policy.reason(analysis) == "unanimous approve verdicts"
+    
+    def test_small_feedback_goes_local(self):
+        """Test small feedback without split verdicts is aggregated locally."""
+        analysis = LocalAggregator().analyze({"R1": TECHNICAL_FEEDBACK, "R2": "Looks reasonable"})
+        
+        assert LocalAggregationPolicy().reason(analysis).startswith("small feedback")
+        assert LocalAggregationPolicy(max_issues=2).reason(analysis) is None
+        assert LocalAggregationPolicy(max_chars=100).reason(analysis) is None
+    
+    def test_split_verdicts_use_llm(self):
+        """Test approval against objection is left to the LLM."""
+        analysis = LocalAggregator().analyze({
+            "Technical Reviewer": TECHNICAL_FEEDBACK,
+            "Security Reviewer": SECURITY_FEEDBACK,
+        })
+        
+        assert LocalAggregationPolicy().reason(analysis) is None
+    
+    def test_agent_skips_llm_call(self):
+        """Test the agent aggregates locally when the policy allows."""
+        mock_provider = Mock()
+        aggregator = AggregatorAgent(mock_provider, local_policy=LocalAggregationPolicy())
+        
+        result = aggregator.aggregate({"R1": "APPROVE: Good", "R2": "APPROVE: Fine"})
+        
+        mock_provider.generate_text.assert_not_called()
+        assert aggregator.last_mode == 'local'
+        assert result.startswith("BOARD DECISION")
+    
+    def test_agent_calls_llm_when_policy_declines(self):
+        """Test the agent calls the LLM when the policy declines."""
+        mock_provider = Mock()
+        mock_provider.generate_text.return_value = "BOARD DECISION\nLLM"
+        aggregator = AggregatorAgent(mock_provider, local_policy=LocalAggregationPolicy())
+        
+        result = aggregator.aggregate({"R1": "APPROVE: Good", "R2": "REJECT: Bad"})
+        
+        mock_provider.generate_text.assert_called_once()
+        assert aggregator.last_mode == 'llm'
+        assert result == "BOARD DECISION\nLLM"
@@ -0,0 +1,241 @@
+"""Unit tests for the caching provider."""
+
+import asyncio
+import pytest
+from unittest.mock import patch
+from app.llm.cache_provider import (
+    CachingProvider,
+    ResponseCache,
+    SQLiteResponseCache,
+    get_default_cache,
+)
+from app.llm.mock_provider import MockLLMProvider
+from app.llm.provider_factory import ProviderFactory
+
+
+class FailingProvider(MockLLMProvider):
+    """Mock provider whose first call fails."""
+    
+    def generate_text(self, prompt: str, **kwargs) -> str:
+        self.call_count += 1
+        if self.call_count == 1:
+            raise Exception("Temporary failure")
+        return "Recovered response"
+
+
+class TestResponseCache:
+    """Tests for the in-memory LRU/TTL cache."""
+    
+    def test_get_set_and_counters(self):
+        """Test basic lookups update hit/miss counters."""
+        cache = ResponseCache()
+        
+        assert cache.get("k") is None
+        cache.set("k", "value")
+        assert cache.get("k") == "value"
+        
+        stats = cache.get_stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+        assert stats['size'] == 1
+        assert stats['hit_rate'] == 0.5
+    
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted."""
+        cache = ResponseCache(max_entries=2)
+        cache.set("a", "1")
+        cache.set("b", "2")
+        cache.get("a")
+        cache.set("c", "3")
+        
+        assert cache.get("b") is None
+        assert cache.get("a") == "1"
+        assert cache.get("c") == "3"
+        assert cache.get_stats()['evictions'] == 1
+    
+    def test_ttl_expiry(self):
+        """Test that expired entries are treated as misses."""
+        cache = ResponseCache(ttl=10)
+        
+        with patch('app.llm.cache_provider.time.monotonic', return_value=100.0):
+            cache.set("k", "value")
+        with patch('app.llm.cache_provider.time.monotonic', return_value=105.0):
+            assert cache.get("k") == "value"
+        with patch('app.llm.cache_provider.time.monotonic', return_value=111.0):
+            assert cache.get("k") is None
+        
+        assert len(cache) == 0
+    
+    def test_invalid_max_entries(self):
+        """Test that a non-positive capacity is rejected."""
+        with pytest.raises(ValueError):
+            ResponseCache(max_entries=0)
+
+
+class TestSQLiteResponseCache:
+    """Tests for the SQLite-backed cache."""
+    
+    def test_entries_survive_reopen(self, tmp_path):
+        """Test that responses persist across cache instances."""
+        path = str(tmp_path / "cache.db")
+        cache = SQLiteResponseCache(path)
+        cache.set("k", "value")
+        cache.close()
+        
+        reopened = SQLiteResponseCache(path)
+        assert reopened.get("k") == "value"
+        assert reopened.get_stats()['hits'] == 1
+        reopened.close()
+    
+    def test_lru_eviction(self, tmp_path):
+        """Test that the database is capped at max_entries."""
+        cache = SQLiteResponseCache(str(tmp_path / "cache.db"), max_entries=2, ttl=None)
+        with patch('app.llm.cache_provider.time.time', side_effect=[1.0, 2.0, 3.0, 4.0]):
+            cache.set("a", "1")
+            cache.set("b", "2")
+            cache.get("a")
+            cache.set("c", "3")
+        
+        assert len(cache) == 2
+        assert cache.get("b") is None
+        assert cache.get("a") == "1"
+        cache.close()
+    
+    def test_ttl_expiry(self, tmp_path):
+        """Test that expired rows are treated as misses."""
+        cache = SQLiteResponseCache(str(tmp_path / "cache.db"), ttl=10)
+        with patch('app.llm.cache_provider.time.time', return_value=100.0):
+            cache.set("k", "value")
+        with patch('app.llm.cache_provider.time.time', return_value=111.0):
+            assert cache.get("k") is None
+        cache.close()
+
+
+class TestCachingProvider:
+    """Tests for CachingProvider."""
+    
+    def test_identical_prompt_served_from_cache(self):
+        """Test that a repeated prompt does not reach the provider."""
+        inner = MockLLMProvider()
+        provider = CachingProvider(inner, cache=ResponseCache())
+        
+        first = provider.generate_text("Review this", temperature=0.3, max_tokens=100)
+        second = provider.generate_text("Review this", temperature=0.3, max_tokens=100)
+        
+        assert first == second
+        assert inner.call_count == 1
+        assert provider.get_cache_stats()['hits'] == 1
+    
+    def test_parameters_are_part_of_key(self):
+        """Test that model, temperature and max_tokens change the key."""
+        inner = MockLLMProvider()
+        provider = CachingProvider(inner, cache=ResponseCache())
+        
+        provider.generate_text("Prompt", temperature=0.3)
+        provider.generate_text("Prompt", temperature=0.7)
+        provider.generate_text("Prompt", temperature=0.3, max_tokens=50)
+        provider.generate_text("Prompt", temperature=0.3, model="other")
+        provider.generate_text("Other prompt", temperature=0.3)
+        
+        assert inner.call_count == 5
+    
+    def test_endpoint_agent_and_credential_are_part_of_key(self):
+        """Test that a shared cache separates servers, agents and accounts."""
+        from app.llm.ollama_provider import OllamaProvider
+        from app.llm.openai_provider import OpenAIProvider
+        cache = ResponseCache()
+        
+        def key(inner):
+            return CachingProvider(inner, cache=cache).cache_key("Prompt")
+        
+        first_key = OpenAIProvider(api_key="key-one", model="gpt-4")
+        second_key = OpenAIProvider(api_key="key-two", model="gpt-4")
+        local = OllamaProvider(model="llama3")
+        remote = OllamaProvider(model="llama3", base_url="http://gpu-box:11434/api")
+        agent_a, agent_b = MockLLMProvider(), MockLLMProvider()
+        agent_a.agent_id, agent_b.agent_id = "agent-a", "agent-b"
+        
+        assert key(first_key) != key(second_key)
+        assert key(local) != key(remote)
+        assert key(agent_a) != key(agent_b)
+    
+    def test_explicit_default_shares_entry(self):
+        """Test that passing a provider default explicitly hits the same entry."""
+        from app.llm.openai_provider import OpenAIProvider
+        inner = OpenAIProvider(api_key="test-key", model="gpt-4")
+        provider = CachingProvider(inner, cache=ResponseCache())
+        
+        assert provider.cache_key("Prompt") == provider.cache_key("Prompt", model="gpt-4")
+    
+    def test_failures_are_not_cached(self):
+        """Test that exceptions propagate and are retried next time."""
+        inner = FailingProvider()
+        provider = CachingProvider(inner, cache=ResponseCache())
+        
+        with pytest.raises(Exception, match="Temporary failure"):
+            provider.generate_text("Prompt")
+        
+        assert provider.generate_text("Prompt") == "Recovered response"
+        assert provider.generate_text("Prompt") == "Recovered response"
+        assert inner.call_count == 2
+    
+    def test_async_generation_uses_cache(self):
+        """Test that agenerate_text shares entries with generate_text."""
+        inner = MockLLMProvider()
+        provider = CachingProvider(inner, cache=ResponseCache())
+        
+        sync_result = provider.generate_text("Prompt")
+        async_result = asyncio.run(provider.agenerate_text("Prompt"))
+        
+        assert async_result == sync_result
+        assert inner.call_count == 1
+    
+    def test_stream_text_is_cached(self):
+        """Test that a completed stream is replayed from the cache."""
+        inner = MockLLMProvider()
+        provider = CachingProvider(inner, cache=ResponseCache())
+        
+        streamed = list(provider.stream_text("Prompt"))
+        replayed = list(provider.stream_text("Prompt"))
+        
+        assert len(streamed) > 1
+        assert replayed == ["".join(streamed)]
+        assert provider.generate_text("Prompt") == "".join(streamed)
+        assert inner.call_count == 1
+    
+    def test_delegates_to_wrapped_provider(self):
+        """Test that metadata and attributes come from the wrapped provider."""
+        inner = MockLLMProvider()
+        provider = CachingProvider(inner, cache=ResponseCache())
+        
+        assert provider.get_provider_name() == "mockllm"
+        assert provider.list_models() == inner.list_models()
+        assert provider.validate_connection() is True
+        provider.generate_text("Prompt")
+        assert provider.last_prompt == "Prompt"
+
+
+class TestProviderFactoryCache:
+    """Tests for cache configuration through ProviderFactory."""
+    
+    def test_cache_disabled_by_default(self):
+        """Test that providers are not wrapped unless requested."""
+        provider = ProviderFactory.create_provider('mock')
+        
+        assert isinstance(provider, MockLLMProvider)
+    
+    def test_cache_true_uses_shared_cache(self):
+        """Test that cache=True wraps the provider with the shared cache."""
+        provider = ProviderFactory.create_provider('mock', cache=True)
+        
+        assert isinstance(provider, CachingProvider)
+        assert provider.cache is get_default_cache()
+    
+    def test_cache_instance_is_used(self):
+        """Test that a supplied cache backend is used as-is."""
+        cache = ResponseCache(max_entries=4)
+        provider = ProviderFactory.create_provider('openai', api_key='test-key', cache=cache)
+        
+        assert isinstance(provider, CachingProvider)
+        assert provider.cache is cache
+        assert provider.api_key == 'test-key'
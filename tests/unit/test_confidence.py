@@ -1,11 +1,15 @@
 """Unit tests for confidence model."""
 
 import pytest
+from app.models.feedback import Feedback, Finding
 from app.orchestration.confidence_model import (
     calculate_confidence,
     get_confidence_level,
     is_ready_for_finalization,
     CONFIDENCE_THRESHOLD,
+    FeedbackFeatures,
+    extract_features,
+    calculate_confidence_batch,
     _calculate_agreement_ratio,
     _calculate_sentiment_consistency,
     _calculate_severity_score,
@@ -254,3 +258,165 @@ class TestFinalizationReadiness:
         assert is_ready_for_finalization(0.75, threshold=0.70) is True
         assert is_ready_for_finalization(0.65, threshold=0.70) is False
 
+
+class TestStructuredConfidence:
+    """Tests for scoring from structured reviewer output."""
+    
+    def _feedback(self, verdict, severities):
+        return Feedback(
+            reviewer_role="technical_reviewer",
+            feedback_points=[f"[Severity: {s}] Finding number {i}" for i, s in enumerate(severities)] or ["None"],
+            iteration=1,
+            verdict=verdict,
+            findings=[Finding(severity=s, description=f"Finding number {i}") for i, s in enumerate(severities)]
+        )
+    
+    def test_severity_from_typed_findings(self):
+        """Test that typed severities replace keyword counting in the text."""
+        # The text mentions CRITICAL in prose, but the only finding is LOW
+        text = {"Technical": "Not critical at all, nothing CRITICAL here"}
+        structured = {"Technical": self._feedback("APPROVE", ["LOW"])}
+        
+        assert _calculate_severity_score(text, structured) == pytest.approx(1.0 - 0.1 / 5.0)
+        assert _calculate_severity_score(text) < _calculate_severity_score(text, structured)
+    
+    def test_verdicts_from_structured_output(self):
+        """Test that typed verdicts drive verdict agreement."""
+        text = {"A": "same words here", "B": "same words here"}
+        structured = {"A": self._feedback("REJECT", []), "B": self._feedback("REJECT", [])}
+        
+        assert _calculate_agreement_ratio(text, structured) == pytest.approx(1.0)
+    
+    def test_roles_without_structured_output_use_text(self):
+        """Test that mixed feedback falls back to text per role."""
+        text = {"A": "Issue: CRITICAL problem", "B": "Issue: CRITICAL problem"}
+        structured = {"A": Feedback(reviewer_role="a", feedback_points=["Point"], iteration=1)}
+        
+        assert _calculate_severity_score(text, structured) == _calculate_severity_score(text)
+
+
+class TestFeedbackFeatures:
+    """Test suite for single-pass feature extraction."""
+    
+    ITERATIVE_FEEDBACK = (
+        "VERDICT: NEEDS REVISION\n"
+        "IMPROVEMENT TRACKING:\n"
+        "✅ FIXED: Error handling added\n"
+        "⚠️ PARTIALLY FIXED: Logging\n"
+        "❌ NOT ADDRESSED: Missing tests\n"
+        "NEW FINDINGS:\n"
+        "[Severity: CRITICAL] Auth bypass\n"
+        "[Severity: HIGH] Slow query\n"
+        "Suggest adding a cache."
+    )
+    
+    def test_extracts_all_features(self):
+        """Test the features read from iterative feedback."""
+        features = FeedbackFeatures.from_text(self.ITERATIVE_FEEDBACK)
+        
+        assert features.verdict == "revision"
+        assert features.has_verdict and features.has_findings and features.has_suggestions
+        assert features.has_improvement_tracking
+        assert (features.fixed_count, features.partially_fixed_count, features.not_addressed_count) == (3, 2, 2)  # markers and emoji lines, as before
+        assert (features.new_critical_count, features.new_high_count) == (1, 1)
+        assert features.critical_count == 1
+        assert "cache" in features.words
+        assert features.negative_count == 3  # error, missing, critical
+    
+    def test_new_findings_section_only(self):
+        """Test that severities outside the NEW FINDINGS section are not new."""
+        features = FeedbackFeatures.from_text("[Severity: CRITICAL] Old\nNEW FINDINGS\n[Severity: HIGH] New")
+        
+        assert (features.new_critical_count, features.new_high_count) == (0, 1)
+    
+    def test_extraction_is_cached(self):
+        """Test that the same feedback string is extracted once."""
+        assert FeedbackFeatures.from_text(self.ITERATIVE_FEEDBACK) is FeedbackFeatures.from_text(self.ITERATIVE_FEEDBACK)
+    
+    def test_structured_overrides(self):
+        """Test that typed fields override the text-derived features."""
+        structured = Feedback(
+            reviewer_role="technical_reviewer",
+            feedback_points=["[Severity: LOW] Minor naming issue"],
+            iteration=2,
+            verdict="APPROVE",
+            findings=[Finding(severity="LOW", description="Minor naming issue")],
+            improvement_tracking={"fixed": ["Auth bypass"], "not_addressed": []}
+        )
+        
+        features = extract_features({"Technical": self.ITERATIVE_FEEDBACK}, {"Technical": structured})["Technical"]
+        
+        assert features.verdict == "approve"
+        assert (features.critical_count, features.low_count) == (0, 1)
+        assert (features.fixed_count, features.partially_fixed_count, features.new_critical_count) == (1, 0, 0)
+        # Text-only features are kept
+        assert features.has_suggestions
+    
+    def test_scorers_accept_precomputed_features(self):
+        """Test that scorers give the same result from precomputed features."""
+        feedback = {"A": self.ITERATIVE_FEEDBACK, "B": "APPROVE: Good and clear, low risk."}
+        features = extract_features(feedback)
+        
+        assert _calculate_severity_score(feedback, features=features) == _calculate_severity_score(feedback)
+        assert _calculate_agreement_ratio(feedback, features=features) == _calculate_agreement_ratio(feedback)
+        assert _calculate_feedback_quality(feedback, features=features) == _calculate_feedback_quality(feedback)
+
+
+class TestConfidenceBatch:
+    """Test suite for vectorized batch confidence scoring."""
+    
+    ITERATIONS = [
+        {},
+        {"Technical": "APPROVE: The design is solid and well-structured."},
+        {
+            "Technical": "REJECT: CRITICAL security issue. Missing authentication.",
+            "Clarity": "NEEDS REVISION: [Severity: HIGH] Unclear section. Suggest a summary.",
+            "Business": "APPROVE: Good business value, low risk."
+        },
+        {
+            "Technical": TestFeedbackFeatures.ITERATIVE_FEEDBACK,
+            "Clarity": "IMPROVEMENT TRACKING:\n✅ FIXED: Summary added\nNEW FINDINGS:\nNone. APPROVE"
+        },
+    ]
+    
+    def test_matches_per_iteration_scores(self):
+        """Test that batch scores equal calculate_confidence per iteration."""
+        previous = [None, None, {"Technical": "old"}, {"Technical": "old"}]
+        
+        scores = calculate_confidence_batch(self.ITERATIONS, previous)
+        
+        expected = [calculate_confidence(feedback, "", prev) for feedback, prev in zip(self.ITERATIONS, previous)]
+        assert scores.tolist() == pytest.approx(expected, abs=1e-12)
+        assert scores[0] == 0.5
+    
+    def test_structured_feedback(self):
+        """Test that structured output overrides apply per iteration."""
+        structured = [None, None, {"Technical": Feedback(
+            reviewer_role="technical_reviewer",
+            feedback_points=["[Severity: LOW] Minor naming issue"],
+            iteration=1,
+            verdict="APPROVE",
+            findings=[Finding(severity="LOW", description="Minor naming issue")]
+        )}, None]
+        
+        scores = calculate_confidence_batch(self.ITERATIONS, structured_feedbacks=structured)
+        
+        assert scores[2] == pytest.approx(calculate_confidence(self.ITERATIONS[2], "", None, structured[2]), abs=1e-12)
+        assert scores[2] > calculate_confidence(self.ITERATIONS[2], "")
+    
+    def test_chunking(self):
+        """Test that scores do not depend on the chunk size."""
+        iterations = self.ITERATIONS * 5
+        
+        assert calculate_confidence_batch(iterations, chunk_size=3).tolist() == pytest.approx(
+            calculate_confidence_batch(iterations).tolist(), abs=1e-12
+        )
+    
+    def test_length_mismatch(self):
+        """Test that misaligned optional sequences are rejected."""
+        with pytest.raises(ValueError):
+            calculate_confidence_batch(self.ITERATIONS, previous_feedbacks=[None])
+    
+    def test_empty_batch(self):
+        """Test scoring an empty batch."""
+        assert calculate_confidence_batch([]).shape == (0,)
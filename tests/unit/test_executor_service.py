@@ -0,0 +1,113 @@
+"""Unit tests for the shared executor service."""
+
+import threading
+import time
+import pytest
+from app.utils.executor_service import (
+    ExecutorService,
+    ExecutorSaturatedError,
+    configure_executor_service,
+    get_executor_service
+)
+
+
+class TestExecutorService:
+    """Test bounded execution and backpressure."""
+    
+    def test_runs_tasks(self):
+        """Test submitted tasks run and return their results."""
+        service = ExecutorService(max_workers=2)
+        try:
+            futures = [service.submit(pow, i, 2) for i in range(5)]
+            assert [future.result() for future in futures] == [0, 1, 4, 9, 16]
+            assert service.get_stats()['submitted'] == 5
+        finally:
+            service.shutdown()
+    
+    def test_caps_concurrency(self):
+        """Test no more than max_workers tasks run at once."""
+        service = ExecutorService(max_workers=2, max_queue=10)
+        lock = threading.Lock()
+        active = [0, 0]  # current, peak
+        
+        def task():
+            with lock:
+                active[0] += 1
+                active[1] = max(active[1], active[0])
+            time.sleep(0.02)
+            with lock:
+                active[0] -= 1
+        
+        try:
+            for future in [service.submit(task) for _ in range(6)]:
+                future.result()
+            assert active[1] <= 2
+        finally:
+            service.shutdown()
+    
+    def test_saturation_raises_after_timeout(self):
+        """Test submit raises once running and queued slots stay full."""
+        service = ExecutorService(max_workers=1, max_queue=1, submit_timeout=0.05)
+        release = threading.Event()
+        try:
+            service.submit(release.wait)
+            service.submit(release.wait)
+            with pytest.raises(ExecutorSaturatedError):
+                service.submit(release.wait)
+            assert service.get_stats()['rejected'] == 1
+        finally:
+            release.set()
+            service.shutdown()
+    
+    def test_try_submit_bounds_the_wait(self):
+        """Test that try_submit gives up after its own timeout, not submit_timeout."""
+        service = ExecutorService(max_workers=1, max_queue=0, submit_timeout=60)
+        release = threading.Event()
+        try:
+            service.submit(release.wait)
+            start = time.monotonic()
+            with pytest.raises(ExecutorSaturatedError):
+                service.try_submit(0.1, release.wait)
+            assert time.monotonic() - start < 1.0
+        finally:
+            release.set()
+            service.shutdown()
+    
+    def test_submit_waits_for_free_slot(self):
+        """Test submit blocks until a running task frees its slot."""
+        service = ExecutorService(max_workers=1, max_queue=0, submit_timeout=2.0)
+        try:
+            service.submit(time.sleep, 0.05)
+            future = service.submit(pow, 2, 3)
+            assert future.result() == 8
+            # Slots are released by a done callback just after the result is set
+            time.sleep(0.01)
+            assert service.get_stats()['in_flight'] == 0
+        finally:
+            service.shutdown()
+    
+    def test_invalid_configuration(self):
+        """Test invalid sizes are rejected."""
+        with pytest.raises(ValueError):
+            ExecutorService(max_workers=0)
+        with pytest.raises(ValueError):
+            ExecutorService(max_queue=-1)
+
+
+class TestSharedExecutorService:
+    """Test the process-wide executor."""
+    
+    def test_shared_instance(self):
+        """Test every caller gets the same executor."""
+        assert get_executor_service() is get_executor_service()
+    
+    def test_configure_replaces_instance(self):
+        """Test configuring swaps the shared executor."""
+        previous = get_executor_service()
+        service = configure_executor_service(max_workers=3, max_queue=4)
+        try:
+            assert get_executor_service() is service
+            assert service.get_stats()['max_workers'] == 3
+            assert service is not previous
+        finally:
+            configure_executor_service()
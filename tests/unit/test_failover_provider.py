@@ -0,0 +1,281 @@
+"""Unit tests for the circuit breaker and failover provider."""
+
+import asyncio
+import pytest
+from unittest.mock import Mock
+from app.llm.failover_provider import CircuitBreaker, FailoverProvider
+from app.llm.mock_provider import MockLLMProvider
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+
+class DownProvider(MockLLMProvider):
+    """Mock provider that fails every call until it is brought back up."""
+    
+    def __init__(self, name: str = "down", **kwargs):
+        super().__init__(**kwargs)
+        self.name = name
+        self.up = False
+    
+    def get_provider_name(self) -> str:
+        return self.name
+    
+    def generate_text(self, prompt: str, **kwargs) -> str:
+        self.call_count += 1
+        if not self.up:
+            raise Exception("Service unavailable")
+        return f"{self.name} response"
+
+
+class NamedProvider(MockLLMProvider):
+    """Mock provider with a fixed response and name."""
+    
+    def __init__(self, name: str, **kwargs):
+        super().__init__(**kwargs)
+        self.name = name
+    
+    def get_provider_name(self) -> str:
+        return self.name
+    
+    def generate_text(self, prompt: str, **kwargs) -> str:
+        self.call_count += 1
+        self.last_kwargs = kwargs
+        return f"{self.name} response"
+
+
+class TestCircuitBreaker:
+    """Tests for CircuitBreaker state transitions."""
+    
+    def test_opens_after_consecutive_failures(self):
+        """Test that repeated failures open the circuit."""
+        breaker = CircuitBreaker(failure_threshold=3)
+        
+        for _ in range(2):
+            breaker.record_failure(0.1)
+        assert breaker.state == CircuitBreaker.CLOSED
+        
+        breaker.record_failure(0.1)
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.allow_request() is False
+        assert breaker.get_stats()['rejected'] == 1
+    
+    def test_success_resets_consecutive_failures(self):
+        """Test that a success in between keeps the circuit closed."""
+        breaker = CircuitBreaker(failure_threshold=2, min_calls=100)
+        
+        breaker.record_failure(0.1)
+        breaker.record_success(0.1)
+        breaker.record_failure(0.1)
+        
+        assert breaker.state == CircuitBreaker.CLOSED
+    
+    def test_opens_on_error_rate(self):
+        """Test that a high error rate over the window opens the circuit."""
+        breaker = CircuitBreaker(failure_threshold=10, error_rate_threshold=0.5, window_size=4, min_calls=4)
+        
+        for failed in (False, True, False, True):
+            if failed:
+                breaker.record_failure(0.1)
+            else:
+                breaker.record_success(0.1)
+        
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.get_stats()['error_rate'] == 0.5
+    
+    def test_slow_calls_count_as_failures(self):
+        """Test that latency above the slow-call threshold trips the circuit."""
+        breaker = CircuitBreaker(failure_threshold=2, slow_call_threshold=5.0)
+        
+        breaker.record_success(6.0)
+        breaker.record_success(7.0)
+        
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.get_stats()['avg_latency'] == 6.5
+    
+    def test_half_open_admits_single_probe(self):
+        """Test that after the reset timeout only one probe is let through."""
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30, clock=clock)
+        breaker.record_failure(0.1)
+        
+        clock.now = 29
+        assert breaker.allow_request() is False
+        
+        clock.now = 30
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert breaker.allow_request() is True
+        assert breaker.allow_request() is False
+    
+    def test_probe_success_closes(self):
+        """Test that a successful probe closes the circuit."""
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30, clock=clock)
+        breaker.record_failure(0.1)
+        clock.now = 30
+        
+        assert breaker.allow_request() is True
+        breaker.record_success(0.1)
+        
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert breaker.get_stats()['error_rate'] == 0.0
+    
+    def test_probe_failure_reopens(self):
+        """Test that a failed probe opens the circuit for another timeout."""
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30, clock=clock)
+        breaker.record_failure(0.1)
+        clock.now = 30
+        
+        assert breaker.allow_request() is True
+        breaker.record_failure(0.1)
+        
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.get_stats()['times_opened'] == 2
+        clock.now = 59
+        assert breaker.allow_request() is False
+    
+    def test_invalid_thresholds(self):
+        """Test that out-of-range settings are rejected."""
+        with pytest.raises(ValueError):
+            CircuitBreaker(failure_threshold=0)
+        with pytest.raises(ValueError):
+            CircuitBreaker(error_rate_threshold=0)
+        with pytest.raises(ValueError):
+            CircuitBreaker(window_size=0)
+
+
+class TestFailoverProvider:
+    """Tests for routing across the provider chain."""
+    
+    def test_requires_providers(self):
+        """Test that an empty chain is rejected."""
+        with pytest.raises(ValueError):
+            FailoverProvider([])
+    
+    def test_uses_primary_when_healthy(self):
+        """Test that a healthy primary serves every call."""
+        primary, secondary = NamedProvider("anthropic"), NamedProvider("openai")
+        provider = FailoverProvider([primary, secondary])
+        
+        assert provider.generate_text("Hello") == "anthropic response"
+        assert secondary.call_count == 0
+    
+    def test_fails_over_to_next_provider(self):
+        """Test that a failing primary falls through to the next provider."""
+        primary, secondary = DownProvider("anthropic"), NamedProvider("openai")
+        provider = FailoverProvider([primary, secondary])
+        
+        assert provider.generate_text("Hello") == "openai response"
+        assert provider.get_health()['anthropic']['failures'] == 1
+    
+    def test_open_circuit_skips_provider(self):
+        """Test that once the circuit opens the failing provider is not called."""
+        primary, secondary = DownProvider("anthropic"), NamedProvider("openai")
+        provider = FailoverProvider([primary, secondary], failure_threshold=2)
+        
+        for _ in range(5):
+            assert provider.generate_text("Hello") == "openai response"
+        
+        assert primary.call_count == 2
+        assert provider.get_health()['anthropic']['state'] == CircuitBreaker.OPEN
+    
+    def test_half_open_probe_recovers_primary(self):
+        """Test that the primary gets traffic back after a successful probe."""
+        clock = FakeClock()
+        primary, secondary = DownProvider("anthropic"), NamedProvider("openai")
+        provider = FailoverProvider([primary, secondary], clock=clock, failure_threshold=1, reset_timeout=30)
+        
+        provider.generate_text("Hello")
+        primary.up = True
+        assert provider.generate_text("Hello") == "openai response"
+        
+        clock.now = 30
+        assert provider.generate_text("Hello") == "anthropic response"
+        assert provider.get_health()['anthropic']['state'] == CircuitBreaker.CLOSED
+    
+    def test_all_providers_failing(self):
+        """Test that the error lists every provider once the chain is exhausted."""
+        provider = FailoverProvider([DownProvider("anthropic"), DownProvider("openai")], failure_threshold=1)
+        
+        with pytest.raises(Exception, match="All providers failed: anthropic: Service unavailable"):
+            provider.generate_text("Hello")
+        
+        with pytest.raises(Exception, match="anthropic: circuit open; openai: circuit open"):
+            provider.generate_text("Hello")
+    
+    def test_model_override_only_for_primary(self):
+        """Test that a provider-specific model is not sent to fallbacks."""
+        primary, secondary = DownProvider("anthropic"), NamedProvider("openai")
+        provider = FailoverProvider([primary, secondary])
+        
+        provider.generate_text("Hello", model="claude-3-opus", temperature=0.2)
+        
+        assert secondary.last_kwargs == {'temperature': 0.2}
+    
+    def test_latency_recorded(self):
+        """Test that call latency feeds the breaker statistics."""
+        clock = FakeClock()
+        primary = NamedProvider("anthropic")
+        original = primary.generate_text
+        
+        def slow_generate(prompt, **kwargs):
+            clock.now += 2.0
+            return original(prompt, **kwargs)
+        
+        primary.generate_text = slow_generate
+        provider = FailoverProvider([primary], clock=clock)
+        provider.generate_text("Hello")
+        
+        assert provider.get_health()['anthropic']['avg_latency'] == 2.0
+    
+    def test_async_fails_over(self):
+        """Test agenerate_text failover."""
+        primary, secondary = DownProvider("anthropic"), NamedProvider("openai")
+        provider = FailoverProvider([primary, secondary])
+        
+        assert asyncio.run(provider.agenerate_text("Hello")) == "openai response"
+        assert provider.get_health()['anthropic']['failures'] == 1
+    
+    def test_stream_fails_over_before_first_chunk(self):
+        """Test that streaming falls through when a provider fails up front."""
+        primary, secondary = DownProvider("anthropic"), NamedProvider("openai")
+        provider = FailoverProvider([primary, secondary])
+        
+        assert "".join(provider.stream_text("Hello")) == "openai response"
+    
+    def test_stream_error_after_output_propagates(self):
+        """Test that a mid-stream failure is raised instead of restarting elsewhere."""
+        primary, secondary = NamedProvider("anthropic"), NamedProvider("openai")
+        
+        def broken_stream(prompt, **kwargs):
+            yield "partial"
+            raise Exception("Connection reset")
+        
+        primary.stream_text = broken_stream
+        provider = FailoverProvider([primary, secondary])
+        
+        chunks = []
+        with pytest.raises(Exception, match="Connection reset"):
+            for chunk in provider.stream_text("Hello"):
+                chunks.append(chunk)
+        
+        assert chunks == ["partial"]
+        assert secondary.call_count == 0
+    
+    def test_close_closes_every_provider(self):
+        """Test that close() releases all providers in the chain."""
+        primary, secondary = Mock(), Mock()
+        primary.api_key, primary.config = None, {}
+        
+        FailoverProvider([primary, secondary]).close()
+        
+        primary.close.assert_called()
+        secondary.close.assert_called()
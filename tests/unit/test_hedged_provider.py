@@ -0,0 +1,197 @@
+"""Unit tests for hedged requests."""
+
+import asyncio
+import pytest
+from app.llm.hedged_provider import HedgedProvider, LatencyTracker
+from app.llm.mock_provider import MockLLMProvider
+from app.orchestration.reviewer_manager import ReviewerManager
+
+
+class SlowProvider(MockLLMProvider):
+    """Mock provider whose async calls take a fixed time."""
+    
+    def __init__(self, name: str, delay: float, fail: bool = False, **kwargs):
+        super().__init__(**kwargs)
+        self.name = name
+        self.delay = delay
+        self.fail = fail
+        self.cancelled = 0
+        self.calls = []
+    
+    async def agenerate_text(self, prompt: str, **kwargs) -> str:
+        self.calls.append(kwargs)
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.fail:
+            raise Exception(f"{self.name} failed")
+        return f"{self.name} response"
+
+
+class TestLatencyTracker:
+    """Tests for LatencyTracker percentiles."""
+    
+    def test_percentile_nearest_rank(self):
+        """Test nearest-rank percentiles over the window."""
+        tracker = LatencyTracker()
+        for latency in range(1, 11):
+            tracker.record(float(latency))
+        
+        assert tracker.percentile(0.9) == 9.0
+        assert tracker.percentile(0.5) == 5.0
+        assert len(tracker) == 10
+    
+    def test_empty_and_window(self):
+        """Test the empty case and that old samples roll off."""
+        tracker = LatencyTracker(window_size=2)
+        assert tracker.percentile(0.9) is None
+        
+        for latency in (100.0, 1.0, 2.0):
+            tracker.record(latency)
+        
+        assert tracker.percentile(0.99) == 2.0
+
+
+class TestHedgedProvider:
+    """Tests for HedgedProvider."""
+    
+    def test_invalid_percentile(self):
+        """Test that percentiles outside (0, 1) are rejected."""
+        with pytest.raises(ValueError):
+            HedgedProvider(MockLLMProvider(), percentile=1.0)
+    
+    def test_no_hedge_before_warmup(self):
+        """Test that calls are not hedged until enough latencies are known."""
+        primary = SlowProvider("primary", 0.05)
+        provider = HedgedProvider(primary, min_samples=10)
+        
+        assert asyncio.run(provider.agenerate_text("Hello")) == "primary response"
+        assert provider.get_hedge_stats()['hedged_requests'] == 0
+        assert provider.hedge_delay() is None
+    
+    def test_hedge_delay_uses_percentile(self):
+        """Test that the hedge delay follows the latency percentile once warmed up."""
+        tracker = LatencyTracker()
+        for latency in range(1, 11):
+            tracker.record(float(latency))
+        provider = HedgedProvider(MockLLMProvider(), latency_tracker=tracker, min_samples=10)
+        
+        assert provider.hedge_delay() == 9.0
+    
+    def test_fast_primary_is_not_hedged(self):
+        """Test that a primary answering before the deadline wins alone."""
+        primary = SlowProvider("primary", 0.01)
+        secondary = SlowProvider("secondary", 0.01)
+        provider = HedgedProvider(primary, hedge_provider=secondary, initial_delay=1.0)
+        
+        assert asyncio.run(provider.agenerate_text("Hello")) == "primary response"
+        assert secondary.calls == []
+    
+    def test_slow_primary_is_hedged_and_cancelled(self):
+        """Test that the hedge wins against a straggler, which is cancelled."""
+        primary = SlowProvider("primary", 5.0)
+        secondary = SlowProvider("secondary", 0.01)
+        provider = HedgedProvider(primary, hedge_provider=secondary, initial_delay=0.05)
+        
+        async def run():
+            result = await provider.agenerate_text("x" * 40)
+            await asyncio.sleep(0)
+            return result
+        
+        assert asyncio.run(run()) == "secondary response"
+        assert primary.cancelled == 1
+        
+        stats = provider.get_hedge_stats()
+        assert stats['hedged_requests'] == 1
+        assert stats['hedge_wins'] == 1
+        assert stats['hedge_rate'] == 1.0
+        # Hedge prompt plus the straggler's output, estimated from the winner's
+        assert stats['extra_prompt_tokens'] == 10
+        assert stats['extra_output_tokens'] == 5
+        assert stats['extra_tokens'] == 15
+    
+    def test_primary_can_still_win_after_hedge(self):
+        """Test that the primary wins if it answers before the hedge."""
+        primary = SlowProvider("primary", 0.1)
+        secondary = SlowProvider("secondary", 5.0)
+        provider = HedgedProvider(primary, hedge_provider=secondary, initial_delay=0.05)
+        
+        assert asyncio.run(provider.agenerate_text("Hello")) == "primary response"
+        assert provider.get_hedge_stats()['hedge_wins'] == 0
+    
+    def test_failed_request_falls_back_to_other(self):
+        """Test that a failure of one request waits for the other."""
+        primary = SlowProvider("primary", 0.1, fail=True)
+        secondary = SlowProvider("secondary", 0.2)
+        provider = HedgedProvider(primary, hedge_provider=secondary, initial_delay=0.05)
+        
+        assert asyncio.run(provider.agenerate_text("Hello")) == "secondary response"
+        assert provider.get_hedge_stats()['extra_output_tokens'] == 0
+    
+    def test_both_failing_raises(self):
+        """Test that the error surfaces when every request failed."""
+        primary = SlowProvider("primary", 0.1, fail=True)
+        secondary = SlowProvider("secondary", 0.01, fail=True)
+        provider = HedgedProvider(primary, hedge_provider=secondary, initial_delay=0.05)
+        
+        with pytest.raises(Exception, match="failed"):
+            asyncio.run(provider.agenerate_text("Hello"))
+        assert len(provider.latency) == 0
+    
+    def test_model_override_not_sent_to_secondary(self):
+        """Test that a provider-specific model is dropped for a different hedge provider."""
+        primary = SlowProvider("primary", 5.0)
+        secondary = SlowProvider("secondary", 0.01)
+        provider = HedgedProvider(primary, hedge_provider=secondary, initial_delay=0.01)
+        
+        asyncio.run(provider.agenerate_text("Hello", model="gpt-4", temperature=0.1))
+        
+        assert primary.calls == [{'model': 'gpt-4', 'temperature': 0.1}]
+        assert secondary.calls == [{'temperature': 0.1}]
+    
+    def test_sync_generate_text_uses_private_loop(self):
+        """Test that sync callers are served and close() stops the loop."""
+        primary = SlowProvider("primary", 5.0)
+        secondary = SlowProvider("secondary", 0.01)
+        provider = HedgedProvider(primary, hedge_provider=secondary, initial_delay=0.05)
+        
+        assert provider.generate_text("Hello") == "secondary response"
+        thread = provider._loop_thread
+        assert thread.is_alive()
+        
+        provider.close()
+        assert not thread.is_alive()
+    
+    def test_records_latency(self):
+        """Test that successful calls feed the latency tracker."""
+        provider = HedgedProvider(SlowProvider("primary", 0.01))
+        
+        asyncio.run(provider.agenerate_text("Hello"))
+        
+        assert len(provider.latency) == 1
+
+
+class TestReviewerHedging:
+    """Tests for opt-in hedging of reviewer calls."""
+    
+    def test_disabled_by_default(self):
+        """Test that reviewers use the provider directly by default."""
+        provider = MockLLMProvider()
+        manager = ReviewerManager(provider)
+        
+        assert manager.reviewer_provider is provider
+        assert manager.get_hedge_stats() is None
+    
+    def test_hedged_reviewers(self):
+        """Test that enabling hedging routes reviewer calls through the wrapper."""
+        provider = MockLLMProvider()
+        manager = ReviewerManager(provider, hedge_percentile=0.9)
+        
+        feedback = manager.run_reviewers("Content to review", ['Technical Reviewer', 'Clarity Reviewer'], 1)
+        
+        assert isinstance(manager.reviewer_provider, HedgedProvider)
+        assert set(feedback) == {'Technical Reviewer', 'Clarity Reviewer'}
+        assert manager.get_hedge_stats()['requests'] == 2
+        manager.reviewer_provider.close()
@@ -0,0 +1,149 @@
+"""Unit tests for background iteration jobs."""
+
+import threading
+import pytest
+from app.core.iteration_jobs import IterationJob, IterationJobRunner
+from app.core.orchestrator import Orchestrator
+from app.core.session_manager import SessionManager
+from app.llm.mock_provider import MockLLMProvider
+
+
+ROLES = ["Technical Reviewer", "Clarity Reviewer"]
+
+
+class GatedProvider(MockLLMProvider):
+    """Mock provider whose calls wait until the test releases them."""
+    
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.release = threading.Event()
+    
+    def generate_text(self, prompt: str, **kwargs) -> str:
+        self.release.wait(timeout=5)
+        return super().generate_text(prompt, **kwargs)
+
+
+@pytest.fixture
+def session_manager():
+    """Create a session manager with active session."""
+    manager = SessionManager()
+    manager.create_session(
+        session_name="Background Session",
+        requirements="Test requirements",
+        selected_roles=ROLES,
+        models_config={}
+    )
+    yield manager
+    manager.end_session()
+
+
+@pytest.fixture
+def runner():
+    """Create a job runner and shut it down after the test."""
+    runner = IterationJobRunner(max_workers=2)
+    yield runner
+    runner.shutdown(wait=True)
+
+
+class TestIterationJob:
+    """Tests for IterationJob progress tracking."""
+    
+    def test_snapshot_copies_progress_and_output(self):
+        """Test that a snapshot reflects progress and streamed output."""
+        job = IterationJob("session-1")
+        job.on_progress("reviewers", 1, 2)
+        job.on_stream("presenter", "Draft ")
+        job.on_stream("presenter", "text")
+        
+        snapshot = job.snapshot()
+        job.on_progress("reviewers", 2, 2)
+        
+        assert snapshot['status'] == IterationJob.QUEUED
+        assert snapshot['stage'] == "reviewers"
+        assert snapshot['progress'] == {"reviewers": (1, 2)}
+        assert snapshot['partial_output'] == {"presenter": "Draft text"}
+    
+    def test_failed_result_marks_job_failed(self):
+        """Test that an iteration error finishes the job as failed."""
+        job = IterationJob("session-1")
+        job._start()
+        job._finish(None, "Iteration 0 failed")
+        
+        assert job.done
+        assert job.status == IterationJob.FAILED
+        assert job.snapshot()['error'] == "Iteration 0 failed"
+
+
+class TestIterationJobRunner:
+    """Tests for IterationJobRunner."""
+    
+    def test_runs_iteration_in_background(self, session_manager, runner):
+        """Test that submit returns at once and the job completes later."""
+        provider = GatedProvider()
+        orchestrator = Orchestrator(session_manager, provider)
+        session_id = session_manager.get_current_session().session_id
+        
+        job = runner.submit(session_id, orchestrator, requirements="Test requirements", selected_roles=ROLES)
+        
+        assert runner.is_running(session_id)
+        provider.release.set()
+        result = job.future.result(timeout=10)
+        
+        assert job.status == IterationJob.COMPLETED
+        assert job.result is result
+        assert orchestrator.get_current_result() is result
+        assert not runner.is_running(session_id)
+    
+    def test_reports_stage_progress(self, session_manager, runner):
+        """Test that every stage's final progress is recorded."""
+        orchestrator = Orchestrator(session_manager, MockLLMProvider())
+        session_id = session_manager.get_current_session().session_id
+        
+        job = runner.submit(session_id, orchestrator, requirements="Test requirements", selected_roles=ROLES)
+        job.future.result(timeout=10)
+        
+        assert job.snapshot()['progress'] == {
+            "presenter": (1, 1),
+            "reviewers": (2, 2),
+            "confidence": (1, 1),
+        }
+    
+    def test_submit_while_running_returns_same_job(self, session_manager, runner):
+        """Test that a rerun's submit doesn't start the iteration again."""
+        provider = GatedProvider()
+        orchestrator = Orchestrator(session_manager, provider)
+        session_id = session_manager.get_current_session().session_id
+        
+        first = runner.submit(session_id, orchestrator, requirements="Test requirements", selected_roles=ROLES)
+        second = runner.submit(session_id, orchestrator, requirements="Test requirements", selected_roles=ROLES)
+        provider.release.set()
+        first.future.result(timeout=10)
+        
+        assert second is first
+        assert len(orchestrator.get_iteration_history()) == 1
+    
+    def test_orchestrator_exception_fails_job(self, runner):
+        """Test that an exception from the orchestrator is captured on the job."""
+        manager = SessionManager()
+        orchestrator = Orchestrator(manager, MockLLMProvider())
+        
+        job = runner.submit("no-session", orchestrator, requirements="Test requirements", selected_roles=ROLES)
+        
+        assert job.future.result(timeout=10) is None
+        assert job.status == IterationJob.FAILED
+        assert "No active session" in job.error
+    
+    def test_discard_forgets_job(self, session_manager, runner):
+        """Test that a discarded job is no longer returned."""
+        orchestrator = Orchestrator(session_manager, MockLLMProvider())
+        session_id = session_manager.get_current_session().session_id
+        runner.submit(session_id, orchestrator, requirements="Test requirements", selected_roles=ROLES).future.result(timeout=10)
+        
+        runner.discard(session_id)
+        
+        assert runner.get_job(session_id) is None
+    
+    def test_invalid_max_workers(self):
+        """Test that max_workers must be positive."""
+        with pytest.raises(ValueError):
+            IterationJobRunner(max_workers=0)
@@ -1,8 +1,14 @@
 """Unit tests for LLM providers."""
 
+import asyncio
+import threading
+import time
 import pytest
+from unittest.mock import AsyncMock, Mock, patch
 from app.llm.base_provider import BaseLLMProvider
 from app.llm.mock_provider import MockLLMProvider
+from app.llm.openai_provider import OpenAIProvider
+from app.llm.anthropic_provider import AnthropicProvider
 
 
 class TestMockLLMProvider:
@@ -111,4 +117,461 @@ class TestBaseLLMProvider:
         assert hasattr(BaseLLMProvider, 'list_models')
         assert hasattr(BaseLLMProvider, 'validate_connection')
         assert hasattr(BaseLLMProvider, 'get_provider_name')
+        assert hasattr(BaseLLMProvider, 'agenerate_text')
 
+
+def _async_client_returning(*responses):
+    """Build a fake httpx.AsyncClient whose post() returns the given responses."""
+    client = Mock()
+    client.post = AsyncMock(side_effect=list(responses))
+    return client
+
+
+def _json_response(status_code, data):
+    """Build a fake HTTP response with a JSON body."""
+    response = Mock()
+    response.status_code = status_code
+    response.json.return_value = data
+    response.text = str(data)
+    return response
+
+
+class TestAsyncGeneration:
+    """Tests for the async agenerate_text interface."""
+    
+    def test_default_offloads_to_generate_text(self):
+        """Test that the base implementation runs generate_text off the loop."""
+        provider = MockLLMProvider()
+        
+        result = asyncio.run(provider.agenerate_text("Hello"))
+        
+        assert result == "This is a mock response from the LLM provider."
+        assert provider.get_call_count() == 1
+        assert provider.get_last_prompt() == "Hello"
+    
+    def test_default_supports_concurrent_calls(self):
+        """Test that many calls can be gathered on one event loop."""
+        provider = MockLLMProvider()
+        
+        async def run_all():
+            return await asyncio.gather(
+                *[provider.agenerate_text(f"Prompt {i}") for i in range(10)]
+            )
+        
+        results = asyncio.run(run_all())
+        
+        assert len(results) == 10
+        assert provider.get_call_count() == 10
+    
+    def test_openai_native_async(self):
+        """Test OpenAI agenerate_text uses the async client."""
+        provider = OpenAIProvider(api_key="test-key")
+        client = _async_client_returning(
+            _json_response(200, {"choices": [{"message": {"content": "Async answer"}}]})
+        )
+        
+        with patch.object(provider, '_get_async_client', return_value=client):
+            result = asyncio.run(provider.agenerate_text("Hello", max_tokens=50))
+        
+        assert result == "Async answer"
+        payload = client.post.call_args.kwargs['json']
+        assert payload['max_tokens'] == 50
+        assert payload['messages'][0]['content'] == "Hello"
+    
+    def test_openai_async_retries_without_blocking(self):
+        """Test OpenAI async retry backoff awaits asyncio.sleep."""
+        provider = OpenAIProvider(api_key="test-key")
+        client = _async_client_returning(
+            _json_response(429, {}),
+            _json_response(200, {"choices": [{"message": {"content": "Recovered"}}]})
+        )
+        
+        with patch.object(provider, '_get_async_client', return_value=client), \
+             patch('app.llm.retry_policy.asyncio.sleep', new=AsyncMock()) as mock_sleep, \
+             patch('app.llm.retry_policy.time.sleep') as mock_time_sleep:
+            result = asyncio.run(provider.agenerate_text("Hello"))
+        
+        assert result == "Recovered"
+        mock_sleep.assert_awaited_once()
+        mock_time_sleep.assert_not_called()
+    
+    def test_openai_async_invalid_key(self):
+        """Test OpenAI async surfaces auth errors."""
+        provider = OpenAIProvider(api_key="bad-key")
+        client = _async_client_returning(_json_response(401, {}))
+        
+        with patch.object(provider, '_get_async_client', return_value=client):
+            with pytest.raises(ValueError, match="Invalid API key"):
+                asyncio.run(provider.agenerate_text("Hello"))
+    
+    def test_anthropic_native_async(self):
+        """Test Anthropic agenerate_text uses the async client."""
+        provider = AnthropicProvider(api_key="test-key")
+        client = _async_client_returning(
+            _json_response(200, {"content": [{"text": "Claude async"}]})
+        )
+        
+        with patch.object(provider, '_get_async_client', return_value=client):
+            result = asyncio.run(provider.agenerate_text("Hello"))
+        
+        assert result == "Claude async"
+        headers = client.post.call_args.kwargs['headers']
+        assert headers['x-api-key'] == "test-key"
+    
+    def test_async_client_is_reused_within_loop(self):
+        """Test the async client is created once per event loop."""
+        provider = OpenAIProvider(api_key="test-key")
+        
+        async def get_twice():
+            first = provider._get_async_client()
+            second = provider._get_async_client()
+            await provider.aclose()
+            return first, second
+        
+        first, second = asyncio.run(get_twice())
+        
+        assert first is second
+    
+    def test_async_client_recreated_for_new_loop(self):
+        """Test a fresh client is created when a new event loop is used."""
+        provider = OpenAIProvider(api_key="test-key")
+        
+        async def get_client():
+            return provider._get_async_client()
+        
+        first = asyncio.run(get_client())
+        second = asyncio.run(get_client())
+        
+        assert first is not second
+
+
+class TestConnectionPooling:
+    """Tests for pooled keep-alive HTTP sessions."""
+    
+    def test_session_reused_across_calls(self):
+        """Test that consecutive generations share one session."""
+        provider = OpenAIProvider(api_key="test-key")
+        response = _json_response(200, {"choices": [{"message": {"content": "Hi"}}]})
+        
+        with patch('app.llm.openai_provider.requests.Session.post', return_value=response) as mock_post:
+            provider.generate_text("one")
+            first_session = provider._session
+            provider.generate_text("two")
+        
+        assert mock_post.call_count == 2
+        assert provider._session is first_session
+    
+    def test_pool_size_is_configurable(self):
+        """Test that pool settings are applied to the mounted adapter."""
+        provider = AnthropicProvider(api_key="test-key", pool_connections=3, pool_maxsize=7)
+        
+        adapter = provider._get_session().get_adapter("https://api.anthropic.com")
+        
+        assert adapter._pool_connections == 3
+        assert adapter._pool_maxsize == 7
+    
+    def test_concurrent_threads_share_session(self):
+        """Test that worker threads all get the same pooled session."""
+        provider = OpenAIProvider(api_key="test-key")
+        sessions = []
+        
+        def grab():
+            sessions.append(provider._get_session())
+        
+        threads = [threading.Thread(target=grab) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert len({id(session) for session in sessions}) == 1
+    
+    def test_close_releases_session(self):
+        """Test that close() closes and drops the session."""
+        provider = OpenAIProvider(api_key="test-key")
+        session = provider._get_session()
+        
+        with patch.object(session, 'close') as mock_close:
+            provider.close()
+        
+        mock_close.assert_called_once()
+        assert provider._session is None
+        
+        # Closing again is a no-op
+        provider.close()
+    
+    def test_context_manager_closes_provider(self):
+        """Test that the provider can be used as a context manager."""
+        with OpenAIProvider(api_key="test-key") as provider:
+            provider._get_session()
+        
+        assert provider._session is None
+    
+    def test_async_client_limits_are_configurable(self):
+        """Test that httpx limits come from provider configuration."""
+        provider = OpenAIProvider(api_key="test-key", max_connections=4, max_keepalive_connections=2)
+        
+        limits = provider._httpx_limits()
+        
+        assert limits.max_connections == 4
+        assert limits.max_keepalive_connections == 2
+
+
+def _stream_response(lines, status_code=200):
+    """Build a mock streaming HTTP response yielding the given lines."""
+    response = Mock()
+    response.status_code = status_code
+    response.iter_lines.return_value = iter(lines)
+    return response
+
+
+class TestStreaming:
+    """Tests for incremental stream_text generation."""
+    
+    def test_default_yields_full_text(self):
+        """Test that providers without native streaming yield one chunk."""
+        class OneShotProvider(BaseLLMProvider):
+            def generate_text(self, prompt: str, **kwargs) -> str:
+                return f"echo: {prompt}"
+            
+            def list_models(self):
+                return ["one-shot"]
+        
+        assert list(OneShotProvider().stream_text("hi")) == ["echo: hi"]
+    
+    def test_mock_provider_streams_words(self):
+        """Test that the mock provider streams its response word by word."""
+        provider = MockLLMProvider()
+        
+        chunks = list(provider.stream_text("Test"))
+        
+        assert len(chunks) > 1
+        assert "".join(chunks) == "This is a mock response from the LLM provider."
+        assert provider.call_count == 1
+    
+    def test_openai_parses_sse_deltas(self):
+        """Test that OpenAI stream deltas are yielded in order."""
+        provider = OpenAIProvider(api_key="test-key")
+        response = _stream_response([
+            'data: {"choices": [{"delta": {"role": "assistant"}}]}',
+            '',
+            'data: {"choices": [{"delta": {"content": "Hello"}}]}',
+            'data: {"choices": [{"delta": {"content": " world"}}]}',
+            'data: [DONE]',
+        ])
+        
+        with patch('app.llm.openai_provider.requests.Session.post', return_value=response) as mock_post:
+            chunks = list(provider.stream_text("Hi"))
+        
+        assert chunks == ["Hello", " world"]
+        assert mock_post.call_args.kwargs['stream'] is True
+        assert mock_post.call_args.kwargs['json']['stream'] is True
+        response.close.assert_called_once()
+    
+    def test_openai_stream_retries_server_error_before_output(self):
+        """Test that a 5xx while opening the stream is retried."""
+        provider = OpenAIProvider(api_key="test-key")
+        failed = _stream_response([], status_code=503)
+        ok = _stream_response(['data: {"choices": [{"delta": {"content": "OK"}}]}', 'data: [DONE]'])
+        
+        with patch('app.llm.openai_provider.requests.Session.post', side_effect=[failed, ok]), \
+                patch('app.llm.retry_policy.time.sleep'):
+            chunks = list(provider.stream_text("Hi"))
+        
+        assert chunks == ["OK"]
+    
+    def test_openai_stream_invalid_key(self):
+        """Test that a 401 while opening the stream raises ValueError."""
+        provider = OpenAIProvider(api_key="bad-key")
+        
+        with patch('app.llm.openai_provider.requests.Session.post',
+                   return_value=_stream_response([], status_code=401)):
+            with pytest.raises(ValueError, match="Invalid API key"):
+                list(provider.stream_text("Hi"))
+    
+    def test_anthropic_parses_text_deltas(self):
+        """Test that Anthropic content_block_delta events are yielded."""
+        provider = AnthropicProvider(api_key="test-key")
+        response = _stream_response([
+            'event: message_start',
+            'data: {"type": "message_start", "message": {}}',
+            'event: content_block_delta',
+            'data: {"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": "Hi"}}',
+            'data: {"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": " there"}}',
+            'data: {"type": "message_stop"}',
+        ])
+        
+        with patch('app.llm.anthropic_provider.requests.Session.post', return_value=response):
+            chunks = list(provider.stream_text("Hello"))
+        
+        assert chunks == ["Hi", " there"]
+    
+    def test_anthropic_error_event_raises(self):
+        """Test that an error event in the stream is raised."""
+        provider = AnthropicProvider(api_key="test-key")
+        response = _stream_response([
+            'data: {"type": "content_block_delta", "delta": {"type": "text_delta", "text": "Par"}}',
+            'data: {"type": "error", "error": {"type": "overloaded_error", "message": "Overloaded"}}',
+        ])
+        
+        with patch('app.llm.anthropic_provider.requests.Session.post', return_value=response):
+            stream = provider.stream_text("Hello")
+            assert next(stream) == "Par"
+            with pytest.raises(Exception, match="Overloaded"):
+                next(stream)
+
+
+class TestStructuredOutput:
+    """Tests for the response_schema generation kwarg."""
+    
+    def test_openai_uses_json_schema_response_format(self):
+        """Test that OpenAI requests Structured Outputs for a schema."""
+        provider = OpenAIProvider(api_key="test-key")
+        schema = {"type": "object", "properties": {"verdict": {"type": "string"}}}
+        
+        _, payload = provider._build_request("Review", response_schema=schema)
+        _, plain = provider._build_request("Review")
+        
+        assert payload['response_format'] == {
+            "type": "json_schema",
+            "json_schema": {"name": "response", "schema": schema}
+        }
+        assert 'response_format' not in plain
+    
+    def test_anthropic_ignores_schema(self):
+        """Test that providers without a JSON mode ignore the kwarg."""
+        provider = AnthropicProvider(api_key="test-key")
+        
+        _, payload = provider._build_request("Review", response_schema={"type": "object"})
+        
+        assert set(payload) == {"model", "messages", "temperature", "max_tokens"}
+
+
+class TestAnthropicPromptCaching:
+    """Tests for Anthropic cache_control breakpoints and usage reporting."""
+    
+    def test_prefix_gets_cache_breakpoint(self):
+        """Test that cacheable_prefix becomes a cached content block."""
+        provider = AnthropicProvider(api_key="test-key")
+        
+        _, payload = provider._build_request("Document\n\nReview it", cacheable_prefix="Document\n\n")
+        
+        assert payload['messages'][0]['content'] == [
+            {"type": "text", "text": "Document\n\n", "cache_control": {"type": "ephemeral"}},
+            {"type": "text", "text": "Review it"},
+        ]
+        assert 'cacheable_prefix' not in payload
+    
+    def test_plain_prompt_without_prefix(self):
+        """Test that prompts without a matching prefix are sent unchanged."""
+        provider = AnthropicProvider(api_key="test-key")
+        
+        _, payload = provider._build_request("Hello")
+        _, mismatched = provider._build_request("Hello", cacheable_prefix="Other")
+        
+        assert payload['messages'][0]['content'] == "Hello"
+        assert mismatched['messages'][0]['content'] == "Hello"
+    
+    def test_prompt_caching_can_be_disabled(self):
+        """Test the prompt_caching opt-out."""
+        provider = AnthropicProvider(api_key="test-key", prompt_caching=False)
+        
+        _, payload = provider._build_request("Document\n\nReview it", cacheable_prefix="Document\n\n")
+        
+        assert payload['messages'][0]['content'] == "Document\n\nReview it"
+    
+    def test_cache_usage_is_reported(self):
+        """Test that cache read/write tokens are surfaced and accumulated."""
+        provider = AnthropicProvider(api_key="test-key")
+        usage = {"input_tokens": 20, "output_tokens": 50,
+                 "cache_creation_input_tokens": 0, "cache_read_input_tokens": 3000}
+        response = _json_response(200, {"content": [{"text": "Review"}], "usage": usage})
+        
+        with patch('app.llm.anthropic_provider.requests.Session.post', return_value=response):
+            provider.generate_text("Hello")
+            provider.generate_text("Hello again")
+        
+        assert provider.last_usage == usage
+        stats = provider.get_usage_stats()
+        assert stats['requests'] == 2
+        assert stats['cache_read_input_tokens'] == 6000
+    
+    def test_stream_usage_is_reported(self):
+        """Test that usage from message_start and message_delta is combined."""
+        provider = AnthropicProvider(api_key="test-key")
+        response = _stream_response([
+            'data: {"type": "message_start", "message": {"usage": {"input_tokens": 5, "cache_creation_input_tokens": 2000, "cache_read_input_tokens": 0}}}',
+            'data: {"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": "Hi"}}',
+            'data: {"type": "message_delta", "delta": {"stop_reason": "end_turn"}, "usage": {"output_tokens": 12}}',
+            'data: {"type": "message_stop"}',
+        ])
+        
+        with patch('app.llm.anthropic_provider.requests.Session.post', return_value=response):
+            list(provider.stream_text("Hello"))
+        
+        assert provider.last_usage == {
+            "input_tokens": 5, "cache_creation_input_tokens": 2000,
+            "cache_read_input_tokens": 0, "output_tokens": 12,
+        }
+    
+    def test_concurrent_calls_wait_for_cache_write(self):
+        """Test that calls sharing a prefix are sent after the first one's response."""
+        provider = AnthropicProvider(api_key="test-key")
+        events = []
+        lock = threading.Lock()
+        
+        def post(url, json=None, **kwargs):
+            with lock:
+                events.append(("sent", json['messages'][0]['content'][1]['text']))
+            if json['messages'][0]['content'][1]['text'] == "Technical":
+                time.sleep(0.2)
+            with lock:
+                events.append(("done", json['messages'][0]['content'][1]['text']))
+            return _json_response(200, {"content": [{"text": "Review"}], "usage": {"input_tokens": 1}})
+        
+        with patch('app.llm.anthropic_provider.requests.Session.post', side_effect=post):
+            first = threading.Thread(target=provider.generate_text, args=("Document\n\nTechnical",),
+                                     kwargs={"cacheable_prefix": "Document\n\n"})
+            first.start()
+            time.sleep(0.05)
+            provider.generate_text("Document\n\nSecurity", cacheable_prefix="Document\n\n")
+            first.join()
+        
+        assert events.index(("sent", "Security")) > events.index(("done", "Technical"))
+    
+    def test_different_prefixes_do_not_wait(self):
+        """Test that only calls sharing a prefix are serialized."""
+        provider = AnthropicProvider(api_key="test-key")
+        
+        first, first_owner = provider._claim_cache_write(
+            provider._build_request("Doc A\n\nReview", cacheable_prefix="Doc A\n\n")[1]
+        )
+        second, second_owner = provider._claim_cache_write(
+            provider._build_request("Doc B\n\nReview", cacheable_prefix="Doc B\n\n")[1]
+        )
+        again, again_owner = provider._claim_cache_write(
+            provider._build_request("Doc A\n\nOther", cacheable_prefix="Doc A\n\n")[1]
+        )
+        
+        assert first_owner and second_owner
+        assert again is first and not again_owner
+        assert provider._claim_cache_write(provider._build_request("Plain")[1]) == (None, False)
+    
+    def test_last_usage_is_per_thread(self):
+        """Test that concurrent callers each see their own response's usage."""
+        provider = AnthropicProvider(api_key="test-key")
+        seen = {}
+        
+        def call(reads):
+            provider._record_usage({"input_tokens": 10, "cache_read_input_tokens": reads})
+            time.sleep(0.05)
+            seen[reads] = provider.last_usage['cache_read_input_tokens']
+        
+        threads = [threading.Thread(target=call, args=(reads,)) for reads in (100, 200)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert seen == {100: 100, 200: 200}
+        assert provider.get_usage_stats()['cache_read_input_tokens'] == 300
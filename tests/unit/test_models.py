@@ -4,7 +4,7 @@ import pytest
 from datetime import datetime
 from app.models.session_state import SessionState, LLMConfig, AgentConfig
 from app.models.message import Message
-from app.models.feedback import Feedback, ReviewerFeedbackCollection
+from app.models.feedback import Feedback, Finding, ReviewerFeedbackCollection
 
 
 class TestSessionState:
@@ -130,6 +130,27 @@ class TestFeedback:
                 feedback_points=[],  # too few
                 iteration=1
             )
+    
+    def test_structured_fields_normalized(self):
+        """Test that verdict and finding severity are normalized."""
+        feedback = Feedback(
+            reviewer_role="technical",
+            feedback_points=["[Severity: HIGH] Missing retries"],
+            iteration=1,
+            verdict="needs_revision",
+            findings=[Finding(severity="high", description="Missing retries")]
+        )
+        
+        assert feedback.verdict == "NEEDS REVISION"
+        assert feedback.findings[0].severity == "HIGH"
+        assert feedback.findings[0].to_text() == "[Severity: HIGH] Missing retries"
+    
+    def test_unknown_structured_values_rejected(self):
+        """Test that unknown verdicts and severities are rejected."""
+        with pytest.raises(ValueError):
+            Finding(severity="SEVERE", description="Missing retries")
+        with pytest.raises(ValueError):
+            Feedback(reviewer_role="technical", feedback_points=["Point"], iteration=1, verdict="MAYBE")
 
 
 class TestReviewerFeedbackCollection:
@@ -1,9 +1,13 @@
 """Unit tests for Orchestrator."""
 
+import threading
+import time
 import pytest
+from unittest.mock import patch
 from app.core.orchestrator import Orchestrator, IterationResult
 from app.core.session_manager import SessionManager
 from app.llm.mock_provider import MockLLMProvider
+from app.utils.executor_service import ExecutorService
 
 
 class TestOrchestrator:
@@ -209,6 +213,301 @@ class TestOrchestrator:
         tech_feedback = result.reviewer_feedback[0]
         assert tech_feedback.modified is True
         assert tech_feedback.feedback_points == modified[actual_role]
+    
+    def test_run_iteration_streams_each_stage(self, orchestrator):
+        """Test that on_stream receives presenter and reviewer chunks by stage."""
+        streamed = {}
+        lock = threading.Lock()
+        
+        def on_stream(stage, chunk):
+            with lock:
+                streamed[stage] = streamed.get(stage, "") + chunk
+        
+        result = orchestrator.run_iteration(
+            requirements="Test requirements",
+            selected_roles=["Technical Reviewer", "Clarity Reviewer"],
+            on_stream=on_stream
+        )
+        
+        assert result.error is None
+        assert set(streamed) == {"presenter", "Technical Reviewer", "Clarity Reviewer"}
+        assert streamed["presenter"].strip() == result.presenter_output
+
+
+class SlowReviewProvider(MockLLMProvider):
+    """Mock provider that delays reviewer calls to expose sequential execution."""
+    
+    def __init__(self, delay: float = 0.2, hang_roles=None, **kwargs):
+        super().__init__(**kwargs)
+        self.delay = delay
+        self.hang_roles = hang_roles or []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+    
+    def generate_text(self, prompt: str, **kwargs) -> str:
+        if "CONTENT TO REVIEW" not in prompt:
+            return super().generate_text(prompt, **kwargs)
+        
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            delay = self.delay
+            if any(role in prompt for role in self.hang_roles):
+                delay = 5.0
+            time.sleep(delay)
+            return (
+                "VERDICT: APPROVE\n\nFINDINGS:\n"
+                "1. [Severity: LOW] Reviewed content looks reasonable overall\n"
+            )
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+class TestParallelReviewers:
+    """Tests for concurrent reviewer fan-out in the orchestrator."""
+    
+    ROLES = [
+        "Technical Reviewer",
+        "Clarity Reviewer",
+        "Security Reviewer",
+        "Business Reviewer",
+        "UX Reviewer",
+    ]
+    
+    @pytest.fixture
+    def session_manager(self):
+        """Create a session manager with active session."""
+        manager = SessionManager()
+        manager.create_session(
+            session_name="Parallel Session",
+            requirements="Test requirements",
+            selected_roles=self.ROLES,
+            models_config={}
+        )
+        yield manager
+        manager.end_session()
+    
+    def test_reviewers_run_concurrently(self, session_manager):
+        """Test that iteration latency is bounded by the slowest reviewer."""
+        provider = SlowReviewProvider(delay=0.2)
+        orchestrator = Orchestrator(session_manager, provider)
+        
+        start = time.monotonic()
+        feedback = orchestrator._run_reviewers("Content", self.ROLES, 1)
+        elapsed = time.monotonic() - start
+        
+        assert len(feedback) == 5
+        assert provider.max_active > 1
+        assert elapsed < 0.2 * len(self.ROLES)
+    
+    def test_results_follow_selected_roles_order(self, session_manager):
+        """Test that feedback is returned in selected_roles order."""
+        provider = SlowReviewProvider(delay=0.01)
+        orchestrator = Orchestrator(session_manager, provider)
+        
+        feedback = orchestrator._run_reviewers("Content", self.ROLES, 1)
+        
+        assert [f.reviewer_role for f in feedback] == [
+            "technical_reviewer",
+            "clarity_reviewer",
+            "security_reviewer",
+            "business_reviewer",
+            "ux_reviewer",
+        ]
+    
+    def test_max_workers_limits_concurrency(self, session_manager):
+        """Test that the worker count caps concurrent reviewers."""
+        provider = SlowReviewProvider(delay=0.05)
+        orchestrator = Orchestrator(session_manager, provider, max_workers=2)
+        
+        orchestrator._run_reviewers("Content", self.ROLES, 1)
+        
+        assert provider.max_active <= 2
+    
+    def test_sequential_mode(self, session_manager):
+        """Test that parallel execution can be disabled."""
+        provider = SlowReviewProvider(delay=0.01)
+        orchestrator = Orchestrator(session_manager, provider, parallel_reviewers=False)
+        
+        feedback = orchestrator._run_reviewers("Content", self.ROLES, 1)
+        
+        assert len(feedback) == 5
+        assert provider.max_active == 1
+    
+    def test_reviewer_timeout_marks_straggler(self, session_manager):
+        """Test that a hung reviewer times out without blocking the others."""
+        provider = SlowReviewProvider(delay=0.01, hang_roles=["security and privacy expert"])
+        orchestrator = Orchestrator(session_manager, provider, reviewer_timeout=0.5)
+        
+        start = time.monotonic()
+        feedback = orchestrator._run_reviewers("Content", self.ROLES, 1)
+        elapsed = time.monotonic() - start
+        
+        assert elapsed < 2.0
+        assert len(feedback) == 5
+        assert feedback[2].reviewer_role == "Security Reviewer"
+        assert "timed out" in feedback[2].feedback_points[0]
+        assert all("timed out" not in f.feedback_points[0] for i, f in enumerate(feedback) if i != 2)
+    
+    def test_reviewer_timeout_covers_queued_reviewers(self, session_manager):
+        """Test that reviewers waiting in a saturated executor still time out."""
+        executor = ExecutorService(max_workers=1)
+        release = threading.Event()
+        executor.submit(release.wait, 5)  # Another session holds the only worker
+        orchestrator = Orchestrator(
+            session_manager, SlowReviewProvider(delay=0.01), reviewer_timeout=0.3, executor=executor
+        )
+        
+        try:
+            start = time.monotonic()
+            feedback = orchestrator._run_reviewers("Content", self.ROLES, 1)
+            elapsed = time.monotonic() - start
+        finally:
+            release.set()
+            executor.shutdown(wait=True)
+        
+        assert elapsed < 2.0
+        assert len(feedback) == 5
+        assert all("timed out" in f.feedback_points[0] for f in feedback)
+    
+    def test_invalid_max_workers(self, session_manager):
+        """Test that a non-positive worker count is rejected."""
+        with pytest.raises(ValueError):
+            Orchestrator(session_manager, MockLLMProvider(), max_workers=0)
+
+
+class TestSpeculativeRefinement:
+    """Tests for speculative presenter refinement during human review."""
+    
+    ROLES = ["Technical Reviewer", "Clarity Reviewer"]
+    
+    @pytest.fixture
+    def session_manager(self):
+        """Create a session manager with active session."""
+        manager = SessionManager()
+        manager.create_session(
+            session_name="Speculative Session",
+            requirements="Test requirements",
+            selected_roles=self.ROLES,
+            models_config={}
+        )
+        yield manager
+        manager.end_session()
+    
+    @pytest.fixture
+    def presenter_calls(self):
+        """Patch the presenter to record its calls and echo its feedback."""
+        calls = []
+        
+        def generate(**kwargs):
+            calls.append(kwargs)
+            return f"Draft with {len(kwargs['feedback'] or [])} points"
+        
+        with patch('app.core.orchestrator.PresenterAgent') as presenter_class:
+            presenter_class.return_value.generate.side_effect = generate
+            yield calls
+    
+    def _run(self, orchestrator, **kwargs):
+        """Run an iteration with the approved feedback, like the review page."""
+        approved = orchestrator.get_approved_feedback() if orchestrator.can_proceed_to_next_iteration() else None
+        return orchestrator.run_iteration("Test requirements", self.ROLES, approved_feedback=approved, **kwargs)
+    
+    def test_disabled_by_default(self, session_manager, presenter_calls):
+        """Test that no background refinement starts unless enabled."""
+        orchestrator = Orchestrator(session_manager, MockLLMProvider())
+        
+        self._run(orchestrator)
+        
+        assert not orchestrator.has_speculation()
+        assert len(presenter_calls) == 1
+    
+    def test_unmodified_approval_uses_speculation(self, session_manager, presenter_calls):
+        """Test that approving as-is reuses the background refinement."""
+        orchestrator = Orchestrator(session_manager, MockLLMProvider(), speculative_refinement=True)
+        first = self._run(orchestrator)
+        assert orchestrator.has_speculation()
+        
+        orchestrator.approve_current_iteration()
+        orchestrator.speculative_refinement = False  # Don't speculate past iteration 2
+        chunks = []
+        second = self._run(orchestrator, on_stream=lambda stage, chunk: chunks.append((stage, chunk)))
+        
+        points = sum(len(feedback.feedback_points) for feedback in first.reviewer_feedback)
+        assert second.presenter_output == f"Draft with {points} points"
+        assert ("presenter", second.presenter_output) in chunks
+        assert len(presenter_calls) == 2
+        assert presenter_calls[1]['previous_output'] == first.presenter_output
+        assert orchestrator.get_speculation_stats()['hits'] == 1
+    
+    def test_modified_feedback_discards_speculation(self, session_manager, presenter_calls):
+        """Test that edited feedback regenerates instead of using the speculation."""
+        orchestrator = Orchestrator(session_manager, MockLLMProvider(), speculative_refinement=True)
+        self._run(orchestrator)
+        orchestrator._speculation.future.result()
+        
+        orchestrator.approve_current_iteration({"technical_reviewer": ["Only this point"]})
+        orchestrator.speculative_refinement = False
+        second = self._run(orchestrator)
+        
+        assert presenter_calls[2]['feedback'][0] == "Only this point"
+        assert second.presenter_output == f"Draft with {len(presenter_calls[2]['feedback'])} points"
+        assert orchestrator.get_speculation_stats()['hits'] == 0
+        assert orchestrator.get_speculation_stats()['discarded'] == 1
+    
+    def test_regenerate_discards_speculation(self, session_manager, presenter_calls):
+        """Test that regenerating without approval doesn't use the speculation."""
+        orchestrator = Orchestrator(session_manager, MockLLMProvider(), speculative_refinement=True)
+        self._run(orchestrator)
+        
+        orchestrator.reject_current_iteration()
+        assert not orchestrator.has_speculation()
+        second = self._run(orchestrator)
+        
+        assert second.presenter_output == "Draft with 0 points"
+        assert orchestrator.get_speculation_stats()['hits'] == 0
+        assert orchestrator.get_speculation_stats()['discarded'] == 1
+    
+    def test_failed_speculation_falls_back(self, session_manager, presenter_calls):
+        """Test that a failed background refinement is regenerated in the foreground."""
+        orchestrator = Orchestrator(session_manager, MockLLMProvider(), speculative_refinement=True)
+        self._run(orchestrator)
+        orchestrator._speculation.future.result()
+        orchestrator._speculation.future = orchestrator._speculation_executor.submit(
+            lambda: (_ for _ in ()).throw(RuntimeError("provider down"))
+        )
+        
+        orchestrator.approve_current_iteration()
+        second = self._run(orchestrator)
+        
+        assert second.error is None
+        assert second.presenter_output.startswith("Draft with")
+        assert orchestrator.get_speculation_stats()['failed'] == 1
+    
+    def test_reset_discards_speculation(self, session_manager, presenter_calls):
+        """Test that resetting the orchestrator drops the pending refinement."""
+        orchestrator = Orchestrator(session_manager, MockLLMProvider(), speculative_refinement=True)
+        self._run(orchestrator)
+        
+        orchestrator.reset()
+        
+        assert not orchestrator.has_speculation()
+    
+    def test_close_shuts_down_speculation(self, session_manager, presenter_calls):
+        """Test that ending the session drops the refinement and its thread."""
+        orchestrator = Orchestrator(session_manager, MockLLMProvider(), speculative_refinement=True)
+        self._run(orchestrator)
+        executor = orchestrator._speculation_executor
+        
+        orchestrator.close()
+        
+        assert not orchestrator.has_speculation()
+        assert orchestrator._speculation_executor is None
+        assert executor._shutdown
+        self._run(orchestrator)
+        assert not orchestrator.has_speculation()
 
 
 class TestIterationResult:
@@ -0,0 +1,299 @@
+"""Unit tests for measured max_tokens budgets and truncation handling."""
+
+import pytest
+from unittest.mock import Mock, patch
+from app.agents.presenter import PresenterAgent
+from app.llm.anthropic_provider import AnthropicProvider
+from app.llm.base_provider import TruncatedResponseError
+from app.llm.cache_provider import CachingProvider, ResponseCache
+from app.llm.failover_provider import FailoverProvider
+from app.llm.mock_provider import MockLLMProvider
+from app.llm.ollama_provider import OllamaProvider
+from app.llm.openai_provider import OpenAIProvider
+from app.llm.output_budget import OutputLengthTracker
+
+
+KEY = ('presenter', 'mockllm', 'mock-model')
+
+
+def _json_response(status_code, data):
+    """Build a fake HTTP response with a JSON body."""
+    response = Mock()
+    response.status_code = status_code
+    response.json.return_value = data
+    response.text = str(data)
+    return response
+
+
+class BudgetedProvider(MockLLMProvider):
+    """Mock provider that truncates responses longer than max_tokens."""
+    
+    def __init__(self, output_tokens: int = 100, **kwargs):
+        super().__init__(**kwargs)
+        self.output_tokens = output_tokens
+        self.requests = []
+    
+    def generate_text(self, prompt: str, **kwargs) -> str:
+        self.requests.append(dict(kwargs))
+        max_tokens = kwargs['max_tokens']
+        if self.output_tokens > max_tokens and kwargs.get('fail_on_truncation'):
+            raise TruncatedResponseError("truncated", max_tokens=max_tokens)
+        return "abcd" * min(self.output_tokens, max_tokens)
+
+
+class FlooredProvider(BudgetedProvider):
+    """Budgeted provider that, like Gemini, never sends less than a floor."""
+    
+    def __init__(self, floor: int, **kwargs):
+        super().__init__(**kwargs)
+        self.floor = floor
+    
+    def generate_text(self, prompt: str, **kwargs) -> str:
+        self.requests.append(dict(kwargs))
+        max_tokens = max(kwargs['max_tokens'], self.floor)
+        if self.output_tokens > max_tokens and kwargs.get('fail_on_truncation'):
+            partial = "abcd" * max_tokens
+            raise TruncatedResponseError("truncated", max_tokens=max_tokens, partial_text=partial)
+        return "abcd" * min(self.output_tokens, max_tokens)
+
+
+class TestOutputLengthTracker:
+    """Tests for OutputLengthTracker."""
+    
+    def test_ceiling_until_enough_samples(self):
+        """Test that the configured budget is used until outputs are measured."""
+        tracker = OutputLengthTracker(min_samples=3)
+        tracker.record(KEY, 400)
+        tracker.record(KEY, 500)
+        
+        assert tracker.max_tokens(KEY, 12000) == 12000
+    
+    def test_percentile_with_headroom(self):
+        """Test that the budget covers the percentile plus headroom."""
+        tracker = OutputLengthTracker(percentile=0.95, headroom=1.25, min_samples=3)
+        for tokens in (400, 500, 800, 600):
+            tracker.record(KEY, tokens)
+        
+        assert tracker.max_tokens(KEY, 12000) == 1000
+        assert tracker.max_tokens(KEY, 900) == 900
+        assert tracker.max_tokens(('reviewer', 'mockllm', 'mock-model'), 5000) == 5000
+    
+    def test_min_tokens_floor(self):
+        """Test that tiny outputs don't shrink the budget below min_tokens."""
+        tracker = OutputLengthTracker(min_samples=1, min_tokens=256)
+        tracker.record(KEY, 10)
+        
+        assert tracker.max_tokens(KEY, 5000) == 256
+    
+    def test_truncation_raises_budget(self):
+        """Test that a truncated output pushes later budgets up."""
+        tracker = OutputLengthTracker(percentile=0.5, headroom=1.0, min_samples=2)
+        tracker.record(KEY, 300)
+        tracker.record(KEY, 300)
+        for _ in range(3):
+            tracker.record_truncation(KEY, 2000)
+        
+        assert tracker.max_tokens(KEY, 12000) == 2000
+        assert tracker.get_stats()["presenter@mockllm/mock-model"]['truncations'] == 3
+    
+    def test_retry_budget(self):
+        """Test that retries grow the budget up to the ceiling."""
+        tracker = OutputLengthTracker()
+        
+        assert tracker.retry_budget(1000, 12000) == 2000
+        assert tracker.retry_budget(8000, 12000) == 12000
+        assert tracker.retry_budget(12000, 12000) is None
+    
+    def test_invalid_settings(self):
+        """Test that out-of-range settings are rejected."""
+        with pytest.raises(ValueError):
+            OutputLengthTracker(percentile=1.5)
+        with pytest.raises(ValueError):
+            OutputLengthTracker(headroom=0.5)
+
+
+class TestDynamicMaxTokens:
+    """Tests for measured budgets in agent generation."""
+    
+    def test_budget_shrinks_after_measurements(self):
+        """Test that the agent requests the measured budget once known."""
+        provider = BudgetedProvider(output_tokens=100)
+        tracker = OutputLengthTracker(min_samples=2, min_tokens=64)
+        presenter = PresenterAgent(provider, output_tracker=tracker)
+        
+        for _ in range(3):
+            presenter.generate("Build a payment service")
+        
+        assert [request['max_tokens'] for request in provider.requests] == [12000, 12000, 125]
+        assert provider.requests[0]['fail_on_truncation'] is False
+        assert provider.requests[2]['fail_on_truncation'] is True
+    
+    def test_truncated_response_is_retried_larger(self):
+        """Test that a truncation at the measured budget is retried with more tokens."""
+        provider = BudgetedProvider(output_tokens=100)
+        tracker = OutputLengthTracker(min_samples=2, min_tokens=64)
+        presenter = PresenterAgent(provider, output_tracker=tracker)
+        presenter.generate("Build a payment service")
+        presenter.generate("Build a payment service")
+        
+        provider.output_tokens = 300
+        result = presenter.generate("Build a payment service")
+        
+        assert [request['max_tokens'] for request in provider.requests[2:]] == [125, 250, 500]
+        assert len(result) == 1200
+        assert tracker.get_stats()["presenter@budgeted/"]['truncations'] == 2
+    
+    def test_retry_grows_from_provider_floor(self):
+        """Test that a retry is sized from the budget the provider actually sent."""
+        provider = FlooredProvider(floor=3000, output_tokens=100)
+        tracker = OutputLengthTracker(min_samples=2, min_tokens=64)
+        presenter = PresenterAgent(provider, output_tracker=tracker)
+        presenter.generate("Build a payment service")
+        presenter.generate("Build a payment service")
+        
+        provider.output_tokens = 4000
+        presenter.generate("Build a payment service")
+        
+        assert [request['max_tokens'] for request in provider.requests[2:]] == [125, 6000]
+        assert tracker._samples[("presenter", "floored", "")][-2] == 3000
+    
+    def test_floor_at_ceiling_returns_partial_output(self):
+        """Test that a floor reaching the ceiling doesn't resend the same request."""
+        provider = FlooredProvider(floor=12000, output_tokens=100)
+        tracker = OutputLengthTracker(min_samples=2, min_tokens=64)
+        presenter = PresenterAgent(provider, output_tracker=tracker)
+        presenter.generate("Build a payment service")
+        presenter.generate("Build a payment service")
+        
+        provider.output_tokens = 20000
+        result = presenter.generate("Build a payment service")
+        
+        assert [request['max_tokens'] for request in provider.requests[2:]] == [125]
+        assert len(result) == 4 * 12000
+    
+    def test_truncation_at_ceiling_propagates(self):
+        """Test that a response truncated at the configured max_tokens is not retried."""
+        provider = Mock()
+        provider.get_provider_name.return_value = 'openai'
+        provider.model = 'gpt-4o'
+        provider.generate_text.side_effect = TruncatedResponseError("no output", max_tokens=12000)
+        presenter = PresenterAgent(provider, output_tracker=OutputLengthTracker())
+        
+        with pytest.raises(Exception, match="no output"):
+            presenter.generate("Build a payment service")
+        
+        assert provider.generate_text.call_count == 1
+    
+    def test_streaming_keeps_ceiling(self):
+        """Test that streamed calls are measured but not resized."""
+        provider = BudgetedProvider(output_tokens=100)
+        tracker = OutputLengthTracker(min_samples=1)
+        presenter = PresenterAgent(provider, output_tracker=tracker)
+        
+        with patch.object(provider, 'stream_text', return_value=iter(["chunk"])) as stream:
+            presenter.generate("Build a payment service", on_chunk=lambda chunk: None)
+        
+        assert stream.call_args.kwargs['max_tokens'] == 12000
+        assert tracker.get_stats()["presenter@budgeted/"]['samples'] == 1
+    
+    def test_disabled(self):
+        """Test that dynamic_max_tokens=False passes max_tokens through."""
+        provider = BudgetedProvider(output_tokens=100)
+        presenter = PresenterAgent(provider, dynamic_max_tokens=False)
+        
+        presenter.generate("Build a payment service")
+        
+        assert provider.requests[0] == {'temperature': 0.7, 'max_tokens': 12000}
+
+
+class TestTruncationDetection:
+    """Tests for providers reporting truncated responses."""
+    
+    def test_openai_finish_reason_length(self):
+        """Test that OpenAI raises on finish_reason 'length' only when asked."""
+        provider = OpenAIProvider(api_key="test-key")
+        data = {"choices": [{"message": {"content": "Partial"}, "finish_reason": "length"}]}
+        session = Mock()
+        session.post.return_value = _json_response(200, data)
+        
+        with patch.object(provider, '_get_session', return_value=session):
+            assert provider.generate_text("Hello", max_tokens=50) == "Partial"
+            with pytest.raises(TruncatedResponseError) as error:
+                provider.generate_text("Hello", max_tokens=50, fail_on_truncation=True)
+        
+        assert error.value.max_tokens == 50
+        assert error.value.partial_text == "Partial"
+        assert session.post.call_count == 2
+    
+    def test_anthropic_stop_reason_max_tokens(self):
+        """Test that Anthropic raises on stop_reason 'max_tokens' when asked."""
+        provider = AnthropicProvider(api_key="test-key")
+        data = {"content": [{"text": "Partial"}], "stop_reason": "max_tokens"}
+        
+        with pytest.raises(TruncatedResponseError):
+            provider._extract_text(data, fail_on_truncation=True, max_tokens=100)
+        assert provider._extract_text({"content": [{"text": "Done"}], "stop_reason": "end_turn"}, True) == "Done"
+    
+    def test_ollama_done_reason_length(self):
+        """Test that Ollama raises on done_reason 'length' when asked."""
+        provider = OllamaProvider()
+        response = _json_response(200, {"response": "Partial", "done_reason": "length"})
+        
+        assert provider._handle_generate_response(response, "llama3") == "Partial"
+        with pytest.raises(TruncatedResponseError):
+            provider._handle_generate_response(response, "llama3", fail_on_truncation=True)
+    
+    @patch('httpx.Client')
+    def test_gemini_finish_reason_max_tokens(self, mock_client_class):
+        """Test that Gemini raises on MAX_TOKENS with partial output when asked."""
+        from app.llm.gemini_provider import GeminiProvider
+        provider = GeminiProvider(api_key="test-key", min_output_tokens=256)
+        response = _json_response(200, {
+            "candidates": [{"content": {"parts": [{"text": "Partial"}]}, "finishReason": "MAX_TOKENS"}]
+        })
+        
+        assert provider._handle_generate_response(response, "gemini-2.5-flash") == "Partial"
+        with pytest.raises(TruncatedResponseError):
+            provider._handle_generate_response(response, "gemini-2.5-flash", fail_on_truncation=True)
+        assert provider._build_request("Hello", max_tokens=500)[1]["generationConfig"]["maxOutputTokens"] == 500
+    
+    @patch('httpx.Client')
+    def test_gemini_truncation_reports_floored_budget(self, mock_client_class):
+        """Test that Gemini's truncation error carries the budget it actually sent."""
+        from app.llm.gemini_provider import GeminiProvider
+        provider = GeminiProvider(api_key="test-key")
+        mock_client = Mock()
+        mock_client.post.return_value = _json_response(200, {
+            "candidates": [{"content": {"parts": [{"text": "Partial"}]}, "finishReason": "MAX_TOKENS"}]
+        })
+        provider.client = mock_client
+        
+        with pytest.raises(TruncatedResponseError) as error:
+            provider.generate_text("Hello", max_tokens=500, fail_on_truncation=True)
+        
+        assert error.value.max_tokens == GeminiProvider.MIN_OUTPUT_TOKENS
+    
+    def test_failover_does_not_fail_over_on_truncation(self):
+        """Test that truncation reaches the caller instead of the next provider."""
+        primary = Mock(spec=MockLLMProvider)
+        primary.api_key = None
+        primary.config = {}
+        primary.generate_text.side_effect = TruncatedResponseError("truncated")
+        secondary = MockLLMProvider()
+        failover = FailoverProvider([primary, secondary])
+        
+        with pytest.raises(TruncatedResponseError):
+            failover.generate_text("Hello", fail_on_truncation=True)
+        
+        assert secondary.get_call_count() == 0
+        assert failover.breakers[0].state == "closed"
+    
+    def test_cache_key_ignores_budget_of_checked_responses(self):
+        """Test that complete responses are cached independently of max_tokens."""
+        provider = CachingProvider(MockLLMProvider(), cache=ResponseCache())
+        
+        checked = [provider.cache_key("Hello", max_tokens=size, fail_on_truncation=True) for size in (500, 900)]
+        unchecked = [provider.cache_key("Hello", max_tokens=size) for size in (500, 900)]
+        
+        assert checked[0] == checked[1]
+        assert unchecked[0] != unchecked[1]
@@ -178,3 +178,26 @@ class TestProviderFactory:
         with pytest.raises(ValueError, match="API key required"):
             ProviderFactory.create_provider('huggingface')
 
+    
+    def test_create_failover_provider(self):
+        """Test creating a failover chain from provider configurations."""
+        from app.llm.failover_provider import FailoverProvider
+        
+        provider = ProviderFactory.create_failover_provider(
+            [
+                {'provider': 'anthropic', 'api_key': 'test-key'},
+                {'provider': 'mock'},
+            ],
+            failure_threshold=2
+        )
+        
+        assert isinstance(provider, FailoverProvider)
+        assert isinstance(provider.providers[0], AnthropicProvider)
+        assert isinstance(provider.providers[1], MockLLMProvider)
+        assert provider.breakers[0].failure_threshold == 2
+        assert provider.get_provider_name() == "failover(anthropic>mockllm)"
+    
+    def test_create_failover_provider_empty_chain(self):
+        """Test that an empty failover chain is rejected."""
+        with pytest.raises(ValueError, match="at least one provider"):
+            ProviderFactory.create_failover_provider([])
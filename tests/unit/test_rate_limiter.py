@@ -0,0 +1,175 @@
+"""Unit tests for the client-side rate limiter."""
+
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+from app.llm.rate_limiter import (
+    RateLimiter,
+    TokenBucket,
+    estimate_tokens,
+    get_rate_limiter,
+)
+from app.llm.openai_provider import OpenAIProvider
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+
+class TestTokenBucket:
+    """Tests for TokenBucket reservations."""
+    
+    def test_burst_then_wait(self):
+        """Test that a full bucket admits a burst and then spaces requests."""
+        clock = FakeClock()
+        bucket = TokenBucket(capacity=2, per_minute=60, clock=clock)
+        
+        assert bucket.reserve(1) == 0.0
+        assert bucket.reserve(1) == 0.0
+        assert bucket.reserve(1) == pytest.approx(1.0)
+    
+    def test_reservations_queue_in_order(self):
+        """Test that each later reservation waits longer (FIFO admission)."""
+        clock = FakeClock()
+        bucket = TokenBucket(capacity=1, per_minute=60, clock=clock)
+        bucket.reserve(1)
+        
+        waits = [bucket.reserve(1) for _ in range(3)]
+        
+        assert waits == pytest.approx([1.0, 2.0, 3.0])
+    
+    def test_refill_over_time(self):
+        """Test that capacity is restored as time passes."""
+        clock = FakeClock()
+        bucket = TokenBucket(capacity=1, per_minute=60, clock=clock)
+        bucket.reserve(1)
+        
+        clock.now = 1.0
+        
+        assert bucket.reserve(1) == 0.0
+    
+    def test_oversized_cost_is_clamped(self):
+        """Test that a cost above capacity waits for a full bucket, not forever."""
+        clock = FakeClock()
+        bucket = TokenBucket(capacity=100, per_minute=100, clock=clock)
+        bucket.reserve(100)
+        
+        assert bucket.reserve(10_000) == pytest.approx(60.0)
+
+
+class TestRateLimiter:
+    """Tests for RateLimiter."""
+    
+    def test_rpm_limit_sleeps_before_request(self):
+        """Test that acquire blocks once the request budget is spent."""
+        clock = FakeClock()
+        sleep = Mock()
+        limiter = RateLimiter(rpm=2, clock=clock, sleep=sleep)
+        
+        limiter.acquire()
+        limiter.acquire()
+        waited = limiter.acquire()
+        
+        assert waited == pytest.approx(30.0)
+        sleep.assert_called_once_with(waited)
+        assert limiter.get_stats()['throttled_requests'] == 1
+    
+    def test_tpm_limit_uses_token_estimate(self):
+        """Test that large prompts are throttled by the token budget."""
+        clock = FakeClock()
+        sleep = Mock()
+        limiter = RateLimiter(tpm=100, clock=clock, sleep=sleep)
+        
+        assert limiter.acquire(tokens=80) == 0.0
+        assert limiter.acquire(tokens=80) == pytest.approx(36.0)
+    
+    def test_unlimited_never_waits(self):
+        """Test that a limiter without budgets admits everything."""
+        sleep = Mock()
+        limiter = RateLimiter(sleep=sleep)
+        
+        for _ in range(100):
+            limiter.acquire(tokens=1000)
+        
+        sleep.assert_not_called()
+    
+    def test_async_acquire_awaits(self):
+        """Test that aacquire waits with asyncio.sleep."""
+        clock = FakeClock()
+        sleep = Mock()
+        limiter = RateLimiter(rpm=1, clock=clock, sleep=sleep)
+        limiter.acquire()
+        
+        with patch('app.llm.rate_limiter.asyncio.sleep', new=AsyncMock()) as mock_sleep:
+            waited = asyncio.run(limiter.aacquire())
+        
+        assert waited == pytest.approx(60.0)
+        mock_sleep.assert_awaited_once_with(waited)
+        sleep.assert_not_called()
+    
+    def test_invalid_budget(self):
+        """Test that non-positive budgets are rejected."""
+        with pytest.raises(ValueError):
+            RateLimiter(rpm=0)
+    
+    def test_estimate_tokens(self):
+        """Test the rough four-characters-per-token estimate."""
+        assert estimate_tokens("") == 0
+        assert estimate_tokens("abcdefgh") == 2
+        assert estimate_tokens("abcdefghi") == 3
+
+
+class TestSharedRateLimiters:
+    """Tests for the process-wide limiter registry."""
+    
+    def test_same_provider_and_key_share_limiter(self):
+        """Test that limiters are shared per provider and credential."""
+        first = get_rate_limiter("gemini", "key-a", rpm=15)
+        second = get_rate_limiter("gemini", "key-a", rpm=15)
+        other_key = get_rate_limiter("gemini", "key-b", rpm=15)
+        other_provider = get_rate_limiter("openai", "key-a", rpm=15)
+        
+        assert first is second
+        assert first is not other_key
+        assert first is not other_provider
+    
+    def test_no_budget_means_no_limiter(self):
+        """Test that providers without budgets are not limited."""
+        assert get_rate_limiter("openai", "key", rpm=None, tpm=None) is None
+    
+    def test_provider_instances_share_limiter(self):
+        """Test that two sessions' providers with one key share a budget."""
+        first = OpenAIProvider(api_key="shared-key", rpm=60)
+        second = OpenAIProvider(api_key="shared-key", rpm=60)
+        
+        assert first._get_rate_limiter() is second._get_rate_limiter()
+    
+    def test_gemini_defaults_to_free_tier_rpm(self):
+        """Test that Gemini is limited to 15 requests per minute by default."""
+        from app.llm.gemini_provider import GeminiProvider
+        
+        provider = GeminiProvider(api_key="test-key")
+        
+        assert provider._get_rate_limiter().rpm == 15
+    
+    def test_provider_waits_before_sending(self):
+        """Test that generate_text queues on the limiter before each request."""
+        provider = OpenAIProvider(api_key="test-key", rpm=1)
+        limiter = provider._get_rate_limiter()
+        response = Mock(status_code=200)
+        response.json.return_value = {"choices": [{"message": {"content": "Hi"}}]}
+        
+        with patch.object(limiter, '_sleep') as mock_sleep, \
+             patch('app.llm.openai_provider.requests.Session.post', return_value=response) as mock_post:
+            provider.generate_text("one")
+            provider.generate_text("two")
+        
+        assert mock_post.call_count == 2
+        mock_sleep.assert_called_once()
+        assert mock_sleep.call_args.args[0] == pytest.approx(60.0, abs=1.0)
@@ -1,6 +1,8 @@
 """Unit tests for report generation utilities."""
 
 import pytest
+import random
+import string
 from app.utils.report_generator import (
     aggregate_reviewer_feedback,
     generate_final_report,
@@ -8,7 +10,9 @@ from app.utils.report_generator import (
     export_session_to_dict,
     _extract_severity,
     _find_common_issues,
-    _find_unique_issues
+    _find_unique_issues,
+    _find_consensus,
+    cluster_issues
 )
 from app.models.feedback import Feedback
 from app.core.orchestrator import IterationResult
@@ -321,6 +325,83 @@ class TestHelperFunctions:
             assert _extract_severity(text) == expected
 
 
+class TestIssueClustering:
+    """Test MinHash/LSH clustering of reviewer findings."""
+    
+    def _feedback(self):
+        return [
+            Feedback(
+                reviewer_role="Technical Reviewer",
+                feedback_points=[
+                    "[Severity: HIGH] Security vulnerability in authentication",
+                    "[Severity: MEDIUM] Missing error handling for API calls"
+                ],
+                iteration=1
+            ),
+            Feedback(
+                reviewer_role="Security Reviewer",
+                feedback_points=[
+                    "[Severity: CRITICAL] Security vulnerability found in the authentication flow",
+                    "[Severity: LOW] Add a glossary of terms"
+                ],
+                iteration=1
+            ),
+            Feedback(
+                reviewer_role="Clarity Reviewer",
+                feedback_points=["[Severity: MEDIUM] Authentication security vulnerability must be fixed"],
+                iteration=1
+            )
+        ]
+    
+    def test_cluster_issues(self):
+        """Test that clusters track reviewers and the highest severity."""
+        issues = [
+            {"text": "[Severity: HIGH] Security vulnerability in authentication", "reviewer": "Technical", "severity": "HIGH"},
+            {"text": "[Severity: CRITICAL] Security vulnerability found in authentication", "reviewer": "Security", "severity": "CRITICAL"},
+            {"text": "[Severity: LOW] Security vulnerability in authentication", "reviewer": "Technical", "severity": "LOW"}
+        ]
+        
+        clusters = cluster_issues(issues)
+        
+        assert len(clusters) == 1
+        assert clusters[0].reviewers == ["Technical", "Security"]
+        assert clusters[0].severity == "CRITICAL"
+        assert clusters[0].representative == issues[0]["text"]
+    
+    def test_reworded_issues_are_common(self):
+        """Test that the same issue in different words counts as common."""
+        result = aggregate_reviewer_feedback(self._feedback())
+        
+        assert result['common_issues'] == ["[Severity: HIGH] Security vulnerability in authentication"]
+        assert result['unique_issues'] == [
+            "[Severity: MEDIUM] Missing error handling for API calls",
+            "[Severity: LOW] Add a glossary of terms"
+        ]
+    
+    def test_consensus_requires_every_reviewer(self):
+        """Test that consensus items were raised by all reviewers."""
+        feedback = self._feedback()
+        
+        assert _find_consensus(feedback) == ["[Severity: HIGH] Security vulnerability in authentication"]
+        assert _find_consensus(feedback[:1]) == []
+        
+        feedback[2].feedback_points = ["[Severity: LOW] Tone is fine"]
+        assert _find_consensus(feedback) == []
+    
+    def test_scales_to_hundreds_of_findings(self):
+        """Test that a long session's findings cluster correctly."""
+        rng = random.Random(0)
+        issues = []
+        for _ in range(300):
+            words = ["".join(rng.choices(string.ascii_lowercase, k=8)) for _ in range(4)]
+            issues.append({"text": " ".join(words), "reviewer": "Technical", "severity": "HIGH"})
+            issues.append({"text": " ".join(reversed(words)), "reviewer": "Security", "severity": "HIGH"})
+        
+        common = _find_common_issues(issues)
+        
+        assert len(common) == 300
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
 
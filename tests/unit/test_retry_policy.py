@@ -0,0 +1,252 @@
+"""Unit tests for the shared retry policy."""
+
+import asyncio
+import json
+import random
+import pytest
+from email.utils import formatdate
+from unittest.mock import AsyncMock, Mock, patch
+from app.llm.retry_policy import RetryPolicy, parse_duration, parse_retry_after
+from app.llm.openai_provider import OpenAIProvider
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+
+def _response(status_code, data=None, headers=None):
+    """Build a fake HTTP response with a JSON body and headers."""
+    response = Mock()
+    response.status_code = status_code
+    response.json.return_value = data or {}
+    response.text = json.dumps(data or {})
+    response.headers = headers or {}
+    return response
+
+
+class TestParseRetryAfter:
+    """Tests for server-provided delay parsing."""
+    
+    def test_retry_after_seconds(self):
+        """Test Retry-After given in seconds."""
+        assert parse_retry_after({'Retry-After': '7'}) == 7.0
+    
+    def test_retry_after_http_date(self):
+        """Test Retry-After given as an HTTP-date."""
+        with patch('app.llm.retry_policy.time.time', return_value=1_700_000_000.0):
+            delay = parse_retry_after({'Retry-After': formatdate(1_700_000_030.0, usegmt=True)})
+        
+        assert delay == pytest.approx(30.0)
+    
+    def test_retry_after_ms(self):
+        """Test the millisecond variant."""
+        assert parse_retry_after({'retry-after-ms': '250'}) == pytest.approx(0.25)
+    
+    def test_openai_reset_durations(self):
+        """Test OpenAI x-ratelimit-reset-* durations; the longest wins."""
+        headers = {'x-ratelimit-reset-requests': '1s', 'x-ratelimit-reset-tokens': '6m0s'}
+        
+        assert parse_retry_after(headers) == pytest.approx(360.0)
+    
+    def test_anthropic_reset_timestamp(self):
+        """Test Anthropic RFC 3339 reset timestamps."""
+        with patch('app.llm.retry_policy.time.time', return_value=1_700_000_000.0):
+            delay = parse_retry_after({'anthropic-ratelimit-requests-reset': '2023-11-14T22:13:40Z'})
+        
+        assert delay == pytest.approx(20.0)
+    
+    def test_past_reset_is_zero(self):
+        """Test that a reset time in the past yields no extra delay."""
+        with patch('app.llm.retry_policy.time.time', return_value=1_700_000_000.0):
+            delay = parse_retry_after({'anthropic-ratelimit-tokens-reset': '2023-11-14T22:00:00Z'})
+        
+        assert delay == 0.0
+    
+    def test_missing_or_unparseable(self):
+        """Test that absent or garbage headers yield None."""
+        assert parse_retry_after(None) is None
+        assert parse_retry_after({}) is None
+        assert parse_retry_after({'Retry-After': 'soon'}) is None
+        assert parse_retry_after(Mock()) is None
+    
+    def test_parse_duration(self):
+        """Test Go/protobuf-style durations."""
+        assert parse_duration("13s") == 13.0
+        assert parse_duration("1m30s") == 90.0
+        assert parse_duration("20ms") == pytest.approx(0.02)
+        assert parse_duration("1.5s") == 1.5
+        assert parse_duration("later") is None
+
+
+class TestRetryPolicy:
+    """Tests for backoff computation, limits and counters."""
+    
+    def test_invalid_limits(self):
+        """Test that out-of-range limits are rejected."""
+        with pytest.raises(ValueError):
+            RetryPolicy(max_attempts=0)
+        with pytest.raises(ValueError):
+            RetryPolicy(base_delay=5, max_delay=1)
+        with pytest.raises(ValueError):
+            RetryPolicy(deadline=0)
+    
+    def test_decorrelated_jitter_bounds(self):
+        """Test that each delay lies between base and 3x the previous, capped."""
+        sleeps = []
+        policy = RetryPolicy(max_attempts=10, base_delay=1, max_delay=20, deadline=None,
+                             sleep=sleeps.append, rng=random.Random(42))
+        state = policy.begin()
+        
+        while state.wait():
+            pass
+        
+        assert len(sleeps) == 9
+        previous = 1
+        for delay in sleeps:
+            assert 1 <= delay <= min(20, previous * 3)
+            previous = delay
+    
+    def test_jitter_spreads_concurrent_callers(self):
+        """Test that callers failing together do not retry in lockstep."""
+        policy = RetryPolicy(max_attempts=3, base_delay=1, max_delay=30, deadline=None,
+                             sleep=lambda delay: None, rng=random.Random(7))
+        
+        first_delays = {round(policy.begin().next_delay(), 6) for _ in range(5)}
+        
+        assert len(first_delays) == 5
+    
+    def test_server_delay_is_lower_bound(self):
+        """Test that a server-provided delay is honored even above max_delay."""
+        sleeps = []
+        policy = RetryPolicy(max_attempts=3, base_delay=1, max_delay=5, deadline=None, sleep=sleeps.append)
+        
+        assert policy.begin().wait(retry_after=12) is True
+        assert sleeps == [12]
+    
+    def test_gives_up_after_max_attempts(self):
+        """Test that only max_attempts - 1 retries are allowed per call."""
+        sleeps = []
+        policy = RetryPolicy(max_attempts=3, base_delay=0, max_delay=0, sleep=sleeps.append)
+        state = policy.begin()
+        
+        assert state.wait() is True
+        assert state.wait() is True
+        assert state.wait() is False
+        assert len(sleeps) == 2
+    
+    def test_deadline_budget(self):
+        """Test that a wait exceeding the remaining deadline is refused."""
+        clock = FakeClock()
+        sleeps = []
+        policy = RetryPolicy(max_attempts=5, base_delay=1, max_delay=1, deadline=10,
+                             clock=clock, sleep=sleeps.append)
+        state = policy.begin()
+        
+        assert state.wait(retry_after=4) is True
+        clock.now = 8.5
+        assert state.remaining == pytest.approx(1.5)
+        assert state.wait(retry_after=4) is False
+        assert sleeps == [4]
+    
+    def test_counters(self):
+        """Test attempts, retries, exhausted and total sleep accounting."""
+        policy = RetryPolicy(max_attempts=2, base_delay=0.5, max_delay=0.5, sleep=lambda delay: None)
+        
+        state = policy.begin()
+        state.wait()
+        state.wait()
+        policy.begin()
+        
+        assert policy.get_stats() == {
+            'calls': 2,
+            'attempts': 3,
+            'retries': 1,
+            'exhausted': 1,
+            'total_sleep': 0.5,
+        }
+    
+    def test_await_wait_does_not_block(self):
+        """Test that the async variant awaits asyncio.sleep."""
+        policy = RetryPolicy(max_attempts=2, base_delay=1, max_delay=1)
+        
+        with patch('app.llm.retry_policy.asyncio.sleep', new=AsyncMock()) as mock_sleep, \
+             patch('app.llm.retry_policy.time.sleep') as mock_time_sleep:
+            assert asyncio.run(policy.begin().await_wait()) is True
+        
+        mock_sleep.assert_awaited_once_with(1)
+        mock_time_sleep.assert_not_called()
+
+
+class TestProviderRetries:
+    """Tests for providers using the shared policy."""
+    
+    def test_provider_policy_from_config(self):
+        """Test that retry kwargs configure the provider's policy."""
+        provider = OpenAIProvider(api_key="test-key", max_retries=5, retry_delay=0.5,
+                                  max_retry_delay=4, retry_deadline=None)
+        
+        assert provider.retry_policy.max_attempts == 5
+        assert provider.retry_policy.base_delay == 0.5
+        assert provider.retry_policy.max_delay == 4
+        assert provider.retry_policy.deadline is None
+    
+    def test_openai_honors_retry_after(self):
+        """Test that a 429 waits at least as long as Retry-After asks."""
+        provider = OpenAIProvider(api_key="test-key")
+        responses = [
+            _response(429, headers={'Retry-After': '7'}),
+            _response(200, {"choices": [{"message": {"content": "Recovered"}}]}),
+        ]
+        
+        with patch('app.llm.openai_provider.requests.Session.post', side_effect=responses):
+            assert provider.generate_text("Hello") == "Recovered"
+        
+        stats = provider.get_retry_stats()
+        assert stats['retries'] == 1
+        assert stats['total_sleep'] >= 7
+    
+    def test_openai_rate_limit_exhausted(self):
+        """Test that persistent 429s surface a rate limit error."""
+        provider = OpenAIProvider(api_key="test-key")
+        
+        with patch('app.llm.openai_provider.requests.Session.post', return_value=_response(429)) as mock_post:
+            with pytest.raises(Exception, match="rate limit exceeded"):
+                provider.generate_text("Hello")
+        
+        assert mock_post.call_count == provider.max_retries
+        assert provider.get_retry_stats()['exhausted'] == 1
+    
+    def test_retry_after_beyond_deadline_fails_fast(self):
+        """Test that a server delay exceeding the deadline is not waited out."""
+        provider = OpenAIProvider(api_key="test-key", retry_deadline=30)
+        
+        with patch('app.llm.openai_provider.requests.Session.post',
+                   return_value=_response(429, headers={'Retry-After': '3600'})) as mock_post:
+            with pytest.raises(Exception, match="rate limit exceeded"):
+                provider.generate_text("Hello")
+        
+        assert mock_post.call_count == 1
+        assert provider.get_retry_stats()['total_sleep'] == 0
+    
+    def test_gemini_retry_delay_from_error_body(self):
+        """Test that Gemini's RetryInfo retryDelay is honored."""
+        from app.llm.gemini_provider import GeminiProvider
+        
+        provider = GeminiProvider(api_key="test-key")
+        response = Mock()
+        response.status_code = 429
+        response.headers = {}
+        response.text = json.dumps({"error": {"code": 429, "details": [
+            {"@type": "type.googleapis.com/google.rpc.RetryInfo", "retryDelay": "13s"}
+        ]}})
+        
+        with pytest.raises(Exception) as excinfo:
+            provider._handle_generate_response(response, "gemini-1.5-flash")
+        
+        assert excinfo.value.retry_after == 13.0
@@ -1,5 +1,8 @@
 """Unit tests for reviewer manager."""
 
+import json
+import threading
+import time
 import pytest
 from unittest.mock import Mock, patch
 from app.orchestration.reviewer_manager import (
@@ -9,6 +12,9 @@ from app.orchestration.reviewer_manager import (
 )
 from app.llm.mock_provider import MockLLMProvider
 from app.agents.reviewer import (
+    ITERATIVE_REVIEW_SCHEMA,
+    REVIEW_SCHEMA,
+    MultiRoleReviewer,
     TechnicalReviewer,
     ClarityReviewer,
     SecurityReviewer,
@@ -16,6 +22,7 @@ from app.agents.reviewer import (
     UXReviewer
 )
 from app.models.feedback import Feedback
+from app.utils.executor_service import ExecutorSaturatedError, ExecutorService
 
 
 class TestReviewerManager:
@@ -146,6 +153,82 @@ class TestReviewerManager:
         assert isinstance(feedback, Feedback)
         assert feedback.reviewer_role == "security_reviewer"  # Agents use snake_case
     
+    def test_reviewer_instances_are_cached(self, reviewer_manager):
+        """Test each role's reviewer agent is created once and reused."""
+        with patch.object(reviewer_manager, '_create_reviewer', wraps=reviewer_manager._create_reviewer) as create:
+            reviewer_manager.run_reviewers("Content", ["Technical Reviewer", "Clarity Reviewer"], 1)
+            reviewer_manager.run_reviewers("Content", ["Technical Reviewer", "Clarity Reviewer"], 2)
+        
+        assert create.call_count == 2
+        assert isinstance(reviewer_manager._get_reviewer("Technical Reviewer"), TechnicalReviewer)
+    
+    def test_parallel_uses_given_executor(self, mock_provider):
+        """Test parallel reviews are submitted to the configured executor."""
+        executor = Mock(wraps=ExecutorService(max_workers=2))
+        manager = ReviewerManager(mock_provider, executor=executor)
+        
+        feedback = manager.run_reviewers("Content", ["Technical Reviewer", "Security Reviewer"], 1)
+        
+        assert executor.submit.call_count == 2
+        assert len(feedback) == 2
+    
+    def test_saturated_executor_reports_failure(self, mock_provider):
+        """Test a rejected submission is reported as that role's failure."""
+        executor = Mock()
+        executor.submit.side_effect = ExecutorSaturatedError("Reviewer executor saturated")
+        manager = ReviewerManager(mock_provider, executor=executor)
+        
+        feedback = manager.run_reviewers("Content", ["Technical Reviewer", "Security Reviewer"], 1)
+        
+        assert feedback["Technical Reviewer"] == "Review failed: Reviewer executor saturated"
+    
+    def test_timeout_marks_late_reviewers(self):
+        """Test reviewers still running at the timeout are marked timed out."""
+        class SlowSecurityProvider(MockLLMProvider):
+            def generate_text(self, prompt, **kwargs):
+                if "security and privacy expert" in prompt:
+                    time.sleep(1.0)
+                return super().generate_text(prompt, **kwargs)
+        
+        for parallel in (True, False):
+            manager = ReviewerManager(SlowSecurityProvider())
+            feedback = manager.run_reviewers(
+                "Content", ["Technical Reviewer", "Security Reviewer"], 1, parallel=parallel, timeout=0.2
+            )
+            
+            assert list(feedback) == ["Technical Reviewer", "Security Reviewer"]
+            assert feedback["Security Reviewer"] == "Review timed out after 0.2s"
+            assert manager.timed_out_roles == ["Security Reviewer"]
+            assert "Technical Reviewer" in manager.last_feedback
+    
+    def test_timeout_covers_waiting_for_queue_slot(self, mock_provider):
+        """Test that a full shared queue can't hold the fan-out past its budget."""
+        executor = ExecutorService(max_workers=1, max_queue=0, submit_timeout=60)
+        release = threading.Event()
+        executor.submit(release.wait, 5)  # Another session holds the only slot
+        manager = ReviewerManager(mock_provider, executor=executor)
+        
+        try:
+            start = time.monotonic()
+            feedback = manager.run_reviewers(
+                "Content", ["Technical Reviewer", "Security Reviewer"], 1, timeout=0.3
+            )
+            elapsed = time.monotonic() - start
+        finally:
+            release.set()
+            executor.shutdown(wait=True)
+        
+        assert elapsed < 2.0
+        assert feedback["Technical Reviewer"] == "Review timed out after 0.3s"
+        assert manager.timed_out_roles == ["Technical Reviewer", "Security Reviewer"]
+    
+    def test_exhausted_timeout_skips_reviews(self, reviewer_manager):
+        """Test a spent budget marks every reviewer without running any."""
+        feedback = reviewer_manager.run_reviewers("Content", ["Technical Reviewer"], 1, timeout=0)
+        
+        assert feedback == {"Technical Reviewer": "Review timed out after 0s"}
+        assert reviewer_manager.last_feedback == {}
+    
     def test_execute_single_reviewer_unknown_role(self, reviewer_manager):
         """Test executing reviewer with unknown role."""
         # Should use base ReviewerAgent
@@ -349,3 +432,194 @@ class TestReviewerManagerErrorHandling:
         # Should have results for all reviewers (some with errors)
         assert len(result) == 3
 
+
+
+class TestCombinedReview:
+    """Tests for the single-call multi-role review mode."""
+    
+    ROLES = ["Technical Reviewer", "Security Reviewer"]
+    
+    def _combined_response(self):
+        return json.dumps({
+            "Technical Reviewer": {
+                "verdict": "NEEDS REVISION",
+                "findings": ["[Severity: HIGH] The caching layer has no eviction policy"],
+                "improvements": ["Add an LRU bound"]
+            },
+            "Security Reviewer": {
+                "verdict": "APPROVE",
+                "findings": ["[Severity: LOW] Tokens should be rotated more frequently"],
+                "improvements": []
+            }
+        })
+    
+    def test_single_call_split_by_role(self):
+        """Test that one call yields feedback for every role."""
+        provider = MockLLMProvider()
+        provider.generate_text = Mock(return_value="```json\n" + self._combined_response() + "\n```")
+        manager = ReviewerManager(provider, combined=True)
+        
+        result = manager.run_reviewers("Design document", self.ROLES, 1)
+        
+        assert provider.generate_text.call_count == 1
+        assert set(result) == set(self.ROLES)
+        assert "no eviction policy" in result["Technical Reviewer"]
+        assert "REVIEWER: technical_reviewer" in result["Technical Reviewer"]
+        assert "rotated more frequently" in result["Security Reviewer"]
+    
+    def test_prompt_lists_roles_and_previous_feedback(self):
+        """Test that the combined prompt covers every role and its history."""
+        provider = MockLLMProvider()
+        provider.generate_text = Mock(return_value=self._combined_response())
+        manager = ReviewerManager(provider, combined=True)
+        
+        manager.run_reviewers(
+            "Design document", self.ROLES, 2,
+            previous_feedback={"Security Reviewer": "Encrypt data at rest"}
+        )
+        
+        prompt = provider.generate_text.call_args.args[0]
+        kwargs = provider.generate_text.call_args.kwargs
+        assert "### Technical Reviewer" in prompt and "### Security Reviewer" in prompt
+        assert "Encrypt data at rest" in prompt
+        assert prompt.startswith(kwargs['cacheable_prefix'])
+    
+    def test_falls_back_on_unparseable_output(self):
+        """Test that invalid JSON falls back to per-role calls."""
+        provider = MockLLMProvider()
+        provider.generate_text = Mock(return_value="FINDINGS:\n1. Not JSON at all, sorry")
+        manager = ReviewerManager(provider, combined=True)
+        
+        result = manager.run_reviewers("Design document", self.ROLES, 1, parallel=False)
+        
+        assert provider.generate_text.call_count == 3
+        assert set(result) == set(self.ROLES)
+    
+    def test_falls_back_on_missing_role(self):
+        """Test that a response missing a role falls back to per-role calls."""
+        provider = MockLLMProvider()
+        partial = json.dumps({"Technical Reviewer": {"findings": ["[Severity: LOW] Fine overall really"]}})
+        provider.generate_text = Mock(return_value=partial)
+        manager = ReviewerManager(provider, combined=True)
+        
+        manager.run_reviewers("Design document", self.ROLES, 1, parallel=False)
+        
+        assert provider.generate_text.call_count == 3
+    
+    def test_max_tokens_capped_at_model_output_limit(self):
+        """Test that the combined call never asks for more than the model allows."""
+        provider = Mock()
+        provider.get_provider_name.return_value = 'openai'
+        provider.model = 'gpt-4-turbo'
+        provider.generate_text.return_value = self._combined_response()
+        reviewers = {role: TechnicalReviewer(provider) for role in self.ROLES}
+        
+        MultiRoleReviewer(provider, reviewers).review("Design document", 1)
+        
+        assert provider.generate_text.call_args.kwargs['max_tokens'] == 4096
+    
+    def test_prompt_fitted_to_budget(self):
+        """Test that previous feedback is shortened before the content to fit the budget."""
+        provider = MockLLMProvider()
+        provider.generate_text = Mock(return_value=self._combined_response())
+        reviewers = {role: TechnicalReviewer(provider) for role in self.ROLES}
+        old_points = "\n".join(f"- Old point {i} about missing error handling" for i in range(200))
+        reviewer = MultiRoleReviewer(provider, reviewers, prompt_budget=1500)
+        
+        reviewer.review("Full design document", 2, previous_feedback={"Security Reviewer": old_points})
+        
+        prompt = provider.generate_text.call_args.args[0]
+        assert "Full design document" in prompt
+        assert "Old point 0" in prompt
+        assert "Old point 199" not in prompt
+        assert reviewer.last_budget_report.fits
+    
+    def test_iterative_schema_for_roles_with_history(self):
+        """Test that roles with previous feedback get the tracking schema."""
+        provider = MockLLMProvider()
+        response = json.loads(self._combined_response())
+        response["Security Reviewer"].update({"fixed": ["Encryption added"], "partially_fixed": [], "not_addressed": []})
+        provider.generate_text = Mock(return_value=json.dumps(response))
+        reviewers = {role: TechnicalReviewer(provider) for role in self.ROLES}
+        
+        result = MultiRoleReviewer(provider, reviewers).review(
+            "Design document", 2, previous_feedback={"Security Reviewer": "Encrypt data at rest"}
+        )
+        
+        schema = provider.generate_text.call_args.kwargs['response_schema']
+        assert schema['properties']["Security Reviewer"] == ITERATIVE_REVIEW_SCHEMA
+        assert schema['properties']["Technical Reviewer"] == REVIEW_SCHEMA
+        assert '"not_addressed"' in provider.generate_text.call_args.args[0]
+        assert result["Security Reviewer"].improvement_tracking['fixed'] == ["Encryption added"]
+    
+    def test_failed_combined_call_spends_fallback_budget(self):
+        """Test that the per-role fallback only gets the time the combined call left."""
+        provider = MockLLMProvider()
+        
+        def slow_generate(prompt, **kwargs):
+            time.sleep(0.7)
+            return "Not JSON"
+        
+        provider.generate_text = Mock(side_effect=slow_generate)
+        manager = ReviewerManager(provider, combined=True)
+        
+        start = time.monotonic()
+        result = manager.run_reviewers("Design document", self.ROLES, 1, timeout=1.0)
+        elapsed = time.monotonic() - start
+        
+        assert elapsed < 1.3
+        assert manager.timed_out_roles == self.ROLES
+        assert result["Technical Reviewer"] == "Review timed out after 1s"
+    
+    def test_combined_call_waits_for_queue_slot_within_budget(self):
+        """Test that a full shared queue times the combined call out at the deadline."""
+        executor = ExecutorService(max_workers=1, max_queue=0, submit_timeout=60)
+        release = threading.Event()
+        executor.submit(release.wait, 5)
+        provider = MockLLMProvider()
+        provider.generate_text = Mock(return_value=self._combined_response())
+        manager = ReviewerManager(provider, executor=executor, combined=True)
+        
+        try:
+            start = time.monotonic()
+            manager.run_reviewers("Design document", self.ROLES, 1, timeout=0.3)
+            elapsed = time.monotonic() - start
+        finally:
+            release.set()
+            executor.shutdown(wait=True)
+        
+        assert elapsed < 2.0
+        assert manager.timed_out_roles == self.ROLES
+        provider.generate_text.assert_not_called()
+    
+    def test_single_role_uses_regular_call(self):
+        """Test that combined mode is skipped when only one role is selected."""
+        provider = MockLLMProvider()
+        provider.generate_text = Mock(return_value="FINDINGS:\n1. A finding that is long enough")
+        manager = ReviewerManager(provider, combined=True)
+        
+        manager.run_reviewers("Design document", ["Technical Reviewer"], 1)
+        
+        assert "### Technical Reviewer" not in provider.generate_text.call_args.args[0]
+
+
+class TestStructuredReviewers:
+    """Tests for structured reviewer output through the manager."""
+    
+    def test_structured_feedback_kept_and_rendered(self):
+        """Test that typed feedback is exposed and its verdict rendered."""
+        provider = MockLLMProvider()
+        provider.generate_text = Mock(return_value=json.dumps({
+            "verdict": "REJECT",
+            "findings": [{"severity": "CRITICAL", "description": "Secrets are stored in plain text"}]
+        }))
+        manager = ReviewerManager(provider, structured_output=True)
+        
+        result = manager.run_reviewers("Design document", ["Security Reviewer"], 1)
+        
+        assert 'response_schema' in provider.generate_text.call_args.kwargs
+        feedback = manager.last_feedback["Security Reviewer"]
+        assert feedback.verdict == "REJECT"
+        assert feedback.findings[0].severity == "CRITICAL"
+        assert "VERDICT: REJECT" in result["Security Reviewer"]
+        assert "[Severity: CRITICAL] Secrets are stored in plain text" in result["Security Reviewer"]
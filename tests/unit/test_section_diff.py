@@ -0,0 +1,178 @@
+"""Unit tests for section-level diff review."""
+
+from unittest.mock import Mock
+from app.orchestration.section_diff import (
+    attribute_point,
+    carry_forward,
+    diff_sections,
+    format_diff_excerpt,
+    merge_carried_points,
+    split_carried_points,
+)
+from app.orchestration.reviewer_manager import ReviewerManager
+from app.llm.mock_provider import MockLLMProvider
+from app.models.feedback import Feedback
+from app.utils.similarity import MinHashLSH
+
+
+PREVIOUS = """# TITLE
+Payment Service
+
+## EXECUTIVE SUMMARY
+The service processes card payments for the online store.
+
+## DETAILED DESCRIPTION
+Payments are authorized through a gateway and settled nightly in batches.
+Refunds are issued through the same gateway.
+
+## KEY REQUIREMENTS
+- Process card payments
+- Support refunds
+
+## CONSTRAINTS
+- PCI compliance is mandatory for stored cardholder data"""
+
+# Only DETAILED DESCRIPTION changed (and whitespace elsewhere)
+CURRENT = PREVIOUS.replace(
+    "Refunds are issued through the same gateway.",
+    "Refunds are issued through the same gateway within five business days."
+).replace("- Support refunds", "-   Support refunds")
+
+
+class TestDiffSections:
+    """Tests for diff_sections and format_diff_excerpt."""
+    
+    def test_changed_and_unchanged_sections(self):
+        """Test edited sections are changed and whitespace-only edits are not."""
+        diff = diff_sections(PREVIOUS, CURRENT)
+        
+        assert [name for name, _ in diff.changed] == ["DETAILED DESCRIPTION"]
+        assert [name for name, _ in diff.unchanged] == [
+            "TITLE", "EXECUTIVE SUMMARY", "KEY REQUIREMENTS", "CONSTRAINTS"
+        ]
+        assert diff.removed == []
+        assert diff.has_changes
+        assert diff.worth_it
+    
+    def test_added_and_removed_sections(self):
+        """Test new sections count as changed and dropped ones as removed."""
+        current = PREVIOUS.replace("## CONSTRAINTS", "## RISKS")
+        diff = diff_sections(PREVIOUS, current)
+        
+        assert [name for name, _ in diff.changed] == ["RISKS"]
+        assert diff.removed == ["CONSTRAINTS"]
+    
+    def test_identical_document_has_no_changes(self):
+        """Test an identical document yields no changes."""
+        diff = diff_sections(PREVIOUS, PREVIOUS)
+        
+        assert not diff.has_changes
+        assert diff.changed_ratio == 0.0
+    
+    def test_large_or_unsectioned_change_not_worth_it(self):
+        """Test rewrites and unsectioned documents fall back to full reviews."""
+        rewritten = "\n\n".join(f"## {name}\nRewritten" for name in ("A", "B", "C"))
+        
+        assert not diff_sections(PREVIOUS, rewritten).worth_it
+        assert not diff_sections("Plain text", "Other plain text").worth_it
+    
+    def test_excerpt_contains_only_changed_text(self):
+        """Test the excerpt has changed sections in full and unchanged ones summarized."""
+        excerpt = format_diff_excerpt(diff_sections(PREVIOUS, CURRENT), previous_iteration=1)
+        
+        assert excerpt.startswith("CHANGES SINCE ITERATION 1")
+        assert "within five business days" in excerpt
+        assert "- EXECUTIVE SUMMARY: The service processes card payments" in excerpt
+        assert "## KEY REQUIREMENTS" not in excerpt
+        assert len(excerpt) < len(CURRENT) + 400
+
+
+class TestCarryForward:
+    """Tests for attributing and carrying forward previous findings."""
+    
+    POINTS = [
+        "[Severity: HIGH] PCI compliance for stored cardholder data is not explained",
+        "[Severity: MEDIUM] Refunds issued through the gateway need a time limit",
+        "[Severity: LOW] The executive summary is too short",
+        "[Severity: LOW] Monitoring and alerting are not covered",
+    ]
+    
+    def test_attribute_point(self):
+        """Test points are attributed by section name or shared wording."""
+        shingler = MinHashLSH()
+        sections = {
+            "EXECUTIVE SUMMARY": shingler.shingles("The service processes card payments"),
+            "CONSTRAINTS": shingler.shingles("PCI compliance is mandatory for stored cardholder data"),
+        }
+        
+        assert attribute_point(self.POINTS[2], sections) == "EXECUTIVE SUMMARY"
+        assert attribute_point(self.POINTS[0], sections) == "CONSTRAINTS"
+        assert attribute_point(self.POINTS[3], sections) is None
+    
+    def test_split_carried_points(self):
+        """Test only points about unchanged sections carry forward."""
+        previous = Feedback(reviewer_role="technical", feedback_points=self.POINTS, iteration=1)
+        
+        carried, recheck = split_carried_points(previous, diff_sections(PREVIOUS, CURRENT))
+        
+        assert carried == [self.POINTS[0], self.POINTS[2]]
+        assert recheck == [self.POINTS[1], self.POINTS[3]]
+    
+    def test_merge_and_carry_forward(self):
+        """Test carried points are merged into the new feedback."""
+        previous = Feedback(reviewer_role="technical", feedback_points=self.POINTS, iteration=1, verdict="REJECT")
+        new = Feedback(reviewer_role="technical", feedback_points=["Refund limit now stated"], iteration=2)
+        
+        merged = merge_carried_points(new, previous, [self.POINTS[0]])
+        copied = carry_forward(previous, 2)
+        
+        assert merged.feedback_points == ["Refund limit now stated", self.POINTS[0]]
+        assert merged.iteration == 2
+        assert copied.feedback_points == self.POINTS
+        assert copied.iteration == 2
+        assert copied.verdict == "REJECT"
+
+
+class TestDiffReview:
+    """Tests for diff review mode in ReviewerManager."""
+    
+    ROLES = ["Technical Reviewer", "Security Reviewer"]
+    
+    def test_second_iteration_reviews_only_changes(self):
+        """Test iteration 2 prompts contain the diff instead of the whole document."""
+        provider = MockLLMProvider()
+        provider.generate_text = Mock(wraps=provider.generate_text)
+        manager = ReviewerManager(provider, diff_review=True)
+        
+        first = manager.run_reviewers(PREVIOUS, self.ROLES, 1)
+        manager.run_reviewers(CURRENT, self.ROLES, 2, previous_feedback=first, previous_content=PREVIOUS)
+        
+        prompts = [call.args[0] for call in provider.generate_text.call_args_list[len(self.ROLES):]]
+        assert len(prompts) == len(self.ROLES)
+        for prompt in prompts:
+            assert "CHANGES SINCE ITERATION 1" in prompt
+            assert "## KEY REQUIREMENTS" not in prompt
+    
+    def test_unchanged_document_carries_feedback_forward(self):
+        """Test an unchanged document reuses feedback without calling the provider."""
+        provider = MockLLMProvider()
+        manager = ReviewerManager(provider, diff_review=True)
+        
+        first = manager.run_reviewers(PREVIOUS, self.ROLES, 1)
+        calls = provider.call_count
+        second = manager.run_reviewers(PREVIOUS, self.ROLES, 2, previous_feedback=first, previous_content=PREVIOUS)
+        
+        assert provider.call_count == calls
+        assert all(manager.last_feedback[role].iteration == 2 for role in self.ROLES)
+        assert set(second) == set(self.ROLES)
+    
+    def test_disabled_by_default(self):
+        """Test full reviews are run unless diff review is enabled."""
+        provider = MockLLMProvider()
+        manager = ReviewerManager(provider)
+        
+        first = manager.run_reviewers(PREVIOUS, self.ROLES, 1)
+        manager.run_reviewers(CURRENT, self.ROLES, 2, previous_feedback=first, previous_content=PREVIOUS)
+        
+        assert "CHANGES SINCE ITERATION" not in provider.last_prompt
+        assert "Process card payments" in provider.last_prompt
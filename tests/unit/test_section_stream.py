@@ -0,0 +1,141 @@
+"""Unit tests for streamed section detection."""
+
+import pytest
+from app.orchestration.section_stream import (
+    SectionStreamParser,
+    format_section_excerpt,
+    merge_section_feedback,
+    MAX_MERGED_POINTS,
+)
+from app.models.feedback import Feedback, Finding
+
+
+DOCUMENT = """# TITLE
+Payment Service
+
+## EXECUTIVE SUMMARY
+A short summary.
+
+## DETAILED DESCRIPTION
+Details here.
+### Background
+Sub-heading stays inside the section.
+
+## KEY REQUIREMENTS
+- Requirement 1"""
+
+
+class TestSectionStreamParser:
+    """Tests for SectionStreamParser."""
+    
+    def _parse_in_chunks(self, text, size):
+        parser = SectionStreamParser()
+        sections = []
+        for start in range(0, len(text), size):
+            sections.extend(parser.feed(text[start:start + size]))
+        return parser, sections
+    
+    def test_sections_complete_when_next_heading_starts(self):
+        """Test that a section is emitted once the following heading arrives."""
+        parser = SectionStreamParser()
+        
+        assert parser.feed("# TITLE\nPayment Service\n") == []
+        completed = parser.feed("## EXECUTIVE SUMMARY\n")
+        
+        assert completed == [("TITLE", "# TITLE\nPayment Service")]
+    
+    def test_chunk_boundaries_do_not_matter(self):
+        """Test that splitting headings across chunks yields the same sections."""
+        _, whole = self._parse_in_chunks(DOCUMENT, len(DOCUMENT))
+        parser, tiny = self._parse_in_chunks(DOCUMENT, 3)
+        
+        assert tiny == whole
+        assert [name for name, _ in tiny] == ["TITLE", "EXECUTIVE SUMMARY", "DETAILED DESCRIPTION"]
+        assert parser.close() == [("KEY REQUIREMENTS", "## KEY REQUIREMENTS\n- Requirement 1")]
+    
+    def test_deeper_headings_stay_in_section(self):
+        """Test that ### headings do not start a new section."""
+        parser, sections = self._parse_in_chunks(DOCUMENT, 10)
+        
+        description = dict(sections)["DETAILED DESCRIPTION"]
+        assert "### Background" in description
+        assert "Sub-heading stays inside the section." in description
+    
+    def test_preamble_and_unstructured_text(self):
+        """Test that text without headings is reported as the preamble."""
+        parser = SectionStreamParser()
+        
+        assert parser.feed("Just some text") == []
+        assert parser.close() == [("PREAMBLE", "Just some text")]
+    
+    def test_blank_preamble_is_skipped(self):
+        """Test that whitespace before the first heading is not a section."""
+        parser = SectionStreamParser()
+        parser.feed("\n\n# TITLE\nName\n")
+        
+        assert parser.close() == [("TITLE", "# TITLE\nName")]
+    
+    def test_hash_without_space_is_not_a_heading(self):
+        """Test that tokens like #hashtag are treated as content."""
+        parser = SectionStreamParser()
+        parser.feed("# TITLE\n#hashtag line\n")
+        
+        assert parser.close() == [("TITLE", "# TITLE\n#hashtag line")]
+
+
+class TestSectionFeedbackHelpers:
+    """Tests for excerpt formatting and feedback merging."""
+    
+    def test_format_section_excerpt(self):
+        """Test that excerpts name their sections and keep their text."""
+        excerpt = format_section_excerpt([("TITLE", "# TITLE\nA"), ("EXECUTIVE SUMMARY", "## EXECUTIVE SUMMARY\nB")])
+        
+        assert "TITLE, EXECUTIVE SUMMARY" in excerpt
+        assert excerpt.endswith("# TITLE\nA\n\n## EXECUTIVE SUMMARY\nB")
+    
+    def test_merge_interleaves_and_dedupes(self):
+        """Test that merged points alternate between batches without duplicates."""
+        first = Feedback(reviewer_role="technical_reviewer", feedback_points=["A1", "A2", "Shared"], iteration=2)
+        second = Feedback(reviewer_role="technical_reviewer", feedback_points=["B1", "shared"], iteration=2)
+        
+        merged = merge_section_feedback([first, second])
+        
+        assert merged.feedback_points == ["A1", "B1", "A2", "shared"]
+        assert merged.reviewer_role == "technical_reviewer"
+        assert merged.iteration == 2
+    
+    def test_merge_caps_points(self):
+        """Test that the merged feedback respects the 8-point limit."""
+        batches = [
+            Feedback(reviewer_role="r", feedback_points=[f"Batch {b} point {i}" for i in range(6)], iteration=1)
+            for b in range(2)
+        ]
+        
+        merged = merge_section_feedback(batches)
+        
+        assert len(merged.feedback_points) == MAX_MERGED_POINTS
+        assert merged.feedback_points[:2] == ["Batch 0 point 0", "Batch 1 point 0"]
+    
+    def test_merge_requires_feedback(self):
+        """Test that merging nothing is rejected."""
+        with pytest.raises(ValueError):
+            merge_section_feedback([])
+    
+    def test_merge_keeps_structured_output(self):
+        """Test that typed findings, worst verdict and tracking survive merging."""
+        first = Feedback(
+            reviewer_role="r", feedback_points=["[Severity: LOW] Typo in summary"], iteration=2,
+            verdict="APPROVE", findings=[Finding(severity="LOW", description="Typo in summary")],
+            improvement_tracking={'fixed': ["Intro"], 'partially_fixed': [], 'not_addressed': []}
+        )
+        second = Feedback(
+            reviewer_role="r", feedback_points=["[Severity: HIGH] No rollback plan"], iteration=2,
+            verdict="NEEDS REVISION", findings=[Finding(severity="HIGH", description="No rollback plan")],
+            improvement_tracking={'fixed': ["Intro", "Scope"], 'partially_fixed': [], 'not_addressed': []}
+        )
+        
+        merged = merge_section_feedback([first, second])
+        
+        assert merged.verdict == "NEEDS REVISION"
+        assert [finding.severity for finding in merged.findings] == ["LOW", "HIGH"]
+        assert merged.improvement_tracking['fixed'] == ["Intro", "Scope"]
@@ -0,0 +1,71 @@
+"""Unit tests for MinHash/LSH near-duplicate clustering."""
+
+import pytest
+from unittest.mock import patch
+from app.utils import similarity
+from app.utils.similarity import MinHashLSH
+
+
+class TestMinHashLSH:
+    """Tests for MinHashLSH."""
+    
+    def test_invalid_settings(self):
+        """Test that bad thresholds and band counts are rejected."""
+        with pytest.raises(ValueError):
+            MinHashLSH(threshold=0)
+        with pytest.raises(ValueError):
+            MinHashLSH(num_perm=64, bands=5)
+    
+    def test_shingles_ignore_severity_and_stopwords(self):
+        """Test that severity tags and filler words do not produce shingles."""
+        lsh = MinHashLSH()
+        
+        assert lsh.shingles("[Severity: HIGH] The cache is missing") == lsh.shingles("cache missing")
+        assert "cache" not in lsh.shingles("cache")
+        assert {"cach", "ache"} <= lsh.shingles("cache")
+    
+    def test_signature_estimates_jaccard(self):
+        """Test that signature agreement tracks shingle similarity."""
+        lsh = MinHashLSH(num_perm=128, bands=32)
+        first = lsh.shingles("Missing error handling for network calls")
+        second = lsh.shingles("Error handling missing around network calls")
+        
+        signature1, signature2 = lsh.signature(first), lsh.signature(second)
+        estimate = sum(a == b for a, b in zip(signature1, signature2)) / len(signature1)
+        exact = len(first & second) / len(first | second)
+        
+        assert abs(estimate - exact) < 0.2
+    
+    def test_signature_is_deterministic(self):
+        """Test that signatures depend only on the seed, not the process."""
+        shingles = MinHashLSH().shingles("Authentication tokens never expire")
+        
+        assert MinHashLSH().signature(shingles) == MinHashLSH().signature(shingles)
+        assert MinHashLSH(seed=2).signature(shingles) != MinHashLSH().signature(shingles)
+    
+    def test_pure_python_signature_matches_numpy(self):
+        """Test the fallback used when numpy is not installed."""
+        lsh = MinHashLSH()
+        shingles = lsh.shingles("Authentication tokens never expire")
+        
+        with patch.object(similarity, 'NUMPY_AVAILABLE', False):
+            fallback = lsh.signature(shingles)
+        
+        assert fallback == lsh.signature(shingles)
+    
+    def test_cluster_groups_near_duplicates(self):
+        """Test that reworded findings cluster and unrelated ones do not."""
+        texts = [
+            "[Severity: HIGH] Security vulnerability in authentication",
+            "[Severity: LOW] Add a glossary of terms",
+            "[Severity: CRITICAL] Security vulnerability found in the authentication flow",
+            "[Severity: MEDIUM] Missing error handling for API calls",
+            "[Severity: HIGH] Error handling is missing around API calls",
+        ]
+        
+        assert MinHashLSH().cluster(texts) == [[0, 2], [1], [3, 4]]
+    
+    def test_cluster_empty_and_blank_texts(self):
+        """Test that texts without shingles stay in their own clusters."""
+        assert MinHashLSH().cluster([]) == []
+        assert MinHashLSH().cluster(["", "the"]) == [[0], [1]]
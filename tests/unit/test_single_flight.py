@@ -0,0 +1,212 @@
+"""Unit tests for single-flight coalescing of provider calls."""
+
+import asyncio
+import threading
+import pytest
+from app.llm.hedged_provider import HedgedProvider
+from app.llm.mock_provider import MockLLMProvider
+from app.llm.single_flight import SingleFlight, no_coalescing
+
+
+class BlockingProvider(MockLLMProvider):
+    """Mock provider whose calls block until released."""
+    
+    def __init__(self, fail: bool = False, **kwargs):
+        super().__init__(**kwargs)
+        self.fail = fail
+        self.calls = 0
+        self.started = threading.Event()
+        self.release = threading.Event()
+    
+    def generate_text(self, prompt: str, **kwargs) -> str:
+        self.calls += 1
+        self.started.set()
+        self.release.wait(timeout=5)
+        if self.fail:
+            raise Exception("Upstream failed")
+        return f"response {self.calls}"
+    
+    async def agenerate_text(self, prompt: str, **kwargs) -> str:
+        self.calls += 1
+        call = self.calls
+        await asyncio.sleep(0.05)
+        if self.fail:
+            raise Exception("Upstream failed")
+        return f"response {call}"
+    
+    def list_models(self):
+        self.calls += 1
+        self.started.set()
+        self.release.wait(timeout=5)
+        return ["mock-model"]
+
+
+class ChildProvider(BlockingProvider):
+    """Subclass delegating to its coalesced parent through super()."""
+    
+    def generate_text(self, prompt: str, **kwargs) -> str:
+        return super().generate_text(prompt, **kwargs).upper()
+
+
+def run_threads(count, target):
+    """Start count threads running target and collect results or errors."""
+    results = [None] * count
+    
+    def worker(index):
+        try:
+            results[index] = target()
+        except Exception as e:
+            results[index] = e
+    
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, results
+
+
+class TestSingleFlight:
+    """Tests for the SingleFlight primitive."""
+    
+    def test_sequential_calls_are_not_cached(self):
+        """Test that a finished call is not reused by later callers."""
+        flight = SingleFlight()
+        counter = iter(range(10))
+        
+        assert flight.do("key", lambda: next(counter)) == 0
+        assert flight.do("key", lambda: next(counter)) == 1
+        assert flight.get_stats() == {'leaders': 2, 'coalesced': 0, 'in_flight': 0}
+    
+    def test_cancelled_async_leader_hands_over(self):
+        """Test that a follower runs the call itself when the leader is cancelled."""
+        flight = SingleFlight()
+        calls = []
+        
+        async def call():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "done"
+        
+        async def run():
+            leader = asyncio.ensure_future(flight.ado("key", call))
+            await asyncio.sleep(0.01)
+            follower = asyncio.ensure_future(flight.ado("key", call))
+            await asyncio.sleep(0.01)
+            leader.cancel()
+            return await follower
+        
+        assert asyncio.run(run()) == "done"
+        assert len(calls) == 2
+
+
+class TestProviderCoalescing:
+    """Tests for coalescing wired into BaseLLMProvider."""
+    
+    def test_concurrent_identical_prompts_share_one_call(self):
+        """Test that concurrent threads with the same prompt make one upstream call."""
+        provider = BlockingProvider()
+        threads, results = run_threads(4, lambda: provider.generate_text("Hello"))
+        provider.started.wait(timeout=5)
+        provider.release.set()
+        for thread in threads:
+            thread.join(timeout=5)
+        
+        assert provider.calls == 1
+        assert results == ["response 1"] * 4
+    
+    def test_different_prompts_are_not_shared(self):
+        """Test that only identical arguments are coalesced."""
+        provider = BlockingProvider()
+        prompts = iter(["Hello", "Other"])
+        lock = threading.Lock()
+        
+        def call():
+            with lock:
+                prompt = next(prompts)
+            return provider.generate_text(prompt)
+        
+        threads, results = run_threads(2, call)
+        provider.started.wait(timeout=5)
+        provider.release.set()
+        for thread in threads:
+            thread.join(timeout=5)
+        
+        assert provider.calls == 2
+    
+    def test_exception_is_shared(self):
+        """Test that every waiting caller receives the leader's exception."""
+        provider = BlockingProvider(fail=True)
+        threads, results = run_threads(3, lambda: provider.generate_text("Hello"))
+        provider.started.wait(timeout=5)
+        provider.release.set()
+        for thread in threads:
+            thread.join(timeout=5)
+        
+        assert provider.calls == 1
+        assert all(isinstance(r, Exception) and str(r) == "Upstream failed" for r in results)
+    
+    def test_async_identical_prompts_share_one_call(self):
+        """Test agenerate_text coalescing within an event loop."""
+        provider = BlockingProvider()
+        
+        async def run():
+            return await asyncio.gather(*(provider.agenerate_text("Hello") for _ in range(3)))
+        
+        assert asyncio.run(run()) == ["response 1"] * 3
+        assert provider.calls == 1
+    
+    def test_super_call_does_not_deadlock(self):
+        """Test that an overriding method calling super() runs the parent directly."""
+        provider = ChildProvider()
+        provider.release.set()
+        
+        assert provider.generate_text("Hello") == "RESPONSE 1"
+    
+    def test_list_models_is_coalesced(self):
+        """Test that concurrent connection checks share one models request."""
+        provider = BlockingProvider()
+        threads, results = run_threads(3, provider.validate_connection)
+        provider.started.wait(timeout=5)
+        provider.release.set()
+        for thread in threads:
+            thread.join(timeout=5)
+        
+        assert results == [True] * 3
+        assert provider.calls == 1
+    
+    def test_opt_out(self):
+        """Test that coalesce=False makes every call go upstream."""
+        provider = BlockingProvider(coalesce=False)
+        
+        async def run():
+            return await asyncio.gather(*(provider.agenerate_text("Hello") for _ in range(3)))
+        
+        asyncio.run(run())
+        assert provider.calls == 3
+    
+    def test_no_coalescing_context(self):
+        """Test that calls inside no_coalescing() are not shared."""
+        provider = BlockingProvider()
+        
+        async def run():
+            with no_coalescing():
+                return await asyncio.gather(*(provider.agenerate_text("Hello") for _ in range(2)))
+        
+        asyncio.run(run())
+        assert provider.calls == 2
+    
+    def test_credentials_separate_calls(self):
+        """Test that providers with different API keys never share a call."""
+        first = BlockingProvider(api_key="key-a")
+        second = BlockingProvider(api_key="key-b")
+        
+        assert first._single_flight_key('generate_text', ("Hello",), {}) != \
+            second._single_flight_key('generate_text', ("Hello",), {})
+    
+    def test_hedge_is_not_coalesced_with_primary(self):
+        """Test that a hedge request is sent even though it is identical to the primary."""
+        primary = BlockingProvider()
+        provider = HedgedProvider(primary, initial_delay=0.01)
+        
+        assert asyncio.run(provider.agenerate_text("Hello")) == "response 1"
+        assert primary.calls == 2
+        assert provider.get_hedge_stats()['hedged_requests'] == 1
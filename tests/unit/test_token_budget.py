@@ -0,0 +1,265 @@
+"""Unit tests for token counting and budget-aware prompt assembly."""
+
+import hashlib
+from unittest.mock import Mock
+from app.agents.presenter import PresenterAgent
+from app.agents.reviewer import ReviewerAgent
+from app.llm.mock_provider import MockLLMProvider
+from app.llm.token_budget import (
+    DEFAULT_CONTEXT_WINDOW,
+    ENCODING_FILE_URLS,
+    OMITTED_NOTE,
+    TRUNCATED_NOTE,
+    PromptBudgeter,
+    PromptPart,
+    TokenCounter,
+    _encoding_file_cached,
+    context_window,
+    outline,
+    output_limit,
+)
+
+
+class WordEncoding:
+    """Stand-in tiktoken encoding with one token per word."""
+    
+    def encode(self, text, disallowed_special=()):
+        return text.split()
+    
+    def decode(self, tokens):
+        return " ".join(tokens)
+
+
+DOCUMENT = """# TITLE
+Payment Service
+
+## EXECUTIVE SUMMARY
+The service settles card payments. It replaces the batch job. It runs in two regions.
+
+## DETAILED DESCRIPTION
+Settlement runs nightly today. Failures are retried by hand. Operators lack visibility.
+"""
+
+
+class TestContextWindow:
+    """Tests for context window lookup."""
+    
+    def test_model_prefix_wins_over_provider(self):
+        """Test that known models use their own window."""
+        assert context_window('openai', 'gpt-4') == 8192
+        assert context_window('openai', 'gpt-4o-mini') == 128000
+        assert context_window('gemini', 'models/gemini-pro') == 32760
+    
+    def test_provider_and_default_fallback(self):
+        """Test that unknown models fall back to the provider, then the default."""
+        assert context_window('anthropic', 'some-new-model') == 200000
+        assert context_window('mock') == DEFAULT_CONTEXT_WINDOW
+
+
+class TestOutputLimit:
+    """Tests for output token limit lookup."""
+    
+    def test_model_and_provider_limits(self):
+        """Test that known models use their own limit, others the provider's."""
+        assert output_limit('openai', 'gpt-4o-mini') == 16384
+        assert output_limit('anthropic', 'claude-3-5-sonnet-20241022') == 8192
+        assert output_limit('gemini', 'models/gemini-2.5-flash') == 65536
+        assert output_limit('anthropic', 'some-new-model') == 4096
+    
+    def test_uncapped_provider(self):
+        """Test that providers without a known limit are not capped."""
+        assert output_limit('ollama', 'qwen2') is None
+        assert output_limit('mock') is None
+
+
+class TestTokenCounter:
+    """Tests for TokenCounter."""
+    
+    def test_estimate_without_encoding(self):
+        """Test that counts fall back to ~4 characters per token."""
+        counter = TokenCounter()
+        
+        assert not counter.exact
+        assert counter.count("x" * 40) == 10
+    
+    def test_exact_with_encoding(self):
+        """Test that an encoding's tokens are counted and truncated exactly."""
+        counter = TokenCounter(WordEncoding())
+        text = " ".join(f"word{i}" for i in range(50))
+        
+        truncated = counter.truncate(text, 20)
+        
+        assert counter.exact
+        assert counter.count(text) == 50
+        assert truncated.endswith(TRUNCATED_NOTE)
+        assert counter.count(truncated) <= 20
+    
+    def test_truncate_keeps_fitting_text(self):
+        """Test that text within the limit is returned unchanged."""
+        assert TokenCounter().truncate("short text", 100) == "short text"
+
+
+class TestEncodingCache:
+    """Tests for detecting locally cached tiktoken encodings."""
+    
+    def test_cached_file_is_found(self, tmp_path, monkeypatch):
+        """Test that an encoding in TIKTOKEN_CACHE_DIR counts as available offline."""
+        monkeypatch.setenv("TIKTOKEN_CACHE_DIR", str(tmp_path))
+        url = ENCODING_FILE_URLS['cl100k_base']
+        (tmp_path / hashlib.sha1(url.encode()).hexdigest()).write_bytes(b"")
+        
+        assert _encoding_file_cached('cl100k_base')
+        assert not _encoding_file_cached('o200k_base')
+    
+    def test_unknown_encoding_or_disabled_cache(self, tmp_path, monkeypatch):
+        """Test that unknown encodings and a disabled cache would need the network."""
+        monkeypatch.setenv("TIKTOKEN_CACHE_DIR", "")
+        
+        assert not _encoding_file_cached('cl100k_base')
+        assert not _encoding_file_cached('unknown_base')
+
+
+class TestOutline:
+    """Tests for document outlining."""
+    
+    def test_keeps_headings_and_leading_sentences(self):
+        """Test that each section keeps its heading and first sentences."""
+        result = outline(DOCUMENT, sentences=1)
+        
+        assert "## EXECUTIVE SUMMARY" in result
+        assert "The service settles card payments." in result
+        assert "It replaces the batch job." not in result
+        assert "Settlement runs nightly today." in result
+    
+    def test_no_headings(self):
+        """Test that unstructured text has no outline."""
+        assert outline("Just a paragraph. Another sentence.") == ""
+
+
+class TestPromptBudgeter:
+    """Tests for PromptBudgeter."""
+    
+    def test_within_budget_is_unchanged(self):
+        """Test that nothing is removed when the prompt fits."""
+        budgeter = PromptBudgeter(budget=1000)
+        
+        result = budgeter.fit([PromptPart('a', "hello"), PromptPart('b', "world")], overhead="Prompt:")
+        
+        assert result.texts == {'a': "hello", 'b': "world"}
+        assert result.report.removed == []
+        assert result.report.fits
+    
+    def test_lowest_priority_shortened_first(self):
+        """Test that only the low-priority part is shortened when that suffices."""
+        budgeter = PromptBudgeter(budget=300)
+        feedback = "\n".join(f"- Feedback point number {i} about the document" for i in range(40))
+        
+        result = budgeter.fit([
+            PromptPart('feedback', feedback, priority=0, strategy='lines'),
+            PromptPart('requirements', "r" * 400, priority=1),
+        ])
+        
+        assert result.texts['requirements'] == "r" * 400
+        assert result.texts['feedback'].startswith("- Feedback point number 0")
+        assert "more lines omitted" in result.texts['feedback']
+        assert result.report.fits
+        assert len(result.report.removed) == 1
+        assert result.report.removed[0].startswith("feedback: dropped")
+    
+    def test_outline_strategy_summarizes_document(self):
+        """Test that a document part is compacted to an outline."""
+        budgeter = PromptBudgeter(budget=60)
+        
+        result = budgeter.fit([PromptPart('previous_output', DOCUMENT, strategy='outline')])
+        
+        assert "## DETAILED DESCRIPTION" in result.texts['previous_output']
+        assert "Operators lack visibility." not in result.texts['previous_output']
+        assert "summarized" in result.report.removed[0]
+        assert result.report.fits
+    
+    def test_part_dropped_when_nothing_useful_fits(self):
+        """Test that a part is replaced by a note if too little room is left."""
+        budgeter = PromptBudgeter(budget=120)
+        
+        result = budgeter.fit([
+            PromptPart('context', "c" * 400, priority=0),
+            PromptPart('requirements', "r" * 400, priority=1, strategy='keep'),
+        ])
+        
+        assert result.texts['context'] == OMITTED_NOTE
+        assert result.texts['requirements'] == "r" * 400
+        assert "context: dropped" in result.report.describe()
+    
+    def test_keep_parts_may_exceed_budget(self):
+        """Test that the report flags a prompt that can't be fitted."""
+        budgeter = PromptBudgeter(budget=10)
+        
+        result = budgeter.fit([PromptPart('requirements', "r" * 400, strategy='keep')])
+        
+        assert result.texts['requirements'] == "r" * 400
+        assert not result.report.fits
+    
+    def test_budget_from_provider(self):
+        """Test that the budget leaves room for the response and a reserve."""
+        provider = Mock()
+        provider.get_provider_name.return_value = 'openai'
+        provider.model = 'gpt-4'
+        
+        budgeter = PromptBudgeter.for_provider(provider, max_output_tokens=2000, reserve_tokens=192)
+        
+        assert budgeter.budget == 8192 - 2000 - 192
+    
+    def test_output_allowance_capped_at_half_window(self):
+        """Test that large max_tokens settings don't consume the whole window."""
+        provider = Mock()
+        provider.get_provider_name.return_value = 'openai'
+        provider.model = 'gpt-4'
+        
+        budgeter = PromptBudgeter.for_provider(provider, max_output_tokens=12000, reserve_tokens=0)
+        
+        assert budgeter.budget == 4096
+
+
+class TestAgentPromptBudget:
+    """Tests for budget-aware prompt assembly in agents."""
+    
+    def test_presenter_compacts_previous_output(self):
+        """Test that refinement summarizes the previous version to fit."""
+        provider = MockLLMProvider()
+        presenter = PresenterAgent(provider, prompt_budget=700)
+        previous = DOCUMENT + "\n".join(f"Extra detail sentence {i}. More words follow here." for i in range(80))
+        
+        presenter.generate("reqs", feedback=["Add metrics"], previous_output=previous)
+        
+        prompt = provider.get_last_prompt()
+        assert "- Add metrics" in prompt
+        assert "## EXECUTIVE SUMMARY" in prompt
+        assert "Extra detail sentence 79" not in prompt
+        assert presenter.last_budget_report.fits
+        assert presenter.last_budget_report.removed[0].startswith("previous_output:")
+    
+    def test_presenter_prompt_unchanged_within_budget(self):
+        """Test that small prompts are sent as before."""
+        provider = MockLLMProvider()
+        presenter = PresenterAgent(provider)
+        
+        presenter.generate("Build a payment service", file_summaries=["spec.pdf: card flows"])
+        
+        prompt = provider.get_last_prompt()
+        assert "Build a payment service" in prompt
+        assert "1. spec.pdf: card flows" in prompt
+        assert presenter.last_budget_report.removed == []
+    
+    def test_reviewer_trims_previous_feedback_before_content(self):
+        """Test that previous feedback gives way before the reviewed content."""
+        provider = MockLLMProvider()
+        reviewer = ReviewerAgent(provider, role="technical", prompt_budget=900)
+        previous_feedback = "\n".join(f"- Old point {i} about missing error handling" for i in range(100))
+        
+        reviewer.review("Full content under review", iteration=2, previous_feedback=previous_feedback)
+        
+        prompt = provider.get_last_prompt()
+        assert "Full content under review" in prompt
+        assert "Old point 0" in prompt
+        assert "Old point 99" not in prompt
+        assert reviewer.last_budget_report.removed[0].startswith("previous_feedback:")